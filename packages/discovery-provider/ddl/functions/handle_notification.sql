@@ -0,0 +1,144 @@
+-- Recomputes unread notification counts of users from scratch, returns the
+-- number of counts that changed
+create or replace function recount_notification_unread_counts(_user_ids int[]) returns integer as $$
+declare
+  changed_count integer;
+begin
+  with unread as (
+    select
+      u.user_id,
+      n.type,
+      count(distinct n.group_id)::integer as unread_count
+    from unnest(_user_ids) as u(user_id)
+    join notification n on array[u.user_id] && n.user_ids
+    where
+      n.type != 'announcement'
+      and n.timestamp > coalesce(
+        (select max(seen_at) from notification_seen s where s.user_id = u.user_id),
+        '2016-01-01'::timestamp
+      )
+    group by u.user_id, n.type
+  ), upserted as (
+    insert into notification_unread_counts (user_id, type, unread_count)
+    select user_id, type, unread_count from unread
+    on conflict (user_id, type) do update
+    set unread_count = excluded.unread_count
+    where notification_unread_counts.unread_count != excluded.unread_count
+    returning 1
+  ), deleted as (
+    delete from notification_unread_counts c
+    where
+      c.user_id = any(_user_ids)
+      and (c.user_id, c.type) not in (select user_id, type from unread)
+    returning 1
+  )
+  select (select count(*) from upserted) + (select count(*) from deleted)
+  into changed_count;
+
+  return changed_count;
+end;
+$$ language plpgsql;
+
+
+create or replace function handle_notification() returns trigger as $$
+begin
+  if new.type = 'announcement' or new.user_ids is null then
+    return null;
+  end if;
+
+  begin
+    with recipients as (
+      select
+        u.user_id,
+        coalesce(max(s.seen_at), '2016-01-01'::timestamp) as seen_at
+      from (select distinct unnest(new.user_ids) as user_id) u
+      left join notification_seen s on s.user_id = u.user_id
+      group by u.user_id
+    ), unread_recipients as (
+      select user_id, seen_at
+      from recipients
+      where new.timestamp > seen_at
+    ), group_unread as (
+      -- recipients who already have an unread notification in the group
+      select distinct r.user_id
+      from notification n
+      cross join lateral unnest(n.user_ids) as nu(user_id)
+      join unread_recipients r on r.user_id = nu.user_id
+      where
+        n.group_id = new.group_id
+        and n.type = new.type
+        and n.id != new.id
+        and n.timestamp > r.seen_at
+    )
+    -- only the first unread notification of a group is counted
+    insert into notification_unread_counts (user_id, type, unread_count)
+    select r.user_id, new.type, 1
+    from unread_recipients r
+    left join group_unread g on g.user_id = r.user_id
+    where g.user_id is null
+    on conflict (user_id, type) do update
+    set unread_count = notification_unread_counts.unread_count + 1;
+  exception
+    when others then
+      raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+  end;
+
+  return null;
+
+exception
+  when others then
+    raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+    raise;
+
+end;
+$$ language plpgsql;
+
+
+create or replace function handle_notification_seen() returns trigger as $$
+begin
+  begin
+    -- seen rows are deleted when their block is reverted
+    if tg_op = 'DELETE' then
+      perform recount_notification_unread_counts(array[old.user_id]);
+    else
+      perform recount_notification_unread_counts(array[new.user_id]);
+    end if;
+  exception
+    when others then
+      raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+  end;
+
+  return null;
+
+exception
+  when others then
+    raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+    raise;
+
+end;
+$$ language plpgsql;
+
+
+do $$ begin
+  create trigger on_notification
+  after insert on notification
+  for each row execute procedure handle_notification();
+exception
+  when others then null;
+end $$;
+
+do $$ begin
+  create trigger on_notification_seen
+  after insert on notification_seen
+  for each row execute procedure handle_notification_seen();
+exception
+  when others then null;
+end $$;
+
+do $$ begin
+  create trigger on_notification_seen_delete
+  after delete on notification_seen
+  for each row execute procedure handle_notification_seen();
+exception
+  when others then null;
+end $$;
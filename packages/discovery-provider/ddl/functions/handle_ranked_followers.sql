@@ -0,0 +1,170 @@
+-- Creators with at least this many followers have their followers kept in
+-- ranked_followers. Matches RANKED_FOLLOWERS_MIN_FOLLOWER_COUNT in
+-- src/queries/get_followers_for_user.py.
+create or replace function ranked_followers_min_follower_count() returns integer as $$
+  select 10000;
+$$ language sql immutable;
+
+
+create or replace function handle_ranked_followers_follow() returns trigger as $$
+begin
+  if new.is_current is false then
+    return null;
+  end if;
+
+  begin
+    if new.is_delete then
+      delete from ranked_followers
+      where
+        followee_user_id = new.followee_user_id
+        and follower_user_id = new.follower_user_id;
+    elsif exists (
+      select 1
+      from aggregate_user
+      where
+        user_id = new.followee_user_id
+        and follower_count >= ranked_followers_min_follower_count()
+    ) then
+      insert into ranked_followers (followee_user_id, follower_user_id, follower_count)
+      values (
+        new.followee_user_id,
+        new.follower_user_id,
+        coalesce(
+          (select follower_count from aggregate_user where user_id = new.follower_user_id),
+          0
+        )
+      )
+      on conflict (followee_user_id, follower_user_id) do nothing;
+    end if;
+  exception
+    when others then
+      raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+  end;
+
+  return null;
+
+exception
+  when others then
+    raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+    raise;
+
+end;
+$$ language plpgsql;
+
+
+create or replace function handle_ranked_followers_follow_delete() returns trigger as $$
+begin
+  begin
+    -- follow rows are only deleted when their block is reverted, which may
+    -- leave a previous follow row current
+    delete from ranked_followers
+    where
+      followee_user_id = old.followee_user_id
+      and follower_user_id = old.follower_user_id;
+
+    insert into ranked_followers (followee_user_id, follower_user_id, follower_count)
+    select
+      f.followee_user_id,
+      f.follower_user_id,
+      coalesce(au.follower_count, 0)
+    from follows f
+    join aggregate_user creator on creator.user_id = f.followee_user_id
+    left join aggregate_user au on au.user_id = f.follower_user_id
+    where
+      f.followee_user_id = old.followee_user_id
+      and f.follower_user_id = old.follower_user_id
+      and f.is_current is true
+      and f.is_delete is false
+      and creator.follower_count >= ranked_followers_min_follower_count()
+    on conflict (followee_user_id, follower_user_id) do nothing;
+  exception
+    when others then
+      raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+  end;
+
+  return null;
+
+exception
+  when others then
+    raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+    raise;
+
+end;
+$$ language plpgsql;
+
+
+create or replace function handle_ranked_followers_aggregate_user() returns trigger as $$
+declare
+  old_follower_count int := 0;
+begin
+  if tg_op = 'UPDATE' then
+    old_follower_count := old.follower_count;
+  end if;
+  if new.follower_count is not distinct from old_follower_count then
+    return null;
+  end if;
+
+  begin
+    -- re-rank the user in the follower lists of the creators they follow
+    update ranked_followers
+    set follower_count = new.follower_count
+    where follower_user_id = new.user_id;
+
+    if new.follower_count >= ranked_followers_min_follower_count()
+      and old_follower_count < ranked_followers_min_follower_count() then
+      insert into ranked_followers (followee_user_id, follower_user_id, follower_count)
+      select
+        f.followee_user_id,
+        f.follower_user_id,
+        coalesce(au.follower_count, 0)
+      from follows f
+      left join aggregate_user au on au.user_id = f.follower_user_id
+      where
+        f.followee_user_id = new.user_id
+        and f.is_current is true
+        and f.is_delete is false
+      on conflict (followee_user_id, follower_user_id) do update
+      set follower_count = excluded.follower_count;
+    elsif new.follower_count < ranked_followers_min_follower_count()
+      and old_follower_count >= ranked_followers_min_follower_count() then
+      delete from ranked_followers where followee_user_id = new.user_id;
+    end if;
+  exception
+    when others then
+      raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+  end;
+
+  return null;
+
+exception
+  when others then
+    raise warning 'An error occurred in %: %', tg_name, sqlerrm;
+    raise;
+
+end;
+$$ language plpgsql;
+
+
+do $$ begin
+  create trigger on_follow_ranked_followers
+  after insert on follows
+  for each row execute procedure handle_ranked_followers_follow();
+exception
+  when others then null;
+end $$;
+
+do $$ begin
+  create trigger on_follow_delete_ranked_followers
+  after delete on follows
+  for each row execute procedure handle_ranked_followers_follow_delete();
+exception
+  when others then null;
+end $$;
+
+do $$ begin
+  create trigger on_aggregate_user_ranked_followers
+  after insert or update of follower_count on aggregate_user
+  for each row execute procedure handle_ranked_followers_aggregate_user();
+exception
+  when others then null;
+end $$;
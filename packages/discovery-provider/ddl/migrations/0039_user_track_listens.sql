@@ -0,0 +1,28 @@
+BEGIN;
+
+-- Normalized listening history, one row per user and track
+CREATE TABLE IF NOT EXISTS user_track_listens (
+    user_id integer NOT NULL,
+    track_id integer NOT NULL,
+    last_listened_at timestamp NOT NULL,
+    play_count integer NOT NULL DEFAULT 1,
+    PRIMARY KEY(user_id, track_id)
+);
+CREATE INDEX IF NOT EXISTS idx_user_track_listens_last_listened_at ON user_track_listens USING btree (user_id, last_listened_at DESC, track_id DESC);
+CREATE INDEX IF NOT EXISTS idx_user_track_listens_play_count ON user_track_listens USING btree (user_id, play_count DESC, last_listened_at DESC, track_id DESC);
+
+-- Backfill from the jsonb listening history, which is no longer written to
+INSERT INTO user_track_listens (user_id, track_id, last_listened_at, play_count)
+SELECT
+    h.user_id,
+    (listen->>'track_id')::integer AS track_id,
+    max((listen->>'timestamp')::timestamp) AS last_listened_at,
+    sum(coalesce((listen->>'play_count')::integer, 1)) AS play_count
+FROM
+    user_listening_history h,
+    jsonb_array_elements(h.listening_history) AS listen
+GROUP BY
+    h.user_id, (listen->>'track_id')::integer
+ON CONFLICT (user_id, track_id) DO NOTHING;
+
+COMMIT;
@@ -0,0 +1,16 @@
+BEGIN;
+
+-- Unread notification groups per user and notification type, maintained by
+-- the handle_notification and handle_notification_seen triggers. Broadcast
+-- announcements are not counted here.
+CREATE TABLE IF NOT EXISTS notification_unread_counts (
+    user_id integer NOT NULL,
+    type varchar NOT NULL,
+    unread_count integer NOT NULL DEFAULT 0,
+    PRIMARY KEY(user_id, type)
+);
+
+-- Announcements are counted at read time
+CREATE INDEX IF NOT EXISTS ix_notification_announcement_timestamp ON notification USING btree (timestamp) WHERE type = 'announcement';
+
+COMMIT;
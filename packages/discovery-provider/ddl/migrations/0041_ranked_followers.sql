@@ -0,0 +1,30 @@
+BEGIN;
+
+-- Followers of creators with at least 10000 followers, kept in the order
+-- follower lists are paginated in. Maintained by the handle_ranked_followers
+-- triggers, see ddl/functions/handle_ranked_followers.sql.
+CREATE TABLE IF NOT EXISTS ranked_followers (
+    followee_user_id integer NOT NULL,
+    follower_user_id integer NOT NULL,
+    follower_count integer NOT NULL DEFAULT 0,
+    PRIMARY KEY(followee_user_id, follower_user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_ranked_followers_follower_count ON ranked_followers USING btree (followee_user_id, follower_count DESC, follower_user_id ASC);
+CREATE INDEX IF NOT EXISTS idx_ranked_followers_follower_user_id ON ranked_followers USING btree (follower_user_id);
+
+INSERT INTO ranked_followers (followee_user_id, follower_user_id, follower_count)
+SELECT
+    f.followee_user_id,
+    f.follower_user_id,
+    coalesce(au.follower_count, 0) AS follower_count
+FROM
+    follows f
+    JOIN aggregate_user creator ON creator.user_id = f.followee_user_id
+    LEFT JOIN aggregate_user au ON au.user_id = f.follower_user_id
+WHERE
+    f.is_current IS TRUE
+    AND f.is_delete IS FALSE
+    AND creator.follower_count >= 10000
+ON CONFLICT (followee_user_id, follower_user_id) DO NOTHING;
+
+COMMIT;
@@ -446,6 +446,27 @@ def test_rejects_invalid_events(app):
         assert did_error == False
 
 
+def test_clear_drops_queued_events(app):
+    setup_challenges(app)
+    with app.app_context():
+        db = get_db()
+
+    redis_conn = get_redis()
+
+    bus = ChallengeEventBus(redis_conn)
+    with db.scoped_session() as session:
+        mgr = ChallengeManager("test_challenge_1", DefaultUpdater())
+        TEST_EVENT = "TEST_EVENT"
+        bus.register_listener(TEST_EVENT, mgr)
+        # events of a rolled back block are cleared before they are flushed
+        bus.dispatch(TEST_EVENT, 100, 1)
+        bus.clear()
+        bus.flush()
+        (count, did_error) = bus.process_events(session)
+        assert count == 0
+        assert did_error == False
+
+
 class BrokenUpdater(ChallengeUpdater):
     # This should trigger a postgres exceptions
     def on_after_challenge_creation(self, session, metadatas: List[FullEventMetadata]):
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from integration_tests.utils import populate_mock_db
+from src.queries.get_feed import get_feed_page
+from src.utils.db_session import get_db
+
+now = datetime(2023, 7, 1, 12, 0, 0)
+
+
+def test_get_feed_inbox_pages(app):
+    """Tests that paging through the inbox feed with cursors skips and repeats nothing"""
+    entities = {
+        "users": [{"user_id": user_id} for user_id in range(1, 5)],
+        "follows": [
+            {"follower_user_id": 1, "followee_user_id": 2},
+            {"follower_user_id": 1, "followee_user_id": 3},
+        ],
+        "tracks": [
+            {"track_id": 1, "owner_id": 2, "created_at": now},
+            {"track_id": 2, "owner_id": 2, "created_at": now + timedelta(minutes=1)},
+            # tracks 3 and 4 share a timestamp and straddle the page boundary
+            {"track_id": 3, "owner_id": 2, "created_at": now + timedelta(minutes=2)},
+            {"track_id": 4, "owner_id": 3, "created_at": now + timedelta(minutes=2)},
+            # not created by a followee, in the feed through the repost below
+            {"track_id": 5, "owner_id": 4, "created_at": now},
+        ],
+        "reposts": [
+            {
+                "user_id": 3,
+                "repost_item_id": 5,
+                "repost_type": "track",
+                "created_at": now + timedelta(minutes=3),
+            },
+        ],
+    }
+
+    with app.app_context():
+        db = get_db()
+    populate_mock_db(db, entities)
+
+    pages = []
+    cursor = None
+    with mock.patch("src.queries.get_feed.is_feed_inbox_enabled", return_value=True):
+        for _ in range(3):
+            with app.test_request_context(query_string={"limit": 2}):
+                page, cursor = get_feed_page(
+                    {"user_id": 1, "filter": "all", "cursor": cursor}
+                )
+            pages.append([track["track_id"] for track in page])
+            if not cursor:
+                break
+
+    assert pages == [[5, 4], [3, 2], [1]]
@@ -0,0 +1,89 @@
+from integration_tests.utils import populate_mock_db
+from src.models.social.follow import Follow
+from src.models.social.ranked_follower import RankedFollower
+from src.models.users.aggregate_user import AggregateUser
+from src.queries.get_followers_for_user import (
+    RANKED_FOLLOWERS_MIN_FOLLOWER_COUNT,
+    get_followers_for_user,
+)
+from src.utils.db_session import get_db
+
+
+def make_follow(follower_user_id, followee_user_id):
+    return {"follower_user_id": follower_user_id, "followee_user_id": followee_user_id}
+
+
+def get_follower_ids(followee_user_id, limit, offset):
+    users = get_followers_for_user(
+        {"followee_user_id": followee_user_id, "limit": limit, "offset": offset}
+    )
+    return [user["user_id"] for user in users]
+
+
+def test_get_followers_for_large_creator(app):
+    with app.app_context():
+        db = get_db()
+
+        populate_mock_db(
+            db,
+            {
+                "users": [{"user_id": i} for i in range(1, 7)],
+                "follows": [
+                    make_follow(2, 1),
+                    make_follow(3, 1),
+                    make_follow(4, 1),
+                    make_follow(5, 1),
+                    make_follow(3, 4),
+                    make_follow(5, 4),
+                    make_follow(2, 5),
+                ],
+            },
+        )
+        # small creators are read from follows
+        assert get_follower_ids(1, 10, 0) == [4, 5, 2, 3]
+
+        with db.scoped_session() as session:
+            assert session.query(RankedFollower).count() == 0
+            # user 1 becomes a large creator
+            session.query(AggregateUser).filter(AggregateUser.user_id == 1).update(
+                {"follower_count": RANKED_FOLLOWERS_MIN_FOLLOWER_COUNT}
+            )
+
+        # new followers and follower count changes are kept in rank
+        populate_mock_db(
+            db, {"follows": [make_follow(6, 1), make_follow(3, 2), make_follow(4, 2)]}
+        )
+        with db.scoped_session() as session:
+            ranked_followers = (
+                session.query(RankedFollower)
+                .filter(RankedFollower.followee_user_id == 1)
+                .all()
+            )
+            assert {
+                (follower.follower_user_id, follower.follower_count)
+                for follower in ranked_followers
+            } == {(2, 2), (3, 0), (4, 2), (5, 1), (6, 0)}
+
+        assert get_follower_ids(1, 10, 0) == [2, 4, 5, 3, 6]
+        assert get_follower_ids(1, 2, 2) == [5, 3]
+
+        # deleting a reverted follow removes the follower
+        with db.scoped_session() as session:
+            session.query(Follow).filter(
+                Follow.follower_user_id == 6, Follow.followee_user_id == 1
+            ).delete()
+            assert (
+                session.query(RankedFollower)
+                .filter(RankedFollower.follower_user_id == 6)
+                .count()
+                == 0
+            )
+        assert get_follower_ids(1, 10, 0) == [2, 4, 5, 3]
+
+        # dropping below the threshold clears the ranked followers
+        with db.scoped_session() as session:
+            session.query(AggregateUser).filter(AggregateUser.user_id == 1).update(
+                {"follower_count": 5}
+            )
+            assert session.query(RankedFollower).count() == 0
+        assert get_follower_ids(1, 10, 0) == [2, 4, 5, 3]
@@ -1,11 +1,15 @@
 from datetime import datetime
 
+import pytest
+
 from integration_tests.utils import populate_mock_db
+from src import exceptions
 from src.queries.get_track_library import (
     GetTrackLibraryArgs,
     LibraryFilterType,
     SortMethod,
     _get_track_library,
+    get_track_library_next_cursor,
 )
 from src.utils.db_session import get_db
 
@@ -447,3 +451,31 @@ def test_tracks_query(session):
     track_library = _get_track_library(args, session)
     assert len(track_library) == 1, "should return 1 track"
     assert_correct_track(track_library, 0, 23)
+
+
+@with_tracks_library_setup
+def test_cursor_pagination(session):
+    """Pages through the all filter with cursors, matching the single page order 23, 26, 21, 20, 18, 17"""
+    args = GetTrackLibraryArgs(
+        user_id=1287290,
+        current_user_id=1287290,
+        limit=4,
+        offset=0,
+        filter_type=LibraryFilterType.all,
+        filter_deleted=False,
+    )
+
+    track_library = _get_track_library(args, session)
+    assert [track["track_id"] for track in track_library] == [23, 26, 21, 20]
+    cursor = get_track_library_next_cursor(args, track_library)
+    assert cursor
+
+    args["cursor"] = cursor
+    track_library = _get_track_library(args, session)
+    assert [track["track_id"] for track in track_library] == [18, 17]
+    assert get_track_library_next_cursor(args, track_library) is None
+
+    # cursors are only supported for the added date sort
+    args["sort_method"] = SortMethod.title
+    with pytest.raises(exceptions.ArgumentError):
+        _get_track_library(args, session)
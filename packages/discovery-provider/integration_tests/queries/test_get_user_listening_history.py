@@ -15,14 +15,9 @@ from src.utils.db_session import get_db
 TIMESTAMP = datetime(2011, 1, 1)
 
 test_entities = {
-    "user_listening_history": [
-        {
-            "user_id": 1,
-            "listening_history": [
-                {"timestamp": str(TIMESTAMP), "track_id": 3},
-                {"timestamp": str(TIMESTAMP), "track_id": 4},
-            ],
-        }
+    "user_track_listens": [
+        {"user_id": 1, "track_id": 3, "last_listened_at": TIMESTAMP},
+        {"user_id": 1, "track_id": 4, "last_listened_at": TIMESTAMP},
     ],
     "plays": [
         {"user_id": 1, "item_id": 1, "created_at": TIMESTAMP + timedelta(minutes=1)},
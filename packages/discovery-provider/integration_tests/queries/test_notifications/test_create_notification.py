@@ -0,0 +1,76 @@
+from sqlalchemy.event import listen, remove
+
+from integration_tests.utils import populate_mock_db
+from src.queries.get_notifications import NotificationType, get_notifications
+from src.utils.db_session import get_db
+
+
+def test_get_create_notifications_filters_usdc_tracks(app):
+    with app.app_context():
+        db_mock = get_db()
+
+        populate_mock_db(
+            db_mock,
+            {
+                "users": [{"user_id": i + 1} for i in range(4)],
+                # user 4 subscribes to users 1, 2 and 3
+                "subscriptions": [
+                    {"subscriber_id": 4, "user_id": user_id} for user_id in range(1, 4)
+                ],
+            },
+        )
+        populate_mock_db(
+            db_mock,
+            {
+                "tracks": [
+                    {"track_id": 10, "owner_id": 1},
+                    {
+                        "track_id": 20,
+                        "owner_id": 2,
+                        "is_premium": True,
+                        "premium_conditions": {
+                            "usdc_purchase": {
+                                "price": 100,
+                                "splits": {"some_user_bank": 1000000},
+                            }
+                        },
+                    },
+                    {"track_id": 30, "owner_id": 3},
+                ],
+            },
+        )
+
+        track_queries = []
+
+        def count_track_queries(
+            conn, cursor, statement, parameters, context, executemany
+        ):
+            if "FROM tracks" in statement:
+                track_queries.append(statement)
+
+        with db_mock.scoped_session() as session:
+            args = {
+                "limit": 10,
+                "user_id": 4,
+                "valid_types": [NotificationType.CREATE],
+            }
+            listen(session.bind, "before_cursor_execute", count_track_queries)
+            try:
+                notifications = get_notifications(session, args)
+            finally:
+                remove(session.bind, "before_cursor_execute", count_track_queries)
+
+            # the usdc gated track of user 2 is filtered out
+            assert {notification["group_id"] for notification in notifications} == {
+                "create:track:user_id:1",
+                "create:track:user_id:3",
+            }
+            # the tracks of every create group are loaded with one query
+            assert len(track_queries) == 1
+
+            args["valid_types"] = [
+                NotificationType.CREATE,
+                NotificationType.USDC_PURCHASE_BUYER,
+            ]
+            notifications = get_notifications(session, args)
+            assert len(notifications) == 3
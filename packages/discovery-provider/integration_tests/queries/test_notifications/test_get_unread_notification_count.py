@@ -1,8 +1,18 @@
 from datetime import datetime, timedelta
 
 from integration_tests.utils import populate_mock_db
+from src.models.notifications.notification import (
+    NotificationSeen,
+    NotificationUnreadCount,
+)
+from src.queries import get_notifications
 from src.queries.get_notifications import get_unread_notification_count
+from src.tasks.reconcile_notification_unread_counts import (
+    _reconcile_notification_unread_counts,
+)
 from src.utils.db_session import get_db
+from src.utils.redis_connection import get_redis
+from src.utils.redis_constants import notification_unread_counts_reconcile_cursor_key
 
 t1 = datetime(2020, 10, 10, 10, 35, 0)
 t2 = t1 - timedelta(hours=1)
@@ -10,49 +20,51 @@ t3 = t1 - timedelta(hours=2)
 t4 = t1 - timedelta(hours=3)
 
 
+def populate_notifications(db_mock):
+    test_entities = {
+        "users": [{"user_id": i + 1} for i in range(5)],
+        "tracks": [{"track_id": 1, "owner_id": 1}],
+        "playlists": [{"playlist_id": 1, "playlist_owner_id": 1}],
+        "notification_seens": [
+            {"user_id": 1, "seen_at": t3},
+        ],
+    }
+
+    populate_mock_db(db_mock, test_entities)
+
+    test_actions = {
+        "follows": [{"follower_user_id": 2, "followee_user_id": 1, "created_at": t1}],
+        "reposts": [
+            {
+                "user_id": 3,
+                "repost_item_id": 1,
+                "repost_type": "track",
+                "created_at": t2,
+            },
+            {
+                "user_id": 3,
+                "repost_item_id": 1,
+                "repost_type": "playlist",
+                "created_at": t3,
+            },
+        ],
+        "saves": [
+            {
+                "user_id": 4,
+                "save_item_id": 1,
+                "save_type": "track",
+                "created_at": t4,
+            }
+        ],
+    }
+    populate_mock_db(db_mock, test_actions)
+
+
 def test_get_unread_notification_count(app):
     with app.app_context():
         db_mock = get_db()
 
-        test_entities = {
-            "users": [{"user_id": i + 1} for i in range(5)],
-            "tracks": [{"track_id": 1, "owner_id": 1}],
-            "playlists": [{"playlist_id": 1, "playlist_owner_id": 1}],
-            "notification_seens": [
-                {"user_id": 1, "seen_at": t3},
-            ],
-        }
-
-        populate_mock_db(db_mock, test_entities)
-
-        test_actions = {
-            "follows": [
-                {"follower_user_id": 2, "followee_user_id": 1, "created_at": t1}
-            ],
-            "reposts": [
-                {
-                    "user_id": 3,
-                    "repost_item_id": 1,
-                    "repost_type": "track",
-                    "created_at": t2,
-                },
-                {
-                    "user_id": 3,
-                    "repost_item_id": 1,
-                    "repost_type": "playlist",
-                    "created_at": t3,
-                },
-            ],
-            "saves": [
-                {
-                    "user_id": 4,
-                    "save_item_id": 1,
-                    "save_type": "track",
-                    "created_at": t4,
-                }
-            ],
-        }
-        populate_mock_db(db_mock, test_actions)
+        populate_notifications(db_mock)
 
         with db_mock.scoped_session() as session:
             args = {"user_id": 1}
@@ -62,3 +74,69 @@ def test_get_unread_notification_count(app):
             args = {"user_id": 3}
             unread_count = get_unread_notification_count(session, args)
             assert unread_count == 0
+
+
+def test_get_maintained_unread_notification_count(app, mocker):
+    mocker.patch.object(
+        get_notifications, "is_notification_unread_counts_enabled", return_value=True
+    )
+    with app.app_context():
+        db_mock = get_db()
+        populate_notifications(db_mock)
+
+        with db_mock.scoped_session() as session:
+            counts = session.query(NotificationUnreadCount).all()
+            assert {(c.user_id, c.type, c.unread_count) for c in counts} == {
+                (1, "follow", 1),
+                (1, "repost", 1),
+            }
+            assert get_unread_notification_count(session, {"user_id": 1}) == 2
+            assert get_unread_notification_count(session, {"user_id": 3}) == 0
+
+        # viewing notifications resets the counts
+        populate_mock_db(
+            db_mock, {"notification_seens": [{"user_id": 1, "seen_at": t1}]}
+        )
+        with db_mock.scoped_session() as session:
+            assert get_unread_notification_count(session, {"user_id": 1}) == 0
+
+        # reverting the view restores the counts
+        with db_mock.scoped_session() as session:
+            session.query(NotificationSeen).filter(
+                NotificationSeen.user_id == 1, NotificationSeen.seen_at == t1
+            ).delete()
+        with db_mock.scoped_session() as session:
+            assert get_unread_notification_count(session, {"user_id": 1}) == 2
+
+
+def test_reconcile_notification_unread_counts(app):
+    redis = get_redis()
+    redis.delete(notification_unread_counts_reconcile_cursor_key)
+    with app.app_context():
+        db_mock = get_db()
+        populate_notifications(db_mock)
+
+        with db_mock.scoped_session() as session:
+            # drift the counts
+            session.query(NotificationUnreadCount).filter(
+                NotificationUnreadCount.type == "follow"
+            ).delete()
+            session.add(NotificationUnreadCount(user_id=3, type="save", unread_count=2))
+            session.query(NotificationUnreadCount).filter(
+                NotificationUnreadCount.type == "repost"
+            ).update({"unread_count": 5})
+
+        with db_mock.scoped_session() as session:
+            assert _reconcile_notification_unread_counts(session, redis, 2) == 2
+            assert int(redis.get(notification_unread_counts_reconcile_cursor_key)) == 2
+            assert _reconcile_notification_unread_counts(session, redis, 2) == 1
+            assert _reconcile_notification_unread_counts(session, redis, 2) == 0
+            # starts over after the last user
+            assert _reconcile_notification_unread_counts(session, redis, 2) == 0
+            assert redis.get(notification_unread_counts_reconcile_cursor_key) is None
+
+            counts = session.query(NotificationUnreadCount).all()
+            assert {(c.user_id, c.type, c.unread_count) for c in counts} == {
+                (1, "follow", 1),
+                (1, "repost", 1),
+            }
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from integration_tests.utils import populate_mock_db
+from src.models.social.follow import Follow
+from src.tasks.entity_manager.entity_manager import (
+    bulk_delete_records,
+    bulk_insert_records,
+)
+from src.utils.db_session import get_db
+
+
+def test_bulk_write_records(app):
+    """Tests that records are replaced with bulk DELETE and INSERT statements"""
+    with app.app_context():
+        db = get_db()
+
+    entities = {
+        "users": [{"user_id": user_id} for user_id in range(1, 4)],
+        "follows": [
+            {"follower_user_id": 1, "followee_user_id": 2},
+            {"follower_user_id": 1, "followee_user_id": 3},
+        ],
+    }
+    populate_mock_db(db, entities)
+
+    with db.scoped_session() as session:
+        existing_follows = session.query(Follow).filter(Follow.is_current == True).all()
+        assert len(existing_follows) == 2
+
+        new_follows = [
+            Follow(
+                blockhash=follow.blockhash,
+                blocknumber=follow.blocknumber,
+                follower_user_id=follow.follower_user_id,
+                followee_user_id=follow.followee_user_id,
+                is_current=True,
+                is_delete=True,
+                created_at=datetime(2023, 1, 1),
+                txhash="0xunfollow",
+            )
+            for follow in existing_follows
+        ]
+        bulk_delete_records(session, existing_follows)
+        bulk_insert_records(session, new_follows)
+
+    with db.scoped_session() as session:
+        follows = session.query(Follow).all()
+        assert len(follows) == 2
+        for follow in follows:
+            assert follow.is_current == True
+            assert follow.is_delete == True
+            assert follow.txhash == "0xunfollow"
+            # columns that were not set fall back to their defaults
+            assert follow.slot is None
@@ -8,13 +8,17 @@ from web3.datastructures import AttributeDict
 
 from integration_tests.utils import populate_mock_db
 from src.models.indexing.cid_data import CIDData
+from src.models.social.follow import Follow
+from src.models.users.associated_wallet import AssociatedWallet
 from src.models.users.user import User
 from src.tasks.entity_manager.utils import (
     PLAYLIST_ID_OFFSET,
     TRACK_ID_OFFSET,
     USER_ID_OFFSET,
+    EntityManagerEvent,
     copy_record,
     get_metadata_type_and_format,
+    get_record_metadata,
     parse_metadata,
     save_cid_metadata,
 )
@@ -369,6 +373,56 @@ def test_invalid_parse_metadata(app):
                     parse_metadata(metadata, action, entity_type)
 
 
+def test_entity_manager_event():
+    """Test that events are decoded with their metadata parsed once"""
+    playlist_data = {"playlist_name": "playlist 1", "description": "test"}
+    valid_event = AttributeDict(
+        {
+            "args": AttributeDict(
+                {
+                    "_entityId": PLAYLIST_ID_OFFSET,
+                    "_entityType": "Playlist",
+                    "_userId": 1,
+                    "_action": "Create",
+                    "_metadata": json.dumps(
+                        {"cid": "QmCreatePlaylist1", "data": playlist_data}
+                    ),
+                    "_signer": "user1wallet",
+                }
+            )
+        }
+    )
+    event = EntityManagerEvent(valid_event, "0x01")
+    assert event.txhash == "0x01"
+    assert event.user_id == 1
+    assert event.entity_id == PLAYLIST_ID_OFFSET
+    assert event.entity_type == "Playlist"
+    assert event.action == "Create"
+    assert event.signer == "user1wallet"
+    assert event.metadata_cid == "QmCreatePlaylist1"
+    assert event.metadata["playlist_name"] == "playlist 1"
+    assert event.metadata_error is None
+
+    invalid_event = AttributeDict(
+        {
+            "args": AttributeDict(
+                {
+                    "_entityId": PLAYLIST_ID_OFFSET,
+                    "_entityType": "Playlist",
+                    "_userId": 1,
+                    "_action": "Create",
+                    "_metadata": '{"cid": "QmCreatePlaylist2"}',  # missing data key
+                    "_signer": "user1wallet",
+                }
+            )
+        }
+    )
+    event = EntityManagerEvent(invalid_event, "0x02")
+    assert event.metadata is None
+    assert event.metadata_cid is None
+    assert event.metadata_error is not None
+
+
 def test_copy_record(app):
     with app.app_context():
         db = get_db()
@@ -424,3 +478,23 @@ def test_copy_record(app):
                 assert old_user_attributes[key] == user_1_txhash
             else:
                 assert value == old_user_attributes[key]
+
+
+def test_get_record_metadata():
+    user_metadata = get_record_metadata(User)
+    assert user_metadata is get_record_metadata(User(user_id=1))
+    assert user_metadata.columns == frozenset(
+        str(column.key) for column in User.__table__.columns
+    )
+    assert user_metadata.has_is_current
+    assert user_metadata.has_updated_at
+    assert "is_current" not in user_metadata.columns_to_copy
+    assert "handle" in user_metadata.columns_to_copy
+
+    follow_metadata = get_record_metadata(Follow)
+    assert follow_metadata.has_is_current
+    assert not follow_metadata.has_updated_at
+
+    wallet_metadata = get_record_metadata(AssociatedWallet)
+    assert wallet_metadata.has_is_current
+    assert not wallet_metadata.has_txhash
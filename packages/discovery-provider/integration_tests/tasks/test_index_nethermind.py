@@ -6,7 +6,12 @@ from web3.types import BlockData
 
 from integration_tests.utils import populate_mock_db_blocks
 from src.models.indexing.block import Block
-from src.tasks.index_nethermind import get_latest_database_block, is_block_on_chain
+from src.tasks.index_nethermind import (
+    CATCH_UP_MODE_BLOCKS_BEHIND,
+    get_block_window_size,
+    get_latest_database_block,
+    is_block_on_chain,
+)
 from src.utils.config import shared_config
 from src.utils.db_session import get_db
 
@@ -59,3 +64,16 @@ def test_is_block_on_chain_not_found(app):
     web3_without_block = RaisingMockWeb3()
     block_on_chain = is_block_on_chain(web3_without_block, b)
     assert block_on_chain == False
+
+
+def test_get_block_window_size():
+    # At the head of the chain, index one block at a time
+    assert get_block_window_size(0, 20) == 1
+    assert get_block_window_size(CATCH_UP_MODE_BLOCKS_BEHIND, 20) == 1
+
+    # Window grows with how far behind the database is
+    assert get_block_window_size(CATCH_UP_MODE_BLOCKS_BEHIND * 5, 20) == 5
+
+    # and is capped by the configured maximum
+    assert get_block_window_size(1_000_000, 20) == 20
+    assert get_block_window_size(1_000_000, 1) == 1
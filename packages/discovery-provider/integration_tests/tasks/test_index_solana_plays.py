@@ -1,96 +1,106 @@
 import json
+from typing import List
 
-from solders.rpc.responses import RpcConfirmedTransactionStatusWithSignature
+import pytest
+from solders.rpc.responses import (
+    GetSignaturesForAddressResp,
+    RpcConfirmedTransactionStatusWithSignature,
+)
+from solders.signature import Signature
 
 from src.tasks.index_solana_plays import (
-    REDIS_TX_CACHE_QUEUE_PREFIX,
-    cache_traversed_tx,
-    fetch_traversed_tx_from_cache,
-)
-from src.utils.redis_connection import get_redis
-
-mock_tx_result_1 = RpcConfirmedTransactionStatusWithSignature.from_json(
-    json.dumps(
-        {
-            "signature": "4NyCD5Ef5bsheuqXKFASJXPsiiss8ESqPg61bF5QNLBMYGshGbKTCfTAFjrxZYAH1JxZdY14kSeQG2b66Cis7vxj",
-            "slot": 111753419,
-            "blockTime": 1640126543,
-            "confirmationStatus": "finalized",
-            "err": None,
-            "memo": None,
-        }
-    )
+    get_signature_batches,
+    get_signature_pages,
+    get_unprocessed_txs,
+    iterate_in_background,
 )
-mock_tx_result_2 = RpcConfirmedTransactionStatusWithSignature.from_json(
-    json.dumps(
-        {
-            "signature": "5211pasG9iDECHnNm4GCWH9xETWJYRk4cxWVcJQyqTJCFGbmmvki2oHyvHJL8MgppztYjXsXPyG4RXcMXuQRpBia",
-            "slot": 111753419 + 100,
-            "blockTime": 1640126543,
-            "confirmationStatus": "finalized",
-            "err": None,
-            "memo": None,
-        }
+
+# 10 transactions, newest first, two per slot
+mock_txs = [
+    RpcConfirmedTransactionStatusWithSignature.from_json(
+        json.dumps(
+            {
+                "signature": str(Signature(bytes([i] * 64))),
+                "slot": 111753419 + i // 2,
+                "blockTime": 1640126543,
+                "confirmationStatus": "finalized",
+                "err": None,
+                "memo": None,
+            }
+        )
     )
-)
+    for i in reversed(range(10))
+]
 
 
-# Confirm expected length of cache array
-def assert_cache_array_length(redis, expected_length: int):
-    cached_val_array = redis.lrange(REDIS_TX_CACHE_QUEUE_PREFIX, 0, 100)
-    cached_val_length = len(cached_val_array)
-    assert cached_val_length == expected_length
+class MockSolanaClientManager:
+    def __init__(self, txs: List[RpcConfirmedTransactionStatusWithSignature]):
+        self.txs = txs
+        self.requests = []
 
+    def get_signatures_for_address(self, account, before=None, until=None, limit=None):
+        self.requests.append(before)
+        start = 0
+        if before is not None:
+            start = [tx.signature for tx in self.txs].index(before) + 1
+        return GetSignaturesForAddressResp(self.txs[start : start + limit])
 
-# Validate caching behavior
 
+def get_slots(txs):
+    return [tx.slot for tx in txs]
 
-def test_cache_traversed_tx(app):
-    with app.app_context():
-        redis = get_redis()
 
-    cache_traversed_tx(redis, mock_tx_result_1)
-    assert_cache_array_length(redis, 1)
-    cached_val_array = redis.lrange(REDIS_TX_CACHE_QUEUE_PREFIX, 0, 100)
-    cached_first_entry = json.loads(cached_val_array[0])
-    assert cached_first_entry == json.loads(mock_tx_result_1.to_json())
+def test_get_unprocessed_txs():
+    # stops at the checkpoint signature
+    checkpoint = (mock_txs[5].slot, str(mock_txs[5].signature))
+    assert get_unprocessed_txs(mock_txs, checkpoint) == mock_txs[:5]
 
+    # without a signature stops before the checkpoint slot
+    checkpoint = (mock_txs[5].slot, None)
+    assert get_unprocessed_txs(mock_txs, checkpoint) == mock_txs[:6]
 
-def test_fetch_traversed_tx_from_cache(app):
-    with app.app_context():
-        redis = get_redis()
+    assert get_unprocessed_txs(mock_txs, (0, None)) == mock_txs
 
-    tx_slot = 111753419
-    first_mock_tx = RpcConfirmedTransactionStatusWithSignature.from_json(
-        json.dumps(
-            {
-                "signature": "4NyCD5Ef5bsheuqXKFASJXPsiiss8ESqPg61bF5QNLBMYGshGbKTCfTAFjrxZYAH1JxZdY14kSeQG2b66Cis7vxj",
-                "slot": tx_slot,
-                "blockTime": 1640126543,
-                "confirmationStatus": "finalized",
-                "err": None,
-                "memo": None,
-            }
-        )
+
+def test_get_signature_batches(mocker):
+    mocker.patch("src.tasks.index_solana_plays.INITIAL_FETCH_SIZE", 2)
+    mocker.patch("src.tasks.index_solana_plays.FETCH_TX_SIGNATURES_BATCH_SIZE", 3)
+    mocker.patch("src.tasks.index_solana_plays.TX_SIGNATURES_PROCESSING_SIZE", 2)
+    solana_client_manager = MockSolanaClientManager(mock_txs)
+    checkpoint = (mock_txs[8].slot, str(mock_txs[8].signature))
+
+    head_txs, cursors = get_signature_pages(solana_client_manager, checkpoint)
+    assert head_txs == mock_txs[:2]
+    # pages of 3 before tx 1 and tx 4, the page before tx 7 is fully processed
+    assert cursors == [mock_txs[4].signature, mock_txs[1].signature]
+
+    batches = list(
+        get_signature_batches(solana_client_manager, checkpoint, head_txs, cursors)
     )
+    assert batches == [
+        [mock_txs[7], mock_txs[6]],
+        [mock_txs[5]],
+        [mock_txs[4], mock_txs[3]],
+        [mock_txs[2]],
+        [mock_txs[1], mock_txs[0]],
+    ]
 
-    cache_traversed_tx(redis, first_mock_tx)
-    # Confirm that if the latest db slot is greater than the cached value, it is removed from redis
-    latest_db_slot = tx_slot + 10
-    fetched_tx = fetch_traversed_tx_from_cache(redis, latest_db_slot)
-    assert fetched_tx == None
 
-    # Confirm the values have been removed from redis queue
-    assert_cache_array_length(redis, 0)
+def test_get_signature_pages_no_new_txs():
+    solana_client_manager = MockSolanaClientManager(mock_txs)
+    checkpoint = (mock_txs[0].slot, str(mock_txs[0].signature))
+    assert get_signature_pages(solana_client_manager, checkpoint) == ([], [])
+    assert solana_client_manager.requests == [None]
 
-    # Now, populate 2 entries into redis
-    cache_traversed_tx(redis, first_mock_tx)
-    cache_traversed_tx(redis, mock_tx_result_2)
 
-    assert_cache_array_length(redis, 2)
+def test_iterate_in_background():
+    assert list(iterate_in_background(range(10), 2)) == list(range(10))
 
-    fetched_tx = fetch_traversed_tx_from_cache(redis, latest_db_slot)
-    assert fetched_tx == mock_tx_result_2.signature
+    def fail():
+        yield 1
+        raise ValueError("failed")
 
-    # Confirm the values have been removed from redis queue
-    assert_cache_array_length(redis, 0)
+    items = iterate_in_background(fail(), 2)
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
@@ -15,7 +15,7 @@ from src.trending_strategies.trending_strategy_factory import TrendingStrategyFa
 from src.trending_strategies.trending_type_and_version import TrendingType
 from src.utils.config import shared_config
 from src.utils.db_session import get_db
-from src.utils.redis_cache import set_json_cached_key
+from src.utils.redis_cache import set_list_cached_key
 from src.utils.redis_connection import get_redis
 
 REDIS_URL = shared_config["redis"]["url"]
@@ -47,9 +47,7 @@ def test_index_trending_notification(app):
             }
             for i in range(1, 21)
         ]
-        track_ids = [track["track_id"] for track in trending_tracks]
-        trending_tracks = (trending_tracks, track_ids)
-        set_json_cached_key(redis, trending_key, trending_tracks)
+        set_list_cached_key(redis, trending_key, trending_tracks, "track_id")
 
         # Add some users to the db so we have blocks
         entities = {
@@ -111,9 +109,7 @@ def test_index_trending_notification(app):
             }
             for i in [2, 4, 5, 1, 7, 8, 9, 10]
         ]
-        track_ids = [track["track_id"] for track in trending_tracks]
-        trending_tracks = (trending_tracks, track_ids)
-        set_json_cached_key(redis, trending_key, trending_tracks)
+        set_list_cached_key(redis, trending_key, trending_tracks, "track_id")
         updated_time = BASE_TIME + timedelta(hours=1)
         updated_time_int = int(round(updated_time.timestamp()))
 
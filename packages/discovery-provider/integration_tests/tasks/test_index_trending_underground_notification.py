@@ -12,7 +12,7 @@ from src.trending_strategies.trending_type_and_version import TrendingType
 from src.utils import helpers
 from src.utils.config import shared_config
 from src.utils.db_session import get_db
-from src.utils.redis_cache import set_json_cached_key
+from src.utils.redis_cache import set_list_cached_key
 from src.utils.redis_connection import get_redis
 
 REDIS_URL = shared_config["redis"]["url"]
@@ -44,8 +44,9 @@ def index_trending_underground_mock(db, track_ids: list[int]) -> None:
             trending_underground_tracks_map[track_id] for track_id in track_ids
         ]
 
-        trending_underground_tracks = (trending_underground_tracks, track_ids)
-        set_json_cached_key(redis, trending_key, trending_underground_tracks)
+        set_list_cached_key(
+            redis, trending_key, trending_underground_tracks, "track_id"
+        )
 
 
 def test_index_trending_underground_notification(app):
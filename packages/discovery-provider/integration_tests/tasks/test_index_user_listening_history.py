@@ -1,10 +1,10 @@
 import logging
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List
 
 from integration_tests.utils import populate_mock_db
 from src.models.indexing.indexing_checkpoints import IndexingCheckpoint
-from src.models.users.user_listening_history import UserListeningHistory
+from src.models.users.user_track_listen import UserTrackListen
 from src.tasks.user_listening_history.index_user_listening_history import (
     USER_LISTENING_HISTORY_TABLE_NAME,
     _index_user_listening_history,
@@ -23,6 +23,23 @@ TIMESTAMP_4 = datetime(2014, 4, 4)
 TIMESTAMP_5 = datetime(2015, 5, 5)
 
 
+def get_user_track_listens(session) -> Dict[int, List[UserTrackListen]]:
+    """Returns each user's listens, most recent first"""
+    listens = (
+        session.query(UserTrackListen)
+        .order_by(
+            UserTrackListen.user_id,
+            UserTrackListen.last_listened_at.desc(),
+            UserTrackListen.track_id.desc(),
+        )
+        .all()
+    )
+    results: Dict[int, List[UserTrackListen]] = {}
+    for listen in listens:
+        results.setdefault(listen.user_id, []).append(listen)
+    return results
+
+
 # Tests
 def test_index_user_listening_history_populate_play_count(app):
     """Tests populating user_listening_history from empty"""
@@ -64,22 +81,17 @@ def test_index_user_listening_history_populate_play_count(app):
     with db.scoped_session() as session:
         _index_user_listening_history(session)
 
-        results: List[UserListeningHistory] = (
-            session.query(UserListeningHistory)
-            .order_by(UserListeningHistory.user_id)
-            .all()
-        )
+        results = get_user_track_listens(session)
 
         assert len(results) == 3
 
-        assert results[0].user_id == 1
-        assert len(results[0].listening_history) == 2
-        assert results[0].listening_history[0]["track_id"] == 3
-        assert results[0].listening_history[0]["timestamp"] == str(TIMESTAMP_5)
-        assert results[0].listening_history[0]["play_count"] == 1
-        assert results[0].listening_history[1]["track_id"] == 1
-        assert results[0].listening_history[1]["timestamp"] == str(TIMESTAMP_4)
-        assert results[0].listening_history[1]["play_count"] == 5
+        assert len(results[1]) == 2
+        assert results[1][0].track_id == 3
+        assert results[1][0].last_listened_at == TIMESTAMP_5
+        assert results[1][0].play_count == 1
+        assert results[1][1].track_id == 1
+        assert results[1][1].last_listened_at == TIMESTAMP_4
+        assert results[1][1].play_count == 5
 
 
 def test_index_user_listening_history_update_play_count(app):
@@ -100,21 +112,16 @@ def test_index_user_listening_history_update_play_count(app):
             {"user_id": 1, "handle": "user-1"},
             {"user_id": 2, "handle": "user-2"},
         ],
-        "user_listening_history": [
-            {
-                "user_id": 1,
-                "listening_history": [
-                    {"timestamp": str(TIMESTAMP_1), "track_id": 1},
-                    {"timestamp": str(TIMESTAMP_2), "track_id": 5},
-                ],
-            },
+        "user_track_listens": [
+            {"user_id": 1, "track_id": 1, "last_listened_at": TIMESTAMP_1},
+            {"user_id": 1, "track_id": 5, "last_listened_at": TIMESTAMP_2},
             {
                 "user_id": 2,
-                "listening_history": [
-                    {"timestamp": str(TIMESTAMP_2), "track_id": 2, "play_count": 3},
-                    {"timestamp": str(TIMESTAMP_1), "track_id": 1},
-                ],
+                "track_id": 2,
+                "last_listened_at": TIMESTAMP_2,
+                "play_count": 3,
             },
+            {"user_id": 2, "track_id": 1, "last_listened_at": TIMESTAMP_1},
         ],
         "plays": [
             # New play
@@ -152,34 +159,28 @@ def test_index_user_listening_history_update_play_count(app):
         _index_user_listening_history(session)
 
     with db.scoped_session() as session:
-        results: List[UserListeningHistory] = (
-            session.query(UserListeningHistory)
-            .order_by(UserListeningHistory.user_id)
-            .all()
-        )
+        results = get_user_track_listens(session)
 
         assert len(results) == 2
 
-        assert results[0].user_id == 1
-        assert len(results[0].listening_history) == 3
-        assert results[0].listening_history[0]["track_id"] == 1
-        assert results[0].listening_history[0]["timestamp"] == str(TIMESTAMP_4)
-        assert results[0].listening_history[0]["play_count"] == 3
-        assert results[0].listening_history[1]["track_id"] == 2
-        assert results[0].listening_history[1]["timestamp"] == str(TIMESTAMP_3)
-        assert results[0].listening_history[1]["play_count"] == 1
-        assert results[0].listening_history[2]["track_id"] == 5
-        assert results[0].listening_history[2]["timestamp"] == str(TIMESTAMP_2)
-        assert results[0].listening_history[2]["play_count"] == 1
-
-        assert results[1].user_id == 2
-        assert len(results[1].listening_history) == 2
-        assert results[1].listening_history[0]["track_id"] == 1
-        assert results[1].listening_history[0]["timestamp"] == str(TIMESTAMP_4)
-        assert results[1].listening_history[0]["play_count"] == 2
-        assert results[1].listening_history[1]["track_id"] == 2
-        assert results[1].listening_history[1]["timestamp"] == str(TIMESTAMP_3)
-        assert results[1].listening_history[1]["play_count"] == 4
+        assert len(results[1]) == 3
+        assert results[1][0].track_id == 1
+        assert results[1][0].last_listened_at == TIMESTAMP_4
+        assert results[1][0].play_count == 3
+        assert results[1][1].track_id == 2
+        assert results[1][1].last_listened_at == TIMESTAMP_3
+        assert results[1][1].play_count == 1
+        assert results[1][2].track_id == 5
+        assert results[1][2].last_listened_at == TIMESTAMP_2
+        assert results[1][2].play_count == 1
+
+        assert len(results[2]) == 2
+        assert results[2][0].track_id == 1
+        assert results[2][0].last_listened_at == TIMESTAMP_4
+        assert results[2][0].play_count == 2
+        assert results[2][1].track_id == 2
+        assert results[2][1].last_listened_at == TIMESTAMP_3
+        assert results[2][1].play_count == 4
 
 
 # Tests
@@ -218,34 +219,27 @@ def test_index_user_listening_history_populate(app):
     with db.scoped_session() as session:
         _index_user_listening_history(session)
 
-        results: List[UserListeningHistory] = (
-            session.query(UserListeningHistory)
-            .order_by(UserListeningHistory.user_id)
-            .all()
-        )
+        results = get_user_track_listens(session)
 
         assert len(results) == 3
 
-        assert results[0].user_id == 1
-        assert len(results[0].listening_history) == 1
-        assert results[0].listening_history[0]["track_id"] == 1
-        assert results[0].listening_history[0]["timestamp"] == str(TIMESTAMP_1)
-
-        assert results[1].user_id == 2
-        assert len(results[1].listening_history) == 2
-        assert results[1].listening_history[0]["track_id"] == 2
-        assert results[1].listening_history[0]["timestamp"] == str(TIMESTAMP_2)
-        assert results[1].listening_history[1]["track_id"] == 1
-        assert results[1].listening_history[1]["timestamp"] == str(TIMESTAMP_1)
-
-        assert results[2].user_id == 3
-        assert len(results[2].listening_history) == 3
-        assert results[2].listening_history[0]["track_id"] == 1
-        assert results[2].listening_history[0]["timestamp"] == str(TIMESTAMP_3)
-        assert results[2].listening_history[1]["track_id"] == 3
-        assert results[2].listening_history[1]["timestamp"] == str(TIMESTAMP_2)
-        assert results[2].listening_history[2]["track_id"] == 2
-        assert results[2].listening_history[2]["timestamp"] == str(TIMESTAMP_1)
+        assert len(results[1]) == 1
+        assert results[1][0].track_id == 1
+        assert results[1][0].last_listened_at == TIMESTAMP_1
+
+        assert len(results[2]) == 2
+        assert results[2][0].track_id == 2
+        assert results[2][0].last_listened_at == TIMESTAMP_2
+        assert results[2][1].track_id == 1
+        assert results[2][1].last_listened_at == TIMESTAMP_1
+
+        assert len(results[3]) == 3
+        assert results[3][0].track_id == 1
+        assert results[3][0].last_listened_at == TIMESTAMP_3
+        assert results[3][1].track_id == 3
+        assert results[3][1].last_listened_at == TIMESTAMP_2
+        assert results[3][2].track_id == 2
+        assert results[3][2].last_listened_at == TIMESTAMP_1
 
         new_checkpoint: IndexingCheckpoint = (
             session.query(IndexingCheckpoint.last_checkpoint)
@@ -277,26 +271,13 @@ def test_index_user_listening_history_update(app):
             {"user_id": 3, "handle": "user-3"},
             {"user_id": 4, "handle": "user-4"},
         ],
-        "user_listening_history": [
-            {
-                "user_id": 1,
-                "listening_history": [{"timestamp": str(TIMESTAMP_1), "track_id": 1}],
-            },
-            {
-                "user_id": 2,
-                "listening_history": [
-                    {"timestamp": str(TIMESTAMP_2), "track_id": 2},
-                    {"timestamp": str(TIMESTAMP_1), "track_id": 1},
-                ],
-            },
-            {
-                "user_id": 3,
-                "listening_history": [
-                    {"timestamp": str(TIMESTAMP_3), "track_id": 1},
-                    {"timestamp": str(TIMESTAMP_2), "track_id": 3},
-                    {"timestamp": str(TIMESTAMP_1), "track_id": 2},
-                ],
-            },
+        "user_track_listens": [
+            {"user_id": 1, "track_id": 1, "last_listened_at": TIMESTAMP_1},
+            {"user_id": 2, "track_id": 2, "last_listened_at": TIMESTAMP_2},
+            {"user_id": 2, "track_id": 1, "last_listened_at": TIMESTAMP_1},
+            {"user_id": 3, "track_id": 1, "last_listened_at": TIMESTAMP_3},
+            {"user_id": 3, "track_id": 3, "last_listened_at": TIMESTAMP_2},
+            {"user_id": 3, "track_id": 2, "last_listened_at": TIMESTAMP_1},
         ],
         "plays": [
             # Current Plays
@@ -338,44 +319,36 @@ def test_index_user_listening_history_update(app):
         _index_user_listening_history(session)
 
     with db.scoped_session() as session:
-        results: List[UserListeningHistory] = (
-            session.query(UserListeningHistory)
-            .order_by(UserListeningHistory.user_id)
-            .all()
-        )
+        results = get_user_track_listens(session)
 
         assert len(results) == 4
 
-        assert results[0].user_id == 1
-        assert len(results[0].listening_history) == 2
-        assert results[0].listening_history[0]["track_id"] == 1
-        assert results[0].listening_history[0]["timestamp"] == str(TIMESTAMP_4)
-        assert results[0].listening_history[1]["track_id"] == 2
-        assert results[0].listening_history[1]["timestamp"] == str(TIMESTAMP_3)
-
-        assert results[1].user_id == 2
-        assert len(results[1].listening_history) == 2
-        assert results[1].listening_history[0]["track_id"] == 2
-        assert results[1].listening_history[0]["timestamp"] == str(TIMESTAMP_2)
-        assert results[1].listening_history[1]["track_id"] == 1
-        assert results[1].listening_history[1]["timestamp"] == str(TIMESTAMP_1)
-
-        assert results[2].user_id == 3
-        assert len(results[2].listening_history) == 3
-        assert results[2].listening_history[0]["track_id"] == 1
-        assert results[2].listening_history[0]["timestamp"] == str(TIMESTAMP_3)
-        assert results[2].listening_history[1]["track_id"] == 3
-        assert results[2].listening_history[1]["timestamp"] == str(TIMESTAMP_2)
-        assert results[2].listening_history[2]["track_id"] == 2
-        assert results[2].listening_history[2]["timestamp"] == str(TIMESTAMP_1)
-
-        assert results[3].user_id == 4
-        assert len(results[3].listening_history) == 1000
-        for i in range(1000):
-            assert results[3].listening_history[i]["track_id"] == 2000 - i
-            assert results[3].listening_history[i]["timestamp"] == str(
-                datetime.fromisoformat("2014-06-26 07:00:00") - timedelta(hours=i)
-            )
+        assert len(results[1]) == 2
+        assert results[1][0].track_id == 1
+        assert results[1][0].last_listened_at == TIMESTAMP_4
+        assert results[1][1].track_id == 2
+        assert results[1][1].last_listened_at == TIMESTAMP_3
+
+        assert len(results[2]) == 2
+        assert results[2][0].track_id == 2
+        assert results[2][0].last_listened_at == TIMESTAMP_2
+        assert results[2][1].track_id == 1
+        assert results[2][1].last_listened_at == TIMESTAMP_1
+
+        assert len(results[3]) == 3
+        assert results[3][0].track_id == 1
+        assert results[3][0].last_listened_at == TIMESTAMP_3
+        assert results[3][1].track_id == 3
+        assert results[3][1].last_listened_at == TIMESTAMP_2
+        assert results[3][2].track_id == 2
+        assert results[3][2].last_listened_at == TIMESTAMP_1
+
+        assert len(results[4]) == 2000
+        for i in range(2000):
+            assert results[4][i].track_id == 2000 - i
+            assert results[4][i].last_listened_at == datetime.fromisoformat(
+                "2014-06-26 07:00:00"
+            ) - timedelta(hours=i)
 
         new_checkpoint: IndexingCheckpoint = (
             session.query(IndexingCheckpoint.last_checkpoint)
@@ -408,26 +381,13 @@ def test_index_user_listening_history_no_update(app):
             {"user_id": 3, "handle": "user-3"},
             {"user_id": 4, "handle": "user-4"},
         ],
-        "user_listening_history": [
-            {
-                "user_id": 1,
-                "listening_history": [{"timestamp": str(TIMESTAMP_1), "track_id": 1}],
-            },
-            {
-                "user_id": 2,
-                "listening_history": [
-                    {"timestamp": str(TIMESTAMP_2), "track_id": 2},
-                    {"timestamp": str(TIMESTAMP_1), "track_id": 1},
-                ],
-            },
-            {
-                "user_id": 3,
-                "listening_history": [
-                    {"timestamp": str(TIMESTAMP_3), "track_id": 1},
-                    {"timestamp": str(TIMESTAMP_2), "track_id": 3},
-                    {"timestamp": str(TIMESTAMP_1), "track_id": 2},
-                ],
-            },
+        "user_track_listens": [
+            {"user_id": 1, "track_id": 1, "last_listened_at": TIMESTAMP_1},
+            {"user_id": 2, "track_id": 2, "last_listened_at": TIMESTAMP_2},
+            {"user_id": 2, "track_id": 1, "last_listened_at": TIMESTAMP_1},
+            {"user_id": 3, "track_id": 1, "last_listened_at": TIMESTAMP_3},
+            {"user_id": 3, "track_id": 3, "last_listened_at": TIMESTAMP_2},
+            {"user_id": 3, "track_id": 2, "last_listened_at": TIMESTAMP_1},
         ],
         "plays": [
             # Current Plays
@@ -451,34 +411,27 @@ def test_index_user_listening_history_no_update(app):
     with db.scoped_session() as session:
         _index_user_listening_history(session)
 
-        results: List[UserListeningHistory] = (
-            session.query(UserListeningHistory)
-            .order_by(UserListeningHistory.user_id)
-            .all()
-        )
+        results = get_user_track_listens(session)
 
         assert len(results) == 3
 
-        assert results[0].user_id == 1
-        assert len(results[0].listening_history) == 1
-        assert results[0].listening_history[0]["track_id"] == 1
-        assert results[0].listening_history[0]["timestamp"] == str(TIMESTAMP_1)
-
-        assert results[1].user_id == 2
-        assert len(results[1].listening_history) == 2
-        assert results[1].listening_history[0]["track_id"] == 2
-        assert results[1].listening_history[0]["timestamp"] == str(TIMESTAMP_2)
-        assert results[1].listening_history[1]["track_id"] == 1
-        assert results[1].listening_history[1]["timestamp"] == str(TIMESTAMP_1)
-
-        assert results[2].user_id == 3
-        assert len(results[2].listening_history) == 3
-        assert results[2].listening_history[0]["track_id"] == 1
-        assert results[2].listening_history[0]["timestamp"] == str(TIMESTAMP_3)
-        assert results[2].listening_history[1]["track_id"] == 3
-        assert results[2].listening_history[1]["timestamp"] == str(TIMESTAMP_2)
-        assert results[2].listening_history[2]["track_id"] == 2
-        assert results[2].listening_history[2]["timestamp"] == str(TIMESTAMP_1)
+        assert len(results[1]) == 1
+        assert results[1][0].track_id == 1
+        assert results[1][0].last_listened_at == TIMESTAMP_1
+
+        assert len(results[2]) == 2
+        assert results[2][0].track_id == 2
+        assert results[2][0].last_listened_at == TIMESTAMP_2
+        assert results[2][1].track_id == 1
+        assert results[2][1].last_listened_at == TIMESTAMP_1
+
+        assert len(results[3]) == 3
+        assert results[3][0].track_id == 1
+        assert results[3][0].last_listened_at == TIMESTAMP_3
+        assert results[3][1].track_id == 3
+        assert results[3][1].last_listened_at == TIMESTAMP_2
+        assert results[3][2].track_id == 2
+        assert results[3][2].last_listened_at == TIMESTAMP_1
 
         new_checkpoint: IndexingCheckpoint = (
             session.query(IndexingCheckpoint.last_checkpoint)
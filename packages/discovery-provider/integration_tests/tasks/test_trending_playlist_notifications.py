@@ -12,7 +12,7 @@ from src.trending_strategies.trending_type_and_version import TrendingType
 from src.utils import helpers
 from src.utils.config import shared_config
 from src.utils.db_session import get_db
-from src.utils.redis_cache import set_json_cached_key
+from src.utils.redis_cache import set_list_cached_key
 from src.utils.redis_connection import get_redis
 
 REDIS_URL = shared_config["redis"]["url"]
@@ -43,8 +43,7 @@ def cache_trending_playlists_mock(db, playlist_ids: list[int]) -> None:
 
         for trending_playlist in trending_playlists:
             trending_playlist["tracks"] = []
-        trending_playlists = (trending_playlists, playlist_ids)
-        set_json_cached_key(redis, trending_key, trending_playlists)
+        set_list_cached_key(redis, trending_key, trending_playlists, "playlist_id")
 
 
 def test_cache_trending_playlist_notifications(app):
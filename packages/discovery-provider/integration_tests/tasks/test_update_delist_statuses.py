@@ -95,9 +95,10 @@ def test_update_user_delist_statuses_missing_user(mock_requests, app):
         current_block_timestamp = datetime.strptime(
             "2023-05-17 19:00:00.999999+00", DATETIME_FORMAT_STRING
         ).timestamp()
-        process_delist_statuses(
+        changed_entity_ids = process_delist_statuses(
             session, trusted_notifier_endpoint, current_block_timestamp
         )
+        assert changed_entity_ids == {"User": set(), "Track": set()}
         # check user_delist_statuses persisted
         all_delist_statuses: List[UserDelistStatus] = (
             session.query(UserDelistStatus)
@@ -159,9 +160,11 @@ def test_update_user_delist_statuses_skip_missing_user(mock_requests, app):
         current_block_timestamp = datetime.strptime(
             "2023-05-17 21:00:00.999999+00", DATETIME_FORMAT_STRING
         ).timestamp()
-        process_delist_statuses(
+        changed_entity_ids = process_delist_statuses(
             session, trusted_notifier_endpoint, current_block_timestamp
         )
+        # user 300 was skipped, user 100 is invalidated from the entity caches
+        assert changed_entity_ids == {"User": {100}, "Track": set()}
         # check user_delist_statuses persisted
         all_delist_statuses: List[UserDelistStatus] = (
             session.query(UserDelistStatus)
@@ -376,3 +376,55 @@ def test_update_track_score_query(app):
         for score in scores:
             assert score.type == udpated_strategy.trending_type.name
             assert score.version == udpated_strategy.version.name
+
+
+def test_update_track_score_query_incremental(app):
+    """Test that incremental updates only write the scores that changed"""
+    with app.app_context():
+        db = get_db()
+
+    setup_trending(db)
+    strategy = TrendingTracksStrategyEJ57D()
+
+    with db.scoped_session() as session:
+        session.execute("REFRESH MATERIALIZED VIEW aggregate_interval_plays")
+        session.execute("REFRESH MATERIALIZED VIEW trending_params")
+        strategy.update_track_score_query(session, full_rebuild=True)
+        expected_scores = {
+            (score.track_id, score.time_range): score.score
+            for score in session.query(TrackTrendingScore).all()
+        }
+
+        # a changed score, a score of a track that is no longer trending
+        # and an unchanged score with a marked created_at
+        session.query(TrackTrendingScore).filter(
+            TrackTrendingScore.track_id == 1, TrackTrendingScore.time_range == "week"
+        ).update({"score": -1})
+        session.add(
+            TrackTrendingScore(
+                track_id=8,
+                type=strategy.trending_type.name,
+                genre=None,
+                version=strategy.version.name,
+                time_range="week",
+                score=100,
+                created_at=datetime(2020, 1, 1),
+            )
+        )
+        session.query(TrackTrendingScore).filter(
+            TrackTrendingScore.track_id == 2, TrackTrendingScore.time_range == "month"
+        ).update({"created_at": datetime(2020, 1, 1)})
+        session.commit()
+
+        strategy.update_track_score_query(session, full_rebuild=False)
+        scores = session.query(TrackTrendingScore).all()
+        assert {
+            (score.track_id, score.time_range): score.score for score in scores
+        } == expected_scores
+
+        unchanged_score = next(
+            score
+            for score in scores
+            if score.track_id == 2 and score.time_range == "month"
+        )
+        assert unchanged_score.created_at == datetime(2020, 1, 1)
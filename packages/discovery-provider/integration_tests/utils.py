@@ -42,8 +42,8 @@ from src.models.users.usdc_transactions_history import (
 from src.models.users.user import User
 from src.models.users.user_balance_change import UserBalanceChange
 from src.models.users.user_bank import USDCUserBankAccount, UserBankAccount, UserBankTx
-from src.models.users.user_listening_history import UserListeningHistory
 from src.models.users.user_tip import UserTip
+from src.models.users.user_track_listen import UserTrackListen
 from src.tasks.aggregates import get_latest_blocknumber
 from src.utils import helpers
 from src.utils.db_session import get_db
@@ -135,7 +135,7 @@ def populate_mock_db(db, entities, block_offset=None):
         aggregate_monthly_plays = entities.get("aggregate_monthly_plays", [])
         aggregate_user = entities.get("aggregate_user", [])
         indexing_checkpoints = entities.get("indexing_checkpoints", [])
-        user_listening_history = entities.get("user_listening_history", [])
+        user_track_listens = entities.get("user_track_listens", [])
         hourly_play_counts = entities.get("hourly_play_counts", [])
         user_bank_accounts = entities.get("user_bank_accounts", [])
         usdc_user_bank_accounts = entities.get("usdc_user_bank_accounts", [])
@@ -424,14 +424,16 @@ def populate_mock_db(db, entities, block_offset=None):
             )
             session.add(user)
 
-        for i, user_listening_history_meta in enumerate(user_listening_history):
-            user_listening_history = UserListeningHistory(
-                user_id=user_listening_history_meta.get("user_id", i + 1),
-                listening_history=user_listening_history_meta.get(
-                    "listening_history", None
+        for i, user_track_listen_meta in enumerate(user_track_listens):
+            user_track_listen = UserTrackListen(
+                user_id=user_track_listen_meta.get("user_id", i + 1),
+                track_id=user_track_listen_meta.get("track_id", i + 1),
+                last_listened_at=user_track_listen_meta.get(
+                    "last_listened_at", datetime.now()
                 ),
+                play_count=user_track_listen_meta.get("play_count", 1),
             )
-            session.add(user_listening_history)
+            session.add(user_track_listen)
 
         for i, hourly_play_count_meta in enumerate(hourly_play_counts):
             hourly_play_count = HourlyPlayCount(
@@ -0,0 +1,116 @@
+"""
+
+Benchmark for hashid encoding on a notification page.
+
+Builds a page of 100 notification groups x 50 repost actions (no database
+needed) and times encoding every id on it with plain hashids, with the
+memoized encode_int_id (cold and warm), with encode_ids, and end to end
+through extend_notification.
+
+To run from packages/discovery-provider:
+
+    PYTHONPATH=. python scripts/benchmark_hashids.py
+
+"""
+
+import random
+import timeit
+from datetime import datetime
+
+from src.api.v1.utils.extend_notification import extend_notification
+from src.utils.helpers import _encode_int_id, encode_ids, encode_int_id, hashids
+
+GROUPS = 100
+ACTIONS_PER_GROUP = 50
+RUNS = 5
+
+
+def build_page():
+    random.seed(0)
+    now = datetime.utcnow()
+    notifications = []
+    for group in range(GROUPS):
+        track_id = random.randint(1, 2_000_000)
+        owner_id = random.randint(1, 1_000_000)
+        actions = []
+        for _ in range(ACTIONS_PER_GROUP):
+            user_id = random.randint(1, 1_000_000)
+            actions.append(
+                {
+                    "specifier": str(user_id),
+                    "type": "repost",
+                    "group_id": f"repost:{track_id}:type:track",
+                    "timestamp": now,
+                    "data": {
+                        "type": "track",
+                        "user_id": user_id,
+                        "repost_item_id": track_id,
+                    },
+                }
+            )
+        notifications.append(
+            {
+                "type": "repost",
+                "group_id": f"repost:{track_id}:type:track",
+                "is_seen": False,
+                "seen_at": None,
+                "actions": actions,
+                "owner_id": owner_id,
+            }
+        )
+    return notifications
+
+
+def page_ids(notifications):
+    ids = []
+    for notification in notifications:
+        for action in notification["actions"]:
+            ids.append(int(action["specifier"]))
+            ids.append(action["data"]["user_id"])
+            ids.append(action["data"]["repost_item_id"])
+    return ids
+
+
+def report(name, id_count, seconds):
+    ids_per_second = id_count * RUNS / seconds
+    ms_per_page = seconds / RUNS * 1000
+    print(f"{name:<28} {ms_per_page:8.2f} ms/page {ids_per_second:12,.0f} ids/sec")
+
+
+def cold_encode_int_id(ids):
+    _encode_int_id.cache_clear()
+    return [encode_int_id(id) for id in ids]
+
+
+if __name__ == "__main__":
+    notifications = build_page()
+    ids = page_ids(notifications)
+    assert encode_ids(ids) == [hashids.encode(id) for id in ids]
+
+    report(
+        "hashids.encode",
+        len(ids),
+        timeit.timeit(lambda: [hashids.encode(id) for id in ids], number=RUNS),
+    )
+    report(
+        "encode_int_id (cold cache)",
+        len(ids),
+        timeit.timeit(lambda: cold_encode_int_id(ids), number=RUNS),
+    )
+    report(
+        "encode_int_id (warm cache)",
+        len(ids),
+        timeit.timeit(lambda: [encode_int_id(id) for id in ids], number=RUNS),
+    )
+    report(
+        "encode_ids (warm cache)",
+        len(ids),
+        timeit.timeit(lambda: encode_ids(ids), number=RUNS),
+    )
+    report(
+        "extend_notification",
+        len(ids),
+        timeit.timeit(
+            lambda: [extend_notification(n) for n in notifications], number=RUNS
+        ),
+    )
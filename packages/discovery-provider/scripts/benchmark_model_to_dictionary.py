@@ -0,0 +1,109 @@
+"""
+
+Micro-benchmark for helpers.model_to_dictionary.
+
+Serializes a batch of transient Track rows (no database needed) with the
+original reflection-per-row implementation and with the per-model serializer,
+checks that both produce the same dictionaries and prints rows/sec for each.
+
+To run from packages/discovery-provider:
+
+    PYTHONPATH=. python scripts/benchmark_model_to_dictionary.py
+
+"""
+
+import timeit
+from datetime import datetime
+
+from sqlalchemy import inspect
+
+from src.models.tracks.track import Track
+from src.utils import helpers
+
+ROWS = 5000
+RUNS = 5
+
+
+def legacy_model_to_dictionary(model, exclude_keys=None):
+    state = inspect(model)
+    unloaded = state.unloaded
+    model_dict = {}
+
+    columns = model.__table__.columns.keys()
+    relationships = model.__mapper__.relationships.keys()
+    properties = []
+    for key in list(set(dir(model)) - set(columns) - set(relationships)):
+        if hasattr(type(model), key):
+            attr = getattr(type(model), key)
+            if not callable(attr) and isinstance(attr, property):
+                properties.append(key)
+
+    if exclude_keys is None:
+        exclude_keys = []
+    if hasattr(model, "exclude_keys"):
+        exclude_keys.extend(model.exclude_keys)
+
+    assert set(exclude_keys).issubset(set(properties).union(columns))
+
+    for key in columns:
+        if key not in exclude_keys and not key.startswith("_"):
+            model_dict[key] = getattr(model, key)
+
+    for key in properties:
+        if key not in exclude_keys and not key.startswith("_"):
+            model_dict[key] = getattr(model, key)
+
+    for key in relationships:
+        if key not in exclude_keys and not key.startswith("_"):
+            if key in unloaded:
+                continue
+            attr = getattr(model, key)
+            if isinstance(attr, list):
+                model_dict[key] = [legacy_model_to_dictionary(a) for a in attr]
+            else:
+                model_dict[key] = legacy_model_to_dictionary(attr)
+
+    return model_dict
+
+
+def build_rows():
+    now = datetime.utcnow()
+    return [
+        Track(
+            blockhash=hex(i),
+            blocknumber=i,
+            track_id=i,
+            is_current=True,
+            is_delete=False,
+            owner_id=i % 100,
+            title=f"track {i}",
+            genre="Electronic",
+            tags="a,b,c",
+            created_at=now,
+            updated_at=now,
+            txhash=hex(i),
+        )
+        for i in range(ROWS)
+    ]
+
+
+def report(name, seconds):
+    rows_per_second = ROWS * RUNS / seconds
+    print(f"{name:<28} {rows_per_second:12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    rows = build_rows()
+    for row in rows:
+        assert legacy_model_to_dictionary(row) == helpers.model_to_dictionary(row)
+
+    legacy_seconds = timeit.timeit(
+        lambda: [legacy_model_to_dictionary(row) for row in rows], number=RUNS
+    )
+    serializer_seconds = timeit.timeit(
+        lambda: helpers.query_result_to_list(rows), number=RUNS
+    )
+
+    report("reflection per row", legacy_seconds)
+    report("per-model serializer", serializer_seconds)
+    print(f"speedup: {legacy_seconds / serializer_seconds:.1f}x")
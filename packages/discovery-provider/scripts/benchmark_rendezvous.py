@@ -0,0 +1,54 @@
+"""
+
+Benchmark for RendezvousHash batch scoring.
+
+Compares calling `get` per key against `get_many` for 1k and 10k CIDs over
+50 content nodes, checking that both return the same nodes.
+
+To run from packages/discovery-provider:
+
+    PYTHONPATH=. python scripts/benchmark_rendezvous.py
+
+"""
+
+import random
+import string
+import timeit
+
+from src.utils.rendezvous import RendezvousHash
+
+NODE_COUNT = 50
+KEY_COUNTS = [1000, 10000]
+RUNS = 3
+
+
+def random_cid():
+    return "Qm" + "".join(random.choices(string.ascii_letters + string.digits, k=44))
+
+
+def report(name, key_count, seconds):
+    keys_per_second = key_count * RUNS / seconds
+    ms_per_run = seconds / RUNS * 1000
+    print(f"{name:<24} {ms_per_run:10.2f} ms {keys_per_second:12,.0f} keys/sec")
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    nodes = [f"https://creatornode{i}.audius.co" for i in range(NODE_COUNT)]
+    hash_obj = RendezvousHash(*nodes)
+
+    for key_count in KEY_COUNTS:
+        keys = [random_cid() for _ in range(key_count)]
+        assert hash_obj.get_many(keys) == [hash_obj.get(key) for key in keys]
+
+        print(f"{key_count} keys x {NODE_COUNT} nodes")
+        report(
+            "get per key",
+            key_count,
+            timeit.timeit(lambda: [hash_obj.get(key) for key in keys], number=RUNS),
+        )
+        report(
+            "get_many",
+            key_count,
+            timeit.timeit(lambda: hash_obj.get_many(keys), number=RUNS),
+        )
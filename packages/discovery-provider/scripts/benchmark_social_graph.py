@@ -0,0 +1,186 @@
+"""
+
+Benchmark for the in-process social graph.
+
+Builds a graph of 10M follows between 1M users (no database needed), with
+followees drawn from a power law so a few creators have hundreds of thousands
+of followers, and times the follow set intersections the user queries need:
+follow intersection, mutuals and the followee follow counts of a page of 100
+users.
+
+With --sql it also loads the graph from the configured database and times the
+same intersections against the SQL queries they replace, for users sampled
+from the follows table.
+
+To run from packages/discovery-provider:
+
+    PYTHONPATH=. python scripts/benchmark_social_graph.py [--sql]
+
+"""
+
+import sys
+import time
+
+import numpy as np
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from src.models.social.follow import Follow
+from src.utils.config import shared_config
+from src.utils.social_graph import SocialGraph, load_social_graph
+
+USERS = 1_000_000
+FOLLOWS = 10_000_000
+PAGE_SIZE = 100
+SAMPLES = 200
+
+
+def build_follows():
+    rng = np.random.default_rng(0)
+    follower_user_ids = rng.integers(1, USERS + 1, FOLLOWS, dtype=np.int32)
+    followee_user_ids = np.minimum(rng.zipf(1.5, FOLLOWS), USERS).astype(np.int32)
+    return follower_user_ids, followee_user_ids
+
+
+def report(name, count, seconds):
+    us_per_op = seconds / count * 1_000_000
+    print(f"{name:<36} {us_per_op:12.1f} us/op {count / seconds:12,.0f} ops/sec")
+
+
+def time_ops(name, ops):
+    start = time.perf_counter()
+    for op in ops:
+        op()
+    report(name, len(ops), time.perf_counter() - start)
+
+
+def benchmark_graph(graph, user_ids, page_user_ids):
+    rng = np.random.default_rng(1)
+    pairs = [
+        (int(a), int(b)) for a, b in zip(rng.choice(page_user_ids, SAMPLES), user_ids)
+    ]
+    time_ops(
+        "graph follow intersection",
+        [lambda a=a, b=b: graph.get_follow_intersection(a, b) for a, b in pairs],
+    )
+    time_ops(
+        "graph mutuals",
+        [lambda user_id=user_id: graph.get_mutuals(user_id) for user_id in user_ids],
+    )
+    time_ops(
+        f"graph followee counts ({PAGE_SIZE} users)",
+        [
+            lambda user_id=user_id: graph.get_followee_follow_counts(
+                user_id, page_user_ids
+            )
+            for user_id in user_ids
+        ],
+    )
+    return pairs
+
+
+def sql_follow_intersection(session, followee_user_id, follower_user_id):
+    return (
+        session.query(Follow.follower_user_id)
+        .filter(
+            Follow.followee_user_id == followee_user_id,
+            Follow.is_current == True,
+            Follow.is_delete == False,
+        )
+        .intersect(
+            session.query(Follow.followee_user_id).filter(
+                Follow.follower_user_id == follower_user_id,
+                Follow.is_current == True,
+                Follow.is_delete == False,
+            )
+        )
+        .all()
+    )
+
+
+def sql_followee_follow_counts(session, user_id, user_ids):
+    followees = (
+        session.query(Follow.followee_user_id)
+        .filter(
+            Follow.is_current == True,
+            Follow.is_delete == False,
+            Follow.follower_user_id == user_id,
+        )
+        .subquery()
+    )
+    return (
+        session.query(Follow.followee_user_id, func.count(Follow.followee_user_id))
+        .filter(
+            Follow.is_current == True,
+            Follow.is_delete == False,
+            Follow.follower_user_id.in_(followees),
+            Follow.followee_user_id.in_(user_ids),
+        )
+        .group_by(Follow.followee_user_id)
+        .all()
+    )
+
+
+def benchmark_sql():
+    engine = create_engine(shared_config["db"]["url_read_replica"])
+    session = sessionmaker(bind=engine)()
+    start = time.perf_counter()
+    graph = load_social_graph(session)
+    print(
+        f"loaded {len(graph.followees.targets):,} follows from the database in "
+        f"{time.perf_counter() - start:.1f} sec"
+    )
+
+    rng = np.random.default_rng(2)
+    user_ids = [int(id) for id in rng.choice(graph.followees.targets, SAMPLES)]
+    page_user_ids = [int(id) for id in rng.choice(graph.followees.targets, PAGE_SIZE)]
+    pairs = benchmark_graph(graph, user_ids, page_user_ids)
+    time_ops(
+        "sql follow intersection",
+        [
+            lambda a=a, b=b: sql_follow_intersection(session, a, b)
+            for a, b in pairs[:SAMPLES]
+        ],
+    )
+    time_ops(
+        f"sql followee counts ({PAGE_SIZE} users)",
+        [
+            lambda user_id=user_id: sql_followee_follow_counts(
+                session, user_id, page_user_ids
+            )
+            for user_id in user_ids
+        ],
+    )
+    session.close()
+
+
+if __name__ == "__main__":
+    follower_user_ids, followee_user_ids = build_follows()
+    start = time.perf_counter()
+    graph = SocialGraph(follower_user_ids, followee_user_ids, 0)
+    # duplicate follows of the largest creators are dropped
+    print(
+        f"built {len(graph.followees.targets):,} follows in "
+        f"{time.perf_counter() - start:.1f} sec"
+    )
+    print(
+        f"graph arrays {(graph.followees.targets.nbytes + graph.followees.offsets.nbytes) * 2 / 2**20:.0f} MiB, "
+        f"largest creator has {int(np.diff(graph.followers.offsets).max()):,} followers"
+    )
+
+    rng = np.random.default_rng(1)
+    user_ids = [int(id) for id in rng.integers(1, USERS + 1, SAMPLES)]
+    # a page of the most followed creators, the slowest case
+    page_user_ids = list(range(1, PAGE_SIZE + 1))
+    benchmark_graph(graph, user_ids, page_user_ids)
+
+    changes = [
+        (int(a), int(b), bool(i % 2), i)
+        for i, (a, b) in enumerate(rng.integers(1, USERS + 1, (100_000, 2)))
+    ]
+    start = time.perf_counter()
+    graph.apply_changes(changes)
+    report("graph apply change", len(changes), time.perf_counter() - start)
+
+    if "--sql" in sys.argv:
+        benchmark_sql()
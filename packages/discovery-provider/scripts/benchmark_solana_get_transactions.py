@@ -0,0 +1,180 @@
+"""
+
+Benchmark for fetching solana transactions.
+
+Starts local stub RPC servers that answer getTransaction, one call or a
+JSON-RPC batch per HTTP request, with a fixed latency per request (no solana
+node needed). Times fetching a block of signatures one call per signature
+through get_sol_tx_info on a thread pool, as the indexers used to, and in
+batches through get_transactions. solana-py's Client sets up a new http
+client for every call, so that cost is part of the get_sol_tx_info numbers,
+while get_transactions reuses pooled connections. Then times a single batch
+against a slow first endpoint, which get_transactions hedges against the
+second one.
+
+To run from packages/discovery-provider:
+
+    PYTHONPATH=. python scripts/benchmark_solana_get_transactions.py
+
+"""
+
+import concurrent.futures
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+from solders.signature import Signature
+
+from src.solana import solana_client_manager
+from src.solana.solana_client_manager import SolanaClientManager
+from src.utils.helpers import split_list
+
+SIGNATURES = 1000
+REQUEST_LATENCY_SEC = 0.02
+SLOW_REQUEST_LATENCY_SEC = 1
+HEDGE_DELAY_SEC = 0.1
+WORKERS = 16
+CHUNK_SIZE = 25
+RUNS = 3
+
+TRANSACTION: Dict[str, Any] = {
+    "slot": 207254272,
+    "transaction": {
+        "signatures": [
+            "564oju8DrSrWd9sSjhgDEFxSYQ1TyAR1dStAwbr5WS6kaLT2GHxt5NVwbdm9cE79ovaGyMu8ZgXUBB9EC8F2XT8J"
+        ],
+        "message": {
+            "header": {
+                "numRequiredSignatures": 1,
+                "numReadonlySignedAccounts": 0,
+                "numReadonlyUnsignedAccounts": 1,
+            },
+            "accountKeys": [
+                "JsP7ivVoNhQZXMDmQd5m6VP6mYmycdCFHzK3i2jAmT9",
+                "11111111111111111111111111111111",
+            ],
+            "recentBlockhash": "3NGCi2ToZdrvLFKMhDneWBajtdLhhwnxvNqfWeNkBJ6u",
+            "instructions": [
+                {
+                    "programIdIndex": 1,
+                    "accounts": [0],
+                    "data": "3Bxs4Bc3VYuGVB19",
+                    "stackHeight": None,
+                }
+            ],
+        },
+    },
+    "meta": {
+        "err": None,
+        "status": {"Ok": None},
+        "fee": 5000,
+        "preBalances": [3474085841, 1],
+        "postBalances": [3474080841, 1],
+        "innerInstructions": [],
+        "logMessages": [],
+        "preTokenBalances": [],
+        "postTokenBalances": [],
+        "rewards": [],
+        "loadedAddresses": {"writable": [], "readonly": []},
+        "computeUnitsConsumed": 150,
+    },
+    "blockTime": 1690212068,
+}
+
+
+class StubRPCServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # get_sol_tx_info opens a connection per call
+    request_queue_size = 128
+
+
+def start_stub_rpc(latency_sec):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency_sec)
+            if isinstance(body, list):
+                response = [respond(request) for request in body]
+            else:
+                response = respond(body)
+            data = json.dumps(response).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = StubRPCServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def respond(request):
+    return {"jsonrpc": "2.0", "result": TRANSACTION, "id": request["id"]}
+
+
+def get_signatures():
+    # the stub answers every signature with the same transaction
+    return [str(Signature.new_unique()) for _ in range(SIGNATURES)]
+
+
+def fetch_one_by_one(solana_client_manager, signatures):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        return list(executor.map(solana_client_manager.get_sol_tx_info, signatures))
+
+
+def fetch_batched(solana_client_manager, signatures):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        results = {}
+        for transactions in executor.map(
+            solana_client_manager.get_transactions,
+            split_list(signatures, CHUNK_SIZE),
+        ):
+            results.update(transactions)
+        return results
+
+
+def report(name, count, seconds):
+    per_second = count * RUNS / seconds
+    ms_per_run = seconds / RUNS * 1000
+    print(f"{name:<36} {ms_per_run:9.2f} ms/run {per_second:10,.0f} txs/sec")
+
+
+if __name__ == "__main__":
+    _, endpoint = start_stub_rpc(REQUEST_LATENCY_SEC)
+    _, slow_endpoint = start_stub_rpc(SLOW_REQUEST_LATENCY_SEC)
+    signatures = get_signatures()
+    manager = SolanaClientManager(endpoint)
+    assert len(fetch_batched(manager, signatures)) == len(set(signatures))
+
+    print(f"{SIGNATURES} signatures, {REQUEST_LATENCY_SEC * 1000:.0f} ms per request")
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fetch_one_by_one(manager, signatures)
+    report("get_sol_tx_info", SIGNATURES, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fetch_batched(manager, signatures)
+    report(
+        f"get_transactions ({CHUNK_SIZE} per batch)",
+        SIGNATURES,
+        time.perf_counter() - start,
+    )
+
+    print(
+        f"first endpoint at {SLOW_REQUEST_LATENCY_SEC * 1000:.0f} ms per request, "
+        f"hedged after {HEDGE_DELAY_SEC * 1000:.0f} ms"
+    )
+    solana_client_manager.HEDGE_DELAY_SECONDS = HEDGE_DELAY_SEC
+    hedged_manager = SolanaClientManager(f"{slow_endpoint},{endpoint}")
+    batch = signatures[:CHUNK_SIZE]
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        hedged_manager.get_transactions(batch)
+    report("get_transactions (hedged)", len(batch), time.perf_counter() - start)
@@ -1,11 +1,10 @@
 import asyncio
 import logging
-import re
 from datetime import datetime
 from typing import Dict, Union, cast
 
 import requests
-from flask_restx import reqparse
+from flask_restx import fields, reqparse
 
 from src import api_helpers
 from src.api.v1.models.common import full_response
@@ -21,10 +20,9 @@ from src.queries.query_helpers import (
 )
 from src.queries.reactions import ReactionResponse
 from src.utils.auth_middleware import MESSAGE_HEADER, SIGNATURE_HEADER
-from src.utils.get_all_other_nodes import get_all_healthy_content_nodes_cached
-from src.utils.helpers import decode_string_id, encode_int_id
+from src.utils.content_node_ring import content_node_ring
+from src.utils.helpers import decode_string_id, encode_ids, encode_int_id
 from src.utils.redis_connection import get_redis
-from src.utils.rendezvous import RendezvousHash
 from src.utils.spl_audio import to_wei_string
 
 redis = get_redis()
@@ -40,33 +38,54 @@ def make_image(endpoint, cid, width="", height=""):
     return f"{endpoint}/content/{cid}/{width}x{height}.jpg"
 
 
-def init_rendezvous(user, cid):
-    if not cid:
-        return ""
-    healthy_nodes = get_all_healthy_content_nodes_cached(redis)
-    if not healthy_nodes:
-        logger.error(
-            f"No healthy Content Nodes found for fetching cid for {user.user_id}: {cid}"
-        )
-        return ""
-
-    return RendezvousHash(
-        *[re.sub("/$", "", node["endpoint"].lower()) for node in healthy_nodes]
+def log_no_healthy_content_nodes(user, cid):
+    logger.error(
+        f"No healthy Content Nodes found for fetching cid for {user.get('user_id')}: {cid}"
     )
 
 
 def get_primary_endpoint(user, cid):
-    rendezvous = init_rendezvous(user, cid)
-    if not rendezvous:
+    if not cid:
         return ""
-    return rendezvous.get(cid)
+    endpoint = content_node_ring.get_primary_endpoint(redis, cid)
+    if not endpoint:
+        log_no_healthy_content_nodes(user, cid)
+    return endpoint
 
 
 def get_n_primary_endpoints(user, cid, n):
-    rendezvous = init_rendezvous(user, cid)
-    if not rendezvous:
+    if not cid:
         return ""
-    return rendezvous.get_n(n, cid)
+    endpoints = content_node_ring.get_n_primary_endpoints(redis, cid, n)
+    if not endpoints:
+        log_no_healthy_content_nodes(user, cid)
+        return ""
+    return endpoints
+
+
+def prefetch_primary_endpoints(tracks=(), playlists=(), users=()):
+    """
+    Looks up the primary endpoints of the artwork of a page of tracks,
+    playlists and users in one batch, so the per-entity artwork helpers
+    below are served from the ring's memoized lookups.
+    """
+    users = list(users)
+    cids = []
+    for track in tracks:
+        if "user" in track:
+            cids.append(track.get("cover_art_sizes"))
+            user = track["user"]
+            users.extend(user if isinstance(user, list) else [user])
+    for playlist in playlists:
+        if "user" in playlist:
+            cids.append(playlist.get("playlist_image_sizes_multihash"))
+            users.append(playlist["user"])
+    for user in users:
+        cids.append(user.get("profile_picture_sizes"))
+        cids.append(user.get("cover_photo_sizes"))
+    cids = [cid for cid in cids if cid]
+    if cids:
+        content_node_ring.get_primary_endpoints(redis, cids)
 
 
 def add_track_artwork(track):
@@ -510,7 +529,7 @@ def extend_tip(tip):
     new_tip["sender"] = extend_user(tip["sender"])
     new_tip["receiver"] = extend_user(tip["receiver"])
     new_tip["followee_supporters"] = [
-        {"user_id": encode_int_id(id)} for id in new_tip["followee_supporters"]
+        {"user_id": user_id} for user_id in encode_ids(new_tip["followee_supporters"])
     ]
     return new_tip
 
@@ -575,6 +594,22 @@ def make_full_response(name, namespace, modelType):
     return namespace.clone(name, full_response, {"data": modelType})
 
 
+def make_cursor_response(name, namespace, modelType):
+    return namespace.model(
+        name,
+        {
+            "data": modelType,
+            "next_cursor": fields.String,
+        },
+    )
+
+
+def make_full_cursor_response(name, namespace, modelType):
+    return namespace.clone(
+        name, full_response, {"data": modelType, "next_cursor": fields.String}
+    )
+
+
 def to_dict(multi_dict):
     """Converts a multi dict into a dict where only list entries are not flat"""
     return {
@@ -692,6 +727,13 @@ pagination_with_current_user_parser.add_argument(
     "user_id", required=False, description="The user ID of the user making the request"
 )
 
+cursor_pagination_with_current_user_parser = pagination_with_current_user_parser.copy()
+cursor_pagination_with_current_user_parser.add_argument(
+    "cursor",
+    required=False,
+    description="The next_cursor of the previous page. Faster than offset for deep pages",
+)
+
 search_parser = reqparse.RequestParser(argument_class=DescriptiveArgument)
 search_parser.add_argument("query", required=True, description="The search query")
 
@@ -732,6 +774,11 @@ user_favorited_tracks_parser.add_argument(
     type=str,
     choices=SortDirection._member_names_,
 )
+user_favorited_tracks_parser.add_argument(
+    "cursor",
+    required=False,
+    description="The next_cursor of the previous page. Only supported when sorting by added date",
+)
 
 user_tracks_library_parser = user_favorited_tracks_parser.copy()
 user_tracks_library_parser.remove_argument("current_user")
@@ -877,6 +924,12 @@ def success_response(entity):
     return api_helpers.success_response(entity, status=200, to_json=False)
 
 
+def cursor_success_response(entity, next_cursor):
+    return api_helpers.success_response(
+        entity, status=200, to_json=False, extras={"next_cursor": next_cursor}
+    )
+
+
 def error_response(error):
     # This is not really a success, but we care about getting the error data back in the same shape
     return api_helpers.success_response(error, status=500, to_json=False)
@@ -18,6 +18,7 @@ from src.api.v1.helpers import (
     make_full_response,
     make_response,
     pagination_with_current_user_parser,
+    prefetch_primary_endpoints,
     search_parser,
     success_response,
     trending_parser,
@@ -120,6 +121,7 @@ def get_tracks_for_playlist(playlist_id, current_user_id=None, exclude_premium=F
         }
         playlist_tracks_map = get_playlist_tracks(session, args)
         playlist_tracks = playlist_tracks_map[playlist_id]
+        prefetch_primary_endpoints(tracks=playlist_tracks)
         tracks = list(map(extend_track, playlist_tracks))
         return tracks
 
@@ -353,6 +355,7 @@ class Top(Resource):
 
         response = get_top_playlists(args.type, args)
 
+        prefetch_primary_endpoints(playlists=response)
         playlists = list(map(extend_playlist, response))
         return success_response(playlists)
 
@@ -386,6 +389,7 @@ class FullTrackFavorites(Resource):
             "offset": offset,
         }
         users = get_savers_for_playlist(args)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
 
         return success_response(users)
@@ -420,6 +424,7 @@ class FullPlaylistReposts(Resource):
             "offset": offset,
         }
         users = get_reposters_for_playlist(args)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
         return success_response(users)
 
@@ -468,6 +473,7 @@ class TrendingPlaylists(Resource):
         )
         playlists = get_trending_playlists(args, strategy)
         playlists = playlists[:TRENDING_LIMIT]
+        prefetch_primary_endpoints(playlists=playlists)
         playlists = list(map(extend_playlist, playlists))
 
         return success_response(playlists)
@@ -10,12 +10,15 @@ from flask import redirect
 from flask.globals import request
 from flask_restx import Namespace, Resource, fields, inputs, marshal, reqparse
 
+from src import exceptions
 from src.api.v1.helpers import (
     DescriptiveArgument,
     abort_bad_path_param,
     abort_bad_request_param,
     abort_not_found,
     current_user_parser,
+    cursor_pagination_with_current_user_parser,
+    cursor_success_response,
     decode_ids_array,
     decode_with_abort,
     extend_track,
@@ -26,10 +29,12 @@ from src.api.v1.helpers import (
     get_current_user_id,
     get_default_max,
     get_encoded_track_id,
+    make_full_cursor_response,
     make_full_response,
     make_response,
     pagination_parser,
     pagination_with_current_user_parser,
+    prefetch_primary_endpoints,
     search_parser,
     stem_from_track,
     success_response,
@@ -70,6 +75,7 @@ from src.queries.get_trending import get_trending
 from src.queries.get_trending_ids import get_trending_ids
 from src.queries.get_unclaimed_id import get_unclaimed_id
 from src.queries.get_underground_trending import get_underground_trending
+from src.queries.query_helpers import get_follower_count_sort_key, get_next_cursor
 from src.queries.search_queries import SearchKind, search
 from src.trending_strategies.trending_strategy_factory import (
     DEFAULT_TRENDING_VERSIONS,
@@ -932,7 +938,7 @@ class FullTrendingIds(Resource):
         return success_response(res)
 
 
-track_favorites_response = make_full_response(
+track_favorites_response = make_full_cursor_response(
     "track_favorites_response_full",
     full_ns,
     fields.List(fields.Nested(user_model_full)),
@@ -947,11 +953,11 @@ class FullTrackFavorites(Resource):
         params={"track_id": "A Track ID"},
         responses={200: "Success", 400: "Bad request", 500: "Server error"},
     )
-    @full_ns.expect(pagination_with_current_user_parser)
+    @full_ns.expect(cursor_pagination_with_current_user_parser)
     @full_ns.marshal_with(track_favorites_response)
     @cache(ttl_sec=5)
     def get(self, track_id):
-        args = pagination_with_current_user_parser.parse_args()
+        args = cursor_pagination_with_current_user_parser.parse_args()
         decoded_id = decode_with_abort(track_id, full_ns)
         limit = get_default_max(args.get("limit"), 10, 100)
         offset = get_default_max(args.get("offset"), 0)
@@ -962,14 +968,19 @@ class FullTrackFavorites(Resource):
             "current_user_id": current_user_id,
             "limit": limit,
             "offset": offset,
+            "cursor": args.get("cursor"),
         }
-        users = get_savers_for_track(args)
+        try:
+            users = get_savers_for_track(args)
+        except exceptions.ArgumentError:
+            abort_bad_request_param("cursor", full_ns)
+        next_cursor = get_next_cursor(users, limit, get_follower_count_sort_key)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
-
-        return success_response(users)
+        return cursor_success_response(users, next_cursor)
 
 
-track_reposts_response = make_full_response(
+track_reposts_response = make_full_cursor_response(
     "track_reposts_response_full", full_ns, fields.List(fields.Nested(user_model_full))
 )
 
@@ -982,11 +993,11 @@ class FullTrackReposts(Resource):
         params={"track_id": "A Track ID"},
         responses={200: "Success", 400: "Bad request", 500: "Server error"},
     )
-    @full_ns.expect(pagination_with_current_user_parser)
+    @full_ns.expect(cursor_pagination_with_current_user_parser)
     @full_ns.marshal_with(track_reposts_response)
     @cache(ttl_sec=5)
     def get(self, track_id):
-        args = pagination_with_current_user_parser.parse_args()
+        args = cursor_pagination_with_current_user_parser.parse_args()
         decoded_id = decode_with_abort(track_id, full_ns)
         limit = get_default_max(args.get("limit"), 10, 100)
         offset = get_default_max(args.get("offset"), 0)
@@ -997,10 +1008,16 @@ class FullTrackReposts(Resource):
             "current_user_id": current_user_id,
             "limit": limit,
             "offset": offset,
+            "cursor": args.get("cursor"),
         }
-        users = get_reposters_for_track(args)
+        try:
+            users = get_reposters_for_track(args)
+        except exceptions.ArgumentError:
+            abort_bad_request_param("cursor", full_ns)
+        next_cursor = get_next_cursor(users, limit, get_follower_count_sort_key)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
-        return success_response(users)
+        return cursor_success_response(users, next_cursor)
 
 
 track_stems_response = make_full_response(
@@ -1053,6 +1070,7 @@ class FullRemixableTracks(Resource):
             "with_users": args.get("with_users", False),
         }
         tracks = get_remixable_tracks(args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -1086,6 +1104,7 @@ class FullRemixesRoute(Resource):
             "offset": format_offset(request_args),
         }
         response = get_remixes_of(args)
+        prefetch_primary_endpoints(tracks=response["tracks"])
         response["tracks"] = list(map(extend_track, response["tracks"]))
         return success_response(response)
 
@@ -1119,6 +1138,7 @@ class FullRemixingRoute(Resource):
             "offset": format_offset(request_args),
         }
         tracks = get_remix_track_parents(args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -1170,6 +1190,7 @@ class BestNewReleases(Resource):
             "user_id": get_current_user_id(request_args),
         }
         tracks = get_top_followee_windowed("track", window, args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -1232,6 +1253,7 @@ class UnderTheRadar(Resource):
             "filter": request_args.get("filter"),
         }
         feed_results = get_feed(args)
+        prefetch_primary_endpoints(tracks=feed_results)
         feed_results = list(map(extend_track, feed_results))
         return success_response(feed_results)
 
@@ -1270,6 +1292,7 @@ class MostLoved(Resource):
             "user_id": get_current_user_id(request_args),
         }
         tracks = get_top_followee_saves("track", args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -1317,6 +1340,7 @@ class FeelingLucky(Resource):
             "min_followers": request_args.get("min_followers"),
         }
         tracks = get_random_tracks(args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
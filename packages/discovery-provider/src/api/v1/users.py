@@ -6,6 +6,7 @@ from eth_account.messages import encode_defunct
 from flask import Response, request
 from flask_restx import Namespace, Resource, fields, reqparse
 
+from src import exceptions
 from src.api.v1.helpers import (
     DescriptiveArgument,
     abort_bad_request_param,
@@ -13,6 +14,8 @@ from src.api.v1.helpers import (
     abort_not_found,
     add_auth_headers_to_parser,
     current_user_parser,
+    cursor_pagination_with_current_user_parser,
+    cursor_success_response,
     decode_with_abort,
     extend_activity,
     extend_challenge_response,
@@ -33,10 +36,13 @@ from src.api.v1.helpers import (
     format_sort_method,
     get_current_user_id,
     get_default_max,
+    make_cursor_response,
+    make_full_cursor_response,
     make_full_response,
     make_response,
     pagination_parser,
     pagination_with_current_user_parser,
+    prefetch_primary_endpoints,
     search_parser,
     success_response,
     track_history_parser,
@@ -117,6 +123,7 @@ from src.queries.get_track_library import (
     GetTrackLibraryArgs,
     LibraryFilterType,
     get_track_library,
+    get_track_library_next_cursor,
 )
 from src.queries.get_tracks import GetTrackArgs, get_tracks
 from src.queries.get_unclaimed_id import get_unclaimed_id
@@ -139,6 +146,8 @@ from src.queries.query_helpers import (
     CollectionLibrarySortMethod,
     PurchaseSortMethod,
     SortDirection,
+    get_follower_count_sort_key,
+    get_next_cursor,
 )
 from src.queries.search_queries import SearchKind, search
 from src.utils import web3_provider
@@ -380,6 +389,7 @@ class TrackList(Resource):
             filter_tracks=filter_tracks,
         )
         tracks = get_tracks(args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -441,6 +451,7 @@ class FullTrackList(Resource):
             filter_tracks=filter_tracks,
         )
         tracks = get_tracks(args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -478,6 +489,7 @@ class HandleFullTrackList(Resource):
             "filter_tracks": filter_tracks,
         }
         tracks = get_tracks(args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -547,6 +559,7 @@ class HandleFullAITrackList(Resource):
             "ai_attributed_only": True,
         }
         tracks = get_tracks(args)
+        prefetch_primary_endpoints(tracks=tracks)
         tracks = list(map(extend_track, tracks))
         return success_response(tracks)
 
@@ -761,7 +774,7 @@ class MostUsedTags(Resource):
 favorites_response = make_response(
     "favorites_response", ns, fields.List(fields.Nested(favorite))
 )
-track_library_full_response = make_full_response(
+track_library_full_response = make_full_cursor_response(
     "track_library_response_full",
     full_ns,
     fields.List(fields.Nested(library_track_activity_model_full)),
@@ -835,10 +848,15 @@ class UserTracksLibraryFull(Resource):
             sort_method=sort_method,
             sort_direction=sort_direction,
             filter_type=filter_type,
+            cursor=args.get("cursor"),
         )
-        library_tracks = get_track_library(get_tracks_args)
+        try:
+            library_tracks = get_track_library(get_tracks_args)
+        except exceptions.ArgumentError:
+            abort_bad_request_param("cursor", full_ns)
+        next_cursor = get_track_library_next_cursor(get_tracks_args, library_tracks)
         tracks = list(map(extend_activity, library_tracks))
-        return success_response(tracks)
+        return cursor_success_response(tracks, next_cursor)
 
 
 def get_user_collections(
@@ -937,10 +955,15 @@ class UserFavoritedTracksFull(Resource):
             sort_method=sort_method,
             sort_direction=sort_direction,
             filter_type=LibraryFilterType.favorite,
+            cursor=args.get("cursor"),
         )
-        track_saves = get_track_library(get_tracks_args)
+        try:
+            track_saves = get_track_library(get_tracks_args)
+        except exceptions.ArgumentError:
+            abort_bad_request_param("cursor", full_ns)
+        next_cursor = get_track_library_next_cursor(get_tracks_args, track_saves)
         tracks = list(map(extend_activity, track_saves))
-        return success_response(tracks)
+        return cursor_success_response(tracks, next_cursor)
 
     @full_ns.doc(
         id="""Get Favorites""",
@@ -1113,6 +1136,7 @@ class FullUserSubscribers(Resource):
             "offset": offset,
         }
         users = get_subscribers_for_user(args)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
         return success_response(users)
 
@@ -1232,10 +1256,10 @@ class BulkUsersSubscribers(FullBulkUsersSubscribers):
         return super()._post()
 
 
-followers_response = make_response(
+followers_response = make_cursor_response(
     "followers_response", ns, fields.List(fields.Nested(user_model))
 )
-full_followers_response = make_full_response(
+full_followers_response = make_full_cursor_response(
     "full_followers_response", full_ns, fields.List(fields.Nested(user_model_full))
 )
 
@@ -1247,7 +1271,7 @@ class FullFollowerUsers(Resource):
     @log_duration(logger)
     def _get_user_followers(self, id):
         decoded_id = decode_with_abort(id, full_ns)
-        args = pagination_with_current_user_parser.parse_args()
+        args = cursor_pagination_with_current_user_parser.parse_args()
         limit = get_default_max(args.get("limit"), 10, 100)
         offset = get_default_max(args.get("offset"), 0)
         current_user_id = get_current_user_id(args)
@@ -1256,10 +1280,16 @@ class FullFollowerUsers(Resource):
             "current_user_id": current_user_id,
             "limit": limit,
             "offset": offset,
+            "cursor": args.get("cursor"),
         }
-        users = get_followers_for_user(args)
+        try:
+            users = get_followers_for_user(args)
+        except exceptions.ArgumentError:
+            abort_bad_request_param("cursor", full_ns)
+        next_cursor = get_next_cursor(users, limit, get_follower_count_sort_key)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
-        return success_response(users)
+        return cursor_success_response(users, next_cursor)
 
     @full_ns.doc(
         id="""Get Followers""",
@@ -1267,7 +1297,7 @@ class FullFollowerUsers(Resource):
         params={"id": "A User ID"},
         responses={200: "Success", 400: "Bad request", 500: "Server error"},
     )
-    @full_ns.expect(pagination_with_current_user_parser)
+    @full_ns.expect(cursor_pagination_with_current_user_parser)
     @full_ns.marshal_with(full_followers_response)
     @cache(ttl_sec=5)
     def get(self, id):
@@ -1282,16 +1312,16 @@ class FollowerUsers(FullFollowerUsers):
         params={"id": "A User ID"},
         responses={200: "Success", 400: "Bad request", 500: "Server error"},
     )
-    @ns.expect(pagination_with_current_user_parser)
+    @ns.expect(cursor_pagination_with_current_user_parser)
     @ns.marshal_with(followers_response)
     def get(self, id):
         return super()._get_user_followers(id)
 
 
-following_response = make_response(
+following_response = make_cursor_response(
     "following_response", ns, fields.List(fields.Nested(user_model))
 )
-following_response_full = make_full_response(
+following_response_full = make_full_cursor_response(
     "following_response_full", full_ns, fields.List(fields.Nested(user_model_full))
 )
 
@@ -1304,7 +1334,7 @@ class FullFollowingUsers(Resource):
     @cache(ttl_sec=5)
     def _get(self, id):
         decoded_id = decode_with_abort(id, full_ns)
-        args = pagination_with_current_user_parser.parse_args()
+        args = cursor_pagination_with_current_user_parser.parse_args()
         limit = get_default_max(args.get("limit"), 10, 100)
         offset = get_default_max(args.get("offset"), 0)
         current_user_id = get_current_user_id(args)
@@ -1313,10 +1343,16 @@ class FullFollowingUsers(Resource):
             "current_user_id": current_user_id,
             "limit": limit,
             "offset": offset,
+            "cursor": args.get("cursor"),
         }
-        users = get_followees_for_user(args)
+        try:
+            users = get_followees_for_user(args)
+        except exceptions.ArgumentError:
+            abort_bad_request_param("cursor", full_ns)
+        next_cursor = get_next_cursor(users, limit, get_follower_count_sort_key)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
-        return success_response(users)
+        return cursor_success_response(users, next_cursor)
 
     @full_ns.doc(
         id="""Get Following""",
@@ -1324,7 +1360,7 @@ class FullFollowingUsers(Resource):
         params={"id": "A User ID"},
         responses={200: "Success", 400: "Bad request", 500: "Server error"},
     )
-    @full_ns.expect(pagination_with_current_user_parser)
+    @full_ns.expect(cursor_pagination_with_current_user_parser)
     @full_ns.marshal_with(following_response_full)
     def get(self, id):
         return self._get(id)
@@ -1338,7 +1374,7 @@ class FollowingUsers(FullFollowingUsers):
         params={"id": "A User ID"},
         responses={200: "Success", 400: "Bad request", 500: "Server error"},
     )
-    @ns.expect(pagination_with_current_user_parser)
+    @ns.expect(cursor_pagination_with_current_user_parser)
     @ns.marshal_with(following_response)
     def get(self, id):
         return super()._get(id)
@@ -1366,6 +1402,7 @@ class FullRelatedUsers(Resource):
         current_user_id = get_current_user_id(args)
         decoded_id = decode_with_abort(id, full_ns)
         users = get_related_artists(decoded_id, current_user_id, limit, offset)
+        prefetch_primary_endpoints(users=users)
         users = list(map(extend_user, users))
         return success_response(users)
 
@@ -1427,6 +1464,7 @@ class FullTopGenreUsers(Resource):
         if args["genre"] is not None:
             get_top_genre_users_args["genre"] = args["genre"]
         top_users = get_top_genre_users(get_top_genre_users_args)
+        prefetch_primary_endpoints(users=top_users["users"])
         users = list(map(extend_user, top_users["users"]))
         return success_response(users)
 
@@ -1472,6 +1510,7 @@ class FullTopUsers(Resource):
         current_user_id = get_current_user_id(args)
 
         top_users = get_top_users(current_user_id)
+        prefetch_primary_endpoints(users=top_users)
         users = list(map(extend_user, top_users))
         return success_response(users)
 
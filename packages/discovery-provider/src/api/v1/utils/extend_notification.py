@@ -35,7 +35,7 @@ from src.queries.get_notifications import (
     UsdcPurchaseBuyerNotification,
     UsdcPurchaseSellerNotification,
 )
-from src.utils.helpers import encode_int_id
+from src.utils.helpers import encode_ids, encode_int_id
 from src.utils.spl_audio import to_wei_string
 
 logger = logging.getLogger(__name__)
@@ -74,97 +74,125 @@ def validate_keys(keys: List[str], data: NotificationData):
 
 def extend_follow(action: NotificationAction):
     data: FollowNotification = action["data"]  # type: ignore
+    specifier, follower_user_id, followee_user_id = encode_ids(
+        [int(action["specifier"]), data["follower_user_id"], data["followee_user_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
-            "follower_user_id": encode_int_id(data["follower_user_id"]),
-            "followee_user_id": encode_int_id(data["followee_user_id"]),
+            "follower_user_id": follower_user_id,
+            "followee_user_id": followee_user_id,
         },
     }
 
 
 def extend_repost(action: NotificationAction):
     data: RepostNotification = action["data"]  # type: ignore
+    specifier, user_id, repost_item_id = encode_ids(
+        [int(action["specifier"]), data["user_id"], data["repost_item_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "type": data["type"],
-            "user_id": encode_int_id(data["user_id"]),
-            "repost_item_id": encode_int_id(data["repost_item_id"]),
+            "user_id": user_id,
+            "repost_item_id": repost_item_id,
         },
     }
 
 
 def extend_repost_of_a_repost(action: NotificationAction):
     data: RepostOfRepostNotification = action["data"]  # type: ignore
+    specifier, user_id, repost_of_repost_item_id = encode_ids(
+        [int(action["specifier"]), data["user_id"], data["repost_of_repost_item_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "type": data["type"],
-            "user_id": encode_int_id(data["user_id"]),
-            "repost_of_repost_item_id": encode_int_id(data["repost_of_repost_item_id"]),
+            "user_id": user_id,
+            "repost_of_repost_item_id": repost_of_repost_item_id,
         },
     }
 
 
 def extend_save_of_repost(action: NotificationAction):
     data: SaveOfRepostNotification = action["data"]  # type: ignore
+    specifier, user_id, save_of_repost_item_id = encode_ids(
+        [int(action["specifier"]), data["user_id"], data["save_of_repost_item_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "type": data["type"],
-            "user_id": encode_int_id(data["user_id"]),
-            "save_of_repost_item_id": encode_int_id(data["save_of_repost_item_id"]),
+            "user_id": user_id,
+            "save_of_repost_item_id": save_of_repost_item_id,
         },
     }
 
 
 def extend_save(action: NotificationAction):
     data: SaveNotification = action["data"]  # type: ignore
+    specifier, user_id, save_item_id = encode_ids(
+        [int(action["specifier"]), data["user_id"], data["save_item_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "type": data["type"],
-            "user_id": encode_int_id(data["user_id"]),
-            "save_item_id": encode_int_id(data["save_item_id"]),
+            "user_id": user_id,
+            "save_item_id": save_item_id,
         },
     }
 
 
 def extend_tastemaker(action: NotificationAction):
     data: TastemakerNotification = action["data"]  # type: ignore
+    (
+        specifier,
+        tastemaker_item_owner_id,
+        tastemaker_item_id,
+        tastemaker_user_id,
+    ) = encode_ids(
+        [
+            int(action["specifier"]),
+            data["tastemaker_item_owner_id"],
+            data["tastemaker_item_id"],
+            data["tastemaker_user_id"],
+        ]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
-            "tastemaker_item_owner_id": encode_int_id(data["tastemaker_item_owner_id"]),
-            "tastemaker_item_id": encode_int_id(data["tastemaker_item_id"]),
+            "tastemaker_item_owner_id": tastemaker_item_owner_id,
+            "tastemaker_item_id": tastemaker_item_id,
             "action": data["action"],
             "tastemaker_item_type": data["tastemaker_item_type"],
-            "tastemaker_user_id": encode_int_id(data["tastemaker_user_id"]),
+            "tastemaker_user_id": tastemaker_user_id,
         },
     }
 
@@ -172,33 +200,44 @@ def extend_tastemaker(action: NotificationAction):
 def extend_remix(action: NotificationAction):
     data: RemixNotification = action["data"]  # type: ignore
     # Specifier is the user who created the remix
+    specifier, parent_track_id, track_id = encode_ids(
+        [int(action["specifier"]), data["parent_track_id"], data["track_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
-            "parent_track_id": encode_int_id(data["parent_track_id"]),
-            "track_id": encode_int_id(data["track_id"]),
-            "track_owner_id": encode_int_id(int(action["specifier"])),
+            "parent_track_id": parent_track_id,
+            "track_id": track_id,
+            "track_owner_id": specifier,
         },
     }
 
 
 def extend_cosign(action: NotificationAction):
     data: CosignRemixNotification = action["data"]  # type: ignore
+    specifier, track_owner_id, parent_track_id, track_id = encode_ids(
+        [
+            int(action["specifier"]),
+            data["track_owner_id"],
+            data["parent_track_id"],
+            data["track_id"],
+        ]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
-            "track_owner_id": encode_int_id(data["track_owner_id"]),
-            "parent_track_owner_id": encode_int_id(int(action["specifier"])),
-            "parent_track_id": encode_int_id(data["parent_track_id"]),
-            "track_id": encode_int_id(data["track_id"]),
+            "track_owner_id": track_owner_id,
+            "parent_track_owner_id": specifier,
+            "parent_track_id": parent_track_id,
+            "track_id": track_id,
         },
     }
 
@@ -226,16 +265,19 @@ def extend_create(action: NotificationAction):
 
 def extend_send_tip(action: NotificationAction):
     data: Union[TipReceiveNotification, TipSendNotification] = action["data"]  # type: ignore
+    specifier, sender_user_id, receiver_user_id = encode_ids(
+        [int(action["specifier"]), data["sender_user_id"], data["receiver_user_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "amount": to_wei_string(data["amount"]),
-            "sender_user_id": encode_int_id(data["sender_user_id"]),
-            "receiver_user_id": encode_int_id(data["receiver_user_id"]),
+            "sender_user_id": sender_user_id,
+            "receiver_user_id": receiver_user_id,
             "tip_tx_signature": data["tx_signature"],
         },
     }
@@ -243,16 +285,19 @@ def extend_send_tip(action: NotificationAction):
 
 def extend_receive_tip(action: NotificationAction):
     data: Union[TipReceiveNotification, TipSendNotification] = action["data"]  # type: ignore
+    specifier, sender_user_id, receiver_user_id = encode_ids(
+        [int(action["specifier"]), data["sender_user_id"], data["receiver_user_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "amount": to_wei_string(data["amount"]),
-            "sender_user_id": encode_int_id(data["sender_user_id"]),
-            "receiver_user_id": encode_int_id(data["receiver_user_id"]),
+            "sender_user_id": sender_user_id,
+            "receiver_user_id": receiver_user_id,
             "tip_tx_signature": data["tx_signature"],
             "reaction_value": data["reaction_value"]  # type: ignore
             if "reaction_value" in data
@@ -263,32 +308,43 @@ def extend_receive_tip(action: NotificationAction):
 
 def extend_supporter_rank_up(action: NotificationAction):
     data: Union[SupporterRankUpNotification, SupportingRankUpNotification] = action["data"]  # type: ignore
+    specifier, sender_user_id, receiver_user_id = encode_ids(
+        [int(action["specifier"]), data["sender_user_id"], data["receiver_user_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "rank": data["rank"],
-            "sender_user_id": encode_int_id(data["sender_user_id"]),
-            "receiver_user_id": encode_int_id(data["receiver_user_id"]),
+            "sender_user_id": sender_user_id,
+            "receiver_user_id": receiver_user_id,
         },
     }
 
 
 def extend_supporter_dethroned(action: NotificationAction):
     data: SupporterDethronedNotification = action["data"]  # type: ignore
+    specifier, dethroned_user_id, sender_user_id, receiver_user_id = encode_ids(
+        [
+            int(action["specifier"]),
+            data["dethroned_user_id"],
+            data["sender_user_id"],
+            data["receiver_user_id"],
+        ]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
-            "dethroned_user_id": encode_int_id(data["dethroned_user_id"]),
-            "sender_user_id": encode_int_id(data["sender_user_id"]),
-            "receiver_user_id": encode_int_id(data["receiver_user_id"]),
+            "dethroned_user_id": dethroned_user_id,
+            "sender_user_id": sender_user_id,
+            "receiver_user_id": receiver_user_id,
         },
     }
 
@@ -311,8 +367,11 @@ def extend_challenge_reward(action: NotificationAction):
 
 def extend_reaction(action: NotificationAction):
     data: ReactionNotification = action["data"]  # type: ignore
+    specifier, receiver_user_id, sender_user_id = encode_ids(
+        [int(action["specifier"]), data["receiver_user_id"], data["sender_user_id"]]
+    )
     return {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
@@ -322,8 +381,8 @@ def extend_reaction(action: NotificationAction):
             "reaction_type": data["reaction_type"],
             "sender_wallet": data["sender_wallet"],
             "reaction_value": data["reaction_value"],
-            "receiver_user_id": encode_int_id(data["receiver_user_id"]),
-            "sender_user_id": encode_int_id(data["sender_user_id"]),
+            "receiver_user_id": receiver_user_id,
+            "sender_user_id": sender_user_id,
             "tip_amount": to_wei_string(data["tip_amount"]),
         },
     }
@@ -398,15 +457,18 @@ def extend_track_added_to_playlist(action: NotificationAction):
     data: TrackAddedToPlaylistNotification = cast(
         TrackAddedToPlaylistNotification, action["data"]
     )
+    specifier, track_id, playlist_id = encode_ids(
+        [int(action["specifier"]), data["track_id"], data["playlist_id"]]
+    )
     notification = {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
-            "track_id": encode_int_id(data["track_id"]),
-            "playlist_id": encode_int_id(data["playlist_id"]),
+            "track_id": track_id,
+            "playlist_id": playlist_id,
             "playlist_owner_id": encode_int_id(data["playlist_owner_id"])
             if data.get("playlist_owner_id")
             else None,
@@ -417,8 +479,9 @@ def extend_track_added_to_playlist(action: NotificationAction):
 
 def extend_trending(action: NotificationAction):
     data: TrendingNotification = action["data"]  # type: ignore
+    specifier, track_id = encode_ids([int(action["specifier"]), data["track_id"]])
     notification = {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
@@ -426,7 +489,7 @@ def extend_trending(action: NotificationAction):
         "data": {
             "rank": data["rank"],
             "genre": data["genre"],
-            "track_id": encode_int_id(data["track_id"]),
+            "track_id": track_id,
             "time_range": data["time_range"],
         },
     }
@@ -435,8 +498,9 @@ def extend_trending(action: NotificationAction):
 
 def extend_trending_playlist(action: NotificationAction):
     data: TrendingPlaylistNotification = action["data"]  # type: ignore
+    specifier, playlist_id = encode_ids([int(action["specifier"]), data["playlist_id"]])
     notification = {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
@@ -444,7 +508,7 @@ def extend_trending_playlist(action: NotificationAction):
         "data": {
             "rank": data["rank"],
             "genre": data["genre"],
-            "playlist_id": encode_int_id(data["playlist_id"]),
+            "playlist_id": playlist_id,
             "time_range": data["time_range"],
         },
     }
@@ -453,21 +517,29 @@ def extend_trending_playlist(action: NotificationAction):
 
 def extend_usdc_purchase_seller(action: NotificationAction):
     data: UsdcPurchaseSellerNotification = action["data"]  # type: ignore
+    specifier, buyer_user_id, seller_user_id, content_id = encode_ids(
+        [
+            int(action["specifier"]),
+            data["buyer_user_id"],
+            data["seller_user_id"],
+            data["content_id"],
+        ]
+    )
     notification = {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "content_type": data["content_type"],
-            "buyer_user_id": encode_int_id(data["buyer_user_id"]),
-            "seller_user_id": encode_int_id(data["seller_user_id"]),
+            "buyer_user_id": buyer_user_id,
+            "seller_user_id": seller_user_id,
             "amount": str(data["amount"]),
             "extra_amount": str(data["extra_amount"])
             if "extra_amount" in data
             else "0",
-            "content_id": encode_int_id(data["content_id"]),
+            "content_id": content_id,
         },
     }
     return notification
@@ -475,21 +547,29 @@ def extend_usdc_purchase_seller(action: NotificationAction):
 
 def extend_usdc_purchase_buyer(action: NotificationAction):
     data: UsdcPurchaseBuyerNotification = action["data"]  # type: ignore
+    specifier, buyer_user_id, seller_user_id, content_id = encode_ids(
+        [
+            int(action["specifier"]),
+            data["buyer_user_id"],
+            data["seller_user_id"],
+            data["content_id"],
+        ]
+    )
     notification = {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
         else action["timestamp"],
         "data": {
             "content_type": data["content_type"],
-            "buyer_user_id": encode_int_id(data["buyer_user_id"]),
-            "seller_user_id": encode_int_id(data["seller_user_id"]),
+            "buyer_user_id": buyer_user_id,
+            "seller_user_id": seller_user_id,
             "amount": str(data["amount"]),
             "extra_amount": str(data["extra_amount"])
             if "extra_amount" in data
             else "0",
-            "content_id": encode_int_id(data["content_id"]),
+            "content_id": content_id,
         },
     }
     return notification
@@ -497,8 +577,9 @@ def extend_usdc_purchase_buyer(action: NotificationAction):
 
 def extend_trending_underground(action: NotificationAction):
     data: TrendingUndergroundNotification = action["data"]  # type: ignore
+    specifier, track_id = encode_ids([int(action["specifier"]), data["track_id"]])
     notification = {
-        "specifier": encode_int_id(int(action["specifier"])),
+        "specifier": specifier,
         "type": action["type"],
         "timestamp": datetime.timestamp(action["timestamp"])
         if action["timestamp"]
@@ -506,7 +587,7 @@ def extend_trending_underground(action: NotificationAction):
         "data": {
             "rank": data["rank"],
             "genre": data["genre"],
-            "track_id": encode_int_id(data["track_id"]),
+            "track_id": track_id,
             "time_range": data["time_range"],
         },
     }
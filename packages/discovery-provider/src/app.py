@@ -325,6 +325,7 @@ def configure_celery(celery, test_config=None):
             "src.tasks.cache_current_nodes",
             "src.tasks.update_aggregates",
             "src.tasks.cache_entity_counts",
+            "src.tasks.reconcile_notification_unread_counts",
         ],
         beat_schedule={
             "aggregate_metrics": {
@@ -435,6 +436,10 @@ def configure_celery(celery, test_config=None):
                 "task": "index_latest_block",
                 "schedule": timedelta(seconds=5),
             },
+            "reconcile_notification_unread_counts": {
+                "task": "reconcile_notification_unread_counts",
+                "schedule": timedelta(minutes=1),
+            },
         },
         task_serializer="json",
         accept_content=["json"],
@@ -492,6 +497,7 @@ def configure_celery(celery, test_config=None):
     redis_inst.delete(INDEX_REACTIONS_LOCK)
     redis_inst.delete(UPDATE_DELIST_STATUSES_LOCK)
     redis_inst.delete("update_aggregates_lock")
+    redis_inst.delete("reconcile_notification_unread_counts_lock")
 
     # delete cached final_poa_block in case it has changed
     redis_inst.delete(final_poa_block_redis_key)
@@ -138,6 +138,10 @@ class ChallengeEventBus:
                 logger.warning(f"ChallengeEventBus: error enqueuing to Redis: {e}")
         self._in_memory_queue.clear()
 
+    def clear(self):
+        """Drops the events in the in-memory queue without dispatching them"""
+        self._in_memory_queue.clear()
+
     def process_events(self, session: Session, max_events=1000) -> Tuple[int, bool]:
         """Dequeues `max_events` from Redis queue and processes them, forwarding to listening ChallengeManagers.
         Returns (num_processed_events, did_error).
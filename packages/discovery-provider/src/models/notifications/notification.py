@@ -51,6 +51,14 @@ class NotificationSeen(Base, RepresentableMixin):
     PrimaryKeyConstraint(user_id, seen_at)
 
 
+class NotificationUnreadCount(Base, RepresentableMixin):
+    __tablename__ = "notification_unread_counts"
+
+    user_id = Column(Integer, primary_key=True, nullable=False)
+    type = Column(String, primary_key=True, nullable=False)
+    unread_count = Column(Integer, nullable=False, server_default=text("0"))
+
+
 class PlaylistSeen(Base, RepresentableMixin):
     __tablename__ = "playlist_seen"
 
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, text
+
+from src.models.base import Base
+from src.models.model_utils import RepresentableMixin
+
+
+class RankedFollower(Base, RepresentableMixin):
+    __tablename__ = "ranked_followers"
+
+    followee_user_id = Column(Integer, primary_key=True, nullable=False)
+    follower_user_id = Column(Integer, primary_key=True, nullable=False)
+    follower_count = Column(Integer, nullable=False, server_default=text("0"))
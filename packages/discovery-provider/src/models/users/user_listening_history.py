@@ -12,6 +12,7 @@ class UserListeningHistory(Base, RepresentableMixin):
         Integer,
         primary_key=True,
     )
+    # Deprecated, listens are stored in user_track_listens
     # listening_history JSON schema
     # [
     #   {"track_id": 1, "timestamp": "2011-01-01 00:00:00"},
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, Integer, text
+
+from src.models.base import Base
+from src.models.model_utils import RepresentableMixin
+
+
+class UserTrackListen(Base, RepresentableMixin):
+    __tablename__ = "user_track_listens"
+
+    user_id = Column(Integer, primary_key=True, nullable=False)
+    track_id = Column(Integer, primary_key=True, nullable=False)
+    last_listened_at = Column(DateTime, nullable=False)
+    play_count = Column(Integer, nullable=False, server_default=text("1"))
@@ -277,7 +277,7 @@ def make_generate_unpopulated_trending(
     exclude_premium: bool,
     usdc_purchase_only=False,
 ):
-    """Wraps a call for use in `use_redis_cache`, which
+    """Wraps a call for use in `use_redis_list_cache`, which
     expects to be passed a function with no arguments."""
 
     def wrapped():
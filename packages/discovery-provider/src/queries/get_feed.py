@@ -1,9 +1,11 @@
 import datetime
 import logging
+from typing import Dict, List, Optional, Set, Tuple
 
 from flask import request
 from sqlalchemy import and_, desc, func, or_
 
+from src import exceptions
 from src.models.playlists.playlist import Playlist
 from src.models.social.follow import Follow
 from src.models.social.repost import Repost, RepostType
@@ -20,27 +22,64 @@ from src.queries.query_helpers import (
     populate_playlist_metadata,
     populate_track_metadata,
 )
-from src.utils import helpers
+from src.utils import helpers, redis_connection
 from src.utils.db_session import get_db_read_replica
 from src.utils.elasticdsl import es_url
+from src.utils.feed_inbox import (
+    FEED_INBOX_MAX_SIZE,
+    decode_feed_cursor,
+    encode_feed_cursor,
+    get_feed_item_key,
+    get_high_follower_user_ids,
+    is_feed_inbox_enabled,
+    parse_feed_item_key,
+    read_feed_inbox,
+    seed_feed_inbox,
+    to_feed_timestamp,
+)
 
 trackDedupeMaxMinutes = 10
+# Max inbox reads for one feed page when hydration drops items
+feedInboxMaxReads = 5
 
 logger = logging.getLogger(__name__)
 
 
 def get_feed(args):
+    feed_results, _ = get_feed_page(args)
+    return feed_results
+
+
+def get_feed_page(args) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Returns a page of the feed and the cursor of the next page. Only feeds
+    read from the feed inbox are paginated with a cursor, for the others the
+    cursor is None.
+    """
+    # The inbox only materializes the unfiltered feed of the user's own followees
+    if (
+        is_feed_inbox_enabled()
+        and args.get("filter") == "all"
+        and not args.get("followee_user_ids")
+    ):
+        try:
+            return get_feed_inbox(args)
+        except exceptions.ArgumentError:
+            raise
+        except Exception as e:
+            logger.error(f"get_feed.py | get_feed_inbox failed: {e}", exc_info=True)
+
     skip_es = request.args.get("es") == "0"
     use_es = es_url and not skip_es
     if use_es:
         try:
             (limit, offset) = get_pagination_vars()
-            return get_feed_es(args, limit, offset)
+            return get_feed_es(args, limit, offset), None
         except Exception as e:
             logger.error(f"elasticsearch get_feed_es failed: {e}")
-            return get_feed_sql(args)
+            return get_feed_sql(args), None
     else:
-        return get_feed_sql(args)
+        return get_feed_sql(args), None
 
 
 def get_feed_sql(args):
@@ -318,16 +357,369 @@ def get_feed_sql(args):
         (limit, offset) = get_pagination_vars()
         feed_results = sorted_feed[offset:limit]
         if "with_users" in args and args.get("with_users") != False:
-            user_id_list = get_users_ids(feed_results)
-            users = get_users_by_id(session, user_id_list)
-            for result in feed_results:
-                if "playlist_owner_id" in result:
-                    user = users[result["playlist_owner_id"]]
-                    if user:
-                        result["user"] = user
-                elif "owner_id" in result:
-                    user = users[result["owner_id"]]
-                    if user:
-                        result["user"] = user
+            add_feed_users(session, feed_results)
 
     return feed_results
+
+
+def add_feed_users(session, feed_results):
+    user_id_list = get_users_ids(feed_results)
+    users = get_users_by_id(session, user_id_list)
+    for result in feed_results:
+        if "playlist_owner_id" in result:
+            user = users[result["playlist_owner_id"]]
+            if user:
+                result["user"] = user
+        elif "owner_id" in result:
+            user = users[result["owner_id"]]
+            if user:
+                result["user"] = user
+
+
+def get_feed_inbox(args):
+    """
+    Reads the "all" feed of the current user from their feed inbox.
+
+    The inbox is filled by the indexer as followees create and repost items.
+    Activity of followees with too many followers to fan out on write is
+    merged in at read time, and every page is re-checked against the database
+    so deleted, hidden and unreposted items are dropped. Pages are read with a
+    keyset `cursor` of the last item of the previous page, and the cursor of
+    the next page is returned with the results, or None on the last page.
+    """
+    db = get_db_read_replica()
+    redis = redis_connection.get_redis()
+
+    # Allow for fetching only tracks
+    tracks_only = args.get("tracks_only", False)
+    current_user_id = args.get("user_id")
+    (limit, offset) = get_pagination_vars()
+    max_timestamp: Optional[int] = None
+    after_item_key: Optional[str] = None
+    if args.get("cursor"):
+        max_timestamp, after_item_key = decode_feed_cursor(args["cursor"])
+
+    with db.scoped_session() as session:
+        followee_user_ids = set(
+            f[0]
+            for f in session.query(Follow.followee_user_id)
+            .filter(
+                Follow.follower_user_id == current_user_id,
+                Follow.is_current == True,
+                Follow.is_delete == False,
+            )
+            .all()
+        )
+        high_follower_user_ids = get_high_follower_user_ids(session, followee_user_ids)
+
+        # Read twice the page size per round since hydration may drop items
+        batch_size = (offset + limit) * 2
+        # (timestamp, item key, item) in feed order
+        feed_items: List[Tuple[int, str, Dict]] = []
+        for _ in range(feedInboxMaxReads):
+            if len(feed_items) >= offset + limit:
+                break
+            entries = read_feed_inbox(redis, current_user_id, max_timestamp, batch_size)
+            if entries is None:
+                seed_feed_inbox(
+                    redis,
+                    current_user_id,
+                    get_followee_activities(
+                        session,
+                        followee_user_ids - high_follower_user_ids,
+                        None,
+                        FEED_INBOX_MAX_SIZE,
+                    ),
+                )
+                continue
+
+            activities = dict(entries)
+            for item_key, timestamp in get_followee_activities(
+                session, high_follower_user_ids, max_timestamp, batch_size
+            ).items():
+                add_feed_activity(activities, item_key, timestamp)
+
+            batch = sorted(
+                (
+                    (timestamp, item_key)
+                    for item_key, timestamp in activities.items()
+                    if max_timestamp is None
+                    or timestamp < max_timestamp
+                    or (timestamp == max_timestamp and item_key < after_item_key)
+                ),
+                reverse=True,
+            )[:batch_size]
+            if not batch:
+                break
+
+            feed_items.extend(
+                hydrate_feed_items(session, batch, followee_user_ids, tracks_only)
+            )
+            max_timestamp, after_item_key = batch[-1]
+            if len(batch) < batch_size:
+                break
+
+        page = feed_items[offset : offset + limit]
+        feed_results = [item for _, _, item in page]
+        next_cursor = (
+            encode_feed_cursor(page[-1][0], page[-1][1]) if len(page) == limit else None
+        )
+
+        # bundle peripheral info into track and playlist objects
+        tracks = [item for item in feed_results if "playlist_id" not in item]
+        playlists = [item for item in feed_results if "playlist_id" in item]
+        populate_track_metadata(
+            session, [track["track_id"] for track in tracks], tracks, current_user_id
+        )
+        populate_playlist_metadata(
+            session,
+            [playlist["playlist_id"] for playlist in playlists],
+            playlists,
+            [RepostType.playlist, RepostType.album],
+            [SaveType.playlist, SaveType.album],
+            current_user_id,
+        )
+
+        if "with_users" in args and args.get("with_users") != False:
+            add_feed_users(session, feed_results)
+
+    return feed_results, next_cursor
+
+
+def add_feed_activity(activities: Dict[str, int], item_key: str, timestamp: int):
+    # Items are placed in the feed by their earliest followee activity
+    if item_key not in activities or timestamp < activities[item_key]:
+        activities[item_key] = timestamp
+
+
+def get_followee_activities(
+    session, user_ids: Set[int], max_timestamp: Optional[int], limit: int
+) -> Dict[str, int]:
+    """
+    Returns item key -> timestamp of the latest `limit` items created and the
+    latest `limit` items reposted by `user_ids` at or before `max_timestamp`.
+    """
+    activities: Dict[str, int] = {}
+    if not user_ids:
+        return activities
+    max_created_at = (
+        datetime.datetime.utcfromtimestamp(max_timestamp)
+        if max_timestamp is not None
+        else None
+    )
+
+    created_tracks_query = session.query(Track.track_id, Track.created_at).filter(
+        Track.is_current == True,
+        Track.is_delete == False,
+        Track.is_unlisted == False,
+        Track.stem_of == None,
+        Track.owner_id.in_(user_ids),
+    )
+    created_playlists_query = session.query(
+        Playlist.playlist_id, Playlist.created_at
+    ).filter(
+        Playlist.is_current == True,
+        Playlist.is_delete == False,
+        Playlist.is_private == False,
+        Playlist.playlist_owner_id.in_(user_ids),
+    )
+    min_created_at = func.min(Repost.created_at)
+    reposts_query = (
+        session.query(Repost.repost_type, Repost.repost_item_id, min_created_at)
+        .filter(
+            Repost.is_current == True,
+            Repost.is_delete == False,
+            Repost.user_id.in_(user_ids),
+        )
+        .group_by(Repost.repost_type, Repost.repost_item_id)
+    )
+    if max_created_at:
+        created_tracks_query = created_tracks_query.filter(
+            Track.created_at <= max_created_at
+        )
+        created_playlists_query = created_playlists_query.filter(
+            Playlist.created_at <= max_created_at
+        )
+        reposts_query = reposts_query.having(min_created_at <= max_created_at)
+
+    for track_id, created_at in (
+        created_tracks_query.order_by(desc(Track.created_at)).limit(limit).all()
+    ):
+        add_feed_activity(
+            activities,
+            get_feed_item_key("track", track_id),
+            to_feed_timestamp(created_at),
+        )
+    for playlist_id, created_at in (
+        created_playlists_query.order_by(desc(Playlist.created_at)).limit(limit).all()
+    ):
+        add_feed_activity(
+            activities,
+            get_feed_item_key("playlist", playlist_id),
+            to_feed_timestamp(created_at),
+        )
+    for repost_type, repost_item_id, created_at in (
+        reposts_query.order_by(desc(min_created_at)).limit(limit).all()
+    ):
+        item_type = "track" if repost_type == RepostType.track else "playlist"
+        add_feed_activity(
+            activities,
+            get_feed_item_key(item_type, repost_item_id),
+            to_feed_timestamp(created_at),
+        )
+    return activities
+
+
+def get_followee_repost_timestamps(session, followee_user_ids, track_ids, playlist_ids):
+    """Returns item key -> oldest followee repost timestamp of the given items."""
+    repost_timestamps: Dict[str, datetime.datetime] = {}
+    if not followee_user_ids or not (track_ids or playlist_ids):
+        return repost_timestamps
+    reposts = (
+        session.query(
+            Repost.repost_type,
+            Repost.repost_item_id,
+            func.min(Repost.created_at),
+        )
+        .filter(
+            Repost.is_current == True,
+            Repost.is_delete == False,
+            Repost.user_id.in_(followee_user_ids),
+            or_(
+                and_(
+                    Repost.repost_type == RepostType.track,
+                    Repost.repost_item_id.in_(track_ids),
+                ),
+                and_(
+                    Repost.repost_type != RepostType.track,
+                    Repost.repost_item_id.in_(playlist_ids),
+                ),
+            ),
+        )
+        .group_by(Repost.repost_type, Repost.repost_item_id)
+        .all()
+    )
+    for repost_type, repost_item_id, created_at in reposts:
+        item_type = "track" if repost_type == RepostType.track else "playlist"
+        item_key = get_feed_item_key(item_type, repost_item_id)
+        if (
+            item_key not in repost_timestamps
+            or created_at < repost_timestamps[item_key]
+        ):
+            repost_timestamps[item_key] = created_at
+    return repost_timestamps
+
+
+def hydrate_feed_items(session, batch, followee_user_ids, tracks_only):
+    """
+    Loads the (timestamp, item key) `batch` read from a feed inbox in order,
+    dropping items that no longer belong in the feed. Returns (timestamp, item
+    key, item) for each item kept.
+    """
+    track_ids = []
+    playlist_ids = []
+    for _, item_key in batch:
+        item_type, item_id = parse_feed_item_key(item_key)
+        if item_type == "track":
+            track_ids.append(item_id)
+        elif not tracks_only:
+            playlist_ids.append(item_id)
+
+    tracks = (
+        session.query(Track)
+        .filter(
+            Track.is_current == True,
+            Track.is_delete == False,
+            Track.is_unlisted == False,
+            Track.stem_of == None,
+            Track.track_id.in_(track_ids),
+        )
+        .all()
+        if track_ids
+        else []
+    )
+    playlists = (
+        session.query(Playlist)
+        .filter(
+            Playlist.is_current == True,
+            Playlist.is_delete == False,
+            Playlist.is_private == False,
+            Playlist.playlist_id.in_(playlist_ids),
+        )
+        .all()
+        if playlist_ids
+        else []
+    )
+    tracks_by_id = {
+        track["track_id"]: track for track in helpers.query_result_to_list(tracks)
+    }
+    playlists_by_id = {
+        playlist["playlist_id"]: playlist
+        for playlist in helpers.query_result_to_list(playlists)
+    }
+
+    # items not created by a followee stay in the feed while a followee reposts them
+    repost_timestamps = get_followee_repost_timestamps(
+        session,
+        followee_user_ids,
+        [
+            track_id
+            for track_id, track in tracks_by_id.items()
+            if track["owner_id"] not in followee_user_ids
+        ],
+        [
+            playlist_id
+            for playlist_id, playlist in playlists_by_id.items()
+            if playlist["playlist_owner_id"] not in followee_user_ids
+        ],
+    )
+
+    # get all track ids that have same owner as playlist and created in "same action"
+    # "same action": track created within [x time] before playlist creation
+    tracks_to_dedupe = set()
+    max_timedelta = datetime.timedelta(minutes=trackDedupeMaxMinutes)
+    for playlist in playlists_by_id.values():
+        if playlist["playlist_owner_id"] not in followee_user_ids:
+            continue
+        for track_entry in playlist["playlist_contents"]["track_ids"]:
+            track = tracks_by_id.get(track_entry["track"])
+            if (
+                track
+                and (track["owner_id"] == playlist["playlist_owner_id"])
+                and (track["created_at"] <= playlist["created_at"])
+                and (playlist["created_at"] - track["created_at"] <= max_timedelta)
+            ):
+                tracks_to_dedupe.add(track["track_id"])
+
+    feed_items = []
+    for timestamp, item_key in batch:
+        item_type, item_id = parse_feed_item_key(item_key)
+        if item_type == "track":
+            item = tracks_by_id.get(item_id)
+            if not item or item_id in tracks_to_dedupe:
+                continue
+            is_followee_item = item["owner_id"] in followee_user_ids
+            # filter out premium track reposts and collectible gated tracks
+            if not is_followee_item and item["is_premium"]:
+                continue
+            if item["premium_conditions"] and (
+                "nft_collection" in item["premium_conditions"]
+            ):
+                continue
+        else:
+            item = playlists_by_id.get(item_id)
+            if not item:
+                continue
+            is_followee_item = item["playlist_owner_id"] in followee_user_ids
+
+        # activity_timestamp: created_at if item created by followee, else reposted_at
+        if is_followee_item:
+            item[response_name_constants.activity_timestamp] = item["created_at"]
+        elif item_key in repost_timestamps:
+            item[response_name_constants.activity_timestamp] = repost_timestamps[
+                item_key
+            ]
+        else:
+            continue
+        feed_items.append((timestamp, item_key, item))
+    return feed_items
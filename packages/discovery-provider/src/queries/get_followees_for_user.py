@@ -1,27 +1,13 @@
-from sqlalchemy.sql import text
+from sqlalchemy import func
 
+from src.models.social.follow import Follow
+from src.models.users.aggregate_user import AggregateUser
 from src.queries.get_unpopulated_users import get_unpopulated_users
-from src.queries.query_helpers import populate_user_metadata
-from src.utils.db_session import get_db_read_replica
-
-sql = text(
-    """
-SELECT
-    followee_user_id
-from
-    follows
-    left outer join aggregate_user on followee_user_id = user_id
-where
-    is_current = true
-    and is_delete = false
-    and follower_user_id = :follower_user_id
-order by
-    follower_count desc,
-    user_id asc
-offset :offset
-limit :limit;
-"""
+from src.queries.query_helpers import (
+    add_query_keyset_pagination,
+    populate_user_metadata,
 )
+from src.utils.db_session import get_db_read_replica
 
 
 def get_followees_for_user(args):
@@ -30,13 +16,24 @@ def get_followees_for_user(args):
     current_user_id = args.get("current_user_id")
     limit = args.get("limit")
     offset = args.get("offset")
+    cursor = args.get("cursor")
 
     db = get_db_read_replica()
     with db.scoped_session() as session:
-        rows = session.execute(
-            sql,
-            {"follower_user_id": follower_user_id, "limit": limit, "offset": offset},
+        query = (
+            session.query(Follow.followee_user_id)
+            .outerjoin(AggregateUser, AggregateUser.user_id == Follow.followee_user_id)
+            .filter(
+                Follow.is_current == True,
+                Follow.is_delete == False,
+                Follow.follower_user_id == follower_user_id,
+            )
         )
+        keyset = [
+            (func.coalesce(AggregateUser.follower_count, 0), True),
+            (Follow.followee_user_id, False),
+        ]
+        rows = add_query_keyset_pagination(query, limit, offset, cursor, keyset).all()
         user_ids = [r[0] for r in rows]
 
         # get all users for above user_ids
@@ -1,27 +1,28 @@
-from sqlalchemy.sql import text
+from sqlalchemy import func
 
+from src.models.social.follow import Follow
+from src.models.social.ranked_follower import RankedFollower
+from src.models.users.aggregate_user import AggregateUser
 from src.queries.get_unpopulated_users import get_unpopulated_users
-from src.queries.query_helpers import populate_user_metadata
+from src.queries.query_helpers import (
+    add_query_keyset_pagination,
+    populate_user_metadata,
+)
 from src.utils.db_session import get_db_read_replica
 
-sql = text(
-    """
-SELECT
-    follower_user_id
-from
-    follows
-    left outer join aggregate_user on follower_user_id = user_id
-where
-    is_current = true
-    and is_delete = false
-    and followee_user_id = :followee_user_id
-order by
-    follower_count desc,
-    user_id asc
-offset :offset
-limit :limit;
-"""
-)
+# Creators with at least this many followers have their followers kept in
+# ranked_followers. Matches ranked_followers_min_follower_count() in
+# ddl/functions/handle_ranked_followers.sql.
+RANKED_FOLLOWERS_MIN_FOLLOWER_COUNT = 10_000
+
+
+def has_ranked_followers(session, user_id):
+    follower_count = (
+        session.query(AggregateUser.follower_count)
+        .filter(AggregateUser.user_id == user_id)
+        .scalar()
+    )
+    return (follower_count or 0) >= RANKED_FOLLOWERS_MIN_FOLLOWER_COUNT
 
 
 def get_followers_for_user(args):
@@ -30,13 +31,37 @@ def get_followers_for_user(args):
     current_user_id = args.get("current_user_id")
     limit = args.get("limit")
     offset = args.get("offset")
+    cursor = args.get("cursor")
 
     db = get_db_read_replica()
     with db.scoped_session() as session:
-        rows = session.execute(
-            sql,
-            {"followee_user_id": followee_user_id, "limit": limit, "offset": offset},
-        )
+        if has_ranked_followers(session, followee_user_id):
+            # Read the page off the ranked_followers index instead of sorting
+            # every follower of a large creator
+            query = session.query(RankedFollower.follower_user_id).filter(
+                RankedFollower.followee_user_id == followee_user_id
+            )
+            keyset = [
+                (RankedFollower.follower_count, True),
+                (RankedFollower.follower_user_id, False),
+            ]
+        else:
+            query = (
+                session.query(Follow.follower_user_id)
+                .outerjoin(
+                    AggregateUser, AggregateUser.user_id == Follow.follower_user_id
+                )
+                .filter(
+                    Follow.is_current == True,
+                    Follow.is_delete == False,
+                    Follow.followee_user_id == followee_user_id,
+                )
+            )
+            keyset = [
+                (func.coalesce(AggregateUser.follower_count, 0), True),
+                (Follow.follower_user_id, False),
+            ]
+        rows = add_query_keyset_pagination(query, limit, offset, cursor, keyset).all()
         user_ids = [r[0] for r in rows]
 
         # get all users for above user_ids
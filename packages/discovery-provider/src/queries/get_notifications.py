@@ -8,6 +8,7 @@ from sqlalchemy import bindparam, text
 from sqlalchemy.orm.session import Session
 
 from src.models.tracks.track import Track
+from src.utils.config import shared_config
 
 logger = logging.getLogger(__name__)
 
@@ -123,6 +124,46 @@ unread_notification_count_sql = unread_notification_count_sql.bindparams(
     bindparam("valid_types", expanding=True)
 )
 
+# Maintained by the handle_notification and handle_notification_seen triggers
+unread_notification_counts_sql = text(
+    """
+SELECT
+    COALESCE(sum(unread_count), 0)
+FROM
+    notification_unread_counts
+WHERE
+    user_id = :user_id AND
+    type in :valid_types;
+"""
+)
+unread_notification_counts_sql = unread_notification_counts_sql.bindparams(
+    bindparam("valid_types", expanding=True)
+)
+
+# Announcements are sent to every user and are not kept in the unread counts
+unread_announcement_count_sql = text(
+    """
+SELECT
+    count(DISTINCT n.group_id)
+FROM
+    notification n
+WHERE
+    n.type = 'announcement' AND
+    (
+        (ARRAY[:user_id] && n.user_ids) OR
+        n.timestamp > (SELECT created_at FROM users WHERE user_id = :user_id AND is_current)
+    ) AND
+    n.timestamp > COALESCE((
+        SELECT
+            max(seen_at)
+        FROM
+            notification_seen
+        WHERE
+            user_id = :user_id
+    ), '2016-01-01'::timestamp);
+"""
+)
+
 
 MAX_LIMIT = 50
 DEFAULT_LIMIT = 20
@@ -481,6 +522,26 @@ notifications_sql = notifications_sql.bindparams(
 )
 
 
+def get_create_notification_tracks(
+    session: Session, notifications: List[Dict]
+) -> Dict[int, Track]:
+    """Loads the tracks of a page of create track notifications with one query."""
+    track_ids = {
+        notification["actions"][0]["data"]["track_id"]
+        for notification in notifications
+        if notification["type"] == NotificationType.CREATE
+        and "track_id" in notification["actions"][0]["data"]
+    }
+    if not track_ids:
+        return {}
+    tracks = (
+        session.query(Track)
+        .filter(Track.track_id.in_(track_ids), Track.is_current == True)
+        .all()
+    )
+    return {track.track_id: track for track in tracks}
+
+
 def get_notifications(session: Session, args: GetNotificationArgs):
     args["valid_types"] = args.get("valid_types", []) + default_valid_types  # type: ignore
 
@@ -515,19 +576,16 @@ def get_notifications(session: Session, args: GetNotificationArgs):
     # TODO(PAY-1880): Remove this check after launch
     if NotificationType.USDC_PURCHASE_BUYER not in args["valid_types"]:  # type: ignore
         # Filter out usdc create tracks
+        tracks = get_create_notification_tracks(session, notifications_and_actions)
         filtered: List[NotificationGroup] = []
         for notification in notifications_and_actions:
             is_track = "track_id" in notification["actions"][0]["data"]
             if notification["type"] == NotificationType.CREATE and is_track:
-                res = (
-                    session.query(Track).filter(
-                        Track.track_id == notification["actions"][0]["data"]["track_id"]
-                    )
-                ).one_or_none()
+                track = tracks.get(notification["actions"][0]["data"]["track_id"])
                 if (
-                    res
-                    and res.premium_conditions
-                    and "usdc_purchase" in res.premium_conditions
+                    track
+                    and track.premium_conditions
+                    and "usdc_purchase" in track.premium_conditions
                 ):
                     # Filter out the notification
                     continue
@@ -542,8 +600,20 @@ class GetUnreadNotificationCount(TypedDict):
     valid_types: Optional[List[NotificationType]]
 
 
+def is_notification_unread_counts_enabled() -> bool:
+    return (
+        shared_config["discprov"].get("notification_unread_counts_enabled", "false")
+        == "true"
+    )
+
+
 def get_unread_notification_count(session: Session, args: GetUnreadNotificationCount):
     args["valid_types"] = args.get("valid_types", []) + default_valid_types  # type: ignore
+    if is_notification_unread_counts_enabled():
+        return get_maintained_unread_notification_count(
+            session, args["user_id"], args["valid_types"]  # type: ignore
+        )
+
     resultproxy = session.execute(
         unread_notification_count_sql,
         {"user_id": args["user_id"], "valid_types": args.get("valid_types", None)},
@@ -552,3 +622,21 @@ def get_unread_notification_count(session: Session, args: GetUnreadNotificationC
     for rowproxy in resultproxy:
         unread_count = rowproxy[0]
     return unread_count
+
+
+def get_maintained_unread_notification_count(
+    session: Session, user_id: int, valid_types: List[NotificationType]
+) -> int:
+    """
+    Reads the unread count from the counts kept up to date as notifications
+    are inserted and seen, see reconcile_notification_unread_counts.
+    """
+    unread_count = session.execute(
+        unread_notification_counts_sql,
+        {"user_id": user_id, "valid_types": valid_types},
+    ).scalar()
+    if NotificationType.ANNOUNCEMENT in valid_types:
+        unread_count += session.execute(
+            unread_announcement_count_sql, {"user_id": user_id}
+        ).scalar()
+    return unread_count
@@ -1,6 +1,11 @@
 import logging  # pylint: disable=C0302
 
-from src.api.v1.helpers import extend_track, format_limit, format_offset
+from src.api.v1.helpers import (
+    extend_track,
+    format_limit,
+    format_offset,
+    prefetch_primary_endpoints,
+)
 from src.queries.generate_unpopulated_trending_tracks import (
     make_generate_unpopulated_trending,
     make_trending_tracks_cache_key,
@@ -8,7 +13,7 @@ from src.queries.generate_unpopulated_trending_tracks import (
 from src.queries.query_helpers import add_users_to_tracks, populate_track_metadata
 from src.utils.db_session import get_db_read_replica
 from src.utils.helpers import decode_string_id
-from src.utils.redis_cache import use_redis_cache
+from src.utils.redis_cache import use_redis_list_cache
 
 logger = logging.getLogger(__name__)
 
@@ -35,24 +40,25 @@ def get_usdc_purchase_tracks(args, strategy):
         # The index_trending task runs every 10 seconds, so we set the TTL to 10 seconds
         ttl_sec = 10
 
-        # Will try to hit cached trending from task, falling back
-        # to generating it here if necessary and storing it with no TTL
-        (tracks, track_ids) = use_redis_cache(
+        # Will try to hit cached trending, falling back to generating it
+        # here if necessary. Only the requested page is read from the cache.
+        generate_unpopulated_trending = make_generate_unpopulated_trending(
+            session=session,
+            genre=genre,
+            time_range=time_range,
+            strategy=strategy,
+            exclude_premium=False,
+            usdc_purchase_only=True,
+        )
+        tracks = use_redis_list_cache(
             key,
             ttl_sec,
-            make_generate_unpopulated_trending(
-                session=session,
-                genre=genre,
-                time_range=time_range,
-                strategy=strategy,
-                exclude_premium=False,
-                usdc_purchase_only=True,
-            ),
+            offset,
+            limit,
+            "track_id",
+            lambda: generate_unpopulated_trending()[0],
         )
-
-        # apply limit and offset
-        tracks = tracks[offset : limit + offset]
-        track_ids = track_ids[offset : limit + offset]
+        track_ids = [track["track_id"] for track in tracks]
 
         # populate track metadata
         tracks = populate_track_metadata(session, track_ids, tracks, current_user_id)
@@ -63,4 +69,5 @@ def get_usdc_purchase_tracks(args, strategy):
 
         add_users_to_tracks(session, tracks, current_user_id)
 
+        prefetch_primary_endpoints(tracks=sorted_tracks)
         return list(map(extend_track, sorted_tracks))
@@ -1,7 +1,7 @@
 import logging  # pylint: disable=C0302
 import random
 
-from src.api.v1.helpers import extend_track, to_dict
+from src.api.v1.helpers import extend_track, prefetch_primary_endpoints, to_dict
 from src.queries.generate_unpopulated_trending_tracks import TRENDING_TRACKS_TTL_SEC
 from src.queries.get_trending_tracks import get_trending_tracks
 from src.utils.helpers import decode_string_id
@@ -36,6 +36,7 @@ def get_recommended_tracks(args, strategy):
     )
 
     random.shuffle(filtered_tracks)
+    prefetch_primary_endpoints(tracks=filtered_tracks)
     return list(map(extend_track, filtered_tracks))
 
 
@@ -1,4 +1,4 @@
-from sqlalchemy import desc, func
+from sqlalchemy import func
 
 from src import exceptions
 from src.models.social.repost import Repost, RepostType
@@ -6,7 +6,10 @@ from src.models.tracks.track import Track
 from src.models.users.aggregate_user import AggregateUser
 from src.models.users.user import User
 from src.queries import response_name_constants
-from src.queries.query_helpers import add_query_pagination, populate_user_metadata
+from src.queries.query_helpers import (
+    add_query_keyset_pagination,
+    populate_user_metadata,
+)
 from src.utils import helpers
 from src.utils.db_session import get_db_read_replica
 
@@ -17,6 +20,7 @@ def get_reposters_for_track(args):
     repost_track_id = args.get("repost_track_id")
     limit = args.get("limit")
     offset = args.get("offset")
+    cursor = args.get("cursor")
 
     db = get_db_read_replica()
     with db.scoped_session() as session:
@@ -39,8 +43,7 @@ def get_reposters_for_track(args):
                 ),
             )
             # Left outer join to associate users with their follower count.
-            .outerjoin(AggregateUser, AggregateUser.user_id == User.user_id)
-            .filter(
+            .outerjoin(AggregateUser, AggregateUser.user_id == User.user_id).filter(
                 User.is_current == True,
                 # Only select users that reposted given track.
                 User.user_id.in_(
@@ -52,9 +55,14 @@ def get_reposters_for_track(args):
                     )
                 ),
             )
-            .order_by(desc(response_name_constants.follower_count))
         )
-        user_results = add_query_pagination(query, limit, offset).all()
+        keyset = [
+            (func.coalesce(AggregateUser.follower_count, 0), True),
+            (User.user_id, False),
+        ]
+        user_results = add_query_keyset_pagination(
+            query, limit, offset, cursor, keyset
+        ).all()
 
         # Fix format to return only Users objects with follower_count field.
         if user_results:
@@ -4,7 +4,7 @@ from src.queries import response_name_constants
 from src.queries.get_unpopulated_users import get_unpopulated_users
 from src.queries.query_helpers import populate_user_metadata
 from src.utils.db_session import get_db_read_replica
-from src.utils.helpers import encode_int_id
+from src.utils.helpers import encode_ids, encode_int_id
 
 sql = text(
     """
@@ -61,7 +61,7 @@ def get_subscribers_for_users(args):
                 sql,
                 {"user_id": user_id, "limit": None, "offset": 0},
             )
-            subscriber_ids = [encode_int_id(r[0]) for r in rows]
+            subscriber_ids = encode_ids([r[0] for r in rows])
             subscribers.append(
                 {
                     response_name_constants.user_id: encode_int_id(user_id),
@@ -2,7 +2,7 @@ from sqlalchemy import asc
 
 from src.models.tracks.track import Track
 from src.utils.db_session import get_db_read_replica
-from src.utils.helpers import encode_int_id
+from src.utils.helpers import encode_ids
 
 
 def get_subsequent_tracks(track_id, limit):
@@ -46,9 +46,9 @@ def get_subsequent_tracks(track_id, limit):
             .order_by(asc("created_at"), asc("track_id"))
             .all()
         )
-        res = [
-            encode_int_id(subsequent_track[0]) for subsequent_track in subsequent_tracks
-        ]
+        res = encode_ids(
+            [subsequent_track[0] for subsequent_track in subsequent_tracks]
+        )
         res = res[:limit]
 
         return res
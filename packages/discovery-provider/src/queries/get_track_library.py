@@ -1,9 +1,10 @@
-from typing import Optional, TypedDict
+from typing import NotRequired, Optional, TypedDict
 
 from sqlalchemy import asc, desc, func, or_
 from sqlalchemy.orm import contains_eager
 from sqlalchemy.sql.functions import coalesce, max
 
+from src import exceptions
 from src.models.social.aggregate_plays import AggregatePlay
 from src.models.social.repost import Repost, RepostType
 from src.models.social.save import Save, SaveType
@@ -13,16 +14,22 @@ from src.models.users.usdc_purchase import USDCPurchase
 from src.models.users.user import User
 from src.queries import response_name_constants
 from src.queries.query_helpers import (
+    Keyset,
     LibraryFilterType,
     SortDirection,
     SortMethod,
+    add_query_keyset_pagination,
     add_query_pagination,
     add_users_to_tracks,
+    get_next_cursor,
     populate_track_metadata,
 )
 from src.utils import helpers
 from src.utils.db_session import get_db_read_replica
 
+# Sort methods ordered by a unique key, which can be cursor paginated
+cursor_sort_methods = [None, SortMethod.added_date]
+
 
 class GetTrackLibraryArgs(TypedDict):
     # The current user logged in (from route param)
@@ -40,6 +47,9 @@ class GetTrackLibraryArgs(TypedDict):
     # The offset for the listen history
     offset: int
 
+    # Optional cursor from the previous page, only for the added date sort
+    cursor: NotRequired[Optional[str]]
+
     # Optional filter for the returned results
     query: Optional[str]
 
@@ -54,6 +64,7 @@ def _get_track_library(args: GetTrackLibraryArgs, session):
     current_user_id = args.get("current_user_id")
     limit = args.get("limit")
     offset = args.get("offset")
+    cursor = args.get("cursor")
     filter_deleted = args.get("filter_deleted")
     query = args.get("query")
     sort_method = args.get("sort_method")
@@ -70,6 +81,11 @@ def _get_track_library(args: GetTrackLibraryArgs, session):
     ):
         raise ValueError(f"Invalid sort method {sort_method}")
 
+    if cursor and sort_method not in cursor_sort_methods:
+        raise exceptions.ArgumentError(
+            f"Cursor pagination is not supported for sort method {sort_method}"
+        )
+
     # Set `sort_fn` (direction) to match legacy behavior:
     # if no `sort_method` is specified, default to descending.
     # Otherwise, if sort method exists, default to ascending.
@@ -165,6 +181,7 @@ def _get_track_library(args: GetTrackLibraryArgs, session):
         )
 
     # Set sort methods
+    keyset: Optional[Keyset] = None
     if sort_method == SortMethod.title:
         base_query = base_query.order_by(sort_fn(TrackWithAggregates.title))
     elif sort_method == SortMethod.artist_name:
@@ -197,12 +214,17 @@ def _get_track_library(args: GetTrackLibraryArgs, session):
         )
     else:
         # This branch covers added_date, or any other sort method
-        base_query = base_query.order_by(
-            sort_fn(subquery.c.item_created_at),
-            desc(TrackWithAggregates.track_id),
-        )
-
-    query_results = add_query_pagination(base_query, limit, offset).all()
+        keyset = [
+            (subquery.c.item_created_at, sort_fn == desc),
+            (TrackWithAggregates.track_id, True),
+        ]
+
+    if keyset:
+        query_results = add_query_keyset_pagination(
+            base_query, limit, offset, cursor, keyset
+        ).all()
+    else:
+        query_results = add_query_pagination(base_query, limit, offset).all()
 
     if not query_results:
         return []
@@ -227,3 +249,17 @@ def get_track_library(args: GetTrackLibraryArgs):
     db = get_db_read_replica()
     with db.scoped_session() as session:
         return _get_track_library(args, session)
+
+
+def get_track_library_next_cursor(args: GetTrackLibraryArgs, tracks) -> Optional[str]:
+    """Returns the cursor of the page after `tracks`, if the sort method supports it."""
+    if args.get("sort_method") not in cursor_sort_methods:
+        return None
+    return get_next_cursor(
+        tracks,
+        args["limit"],
+        lambda track: (
+            track[response_name_constants.activity_timestamp],
+            track["track_id"],
+        ),
+    )
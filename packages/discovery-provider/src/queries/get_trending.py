@@ -1,6 +1,11 @@
 import logging
 
-from src.api.v1.helpers import extend_track, format_limit, format_offset
+from src.api.v1.helpers import (
+    extend_track,
+    format_limit,
+    format_offset,
+    prefetch_primary_endpoints,
+)
 from src.premium_content.premium_content_constants import (
     SHOULD_TRENDING_EXCLUDE_PREMIUM_TRACKS,
 )
@@ -33,4 +38,5 @@ def get_trending(args, strategy):
         args["current_user_id"] = decoded_id
 
     tracks = get_trending_tracks(args, strategy)
+    prefetch_primary_endpoints(tracks=tracks)
     return list(map(extend_track, tracks))
@@ -13,6 +13,7 @@ from src.api.v1.helpers import (
     extend_track,
     format_limit,
     format_offset,
+    prefetch_primary_endpoints,
     to_dict,
 )
 from src.models.playlists.aggregate_playlist import AggregatePlaylist
@@ -37,7 +38,7 @@ from src.trending_strategies.trending_strategy_factory import DEFAULT_TRENDING_V
 from src.trending_strategies.trending_type_and_version import TrendingType
 from src.utils.db_session import get_db_read_replica
 from src.utils.helpers import decode_string_id
-from src.utils.redis_cache import get_trending_cache_key, use_redis_cache
+from src.utils.redis_cache import get_trending_cache_key, use_redis_list_cache
 
 
 class jsonb_array_length(GenericFunction):  # pylint: disable=too-many-ancestors
@@ -269,17 +270,20 @@ def _get_trending_playlists_with_session(
     limit, offset = args.get("limit"), args.get("offset")
     key = make_trending_playlists_cache_key(time, strategy.version)
 
-    # Get unpopulated playlists,
-    # cached if it exists.
-    (playlists, playlist_ids) = use_redis_cache(
-        key, None, make_get_unpopulated_playlists(session, time, strategy)
+    # Get unpopulated playlists, cached if it exists. Only the requested
+    # page is read, which reduces the amount of population work we have to do
+    generate_trending_playlists = make_get_unpopulated_playlists(
+        session, time, strategy
     )
-
-    # Apply limit + offset early to reduce the amount of
-    # population work we have to do
-    if limit is not None and offset is not None:
-        playlists = playlists[offset : limit + offset]
-        playlist_ids = playlist_ids[offset : limit + offset]
+    playlists = use_redis_list_cache(
+        key,
+        None,
+        offset,
+        limit,
+        "playlist_id",
+        lambda: generate_trending_playlists()[0],
+    )
+    playlist_ids = [playlist["playlist_id"] for playlist in playlists]
 
     # Populate playlist metadata
     playlists = populate_playlist_metadata(
@@ -346,6 +350,7 @@ def _get_trending_playlists_with_session(
             playlist["user"] = user
 
     # Extend the playlists
+    prefetch_primary_endpoints(playlists=playlists)
     playlists = list(map(extend_playlist, playlists))
     return sorted_playlists
 
@@ -381,9 +386,13 @@ def get_full_trending_playlists(request, args, strategy):
             "with_tracks": True,
         }
         key = get_trending_cache_key(to_dict(request.args), request.path)
-        playlists = use_redis_cache(
-            key, TRENDING_TTL_SEC, lambda: get_trending_playlists(args, strategy)
+        playlists = use_redis_list_cache(
+            key,
+            TRENDING_TTL_SEC,
+            offset,
+            limit,
+            "id",
+            lambda: get_trending_playlists(args, strategy),
         )
-        playlists = playlists[offset : limit + offset]
 
     return playlists
@@ -13,7 +13,7 @@ from src.queries.generate_unpopulated_trending_tracks import (
 from src.queries.query_helpers import add_users_to_tracks, populate_track_metadata
 from src.trending_strategies.base_trending_strategy import BaseTrendingStrategy
 from src.utils.db_session import get_db_read_replica
-from src.utils.redis_cache import use_redis_cache
+from src.utils.redis_cache import use_redis_list_cache
 
 
 class GetTrendingTracksArgs(TypedDict, total=False):
@@ -47,20 +47,24 @@ def _get_trending_tracks_with_session(
     key = make_trending_tracks_cache_key(time_range, genre, strategy.version)
 
     # Will try to hit cached trending from task, falling back
-    # to generating it here if necessary and storing it with no TTL
-    (tracks, track_ids) = use_redis_cache(
+    # to generating it here if necessary and storing it with no TTL.
+    # Only the requested page is read from the cache.
+    generate_unpopulated_trending = make_generate_unpopulated_trending(
+        session=session,
+        genre=genre,
+        time_range=time_range,
+        strategy=strategy,
+        exclude_premium=exclude_premium,
+    )
+    tracks = use_redis_list_cache(
         key,
         None,
-        make_generate_unpopulated_trending(
-            session=session,
-            genre=genre,
-            time_range=time_range,
-            strategy=strategy,
-            exclude_premium=exclude_premium,
-        ),
+        offset,
+        limit,
+        "track_id",
+        lambda: generate_unpopulated_trending()[0],
     )
-    tracks = tracks[offset : limit + offset]
-    track_ids = track_ids[offset : limit + offset]
+    track_ids = [track["track_id"] for track in tracks]
     # populate track metadata
     tracks = populate_track_metadata(session, track_ids, tracks, current_user_id)
     tracks_map = {track["track_id"]: track for track in tracks}
@@ -5,7 +5,13 @@ from typing import Any, Optional, TypedDict
 from sqlalchemy import func
 from sqlalchemy.orm.session import Session
 
-from src.api.v1.helpers import extend_track, format_limit, format_offset, to_dict
+from src.api.v1.helpers import (
+    extend_track,
+    format_limit,
+    format_offset,
+    prefetch_primary_endpoints,
+    to_dict,
+)
 from src.models.social.aggregate_plays import AggregatePlay
 from src.models.social.follow import Follow
 from src.models.social.repost import RepostType
@@ -38,7 +44,7 @@ from src.utils.helpers import decode_string_id
 from src.utils.redis_cache import (
     get_json_cached_key,
     get_trending_cache_key,
-    use_redis_cache,
+    use_redis_list_cache,
 )
 from src.utils.redis_connection import get_redis
 
@@ -250,14 +256,20 @@ def _get_underground_trending_with_session(
     limit, offset = args.get("limit"), args.get("offset")
     key = make_underground_trending_cache_key(strategy.version)
 
-    (tracks, track_ids) = use_redis_cache(
-        key, None, make_get_unpopulated_tracks(session, redis_conn, strategy)
+    # Only the requested page is read from the cache, which reduces
+    # the amount of population work we have to do
+    generate_underground_trending = make_get_unpopulated_tracks(
+        session, redis_conn, strategy
     )
-
-    # Apply limit + offset early to reduce the amount of
-    # population work we have to do
-    if limit is not None and offset is not None:
-        track_ids = track_ids[offset : limit + offset]
+    tracks = use_redis_list_cache(
+        key,
+        None,
+        offset,
+        limit,
+        "track_id",
+        lambda: generate_underground_trending()[0],
+    )
+    track_ids = [track["track_id"] for track in tracks]
 
     tracks = populate_track_metadata(session, track_ids, tracks, current_user_id)
 
@@ -271,6 +283,7 @@ def _get_underground_trending_with_session(
         user = users[track["owner_id"]]
         if user:
             track["user"] = user
+    prefetch_primary_endpoints(tracks=sorted_tracks)
     sorted_tracks = list(map(extend_track, sorted_tracks))
     return sorted_tracks
 
@@ -293,14 +306,15 @@ def get_underground_trending(request, args, strategy):
         args["current_user_id"] = decoded
         trending = _get_underground_trending(args, strategy)
     else:
-        # If no user ID, fetch all cached tracks
-        # and perform pagination here, passing
-        # no args so we get the full list of tracks.
+        # If no user ID, read the page from the cached tracks,
+        # passing no args so we cache the full list of tracks.
         key = get_trending_cache_key(to_dict(request.args), request.path)
-        trending = use_redis_cache(
+        trending = use_redis_list_cache(
             key,
             TRENDING_TRACKS_TTL_SEC,
+            offset,
+            limit,
+            "id",
             lambda: _get_underground_trending({}, strategy),
         )
-        trending = trending[offset : limit + offset]
     return trending
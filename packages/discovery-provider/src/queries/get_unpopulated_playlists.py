@@ -2,7 +2,8 @@ import logging  # pylint: disable=C0302
 from datetime import datetime
 
 from src.models.playlists.playlist import Playlist
-from src.utils import helpers
+from src.utils import helpers, redis_connection
+from src.utils.entity_cache import is_entity_cache_enabled, playlist_cache
 
 logger = logging.getLogger(__name__)
 
@@ -27,21 +28,33 @@ def get_unpopulated_playlists(session, playlist_ids, filter_deleted=False):
         Array of playlists
     """
 
-    playlists_query = (
-        session.query(Playlist)
-        .filter(Playlist.is_current == True)
-        .filter(Playlist.playlist_id.in_(playlist_ids))
-    )
-    if filter_deleted:
-        playlists_query = playlists_query.filter(Playlist.is_delete == False)
-
-    playlists = playlists_query.all()
-    playlists = helpers.query_result_to_list(playlists)
-    queried_playlists = {playlist["playlist_id"]: playlist for playlist in playlists}
+    if is_entity_cache_enabled():
+        queried_playlists = playlist_cache.get_many(
+            redis_connection.get_redis(),
+            playlist_ids,
+            lambda ids: _get_current_playlists(session, ids),
+        )
+    else:
+        queried_playlists = {
+            playlist["playlist_id"]: playlist
+            for playlist in _get_current_playlists(session, playlist_ids)
+        }
 
     playlists_response = []
     for playlist_id in playlist_ids:
-        if playlist_id in queried_playlists:
-            playlists_response.append(queried_playlists[playlist_id])
+        playlist = queried_playlists.get(playlist_id)
+        if not playlist or (filter_deleted and playlist["is_delete"]):
+            continue
+        playlists_response.append(playlist)
 
     return playlists_response
+
+
+def _get_current_playlists(session, playlist_ids):
+    playlists = (
+        session.query(Playlist)
+        .filter(Playlist.is_current == True)
+        .filter(Playlist.playlist_id.in_(playlist_ids))
+        .all()
+    )
+    return helpers.query_result_to_list(playlists)
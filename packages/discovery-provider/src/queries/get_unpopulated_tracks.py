@@ -2,7 +2,8 @@ import logging
 from datetime import datetime
 
 from src.models.tracks.track import Track
-from src.utils import helpers
+from src.utils import helpers, redis_connection
+from src.utils.entity_cache import is_entity_cache_enabled, track_cache
 
 logger = logging.getLogger(__name__)
 
@@ -35,30 +36,39 @@ def get_unpopulated_tracks(
         Array of tracks
     """
 
-    tracks_query = (
-        session.query(Track)
-        .filter(Track.is_current == True, Track.stem_of == None)
-        .filter(Track.track_id.in_(track_ids))
-    )
-
-    if filter_unlisted:
-        tracks_query = tracks_query.filter(Track.is_unlisted == False)
-
-    if filter_deleted:
-        tracks_query = tracks_query.filter(Track.is_delete == False)
-
-    if exclude_premium:
-        tracks_query = tracks_query.filter(Track.is_premium == False)
-
-    tracks = tracks_query.all()
-    tracks = helpers.query_result_to_list(tracks)
-    queried_tracks = {track["track_id"]: track for track in tracks}
-
-    # cache tracks for future use
+    if is_entity_cache_enabled():
+        queried_tracks = track_cache.get_many(
+            redis_connection.get_redis(),
+            track_ids,
+            lambda ids: _get_current_tracks(session, ids),
+        )
+    else:
+        queried_tracks = {
+            track["track_id"]: track
+            for track in _get_current_tracks(session, track_ids)
+        }
 
     tracks_response = []
     for track_id in track_ids:
-        if track_id in queried_tracks:
-            tracks_response.append(queried_tracks[track_id])
+        track = queried_tracks.get(track_id)
+        if (
+            not track
+            or track["stem_of"] is not None
+            or (filter_unlisted and track["is_unlisted"])
+            or (filter_deleted and track["is_delete"])
+            or (exclude_premium and track["is_premium"])
+        ):
+            continue
+        tracks_response.append(track)
 
     return tracks_response
+
+
+def _get_current_tracks(session, track_ids):
+    tracks = (
+        session.query(Track)
+        .filter(Track.is_current == True)
+        .filter(Track.track_id.in_(track_ids))
+        .all()
+    )
+    return helpers.query_result_to_list(tracks)
@@ -2,7 +2,8 @@ import logging  # pylint: disable=C0302
 from datetime import datetime
 
 from src.models.users.user import User
-from src.utils import helpers
+from src.utils import helpers, redis_connection
+from src.utils.entity_cache import is_entity_cache_enabled, user_cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,18 +26,32 @@ def get_unpopulated_users(session, user_ids):
         Array of users
     """
 
-    users = (
-        session.query(User)
-        .filter(User.is_current == True, User.wallet != None, User.handle != None)
-        .filter(User.user_id.in_(user_ids))
-        .all()
-    )
-    users = helpers.query_result_to_list(users)
-    queried_users = {user["user_id"]: user for user in users}
+    if is_entity_cache_enabled():
+        queried_users = user_cache.get_many(
+            redis_connection.get_redis(),
+            user_ids,
+            lambda ids: _get_current_users(session, ids),
+        )
+    else:
+        queried_users = {
+            user["user_id"]: user for user in _get_current_users(session, user_ids)
+        }
 
     users_response = []
     for user_id in user_ids:
-        if user_id in queried_users:
-            users_response.append(queried_users[user_id])
+        user = queried_users.get(user_id)
+        if not user or user["wallet"] is None or user["handle"] is None:
+            continue
+        users_response.append(user)
 
     return users_response
+
+
+def _get_current_users(session, user_ids):
+    users = (
+        session.query(User)
+        .filter(User.is_current == True)
+        .filter(User.user_id.in_(user_ids))
+        .all()
+    )
+    return helpers.query_result_to_list(users)
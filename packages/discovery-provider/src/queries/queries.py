@@ -4,7 +4,7 @@ from flask import Blueprint, Response, request
 
 from src import api_helpers, exceptions
 from src.queries.get_cid_source import get_cid_source
-from src.queries.get_feed import get_feed
+from src.queries.get_feed import get_feed_page
 from src.queries.get_follow_intersection_users import get_follow_intersection_users
 from src.queries.get_followees_for_user import get_followees_for_user
 from src.queries.get_followers_for_user import get_followers_for_user
@@ -189,6 +189,9 @@ def get_playlists_route():
 #   - Query additional metadata around feed entries in each array, repost + save counts, user repost boolean
 #   - Combine unsorted playlist and track arrays
 #   - Sort combined results by 'timestamp' field and return
+# When feed inboxes are enabled the "all" feed is read from the user's inbox
+# instead, paginated with a `cursor` of `<activity unix timestamp>:<track|playlist>:<id>`.
+# The cursor of the next page is returned as `next_cursor`.
 @bp.route("/feed", methods=("GET",))
 @log_duration(logger)
 @record_metrics
@@ -214,8 +217,13 @@ def get_feed_route():
         )
     user_id = get_current_user_id()
     args["user_id"] = user_id
-    feed_results = get_feed(args)
-    return api_helpers.success_response(feed_results)
+    try:
+        feed_results, next_cursor = get_feed_page(args)
+        return api_helpers.success_response(
+            feed_results, extras={"next_cursor": next_cursor}
+        )
+    except exceptions.ArgumentError as e:
+        return api_helpers.error_response(str(e), 400)
 
 
 # user repost feed steps
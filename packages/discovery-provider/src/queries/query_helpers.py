@@ -1,10 +1,13 @@
 # pylint: disable=too-many-lines
+import base64
+import datetime
 import enum
+import json
 import logging
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from flask import request
-from sqlalchemy import Integer, and_, bindparam, cast, desc, func, text
+from sqlalchemy import DateTime, Integer, and_, asc, bindparam, cast, desc, func, text
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import or_
 
@@ -31,6 +34,7 @@ from src.queries.get_balances import get_balances
 from src.queries.get_unpopulated_users import get_unpopulated_users
 from src.trending_strategies.trending_type_and_version import TrendingVersion
 from src.utils import helpers, redis_connection
+from src.utils.social_graph import get_social_graph
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,9 @@ maxLimit = 10000
 defaultOffset = 0
 minOffset = 0
 
+# (column, is_descending) pairs a query is ordered and keyset paginated by
+Keyset = List[Tuple]
+
 # Used when generating genre list to special case Electronic tunes
 electronic_sub_genres = [
     "Techno",
@@ -270,30 +277,38 @@ def populate_user_metadata(
             current_user_subscribed_user_ids[subscription.user_id] = True
 
         # build dict of user id --> followee follow count
-        current_user_followees = (
-            session.query(Follow.followee_user_id)
-            .filter(
-                Follow.is_current == True,
-                Follow.is_delete == False,
-                Follow.follower_user_id == current_user_id,
+        social_graph = get_social_graph()
+        if social_graph:
+            current_user_followee_follow_count_dict = (
+                social_graph.get_followee_follow_counts(current_user_id, user_ids)
+            )
+        else:
+            current_user_followees = (
+                session.query(Follow.followee_user_id)
+                .filter(
+                    Follow.is_current == True,
+                    Follow.is_delete == False,
+                    Follow.follower_user_id == current_user_id,
+                )
+                .subquery()
             )
-            .subquery()
-        )
 
-        current_user_followee_follow_counts = (
-            session.query(Follow.followee_user_id, func.count(Follow.followee_user_id))
-            .filter(
-                Follow.is_current == True,
-                Follow.is_delete == False,
-                Follow.follower_user_id.in_(current_user_followees),
-                Follow.followee_user_id.in_(user_ids),
+            current_user_followee_follow_counts = (
+                session.query(
+                    Follow.followee_user_id, func.count(Follow.followee_user_id)
+                )
+                .filter(
+                    Follow.is_current == True,
+                    Follow.is_delete == False,
+                    Follow.follower_user_id.in_(current_user_followees),
+                    Follow.followee_user_id.in_(user_ids),
+                )
+                .group_by(Follow.followee_user_id)
+                .all()
+            )
+            current_user_followee_follow_count_dict = dict(
+                current_user_followee_follow_counts
             )
-            .group_by(Follow.followee_user_id)
-            .all()
-        )
-        current_user_followee_follow_count_dict = dict(
-            current_user_followee_follow_counts
-        )
 
     balance_dict = get_balances(session, redis, user_ids)
 
@@ -1186,6 +1201,79 @@ def add_query_pagination(
     return modified_query
 
 
+def encode_cursor(sort_key: Sequence) -> str:
+    """
+    Encodes the sort key of the last row of a page into an opaque cursor.
+    Datetimes are encoded as iso strings and decoded back by `decode_cursor`.
+    """
+    values = [
+        value.isoformat() if isinstance(value, datetime.datetime) else value
+        for value in sort_key
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str, keyset: Keyset) -> List:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+        if not isinstance(values, list) or len(values) != len(keyset):
+            raise ValueError("cursor does not match the sort key")
+        return [
+            datetime.datetime.fromisoformat(value)
+            if isinstance(column.type, DateTime) and value is not None
+            else value
+            for (column, _), value in zip(keyset, values)
+        ]
+    except (ValueError, TypeError) as e:
+        raise exceptions.ArgumentError(f"Invalid cursor: {e}")
+
+
+def add_query_keyset_pagination(query_obj, limit, offset, cursor, keyset: Keyset):
+    """
+    Orders `query_obj` by `keyset`, a list of (column, is_descending) ending in
+    a unique column, and returns the page after the row `cursor` was encoded
+    from. Without a cursor this is regular offset pagination over the same
+    order, so a cursor taken from any page continues where it ended.
+
+    Sort columns must not be null, coalesce nullable columns in the keyset.
+    """
+    query_obj = query_obj.order_by(
+        *[
+            desc(column) if is_descending else asc(column)
+            for column, is_descending in keyset
+        ]
+    )
+    if cursor:
+        values = decode_cursor(cursor, keyset)
+        # (a, b) comes after (x, y) when a > x or (a = x and b > y),
+        # with > flipped to < for descending columns
+        after_clauses = []
+        for i, (column, is_descending) in enumerate(keyset):
+            after_clauses.append(
+                and_(
+                    *[
+                        previous_column == value
+                        for (previous_column, _), value in zip(keyset[:i], values)
+                    ],
+                    column < values[i] if is_descending else column > values[i],
+                )
+            )
+        query_obj = query_obj.filter(or_(*after_clauses))
+    return add_query_pagination(query_obj, limit, offset)
+
+
+def get_next_cursor(results: List, limit: int, get_sort_key) -> Optional[str]:
+    """Returns the cursor of the page after `results`, or None on the last page."""
+    if not results or len(results) < limit:
+        return None
+    return encode_cursor(get_sort_key(results[-1]))
+
+
+def get_follower_count_sort_key(user):
+    """Sort key of user lists paginated by follower count and then user id."""
+    return (user[response_name_constants.follower_count], user["user_id"])
+
+
 def get_genre_list(genre):
     genre_list = []
     genre_list.append(genre)
@@ -1,10 +1,17 @@
+import concurrent.futures
+import json
 import logging
+import os
 import random
 import signal
+import threading
 import time
 from contextlib import contextmanager
-from typing import Optional
+from typing import Dict, List, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+from solders.account import Account
 from solders.pubkey import Pubkey
 from solders.rpc.responses import GetSignaturesForAddressResp, GetTransactionResp
 from solders.signature import Signature
@@ -20,6 +27,16 @@ logger = logging.getLogger(__name__)
 DEFAULT_MAX_RETRIES = 5
 # number of seconds to wait between calls to get_confirmed_transaction
 DELAY_SECONDS = 0.2
+# maximum number of getTransaction calls sent in one JSON-RPC batch request
+GET_TRANSACTIONS_BATCH_SIZE = 50
+# maximum number of accounts per getMultipleAccounts call
+GET_MULTIPLE_ACCOUNTS_BATCH_SIZE = 100
+# number of seconds to wait on an endpoint before also sending the request to the next one
+HEDGE_DELAY_SECONDS = 2.0
+# number of seconds before a JSON-RPC http request times out
+RPC_REQUEST_TIMEOUT_SECONDS = 10
+# maximum number of concurrent JSON-RPC http requests and pooled connections per endpoint
+RPC_POOL_SIZE = 32
 
 
 class SolanaClientManager:
@@ -27,6 +44,17 @@ class SolanaClientManager:
         self.endpoints = solana_endpoints.split(",")
         self.clients = [Client(endpoint) for endpoint in self.endpoints]
 
+        # Pooled http session for JSON-RPC batch requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=len(self.endpoints), pool_maxsize=RPC_POOL_SIZE
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._executor_lock = threading.Lock()
+
     def get_client(self, randomize=False) -> Client:
         if not self.clients:
             raise Exception(
@@ -80,6 +108,146 @@ class SolanaClientManager:
             f"solana_client_manager.py | get_sol_tx_info | All requests failed to fetch {tx_sig}",
         )
 
+    def get_transactions(
+        self, tx_sigs: List[str], retries=DEFAULT_MAX_RETRIES, encoding="json"
+    ) -> Dict[str, GetTransactionResp]:
+        """
+        Fetches solana transactions by signature with JSON-RPC batch requests of
+        up to GET_TRANSACTIONS_BATCH_SIZE transactions, returning signature ->
+        transaction.
+
+        Batches are hedged: if an endpoint has not answered after
+        HEDGE_DELAY_SECONDS the batch is also sent to the next endpoint and the
+        first response is used. Transactions that were not returned are
+        requested again, starting from the next endpoint, up to `retries` times.
+
+        Unlike get_sol_tx_info, failed transactions are returned, callers should
+        check `meta.err`. Batches are requested one after another, callers
+        fetching many transactions can call this concurrently.
+        """
+        unique_tx_sigs = list(dict.fromkeys(tx_sigs))
+        tx_infos: Dict[str, GetTransactionResp] = {}
+        for i in range(0, len(unique_tx_sigs), GET_TRANSACTIONS_BATCH_SIZE):
+            tx_infos.update(
+                self._get_transactions_batch(
+                    unique_tx_sigs[i : i + GET_TRANSACTIONS_BATCH_SIZE],
+                    retries,
+                    encoding,
+                )
+            )
+        return tx_infos
+
+    def _get_transactions_batch(
+        self, tx_sigs: List[str], retries: int, encoding: str
+    ) -> Dict[str, GetTransactionResp]:
+        tx_infos: Dict[str, GetTransactionResp] = {}
+        remaining_tx_sigs = tx_sigs
+        for attempt in range(retries):
+            if attempt > 0:
+                time.sleep(DELAY_SECONDS)
+                logger.error(
+                    f"solana_client_manager.py | get_transactions | Retrying {len(remaining_tx_sigs)} txs"
+                )
+            payload = json.dumps(
+                [
+                    {
+                        "jsonrpc": "2.0",
+                        "id": id,
+                        "method": "getTransaction",
+                        "params": [
+                            tx_sig,
+                            {
+                                "encoding": encoding,
+                                "commitment": "finalized",
+                                "maxSupportedTransactionVersion": 0,
+                            },
+                        ],
+                    }
+                    for id, tx_sig in enumerate(remaining_tx_sigs)
+                ]
+            )
+            try:
+                responses = self._post_hedged(payload, attempt % len(self.endpoints))
+            except Exception as e:
+                logger.error(
+                    f"solana_client_manager.py | get_transactions | Error fetching {len(remaining_tx_sigs)} txs, {e}"
+                )
+                continue
+            tx_sigs_by_id = dict(enumerate(remaining_tx_sigs))
+            for response in responses:
+                if not isinstance(response, dict) or "result" not in response:
+                    continue
+                if response.get("id") is None:
+                    continue
+                tx_sig = tx_sigs_by_id.get(response["id"])
+                if tx_sig is None:
+                    continue
+                tx_info = GetTransactionResp.from_json(json.dumps(response))
+                if isinstance(tx_info, GetTransactionResp) and tx_info.value:
+                    tx_infos[tx_sig] = tx_info
+            remaining_tx_sigs = [
+                tx_sig for tx_sig in remaining_tx_sigs if tx_sig not in tx_infos
+            ]
+            if not remaining_tx_sigs:
+                return tx_infos
+        raise Exception(
+            f"solana_client_manager.py | get_transactions | Failed to fetch {len(remaining_tx_sigs)} txs, first {remaining_tx_sigs[0]}"
+        )
+
+    def _post_hedged(self, payload: str, first_index: int) -> list:
+        """
+        Posts a JSON-RPC request to the endpoints in order starting from
+        `first_index`, moving on to the next endpoint when one fails or is slow,
+        and returns the first successful response.
+        """
+        executor = self._get_executor()
+        indexes = [
+            (first_index + i) % len(self.endpoints) for i in range(len(self.endpoints))
+        ]
+        pending = set()
+        while indexes or pending:
+            if indexes:
+                pending.add(
+                    executor.submit(self._post, self.endpoints[indexes.pop(0)], payload)
+                )
+            done, pending = concurrent.futures.wait(
+                pending,
+                timeout=HEDGE_DELAY_SECONDS if indexes else None,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    logger.error(
+                        f"solana_client_manager.py | _post_hedged | Request failed, {e}"
+                    )
+        raise Exception("solana_client_manager.py | _post_hedged | All requests failed")
+
+    def _post(self, endpoint: str, payload: str) -> list:
+        response = self.session.post(
+            endpoint,
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=RPC_REQUEST_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        responses = response.json()
+        if not isinstance(responses, list):
+            raise Exception(f"Unexpected response from {endpoint}: {responses}")
+        return responses
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        # Created per process so that forked workers do not share it
+        pid = os.getpid()
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != pid:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=RPC_POOL_SIZE, thread_name_prefix="solana_rpc"
+                )
+                self._executor_pid = pid
+            return self._executor
+
     def get_signatures_for_address(
         self,
         account: str,
@@ -224,6 +392,48 @@ class SolanaClientManager:
             "solana_client_manager.py | get_account_info | All requests failed to fetch",
         )
 
+    def get_multiple_accounts(
+        self, accounts: List[Pubkey], retries=DEFAULT_MAX_RETRIES
+    ) -> List[Optional[Account]]:
+        """
+        Fetches accounts with getMultipleAccounts calls of up to
+        GET_MULTIPLE_ACCOUNTS_BATCH_SIZE accounts, returning the account info
+        of each account in order, or None for accounts that do not exist.
+        """
+        account_infos: List[Optional[Account]] = []
+        for i in range(0, len(accounts), GET_MULTIPLE_ACCOUNTS_BATCH_SIZE):
+            batch = accounts[i : i + GET_MULTIPLE_ACCOUNTS_BATCH_SIZE]
+
+            def _get_multiple_accounts(client: Client, index):
+                endpoint = self.endpoints[index]
+                num_retries = retries
+                while num_retries > 0:
+                    try:
+                        response = client.get_multiple_accounts(batch)
+                        return response.value
+                    except Exception as e:
+                        logger.error(
+                            f"solana_client_manager.py | get_multiple_accounts, {e}",
+                            exc_info=True,
+                        )
+                    num_retries -= 1
+                    time.sleep(DELAY_SECONDS)
+                    logger.error(
+                        f"solana_client_manager.py | get_multiple_accounts | Retrying with endpoint {endpoint}"
+                    )
+                raise Exception(
+                    f"solana_client_manager.py | get_multiple_accounts | Failed with endpoint {endpoint}"
+                )
+
+            account_infos.extend(
+                _try_all(
+                    self.clients,
+                    _get_multiple_accounts,
+                    "solana_client_manager.py | get_multiple_accounts | All requests failed to fetch",
+                )
+            )
+        return account_infos
+
 
 @contextmanager
 def timeout(time):
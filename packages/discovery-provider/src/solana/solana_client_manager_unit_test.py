@@ -1,7 +1,16 @@
+import json
+import threading
+import time
 from unittest import mock
 
 import pytest
-from solders.rpc.responses import GetTransactionResp
+from solders.account import Account
+from solders.pubkey import Pubkey
+from solders.rpc.responses import (
+    GetMultipleAccountsResp,
+    GetTransactionResp,
+    RpcResponseContext,
+)
 
 from src.solana.solana_client_manager import SolanaClientManager
 
@@ -156,3 +165,102 @@ def test_get_sol_tx_info_v0_transaction(_):
         )
         == expected_response
     )
+
+
+def get_batch_response(request, responses):
+    """Answers a getTransaction batch request from signature -> response"""
+    return [
+        {**json.loads(responses[call["params"][0]].to_json()), "id": call["id"]}
+        for call in reversed(request.json())
+        if call["params"][0] in responses
+    ]
+
+
+def test_get_transactions(requests_mock):
+    endpoints = ["https://first.rpc", "https://second.rpc"]
+    manager = SolanaClientManager(",".join(endpoints))
+    tx_sig = "564oju8DrSrWd9sSjhgDEFxSYQ1TyAR1dStAwbr5WS6kaLT2GHxt5NVwbdm9cE79ovaGyMu8ZgXUBB9EC8F2XT8J"
+    tx_sig_v0 = "2ML2h2YwBmRqgmF86EvxdZMJCBwBDtspaqANpqdm4ajuKCnL7K7nXuHK7AMeBe9Zk7yJp3KR4V28WZ8tPApaQB6t"
+
+    # the first endpoint does not have the v0 transaction yet
+    first_mock = requests_mock.post(
+        endpoints[0],
+        json=lambda request, _: get_batch_response(request, {tx_sig: example_response}),
+    )
+    second_mock = requests_mock.post(
+        endpoints[1],
+        json=lambda request, _: get_batch_response(
+            request, {tx_sig: example_response, tx_sig_v0: example_response_v0}
+        ),
+    )
+
+    assert manager.get_transactions([tx_sig, tx_sig_v0, tx_sig]) == {
+        tx_sig: example_response,
+        tx_sig_v0: example_response_v0,
+    }
+    assert [call["params"][0] for call in first_mock.last_request.json()] == [
+        tx_sig,
+        tx_sig_v0,
+    ]
+    # only the missing transaction is requested again, from the next endpoint
+    assert [call["params"][0] for call in second_mock.last_request.json()] == [
+        tx_sig_v0
+    ]
+
+    # test exception raised if a transaction is never returned
+    with pytest.raises(Exception):
+        manager.get_transactions(["unknown"], retries=2)
+
+
+@mock.patch("src.solana.solana_client_manager.HEDGE_DELAY_SECONDS", 0.1)
+def test_get_transactions_hedged():
+    endpoints = ["https://slow.rpc", "https://fast.rpc"]
+    manager = SolanaClientManager(",".join(endpoints))
+    tx_sig = "564oju8DrSrWd9sSjhgDEFxSYQ1TyAR1dStAwbr5WS6kaLT2GHxt5NVwbdm9cE79ovaGyMu8ZgXUBB9EC8F2XT8J"
+    response = [{**json.loads(example_response.to_json()), "id": 0}]
+    slow_request_done = threading.Event()
+
+    def post(endpoint, payload):
+        if endpoint == endpoints[0]:
+            slow_request_done.wait(5)
+            raise Exception("timed out")
+        return response
+
+    with mock.patch.object(manager, "_post", side_effect=post) as post_mock:
+        start_time = time.time()
+        assert manager.get_transactions([tx_sig]) == {tx_sig: example_response}
+        assert time.time() - start_time < 2
+        assert [call.args[0] for call in post_mock.call_args_list] == endpoints
+    slow_request_done.set()
+
+
+@mock.patch("solana.rpc.api.Client")
+def test_get_multiple_accounts(_):
+    client_mocks = [
+        mock.Mock(name="first"),
+        mock.Mock(name="second"),
+    ]
+    solana_client_manager.clients = client_mocks
+    accounts = [Pubkey.new_unique() for _ in range(150)]
+    account_infos = {
+        account: Account(lamports=i, data=b"", owner=Pubkey.default())
+        for i, account in enumerate(accounts)
+        if i % 2
+    }
+
+    def get_multiple_accounts(pubkeys):
+        return GetMultipleAccountsResp(
+            [account_infos.get(pubkey) for pubkey in pubkeys], RpcResponseContext(1)
+        )
+
+    # test that it will try subsequent clients if first one fails
+    client_mocks[0].get_multiple_accounts.side_effect = Exception()
+    client_mocks[1].get_multiple_accounts.side_effect = get_multiple_accounts
+    assert solana_client_manager.get_multiple_accounts(accounts, retries=1) == [
+        account_infos.get(account) for account in accounts
+    ]
+    # accounts are fetched 100 at a time
+    assert [
+        len(call.args[0])
+        for call in client_mocks[1].get_multiple_accounts.call_args_list
+    ] == [100, 50]
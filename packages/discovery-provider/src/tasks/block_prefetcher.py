@@ -0,0 +1,113 @@
+import concurrent.futures
+import logging
+import threading
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+from src.utils.prometheus_metric import PrometheusMetric, PrometheusMetricNames
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BlockPrefetcher(Generic[T]):
+    """
+    Keeps the next `max_size` blocks in flight on a long-lived thread pool so
+    that network time for upcoming blocks overlaps with the database work for
+    the current one.
+
+    `fetch_block` is called with a block number and returns the fetched block
+    (along with anything else the indexer needs, e.g. receipts), or None if the
+    block does not exist yet. Results are handed out in order by `get`; anything
+    older than the requested block is dropped from the buffer.
+    """
+
+    def __init__(
+        self,
+        fetch_block: Callable[[int], Optional[T]],
+        max_size: int,
+        name: str = "block_prefetcher",
+    ):
+        self.fetch_block = fetch_block
+        self.max_size = max(1, max_size)
+        self.name = name
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._buffer: Dict[int, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        # Created lazily so no threads exist before celery forks its workers
+        if not self._executor:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_size, thread_name_prefix=self.name
+            )
+        return self._executor
+
+    def buffered_blocks(self):
+        with self._lock:
+            return sorted(self._buffer.keys())
+
+    def clear(self):
+        """
+        Drops every buffered block, e.g. after a revert when prefetched blocks
+        may belong to an abandoned fork.
+        """
+        with self._lock:
+            for future in self._buffer.values():
+                future.cancel()
+            self._buffer = {}
+        self._record_buffer_size()
+
+    def get(self, block_number: int, latest_block_number: Optional[int] = None):
+        """
+        Returns the result of `fetch_block(block_number)`, waiting on the
+        in-flight request if there is one, and schedules the blocks after it up
+        to `latest_block_number` (the known chain head).
+        """
+        wait_metric = PrometheusMetric(
+            PrometheusMetricNames.INDEX_BLOCKS_PREFETCH_WAIT_DURATION_SECONDS
+        )
+        with self._lock:
+            for buffered_number in list(self._buffer.keys()):
+                if buffered_number < block_number:
+                    self._buffer.pop(buffered_number).cancel()
+            future = self._buffer.get(block_number)
+            is_hit = future is not None
+            if not future:
+                future = self.executor.submit(self.fetch_block, block_number)
+                self._buffer[block_number] = future
+
+            last_block_to_prefetch = block_number + self.max_size - 1
+            if latest_block_number is not None:
+                last_block_to_prefetch = min(
+                    last_block_to_prefetch, latest_block_number
+                )
+            for next_number in range(block_number + 1, last_block_to_prefetch + 1):
+                if next_number not in self._buffer:
+                    self._buffer[next_number] = self.executor.submit(
+                        self.fetch_block, next_number
+                    )
+
+        try:
+            result = future.result()
+        except Exception:
+            self._evict(block_number)
+            raise
+        finally:
+            wait_metric.save_time({"hit": str(is_hit).lower()})
+
+        # Blocks that did not exist when fetched are retried on the next call
+        if result is None:
+            self._evict(block_number)
+        self._record_buffer_size()
+        return result
+
+    def _evict(self, block_number: int):
+        with self._lock:
+            self._buffer.pop(block_number, None)
+
+    def _record_buffer_size(self):
+        PrometheusMetric(
+            PrometheusMetricNames.INDEX_BLOCKS_PREFETCH_BUFFER_LATEST
+        ).save(len(self._buffer))
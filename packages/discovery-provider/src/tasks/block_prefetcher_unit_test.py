@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from src.tasks.block_prefetcher import BlockPrefetcher
+
+
+class MockChain:
+    def __init__(self, head):
+        self.head = head
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def fetch_block(self, number):
+        with self.lock:
+            self.fetched.append(number)
+        if number > self.head:
+            return None
+        return {"number": number}
+
+
+def test_get_prefetches_up_to_max_size():
+    chain = MockChain(head=100)
+    prefetcher = BlockPrefetcher(chain.fetch_block, 5)
+
+    assert prefetcher.get(1) == {"number": 1}
+    assert prefetcher.buffered_blocks() == [1, 2, 3, 4, 5]
+
+    # Older blocks are dropped and the window slides forward
+    assert prefetcher.get(2) == {"number": 2}
+    assert prefetcher.buffered_blocks() == [2, 3, 4, 5, 6]
+    assert sorted(chain.fetched) == [1, 2, 3, 4, 5, 6]
+
+
+def test_get_does_not_prefetch_past_chain_head():
+    chain = MockChain(head=3)
+    prefetcher = BlockPrefetcher(chain.fetch_block, 5)
+
+    assert prefetcher.get(1, latest_block_number=3) == {"number": 1}
+    assert prefetcher.buffered_blocks() == [1, 2, 3]
+
+
+def test_get_retries_missing_blocks():
+    chain = MockChain(head=1)
+    prefetcher = BlockPrefetcher(chain.fetch_block, 1)
+
+    assert prefetcher.get(2) is None
+    assert prefetcher.buffered_blocks() == []
+
+    chain.head = 2
+    assert prefetcher.get(2) == {"number": 2}
+    assert chain.fetched == [2, 2]
+
+
+def test_get_evicts_failed_fetches():
+    def fetch_block(number):
+        raise Exception("rpc error")
+
+    prefetcher = BlockPrefetcher(fetch_block, 1)
+    with pytest.raises(Exception):
+        prefetcher.get(1)
+    assert prefetcher.buffered_blocks() == []
+
+
+def test_clear():
+    chain = MockChain(head=100)
+    prefetcher = BlockPrefetcher(chain.fetch_block, 3)
+    prefetcher.get(1)
+    prefetcher.clear()
+    assert prefetcher.buffered_blocks() == []
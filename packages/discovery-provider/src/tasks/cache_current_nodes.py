@@ -1,6 +1,7 @@
 import logging
 
 from src.tasks.celery_app import celery
+from src.utils.content_node_ring import set_content_nodes_version
 from src.utils.get_all_other_nodes import (
     ALL_CONTENT_NODES_CACHE_KEY,
     ALL_DISCOVERY_NODES_CACHE_KEY,
@@ -63,6 +64,7 @@ def cache_current_nodes_task(self):
             set_json_cached_key(
                 redis, ALL_HEALTHY_CONTENT_NODES_CACHE_KEY, healthy_content_nodes
             )
+            set_content_nodes_version(redis, healthy_content_nodes)
             logger.info("cache_current_nodes.py | set alive content nodes in redis")
         else:
             logger.info("cache_current_nodes.py | Failed to acquire lock")
@@ -14,7 +14,7 @@ from src.tasks.celery_app import celery
 from src.trending_strategies.trending_strategy_factory import TrendingStrategyFactory
 from src.trending_strategies.trending_type_and_version import TrendingType
 from src.utils.prometheus_metric import save_duration_metric
-from src.utils.redis_cache import set_json_cached_key
+from src.utils.redis_cache import set_list_cached_key
 from src.utils.redis_constants import trending_playlists_last_completion_redis_key
 from src.utils.session_manager import SessionManager
 
@@ -31,7 +31,7 @@ def cache_trending(db, redis, strategy):
         for time_range in TIME_RANGES:
             key = make_trending_playlists_cache_key(time_range, strategy.version)
             res = make_get_unpopulated_playlists(session, time_range, strategy)()
-            set_json_cached_key(redis, key, res)
+            set_list_cached_key(redis, key, res[0], "playlist_id")
             if time_range == "week":
                 index_trending_playlist_notifications(db, time_range, now)
 
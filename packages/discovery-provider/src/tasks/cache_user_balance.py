@@ -1,16 +1,13 @@
 import logging
 import time
-from typing import Dict, List, Optional, Set, Tuple, TypedDict
+from typing import Dict, List, Set, Tuple
 
 from redis import Redis
-from solders.keypair import Keypair
 from solders.pubkey import Pubkey
-from spl.token.client import Token
 from sqlalchemy import and_
 from sqlalchemy.orm.session import Session
 from web3 import Web3
 
-from solana.rpc.api import Client
 from src.app import get_eth_abi_values
 from src.models.users.associated_wallet import AssociatedWallet
 from src.models.users.user import User
@@ -22,7 +19,7 @@ from src.queries.get_balances import (
     LAZY_REFRESH_REDIS_PREFIX,
     does_user_balance_need_refresh,
 )
-from src.solana.solana_helpers import ASSOCIATED_TOKEN_PROGRAM_ID_PK, SPL_TOKEN_ID_PK
+from src.solana.solana_client_manager import SolanaClientManager
 from src.tasks.celery_app import celery
 from src.utils import web3_provider
 from src.utils.config import shared_config
@@ -30,6 +27,7 @@ from src.utils.prometheus_metric import save_duration_metric
 from src.utils.redis_constants import user_balances_refresh_last_completion_redis_key
 from src.utils.session_manager import SessionManager
 from src.utils.spl_audio import to_wei
+from src.utils.user_balances import UserWalletMetadata, fetch_user_balances
 
 logger = logging.getLogger(__name__)
 audius_token_registry_key = bytes("Token", "utf-8")
@@ -47,17 +45,6 @@ MAX_LAZY_REFRESH_USER_IDS = 100
 eth_web3 = web3_provider.get_eth_web3()
 
 
-class AssociatedWallets(TypedDict):
-    eth: List[str]
-    sol: List[str]
-
-
-class UserWalletMetadata(TypedDict):
-    owner_wallet: str
-    associated_wallets: AssociatedWallets
-    bank_account: Optional[str]
-
-
 def get_lazy_refresh_user_ids(redis: Redis, session: Session) -> List[int]:
     redis_user_ids = redis.smembers(LAZY_REFRESH_REDIS_PREFIX)
     user_ids = [int(user_id.decode()) for user_id in redis_user_ids]
@@ -113,7 +100,7 @@ def refresh_user_ids(
     delegate_manager_contract,
     staking_contract,
     eth_web3,
-    waudio_token: Token | None,
+    solana_client_manager: SolanaClientManager,
 ):
     with db.scoped_session() as session:
         # lazy_refresh_user_ids = get_lazy_refresh_user_ids(redis, session)[
@@ -221,73 +208,25 @@ def refresh_user_ids(
         # mapping of user_id => balance change
         needs_balance_change_update: Dict[int, Dict] = {}
 
-        # Fetch balances
-        # pylint: disable=too-many-nested-blocks
-        for user_id, wallets in user_id_metadata.items():
+        # Fetch balances at one block so they are consistent across users
+        blocknumber = eth_web3.eth.block_number
+        user_id_balances = fetch_user_balances(
+            user_id_metadata,
+            token_contract,
+            delegate_manager_contract,
+            staking_contract,
+            eth_web3,
+            solana_client_manager,
+            WAUDIO_MINT_PUBKEY,
+            blocknumber,
+        )
+
+        for user_id, balances in user_id_balances.items():
             try:
-                owner_wallet = wallets["owner_wallet"]
-                owner_wallet = Web3.to_checksum_address(owner_wallet)
-                owner_wallet_balance = token_contract.functions.balanceOf(
-                    owner_wallet
-                ).call()
-                associated_balance = 0
-                waudio_balance: str = "0"
-                associated_sol_balance = 0
-
-                if "associated_wallets" in wallets:
-                    for wallet in wallets["associated_wallets"]["eth"]:
-                        wallet = Web3.to_checksum_address(wallet)
-                        balance = token_contract.functions.balanceOf(wallet).call()
-                        delegation_balance = (
-                            delegate_manager_contract.functions.getTotalDelegatorStake(
-                                wallet
-                            ).call()
-                        )
-                        stake_balance = staking_contract.functions.totalStakedFor(
-                            wallet
-                        ).call()
-                        associated_balance += (
-                            balance + delegation_balance + stake_balance
-                        )
-                    if waudio_token is not None:
-                        for wallet in wallets["associated_wallets"]["sol"]:
-                            try:
-                                root_sol_account = Pubkey.from_string(wallet)
-                                derived_account, _ = Pubkey.find_program_address(
-                                    [
-                                        bytes(root_sol_account),
-                                        bytes(SPL_TOKEN_ID_PK),
-                                        bytes(WAUDIO_MINT_PUBKEY),  # type: ignore
-                                    ],
-                                    ASSOCIATED_TOKEN_PROGRAM_ID_PK,
-                                )
-
-                                bal_info = waudio_token.get_balance(derived_account)
-                                associated_waudio_balance = bal_info.value.amount
-                                associated_sol_balance += int(associated_waudio_balance)
-                            except Exception as e:
-                                logger.error(
-                                    " ".join(
-                                        [
-                                            "cache_user_balance.py | Error fetching associated ",
-                                            "wallet balance for user %s, wallet %s: %s",
-                                        ]
-                                    ),
-                                    user_id,
-                                    wallet,
-                                    e,
-                                )
-
-                if wallets["bank_account"] is not None:
-                    if waudio_token is None:
-                        logger.error(
-                            "cache_user_balance.py | Missing Required SPL Confirguration"
-                        )
-                    else:
-                        bal_info = waudio_token.get_balance(
-                            Pubkey.from_string(wallets["bank_account"])
-                        )
-                        waudio_balance = bal_info.value.amount
+                owner_wallet_balance = balances["owner_wallet_balance"]
+                associated_balance = balances["associated_balance"]
+                waudio_balance = balances["waudio_balance"]
+                associated_sol_balance = balances["associated_sol_balance"]
 
                 # update the balance on the user model
                 user_balance = user_balances[user_id]
@@ -319,7 +258,7 @@ def refresh_user_ids(
                 # Write to user_balance_changes table
                 needs_balance_change_update[user_id] = {
                     "user_id": user_id,
-                    "blocknumber": eth_web3.eth.block_number,
+                    "blocknumber": blocknumber,
                     "current_balance": str(current_total_balance),
                     "previous_balance": str(prev_total_balance),
                 }
@@ -333,7 +272,7 @@ def refresh_user_ids(
 
             except Exception as e:
                 logger.error(
-                    f"cache_user_balance.py | Error fetching balance for user {user_id}: {(e)}"
+                    f"cache_user_balance.py | Error updating balance for user {user_id}: {(e)}"
                 )
 
         # Outside the loop, batch update the UserBalanceChanges:
@@ -454,24 +393,6 @@ def get_staking_contract(eth_web3):
     return staking_instance
 
 
-SPL_TOKEN_PROGRAM_ID_PUBKEY = Pubkey.from_string(
-    "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
-)
-
-
-def get_audio_token(solana_client: Client):
-    if WAUDIO_MINT_PUBKEY is None:
-        logger.error("cache_user_balance.py | Missing Required SPL Confirguration")
-        return None
-    waudio_token = Token(
-        conn=solana_client,
-        pubkey=WAUDIO_MINT_PUBKEY,
-        program_id=SPL_TOKEN_PROGRAM_ID_PUBKEY,
-        payer=Keypair(),
-    )
-    return waudio_token
-
-
 @celery.task(name="update_user_balances", bind=True)
 @save_duration_metric(metric_group="celery_task")
 def update_user_balances_task(self):
@@ -495,7 +416,6 @@ def update_user_balances_task(self):
         if have_lock:
             start_time = time.time()
 
-            waudio_token = get_audio_token(solana_client_manager.get_client())
             refresh_user_ids(
                 redis,
                 db,
@@ -503,7 +423,7 @@ def update_user_balances_task(self):
                 self.delegate_manager_inst,
                 self.staking_inst,
                 eth_web3,
-                waudio_token,
+                solana_client_manager,
             )
 
             end_time = time.time()
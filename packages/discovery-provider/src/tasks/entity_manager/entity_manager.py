@@ -1,10 +1,9 @@
-import json
 import time
 from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Set, Tuple, cast
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, cast
 
-from sqlalchemy import and_, func, literal_column, or_
+from sqlalchemy import Table, and_, func, inspect, literal_column, or_, tuple_
 from sqlalchemy.orm.session import Session
 from web3.types import TxReceipt
 
@@ -68,15 +67,17 @@ from src.tasks.entity_manager.utils import (
     MANAGE_ENTITY_EVENT_TYPE,
     Action,
     EntitiesToFetchDict,
+    EntityManagerEvent,
     EntityType,
     ManageEntityParameters,
     RecordDict,
     expect_cid_metadata_json,
     get_record_key,
-    parse_metadata,
+    get_record_metadata,
     save_cid_metadata,
 )
 from src.utils import helpers
+from src.utils.feed_inbox import FeedInboxUpdates
 from src.utils.indexing_errors import IndexingError
 from src.utils.prometheus_metric import PrometheusMetric, PrometheusMetricNames
 from src.utils.structured_logger import StructuredLogger
@@ -86,6 +87,9 @@ logger = StructuredLogger(__name__)
 # Please toggle below variable to true for development
 ENABLE_DEVELOPMENT_FEATURES = True
 
+# Max rows per bulk DELETE / INSERT statement in save_new_records
+BULK_WRITE_CHUNK_SIZE = 1000
+
 entity_type_table_mapping = {
     "Save": Save.__tablename__,
     "Repost": Repost.__tablename__,
@@ -105,11 +109,6 @@ entity_type_table_mapping = {
 }
 
 
-def get_record_columns(record) -> List[str]:
-    columns = [str(m.key) for m in record.__table__.columns]
-    return columns
-
-
 def entity_manager_update(
     update_task: DatabaseTask,
     session: Session,
@@ -117,10 +116,15 @@ def entity_manager_update(
     block_number: int,
     block_timestamp: int,
     block_hash: str,
+    feed_inbox_updates: Optional[FeedInboxUpdates] = None,
 ) -> Tuple[int, Dict[str, Set[(int)]]]:
     """
     Process a block of EM transactions.
 
+    Feed inbox changes are added to `feed_inbox_updates` for the caller to
+    apply once the session has committed.
+
+    0. Decode events and parse metadata for all transactions.
     1. Fetch relevant entities for all transactions.
     2. Process transactions based on type and action.
     3. Validate transaction.
@@ -144,9 +148,17 @@ def entity_manager_update(
         metric_num_changed = PrometheusMetric(
             PrometheusMetricNames.ENTITY_MANAGER_UPDATE_CHANGED_LATEST
         )
+        metric_handler_latency = PrometheusMetric(
+            PrometheusMetricNames.ENTITY_MANAGER_HANDLER_DURATION_SECONDS
+        )
+
+        # decode events and parse their metadata once for the whole block
+        entity_manager_events = decode_entity_manager_events(
+            update_task, entity_manager_txs
+        )
 
         # collect events by entity type and action
-        entities_to_fetch = collect_entities_to_fetch(update_task, entity_manager_txs)
+        entities_to_fetch = collect_entities_to_fetch(entity_manager_events)
 
         # fetch existing tracks and playlists
         existing_records, existing_records_in_json = fetch_existing_entities(
@@ -168,152 +180,64 @@ def entity_manager_update(
         cid_metadata: Dict[str, Dict] = {}
 
         # process in tx order and populate records_to_save
-        for tx_receipt in entity_manager_txs:
-            txhash = update_task.web3.to_hex(tx_receipt["transactionHash"])
-            entity_manager_event_tx = get_entity_manager_events_tx(
-                update_task, tx_receipt
-            )
+        for event in entity_manager_events:
+            txhash = event.txhash
+            handler = get_entity_manager_handler(event)
+            if not handler:
+                logger.debug(
+                    f"entity_manager.py | No handler for {event.action} {event.entity_type}"
+                )
+                continue
+
+            handler_start_time = time.time()
+            try:
+                params = ManageEntityParameters(
+                    session,
+                    update_task.redis,
+                    challenge_bus,
+                    event,
+                    new_records,  # actions below populate these records
+                    existing_records,
+                    pending_track_routes,
+                    pending_playlist_routes,
+                    update_task.eth_manager,
+                    update_task.web3,
+                    block_timestamp,
+                    block_number,
+                    block_hash,
+                    txhash,
+                    logger,
+                )
 
-            for event in entity_manager_event_tx:
-                try:
-                    params = ManageEntityParameters(
-                        session,
-                        update_task.redis,
-                        challenge_bus,
-                        event,
-                        new_records,  # actions below populate these records
-                        existing_records,
-                        pending_track_routes,
-                        pending_playlist_routes,
-                        update_task.eth_manager,
-                        update_task.web3,
-                        block_timestamp,
-                        block_number,
-                        block_hash,
-                        txhash,
-                        logger,
-                    )
-
-                    # update logger context with this tx event
-                    logger.update_context(event["args"])
-
-                    if (
-                        params.action == Action.CREATE
-                        and params.entity_type == EntityType.PLAYLIST
-                    ):
-                        create_playlist(params)
-                    elif (
-                        params.action == Action.UPDATE
-                        and params.entity_type == EntityType.PLAYLIST
-                    ):
-                        update_playlist(params)
-                    elif (
-                        params.action == Action.DELETE
-                        and params.entity_type == EntityType.PLAYLIST
-                    ):
-                        delete_playlist(params)
-                    elif (
-                        params.action == Action.CREATE
-                        and params.entity_type == EntityType.TRACK
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        create_track(params)
-                    elif (
-                        params.action == Action.UPDATE
-                        and params.entity_type == EntityType.TRACK
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        update_track(params)
-
-                    elif (
-                        params.action == Action.DELETE
-                        and params.entity_type == EntityType.TRACK
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        delete_track(params)
-                    elif params.action in create_social_action_types:
-                        create_social_record(params)
-                    elif params.action in delete_social_action_types:
-                        delete_social_record(params)
-                    elif (
-                        params.action == Action.CREATE
-                        and params.entity_type == EntityType.USER
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        create_user(params, cid_type, cid_metadata)
-                    elif (
-                        params.action == Action.UPDATE
-                        and params.entity_type == EntityType.USER
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        update_user(params, cid_type, cid_metadata)
-                    elif (
-                        params.action == Action.VERIFY
-                        and params.entity_type == EntityType.USER
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        verify_user(params)
-                    elif (
-                        params.action == Action.UPDATE
-                        and params.entity_type == EntityType.USER_REPLICA_SET
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        update_user_replica_set(params)
-                    elif (
-                        params.action == Action.VIEW
-                        and params.entity_type == EntityType.NOTIFICATION
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        view_notification(params)
-                    elif (
-                        params.action == Action.CREATE
-                        and params.entity_type == EntityType.NOTIFICATION
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        create_notification(params)
-                    elif (
-                        params.action == Action.VIEW_PLAYLIST
-                        and params.entity_type == EntityType.NOTIFICATION
-                        and ENABLE_DEVELOPMENT_FEATURES
-                    ):
-                        view_playlist(params)
-                    elif (
-                        params.action == Action.CREATE
-                        and params.entity_type == EntityType.DEVELOPER_APP
-                    ):
-                        create_developer_app(params)
-                    elif (
-                        params.action == Action.DELETE
-                        and params.entity_type == EntityType.DEVELOPER_APP
-                    ):
-                        delete_developer_app(params)
-                    elif (
-                        params.action == Action.CREATE
-                        and params.entity_type == EntityType.GRANT
-                    ):
-                        create_grant(params)
-                    elif (
-                        params.action == Action.DELETE
-                        and params.entity_type == EntityType.GRANT
-                    ):
-                        revoke_grant(params)
-
-                    logger.info("process transaction")  # log event context
-                except IndexingValidationError as e:
-                    # swallow exception to keep indexing
-                    logger.error(f"failed to process transaction error {e}")
-                except Exception as e:
-                    indexing_error = IndexingError(
-                        "tx-failure",
-                        block_number,
-                        block_hash,
-                        txhash,
-                        str(e),
-                    )
-                    create_and_raise_indexing_error(
-                        indexing_error, update_task.redis, session
-                    )
-                    logger.error(f"skipping transaction hash {indexing_error}")
+                # update logger context with this tx event
+                logger.update_context(event.event["args"])
+
+                if handler.uses_cid_metadata:
+                    handler.handle(params, cid_type, cid_metadata)
+                else:
+                    handler.handle(params)
+
+                logger.info("process transaction")  # log event context
+            except IndexingValidationError as e:
+                # swallow exception to keep indexing
+                logger.error(f"failed to process transaction error {e}")
+            except Exception as e:
+                indexing_error = IndexingError(
+                    "tx-failure",
+                    block_number,
+                    block_hash,
+                    txhash,
+                    str(e),
+                )
+                create_and_raise_indexing_error(
+                    indexing_error, update_task.redis, session
+                )
+                logger.error(f"skipping transaction hash {indexing_error}")
+            finally:
+                metric_handler_latency.save_time(
+                    {"action": event.action, "entity_type": event.entity_type},
+                    start_time=handler_start_time,
+                )
 
         # compile records_to_save
         save_new_records(
@@ -325,7 +249,20 @@ def entity_manager_update(
             session,
         )
 
+        if feed_inbox_updates is not None:
+            try:
+                feed_inbox_updates.add(new_records, original_records, block_timestamp)
+            except Exception as e:
+                # inboxes are only a read optimization, never fail indexing on them
+                logger.error(
+                    f"entity_manager.py | Failed to collect feed inbox updates {e}",
+                    exc_info=True,
+                )
+
         num_total_changes += len(new_records)
+        # entities to invalidate in the entity caches once committed
+        for record_type in ["Track", "User", "Playlist"]:
+            changed_entity_ids[record_type].update(new_records[record_type].keys())
         # update metrics
         metric_latency.save_time(
             {"scope": "entity_manager_update"},
@@ -367,56 +304,108 @@ def save_new_records(
     existing_records_in_json: dict[str, dict],
     session: Session,
 ):
+    block_datetime = datetime.utcfromtimestamp(block_timestamp)
     prev_records: Dict[str, List] = defaultdict(list)
-    records_to_update = []
+    records_to_delete = []
+    records_to_add = []
     for record_type, record_dict in new_records.items():
         # This is actually a dict, but python has a hard time inferring.
         casted_record_dict = cast(dict, record_dict)
         for entity_id, records in casted_record_dict.items():
             if not records:
                 continue
-            record_to_delete = None
-            records_to_add = []
             # invalidate old records
             if (
                 record_type in original_records
                 and entity_id in original_records[record_type]
-                and "is_current"
-                in get_record_columns(original_records[record_type][entity_id])
+                and get_record_metadata(
+                    original_records[record_type][entity_id]
+                ).has_is_current
                 and original_records[record_type][entity_id].is_current
             ):
                 if record_type == "PlaylistRoute" or record_type == "TrackRoute":
                     # these are an exception since we want to keep is_current false to preserve old slugs
                     original_records[record_type][entity_id].is_current = False
                 else:
-                    record_to_delete = original_records[record_type][entity_id]
+                    records_to_delete.append(original_records[record_type][entity_id])
                 # add the json record for revert blocks
                 prev_records[entity_type_table_mapping[record_type]].append(
                     existing_records_in_json[record_type][entity_id]
                 )
             # invalidate all new records except the last
+            record_metadata = get_record_metadata(records[-1])
             for record in records:
-                if "is_current" in get_record_columns(record):
+                if record_metadata.has_is_current:
                     record.is_current = False
 
-                if "updated_at" in get_record_columns(record):
-                    record.updated_at = datetime.utcfromtimestamp(block_timestamp)
-            if "is_current" in get_record_columns(records[-1]):
+                if record_metadata.has_updated_at:
+                    record.updated_at = block_datetime
+            if record_metadata.has_is_current:
                 records[-1].is_current = True
             if record_type == "PlaylistRoute" or record_type == "TrackRoute":
                 records_to_add.extend(records)
             else:
                 records_to_add.append(records[-1])
-            records_to_update.append((record_to_delete, records_to_add))
     if prev_records:
         revert_block = RevertBlock(blocknumber=block_number, prev_records=prev_records)
         session.add(revert_block)
-        session.flush()
-    for record_to_delete, records_to_add in records_to_update:
-        if record_to_delete:
-            session.delete(record_to_delete)
-        session.flush()
-        session.add_all(records_to_add)
+    # flush changes made by handlers so they land before the bulk statements
+    session.flush()
+    bulk_delete_records(session, records_to_delete)
+    bulk_insert_records(session, records_to_add)
+
+
+def bulk_delete_records(session: Session, records: List):
+    """
+    Deletes records with one DELETE ... WHERE (pk) IN (...) per table
+    and detaches them from the session.
+    """
+    records_by_table: Dict[Table, List] = defaultdict(list)
+    for record in records:
+        records_by_table[record.__table__].append(record)
+
+    for table, table_records in records_by_table.items():
+        # identities are in the order of the mapper's primary key columns
+        primary_key_columns = inspect(table_records[0]).mapper.primary_key
+        for records_chunk in helpers.split_list(table_records, BULK_WRITE_CHUNK_SIZE):
+            primary_keys = [inspect(record).identity for record in records_chunk]
+            session.execute(
+                table.delete().where(tuple_(*primary_key_columns).in_(primary_keys))
+            )
+        for record in table_records:
+            session.expunge(record)
+
+
+def bulk_insert_records(session: Session, records: List):
+    """
+    Inserts new records with one multi-row INSERT per table and set of columns.
+
+    Mirrors the ORM flush: attributes that were never set, or are None on a
+    column that does not store JSON null, are left to the column defaults.
+    """
+    rows_by_table: Dict[Tuple[Table, Tuple[str, ...]], List[Dict]] = defaultdict(list)
+    for record in records:
+        state = inspect(record)
+        if not state.transient:
+            # already tracked by the session, e.g. an existing record that was
+            # updated in place
+            session.add(record)
+            continue
+
+        row = {}
+        for column_property in state.mapper.column_attrs:
+            if column_property.key not in state.dict:
+                continue
+            column = column_property.columns[0]
+            value = state.dict[column_property.key]
+            if value is None and not column.type.should_evaluate_none:
+                continue
+            row[column.key] = value
+        rows_by_table[(record.__table__, tuple(sorted(row.keys())))].append(row)
+
+    for (table, _), rows in rows_by_table.items():
+        for rows_chunk in helpers.split_list(rows, BULK_WRITE_CHUNK_SIZE):
+            session.execute(table.insert().values(rows_chunk))
 
 
 def copy_original_records(existing_records):
@@ -431,109 +420,218 @@ def copy_original_records(existing_records):
 entity_types_to_fetch = set([EntityType.USER, EntityType.TRACK, EntityType.PLAYLIST])
 
 
-def collect_entities_to_fetch(update_task, entity_manager_txs):
+def prefetch_event_entities(event: EntityManagerEvent, entities_to_fetch):
+    """
+    Entities every handled event needs: the entity acted on, the acting user
+    and any grant that lets the signer act for them.
+    """
+    entity_id = event.entity_id
+    entity_type = event.entity_type
+    user_id = event.user_id
+
+    if entity_type in entity_types_to_fetch:
+        entities_to_fetch[entity_type].add(entity_id)
+    if entity_type == EntityType.USER:
+        entities_to_fetch[EntityType.USER_EVENT].add(user_id)
+        entities_to_fetch[EntityType.ASSOCIATED_WALLET].add(user_id)
+    if entity_type == EntityType.TRACK:
+        entities_to_fetch[EntityType.TRACK_ROUTE].add(entity_id)
+    if entity_type == EntityType.PLAYLIST:
+        entities_to_fetch[EntityType.PLAYLIST_ROUTE].add(entity_id)
+    if user_id:
+        entities_to_fetch[EntityType.USER].add(user_id)
+    if event.signer:
+        entities_to_fetch[EntityType.GRANT].add((event.signer.lower(), user_id))
+
+
+def prefetch_metadata_entities(event: EntityManagerEvent, entities_to_fetch):
+    if not expect_cid_metadata_json(
+        event.raw_metadata, event.action, event.entity_type
+    ):
+        return
+    if event.metadata_error:
+        # skip invalid metadata
+        return
+    json_metadata = event.metadata
+
+    # Add playlist track ids in entities to fetch
+    # to prevent playlists from including premium tracks
+    tracks = json_metadata.get("playlist_contents", {}).get("track_ids", [])
+    for track in tracks:
+        entities_to_fetch[EntityType.TRACK].add(track["track"])
+
+    if event.entity_type == EntityType.TRACK:
+        user_id = json_metadata.get("ai_attribution_user_id")
+        if user_id:
+            entities_to_fetch[EntityType.USER].add(user_id)
+
+
+def prefetch_social_entities(event: EntityManagerEvent, entities_to_fetch):
+    # Query social operations as needed
+    for record_type in action_to_record_types[event.action]:
+        entity_key = get_record_key(event.user_id, event.entity_type, event.entity_id)
+        entities_to_fetch[record_type].add(entity_key)
+
+
+def prefetch_playlist_seen_entities(event: EntityManagerEvent, entities_to_fetch):
+    entities_to_fetch[EntityType.PLAYLIST_SEEN].add((event.user_id, event.entity_id))
+    entities_to_fetch[EntityType.PLAYLIST].add(event.entity_id)
+
+
+def prefetch_developer_app_entities(event: EntityManagerEvent, entities_to_fetch):
+    json_metadata = event.json_metadata
+    if not isinstance(json_metadata, dict):
+        logger.error(
+            f"tasks | entity_manager.py | Invalid {event.action} {event.entity_type} event metadata"
+        )
+        # skip invalid metadata
+        return
+
+    raw_address = json_metadata.get("address", None)
+    if raw_address:
+        entities_to_fetch[EntityType.DEVELOPER_APP].add(raw_address.lower())
+    else:
+        try:
+            entities_to_fetch[EntityType.DEVELOPER_APP].add(
+                get_app_address_from_signature(json_metadata.get("app_signature", {}))
+            )
+        except:
+            logger.error(
+                "tasks | entity_manager.py | Missing address or valid app signature in metadata required for add developer app tx"
+            )
+
+
+def prefetch_grant_entities(event: EntityManagerEvent, entities_to_fetch):
+    json_metadata = event.json_metadata
+    if not isinstance(json_metadata, dict):
+        logger.error(
+            f"tasks | entity_manager.py | Invalid {event.action} {event.entity_type} event metadata"
+        )
+        # skip invalid metadata
+        return
+
+    raw_grantee_address = json_metadata.get("grantee_address", None)
+    if raw_grantee_address:
+        entities_to_fetch[EntityType.GRANT].add(
+            (raw_grantee_address.lower(), event.user_id)
+        )
+        entities_to_fetch[EntityType.DEVELOPER_APP].add(raw_grantee_address.lower())
+    else:
+        logger.error(
+            "tasks | entity_manager.py | Missing grantee address in metadata required for add grant tx"
+        )
+
+
+class EntityManagerHandler:
+    """
+    Processes ManageEntity events for one (action, entity type) pair.
+
+    handle: called with the event's ManageEntityParameters, and with the
+        block's cid_type and cid_metadata dicts if uses_cid_metadata is set
+    prefetch: adds the entities the handler needs to entities_to_fetch,
+        on top of the ones every event needs
+    """
+
+    def __init__(
+        self,
+        handle: Callable,
+        prefetch: Sequence[Callable[[EntityManagerEvent, Dict], None]] = (),
+        uses_cid_metadata: bool = False,
+    ):
+        self.handle = handle
+        self.prefetch = prefetch
+        self.uses_cid_metadata = uses_cid_metadata
+
+
+entity_manager_handlers: Dict[Tuple[str, str], EntityManagerHandler] = {
+    (Action.CREATE, EntityType.PLAYLIST): EntityManagerHandler(
+        create_playlist, [prefetch_metadata_entities]
+    ),
+    (Action.UPDATE, EntityType.PLAYLIST): EntityManagerHandler(
+        update_playlist, [prefetch_metadata_entities]
+    ),
+    (Action.DELETE, EntityType.PLAYLIST): EntityManagerHandler(delete_playlist),
+    (Action.CREATE, EntityType.DEVELOPER_APP): EntityManagerHandler(
+        create_developer_app, [prefetch_developer_app_entities]
+    ),
+    (Action.DELETE, EntityType.DEVELOPER_APP): EntityManagerHandler(
+        delete_developer_app, [prefetch_developer_app_entities]
+    ),
+    (Action.CREATE, EntityType.GRANT): EntityManagerHandler(
+        create_grant, [prefetch_grant_entities]
+    ),
+    (Action.DELETE, EntityType.GRANT): EntityManagerHandler(
+        revoke_grant, [prefetch_grant_entities]
+    ),
+}
+
+# Social actions are dispatched on the action alone
+entity_manager_handlers.update(
+    {
+        (action, entity_type): EntityManagerHandler(
+            create_social_record, [prefetch_social_entities]
+        )
+        for action in create_social_action_types
+        for entity_type in EntityType
+    }
+)
+entity_manager_handlers.update(
+    {
+        (action, entity_type): EntityManagerHandler(
+            delete_social_record, [prefetch_social_entities]
+        )
+        for action in delete_social_action_types
+        for entity_type in EntityType
+    }
+)
+
+if ENABLE_DEVELOPMENT_FEATURES:
+    entity_manager_handlers.update(
+        {
+            (Action.CREATE, EntityType.TRACK): EntityManagerHandler(
+                create_track, [prefetch_metadata_entities]
+            ),
+            (Action.UPDATE, EntityType.TRACK): EntityManagerHandler(
+                update_track, [prefetch_metadata_entities]
+            ),
+            (Action.DELETE, EntityType.TRACK): EntityManagerHandler(delete_track),
+            (Action.CREATE, EntityType.USER): EntityManagerHandler(
+                create_user, [prefetch_metadata_entities], uses_cid_metadata=True
+            ),
+            (Action.UPDATE, EntityType.USER): EntityManagerHandler(
+                update_user, [prefetch_metadata_entities], uses_cid_metadata=True
+            ),
+            (Action.VERIFY, EntityType.USER): EntityManagerHandler(verify_user),
+            (Action.UPDATE, EntityType.USER_REPLICA_SET): EntityManagerHandler(
+                update_user_replica_set
+            ),
+            (Action.VIEW, EntityType.NOTIFICATION): EntityManagerHandler(
+                view_notification
+            ),
+            (Action.CREATE, EntityType.NOTIFICATION): EntityManagerHandler(
+                create_notification
+            ),
+            (Action.VIEW_PLAYLIST, EntityType.NOTIFICATION): EntityManagerHandler(
+                view_playlist, [prefetch_playlist_seen_entities]
+            ),
+        }
+    )
+
+
+def get_entity_manager_handler(event: EntityManagerEvent):
+    return entity_manager_handlers.get((event.action, event.entity_type))
+
+
+def collect_entities_to_fetch(entity_manager_events: List[EntityManagerEvent]):
     entities_to_fetch: Dict[EntityType, Set] = defaultdict(set)
 
-    for tx_receipt in entity_manager_txs:
-        entity_manager_event_tx = get_entity_manager_events_tx(update_task, tx_receipt)
-        for event in entity_manager_event_tx:
-            entity_id = helpers.get_tx_arg(event, "_entityId")
-            entity_type = helpers.get_tx_arg(event, "_entityType")
-            action = helpers.get_tx_arg(event, "_action")
-            user_id = helpers.get_tx_arg(event, "_userId")
-            metadata = helpers.get_tx_arg(event, "_metadata")
-            signer = helpers.get_tx_arg(event, "_signer")
-
-            if entity_type in entity_types_to_fetch:
-                entities_to_fetch[entity_type].add(entity_id)
-            if entity_type == EntityType.USER:
-                entities_to_fetch[EntityType.USER_EVENT].add(user_id)
-                entities_to_fetch[EntityType.ASSOCIATED_WALLET].add(user_id)
-            if entity_type == EntityType.TRACK:
-                entities_to_fetch[EntityType.TRACK_ROUTE].add(entity_id)
-            if entity_type == EntityType.PLAYLIST:
-                entities_to_fetch[EntityType.PLAYLIST_ROUTE].add(entity_id)
-            if (
-                entity_type == EntityType.NOTIFICATION
-                and action == Action.VIEW_PLAYLIST
-            ):
-                entities_to_fetch[EntityType.PLAYLIST_SEEN].add((user_id, entity_id))
-                entities_to_fetch[EntityType.PLAYLIST].add(entity_id)
-            if user_id:
-                entities_to_fetch[EntityType.USER].add(user_id)
-            if signer:
-                entities_to_fetch[EntityType.GRANT].add((signer.lower(), user_id))
-            if entity_type == EntityType.DEVELOPER_APP:
-                try:
-                    json_metadata = json.loads(metadata)
-                except Exception as e:
-                    logger.error(
-                        f"tasks | entity_manager.py | Exception deserializing {action} {entity_type} event metadata: {e}"
-                    )
-                    # skip invalid metadata
-                    continue
-
-                raw_address = json_metadata.get("address", None)
-                if raw_address:
-                    entities_to_fetch[EntityType.DEVELOPER_APP].add(raw_address.lower())
-                else:
-                    try:
-                        entities_to_fetch[EntityType.DEVELOPER_APP].add(
-                            get_app_address_from_signature(
-                                json_metadata.get("app_signature", {})
-                            )
-                        )
-                    except:
-                        logger.error(
-                            "tasks | entity_manager.py | Missing address or valid app signature in metadata required for add developer app tx"
-                        )
-            if entity_type == EntityType.GRANT:
-                try:
-                    json_metadata = json.loads(metadata)
-                except Exception as e:
-                    logger.error(
-                        f"tasks | entity_manager.py | Exception deserializing {action} {entity_type} event metadata: {e}"
-                    )
-                    # skip invalid metadata
-                    continue
-
-                raw_grantee_address = json_metadata.get("grantee_address", None)
-                if raw_grantee_address:
-                    entities_to_fetch[EntityType.GRANT].add(
-                        (raw_grantee_address.lower(), user_id)
-                    )
-                    entities_to_fetch[EntityType.DEVELOPER_APP].add(
-                        raw_grantee_address.lower()
-                    )
-                else:
-                    logger.error(
-                        "tasks | entity_manager.py | Missing grantee address in metadata required for add grant tx"
-                    )
-
-            # Query social operations as needed
-            if action in action_to_record_types.keys():
-                record_types = action_to_record_types[action]
-                for record_type in record_types:
-                    entity_key = get_record_key(user_id, entity_type, entity_id)
-                    entities_to_fetch[record_type].add(entity_key)
-
-            if expect_cid_metadata_json(metadata, action, entity_type):
-                try:
-                    json_metadata, _ = parse_metadata(metadata, action, entity_type)
-                except Exception:
-                    # skip invalid metadata
-                    continue
-
-                # Add playlist track ids in entities to fetch
-                # to prevent playlists from including premium tracks
-                tracks = json_metadata.get("playlist_contents", {}).get("track_ids", [])
-                for track in tracks:
-                    entities_to_fetch[EntityType.TRACK].add(track["track"])
-
-                if entity_type == EntityType.TRACK:
-                    user_id = json_metadata.get("ai_attribution_user_id")
-                    if user_id:
-                        entities_to_fetch[EntityType.USER].add(user_id)
+    for event in entity_manager_events:
+        handler = get_entity_manager_handler(event)
+        if not handler:
+            continue
+        prefetch_event_entities(event, entities_to_fetch)
+        for prefetch in handler.prefetch:
+            prefetch(event, entities_to_fetch)
 
     return entities_to_fetch
 
@@ -908,6 +1006,20 @@ def get_entity_manager_events_tx(update_task, tx_receipt: TxReceipt):
     )().process_receipt(tx_receipt)
 
 
+def decode_entity_manager_events(
+    update_task, entity_manager_txs: List[TxReceipt]
+) -> List[EntityManagerEvent]:
+    """
+    Decodes the ManageEntity events of every transaction in tx order.
+    """
+    entity_manager_events: List[EntityManagerEvent] = []
+    for tx_receipt in entity_manager_txs:
+        txhash = update_task.web3.to_hex(tx_receipt["transactionHash"])
+        for event in get_entity_manager_events_tx(update_task, tx_receipt):
+            entity_manager_events.append(EntityManagerEvent(event, txhash))
+    return entity_manager_events
+
+
 def create_and_raise_indexing_error(err, redis, session):
     logger.error(
         f"Error in the indexing task at"
@@ -0,0 +1,60 @@
+from web3.datastructures import AttributeDict
+
+from src.tasks.entity_manager.entities.social_features import create_social_record
+from src.tasks.entity_manager.entities.track import create_track
+from src.tasks.entity_manager.entity_manager import (
+    collect_entities_to_fetch,
+    get_entity_manager_handler,
+)
+from src.tasks.entity_manager.utils import Action, EntityManagerEvent, EntityType
+
+
+def make_event(action, entity_type, entity_id, user_id=1, metadata=""):
+    return EntityManagerEvent(
+        AttributeDict(
+            {
+                "args": AttributeDict(
+                    {
+                        "_entityId": entity_id,
+                        "_entityType": entity_type,
+                        "_userId": user_id,
+                        "_action": action,
+                        "_metadata": metadata,
+                        "_signer": "0xSigner",
+                    }
+                )
+            }
+        ),
+        "0x01",
+    )
+
+
+def test_get_entity_manager_handler():
+    handler = get_entity_manager_handler(make_event("Create", "Track", 1))
+    assert handler.handle == create_track
+
+    handler = get_entity_manager_handler(make_event("Save", "Playlist", 1))
+    assert handler.handle == create_social_record
+
+    assert get_entity_manager_handler(make_event("Verify", "Track", 1)) is None
+    assert get_entity_manager_handler(make_event("Unknown", "Track", 1)) is None
+
+
+def test_collect_entities_to_fetch():
+    entities_to_fetch = collect_entities_to_fetch(
+        [
+            make_event(Action.SAVE, EntityType.TRACK, 10, user_id=1),
+            make_event(Action.FOLLOW, EntityType.USER, 2, user_id=1),
+            # events without a handler do not fetch anything
+            make_event("Unknown", EntityType.PLAYLIST, 20, user_id=3),
+        ]
+    )
+
+    assert entities_to_fetch[EntityType.TRACK] == {10}
+    assert entities_to_fetch[EntityType.TRACK_ROUTE] == {10}
+    assert entities_to_fetch[EntityType.USER] == {1, 2}
+    assert entities_to_fetch[EntityType.SAVE] == {(1, "Track", 10)}
+    assert entities_to_fetch[EntityType.FOLLOW] == {(1, "User", 2)}
+    assert entities_to_fetch[EntityType.SUBSCRIPTION] == {(1, "User", 2)}
+    assert entities_to_fetch[EntityType.GRANT] == {("0xsigner", 1)}
+    assert EntityType.PLAYLIST not in entities_to_fetch
@@ -1,7 +1,17 @@
 import json
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Literal, Set, Tuple, TypedDict, Union
+from typing import (
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+)
 
 from multiformats import CID, multihash
 from sqlalchemy.orm.session import Session
@@ -26,7 +36,9 @@ from src.models.social.save import Save
 from src.models.social.subscription import Subscription
 from src.models.tracks.track import Track
 from src.models.tracks.track_route import TrackRoute
+from src.models.users.associated_wallet import AssociatedWallet
 from src.models.users.user import User
+from src.models.users.user_events import UserEvent
 from src.tasks.metadata import (
     playlist_metadata_format,
     track_metadata_format,
@@ -157,6 +169,63 @@ class EntitiesToFetchDict(TypedDict):
 MANAGE_ENTITY_EVENT_TYPE = "ManageEntity"
 
 
+class EntityManagerEvent:
+    """
+    A ManageEntity event decoded from its transaction receipt, with its
+    metadata parsed up front.
+
+    Events are decoded once per block and shared by collecting entities to
+    fetch and processing the event, so neither ABI decoding nor metadata
+    parsing is repeated.
+    """
+
+    __slots__ = (
+        "event",
+        "txhash",
+        "user_id",
+        "entity_id",
+        "entity_type",
+        "action",
+        "signer",
+        "raw_metadata",
+        "metadata",
+        "metadata_cid",
+        "metadata_error",
+        "json_metadata",
+    )
+
+    def __init__(self, event: AttributeDict, txhash: str):
+        self.event = event
+        self.txhash = txhash
+        self.user_id = helpers.get_tx_arg(event, "_userId")
+        self.entity_id = helpers.get_tx_arg(event, "_entityId")
+        self.entity_type: EntityTypeLiteral = helpers.get_tx_arg(event, "_entityType")
+        self.action = helpers.get_tx_arg(event, "_action")
+        self.signer = helpers.get_tx_arg(event, "_signer")
+        self.raw_metadata = helpers.get_tx_arg(event, "_metadata")
+
+        # Invalid metadata is only an error when the event is processed
+        self.metadata_error: Optional[IndexingValidationError] = None
+        try:
+            self.metadata, self.metadata_cid = parse_metadata(
+                self.raw_metadata, self.action, self.entity_type
+            )
+        except IndexingValidationError as e:
+            self.metadata, self.metadata_cid = None, None
+            self.metadata_error = e
+
+        # Developer app and grant metadata is plain json without a cid, None
+        # when it is invalid
+        self.json_metadata: Optional[Dict] = None
+        if self.entity_type in [EntityType.DEVELOPER_APP, EntityType.GRANT]:
+            try:
+                self.json_metadata = json.loads(self.raw_metadata)
+            except Exception as e:
+                utils_logger.info(
+                    f"entity_manager.py | utils.py | error deserializing metadata {self.raw_metadata}: {e}"
+                )
+
+
 class ManageEntityParameters:
     """
     A set of parameters for processing a single transactions.
@@ -173,7 +242,7 @@ class ManageEntityParameters:
         session: Session,
         redis,
         challenge_bus: ChallengeEventBus,
-        event: AttributeDict,
+        event: EntityManagerEvent,
         new_records: RecordDict,
         existing_records: ExistingRecordDict,
         pending_track_routes: List[TrackRoute],
@@ -186,11 +255,14 @@ class ManageEntityParameters:
         txhash: str,
         logger: StructuredLogger,
     ):
-        self.user_id = helpers.get_tx_arg(event, "_userId")
-        self.entity_id = helpers.get_tx_arg(event, "_entityId")
-        self.entity_type: EntityTypeLiteral = helpers.get_tx_arg(event, "_entityType")
-        self.action = helpers.get_tx_arg(event, "_action")
-        self.signer = helpers.get_tx_arg(event, "_signer")
+        if event.metadata_error:
+            raise event.metadata_error
+
+        self.user_id = event.user_id
+        self.entity_id = event.entity_id
+        self.entity_type: EntityTypeLiteral = event.entity_type
+        self.action = event.action
+        self.signer = event.signer
         self.block_datetime = datetime.utcfromtimestamp(block_timestamp)
         self.block_integer_time = int(block_timestamp)
 
@@ -202,10 +274,8 @@ class ManageEntityParameters:
         self.pending_track_routes = pending_track_routes
         self.pending_playlist_routes = pending_playlist_routes
 
-        self.event = event
-        self.metadata, self.metadata_cid = parse_metadata(
-            helpers.get_tx_arg(event, "_metadata"), self.action, self.entity_type
-        )
+        self.event = event.event
+        self.metadata, self.metadata_cid = event.metadata, event.metadata_cid
         self.block_number = block_number
         self.event_blockhash = event_blockhash
         self.txhash = txhash
@@ -366,6 +436,74 @@ def get_record_key(user_id: int, entity_type: str, entity_id: int):
     return (user_id, entity_type.capitalize(), entity_id)
 
 
+# Columns copy_record sets from the event instead of the old record
+copy_record_override_columns = frozenset(
+    ["is_current", "updated_at", "blocknumber", "blockhash", "txhash"]
+)
+
+
+class RecordMetadata:
+    """
+    Column names and flags of a model's table, computed once per model class.
+    """
+
+    __slots__ = (
+        "columns",
+        "columns_to_copy",
+        "has_is_current",
+        "has_updated_at",
+        "has_blocknumber",
+        "has_blockhash",
+        "has_txhash",
+    )
+
+    def __init__(self, model):
+        column_names = [str(column.key) for column in model.__table__.columns]
+        self.columns: FrozenSet[str] = frozenset(column_names)
+        self.columns_to_copy: Tuple[str, ...] = tuple(
+            name for name in column_names if name not in copy_record_override_columns
+        )
+        self.has_is_current = "is_current" in self.columns
+        self.has_updated_at = "updated_at" in self.columns
+        self.has_blocknumber = "blocknumber" in self.columns
+        self.has_blockhash = "blockhash" in self.columns
+        self.has_txhash = "txhash" in self.columns
+
+
+record_metadata_by_model: Dict[type, RecordMetadata] = {
+    model: RecordMetadata(model)
+    for model in [
+        AssociatedWallet,
+        DeveloperApp,
+        Follow,
+        Grant,
+        Notification,
+        NotificationSeen,
+        Playlist,
+        PlaylistRoute,
+        PlaylistSeen,
+        Repost,
+        Save,
+        Subscription,
+        Track,
+        TrackRoute,
+        User,
+        UserEvent,
+    ]
+}
+
+
+def get_record_metadata(record_or_model) -> RecordMetadata:
+    model = (
+        record_or_model if isinstance(record_or_model, type) else type(record_or_model)
+    )
+    record_metadata = record_metadata_by_model.get(model)
+    if not record_metadata:
+        record_metadata = RecordMetadata(model)
+        record_metadata_by_model[model] = record_metadata
+    return record_metadata
+
+
 def copy_record(
     old_record: Union[User, Track, Playlist, DeveloperApp, Grant],
     block_number: int,
@@ -373,21 +511,20 @@ def copy_record(
     txhash: str,
     block_datetime: datetime,
 ):
-    old_user_attributes = old_record.get_attributes_dict()
+    record_metadata = get_record_metadata(old_record)
     record_copy = type(old_record)()
-    for key, value in old_user_attributes.items():
-        if key == "is_current":
-            setattr(record_copy, key, False)
-        elif key == "updated_at":
-            setattr(record_copy, key, block_datetime)
-        elif key == "blocknumber":
-            setattr(record_copy, key, block_number)
-        elif key == "blockhash":
-            setattr(record_copy, key, event_blockhash)
-        elif key == "txhash":
-            setattr(record_copy, key, txhash)
-        else:
-            setattr(record_copy, key, value)
+    for key in record_metadata.columns_to_copy:
+        setattr(record_copy, key, getattr(old_record, key))
+    if record_metadata.has_is_current:
+        record_copy.is_current = False
+    if record_metadata.has_updated_at:
+        record_copy.updated_at = block_datetime
+    if record_metadata.has_blocknumber:
+        record_copy.blocknumber = block_number
+    if record_metadata.has_blockhash:
+        record_copy.blockhash = event_blockhash
+    if record_metadata.has_txhash:
+        record_copy.txhash = txhash
     return record_copy
 
 
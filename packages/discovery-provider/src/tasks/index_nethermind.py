@@ -2,15 +2,16 @@
 import concurrent.futures
 import copy
 import os
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Sequence, Tuple, TypedDict, cast
+from typing import Dict, List, Optional, Sequence, Set, Tuple, TypedDict, cast
 
 from hexbytes import HexBytes
 from redis import Redis
 from sqlalchemy.orm.session import Session
 from web3 import Web3
 from web3.exceptions import BlockNotFound
-from web3.types import BlockData, HexStr, TxReceipt
+from web3.types import BlockData, BlockNumber, HexStr, TxReceipt
 
 from src.challenges.challenge_event_bus import ChallengeEventBus
 from src.challenges.trending_challenge import should_trending_challenge_update
@@ -30,13 +31,22 @@ from src.models.tracks.track_route import TrackRoute
 from src.models.users.associated_wallet import AssociatedWallet
 from src.models.users.user import User
 from src.models.users.user_events import UserEvent
+from src.tasks.block_prefetcher import BlockPrefetcher
 from src.tasks.celery_app import celery
 from src.tasks.entity_manager.entity_manager import entity_manager_update
+from src.tasks.entity_manager.utils import get_record_metadata
 from src.tasks.sort_block_transactions import sort_block_transactions
 from src.utils import helpers, web3_provider
 from src.utils.constants import CONTRACT_TYPES
+from src.utils.entity_cache import invalidate_entity_caches, is_entity_cache_enabled
+from src.utils.feed_inbox import (
+    FeedInboxUpdates,
+    apply_feed_inbox_updates,
+    is_feed_inbox_enabled,
+)
 from src.utils.indexing_errors import NotAllTransactionsFetched
 from src.utils.redis_constants import (
+    latest_block_redis_key,
     most_recent_indexed_block_hash_redis_key,
     most_recent_indexed_block_redis_key,
 )
@@ -52,6 +62,14 @@ BLOCKS_PER_DAY = (24 * 60 * 60) / 5
 
 FINAL_POA_BLOCK = helpers.get_final_poa_block()
 
+# Number of blocks behind chain head before the indexer switches to catch-up mode
+# and applies a window of blocks per transaction instead of a single block
+CATCH_UP_MODE_BLOCKS_BEHIND = 10
+
+# Number of upcoming blocks (and their receipts) kept in flight while the
+# current block is written to the database
+BLOCK_PREFETCH_SIZE = 20
+
 
 logger = StructuredLogger(__name__)
 
@@ -90,6 +108,25 @@ class TxReceiptAndHash(TypedDict):
     tx_hash: str
 
 
+class BlockAndReceipts(TypedDict):
+    block: BlockData
+    tx_receipts: dict[str, TxReceipt]
+
+
+rpc_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def get_rpc_executor() -> concurrent.futures.ThreadPoolExecutor:
+    # pylint: disable=W0603
+    global rpc_executor
+    # Created lazily so no threads exist before celery forks its workers
+    if not rpc_executor:
+        rpc_executor = concurrent.futures.ThreadPoolExecutor(
+            thread_name_prefix="index_nethermind_rpc"
+        )
+    return rpc_executor
+
+
 def fetch_tx_receipt(tx_hash: HexBytes) -> TxReceiptAndHash:
     receipt = web3.eth.get_transaction_receipt(tx_hash)
     return {"tx_receipt": receipt, "tx_hash": tx_hash.hex()}
@@ -100,21 +137,20 @@ def fetch_tx_receipts(block: BlockData):
     # We fetch HexBytes rather than full TxData
     block_transactions = cast(Sequence[HexBytes], block["transactions"])
     block_tx_with_receipts: dict[str, TxReceipt] = {}
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future_to_tx_receipt = {
-            executor.submit(fetch_tx_receipt, tx): tx
-            for tx in (block_transactions or [])
-        }
-        for future in concurrent.futures.as_completed(future_to_tx_receipt):
-            tx = future_to_tx_receipt[future]
-            try:
-                tx_receipt_info = future.result()
-                tx_hash = tx_receipt_info["tx_hash"]
-                block_tx_with_receipts[tx_hash] = tx_receipt_info["tx_receipt"]
-            except Exception as exc:
-                logger.error(
-                    f"index_nethermind.py | fetch_tx_receipts {tx.hex()} generated {exc}"
-                )
+    executor = get_rpc_executor()
+    future_to_tx_receipt = {
+        executor.submit(fetch_tx_receipt, tx): tx for tx in (block_transactions or [])
+    }
+    for future in concurrent.futures.as_completed(future_to_tx_receipt):
+        tx = future_to_tx_receipt[future]
+        try:
+            tx_receipt_info = future.result()
+            tx_hash = tx_receipt_info["tx_hash"]
+            block_tx_with_receipts[tx_hash] = tx_receipt_info["tx_receipt"]
+        except Exception as exc:
+            logger.error(
+                f"index_nethermind.py | fetch_tx_receipts {tx.hex()} generated {exc}"
+            )
     num_processed_txs = len(block_tx_with_receipts.keys())
     num_submitted_txs = len(block_transactions)
     logger.debug(
@@ -166,6 +202,7 @@ def add_indexed_block_to_db(
 
     current_block.is_current = False
     session.add(block_model)
+    return block_model
 
 
 def add_indexed_block_to_redis(block: BlockData, redis: Redis):
@@ -177,6 +214,8 @@ def process_state_changes(
     session: Session,
     tx_type_to_grouped_lists_map: dict[str, List[TxReceipt]],
     block: BlockData,
+    changed_entity_ids: Dict[str, Set[int]],
+    feed_inbox_updates: Optional[FeedInboxUpdates] = None,
 ):
     block_number = block["number"]
     block_hash = block["hash"].hex()
@@ -191,12 +230,15 @@ def process_state_changes(
             block_number,
             block_timestamp,
             block_hash,
+            feed_inbox_updates,
         ]
 
         (
             total_changes_for_tx_type,
-            _,
+            changed_entity_ids_for_tx_type,
         ) = bulk_processor(*tx_processing_args)
+        for entity_type, entity_ids in changed_entity_ids_for_tx_type.items():
+            changed_entity_ids[entity_type].update(entity_ids)
 
         logger.info(
             f"{bulk_processor.__name__} completed"
@@ -204,6 +246,31 @@ def process_state_changes(
         )
 
 
+def get_latest_chain_block_number(web3: Web3, redis: Redis) -> int:
+    """
+    Gets the chain head as last cached by index_latest_block, falling back to
+    the node if the cached value has expired.
+    """
+    latest_block_number = redis.get(latest_block_redis_key)
+    if latest_block_number is not None:
+        return int(latest_block_number)
+    return web3.eth.block_number + (FINAL_POA_BLOCK or 0)
+
+
+def get_block_window_size(blocks_behind: int, max_window_size: int) -> int:
+    """
+    Number of blocks to index in a single transaction.
+
+    At the head of the chain blocks are indexed one at a time. The further the
+    database is behind the chain head, the more blocks are applied per task run,
+    up to `max_window_size`.
+    """
+    if blocks_behind <= CATCH_UP_MODE_BLOCKS_BEHIND:
+        return 1
+    window_size = blocks_behind // CATCH_UP_MODE_BLOCKS_BEHIND
+    return max(1, min(window_size, max_window_size))
+
+
 def get_latest_database_block(session: Session) -> Block:
     """
     Gets the latest block in the database.
@@ -250,38 +317,87 @@ def get_next_block(web3: Web3, latest_database_block: Block, final_poa_block=0):
         return False
 
 
+def fetch_block_and_receipts(block_number: int) -> Optional[BlockAndReceipts]:
+    """
+    Fetches a block by its indexed (final POA adjusted) number along with its
+    transaction receipts. Returns None if the block is not on chain yet.
+    """
+    try:
+        block_immutable = web3.eth.get_block(block_number - (FINAL_POA_BLOCK or 0))
+    except BlockNotFound:
+        return None
+    # Copy the immutable attribute dict to a mutable dict
+    block: BlockData = cast(BlockData, dict(block_immutable))
+    block["number"] = BlockNumber(block["number"] + (FINAL_POA_BLOCK or 0))
+    return {"block": block, "tx_receipts": fetch_tx_receipts(block)}
+
+
+block_prefetcher: BlockPrefetcher[BlockAndReceipts] = BlockPrefetcher(
+    fetch_block_and_receipts, BLOCK_PREFETCH_SIZE, "index_nethermind_prefetch"
+)
+
+
 def get_relevant_blocks(
-    web3: Web3, latest_database_block: Block, final_poa_block=0
-) -> Tuple[BlockData | bool, BlockData | bool]:
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        is_block_on_chain_future = executor.submit(
-            is_block_on_chain, web3, latest_database_block
-        )
-        next_block_future = executor.submit(
-            get_next_block, web3, latest_database_block, final_poa_block
+    web3: Web3,
+    latest_database_block: Block,
+    final_poa_block=0,
+    latest_chain_block_number: Optional[int] = None,
+) -> Tuple[BlockData | bool, Optional[BlockAndReceipts]]:
+    """
+    Returns whether the latest database block is still valid on chain, along
+    with the next block to index and its receipts from the prefetcher.
+    """
+    if latest_database_block.number is None:
+        logger.info(f"Block number invalid {latest_database_block}, returning early")
+        return False, None
+
+    is_block_on_chain_future = get_rpc_executor().submit(
+        is_block_on_chain, web3, latest_database_block
+    )
+    next_block_number = latest_database_block.number + 1
+
+    def is_child_of_latest_database_block(next_block: Optional[BlockAndReceipts]):
+        return (
+            not next_block
+            or latest_database_block.number == 0
+            or web3.to_hex(next_block["block"]["parentHash"])
+            == latest_database_block.blockhash
         )
 
-        block_on_chain = is_block_on_chain_future.result()
-        next_block = next_block_future.result()
+    next_block = block_prefetcher.get(next_block_number, latest_chain_block_number)
+    if not is_child_of_latest_database_block(next_block):
+        # The prefetched block may belong to a fork that has since been
+        # abandoned, so refetch before deciding to revert
+        block_prefetcher.clear()
+        next_block = block_prefetcher.get(next_block_number, latest_chain_block_number)
 
-        if (
-            next_block
-            and web3.to_hex(next_block["parentHash"]) != latest_database_block.blockhash
-            and latest_database_block.number != 0
-        ):
-            block_on_chain = False
+    block_on_chain = is_block_on_chain_future.result()
+    if not next_block:
+        logger.info(f"Block not found {next_block_number}, returning early")
+    elif not is_child_of_latest_database_block(next_block):
+        block_on_chain = False
 
-        return block_on_chain, next_block
+    return block_on_chain, next_block
 
 
 @log_duration(logger)
 def index_next_block(
-    session: Session, latest_database_block: Block, next_block: BlockData
-):
+    session: Session,
+    latest_database_block: Block,
+    next_block: BlockData,
+    changed_entity_ids: Dict[str, Set[int]],
+    tx_receipt_dict: Optional[dict[str, TxReceipt]] = None,
+    feed_inbox_updates: Optional[FeedInboxUpdates] = None,
+) -> Block:
     """
     Given the latest block in the database, index forward one block.
+    Returns the newly indexed block, which is now the current block.
+    Ids of the entities it changes are added to `changed_entity_ids`.
+
+    Challenge events are left queued on the challenge event bus, feed inbox
+    changes are added to `feed_inbox_updates` and the redis indexed block is
+    not updated, the caller does all three once the session has committed.
     """
-    redis = index_nethermind.redis
     shared_config = index_nethermind.shared_config
     next_block_number = next_block["number"]
     logger.set_context("block", next_block_number)
@@ -291,92 +407,146 @@ def index_next_block(
         or 0
     )
 
-    challenge_bus: ChallengeEventBus = index_nethermind.challenge_event_bus
-    with challenge_bus.use_scoped_dispatch_queue():
-        txs_grouped_by_type: dict[str, List[TxReceipt]] = {
-            ENTITY_MANAGER: [],
-        }
-        try:
-            """
-            Fetch transaction receipts
-            """
+    txs_grouped_by_type: dict[str, List[TxReceipt]] = {
+        ENTITY_MANAGER: [],
+    }
+    try:
+        """
+        Fetch transaction receipts if they were not prefetched
+        """
+        if tx_receipt_dict is None:
             tx_receipt_dict = fetch_tx_receipts(next_block)
 
-            """
-            Parse transaction receipts
-            """
-            sorted_txs = sort_block_transactions(
-                next_block,
-                tx_receipt_dict.values(),
-                indexing_transaction_index_sort_order_start_block,
-            )
-            logger.set_context("tx_count", len(sorted_txs))
-
-            # Parse tx events in each block
-            for tx in sorted_txs:
-                tx_hash = tx["transactionHash"].hex()
-                tx_receipt = tx_receipt_dict[tx_hash]
-                contract_type = get_contract_type_for_tx(
-                    txs_grouped_by_type, tx, tx_receipt
-                )
-                if contract_type:
-                    txs_grouped_by_type[contract_type].append(tx_receipt)
-
-            """
-            Add block to db
-            """
-            add_indexed_block_to_db(session, next_block, latest_database_block)
-
-            """
-            Add state changes in block to db (users, tracks, etc.)
-            """
-            # bulk process operations once all tx's for block have been parsed
-            # and get changed entity IDs for cache clearing
-            # after session commit
-            process_state_changes(
-                session,
-                txs_grouped_by_type,
-                next_block,
+        """
+        Parse transaction receipts
+        """
+        sorted_txs = sort_block_transactions(
+            next_block,
+            list(tx_receipt_dict.values()),
+            indexing_transaction_index_sort_order_start_block,
+        )
+        logger.set_context("tx_count", len(sorted_txs))
+
+        # Parse tx events in each block
+        for tx in sorted_txs:
+            tx_hash = tx["transactionHash"].hex()
+            tx_receipt = tx_receipt_dict[tx_hash]
+            contract_type = get_contract_type_for_tx(
+                txs_grouped_by_type, tx, tx_receipt
             )
+            if contract_type:
+                txs_grouped_by_type[contract_type].append(tx_receipt)
+
+        """
+        Add block to db
+        """
+        indexed_block = add_indexed_block_to_db(
+            session, next_block, latest_database_block
+        )
 
-        except NotAllTransactionsFetched as e:
-            raise e
-        try:
-            # Only dispatch trending challenge computation on a similar block, modulo 100
-            # so things are consistent. Note that if a discovery node is behind, this will be
-            # inconsistent.
-            # TODO: Consider better alternatives for consistency with behind nodes. Maybe this
-            # should not be calculated.
-            if next_block["number"] % 100 == 0:
-                # Check the last block's timestamp for updating the trending challenge
-                [should_update, date] = should_trending_challenge_update(
-                    session, next_block["timestamp"]
-                )
-                if should_update:
-                    celery.send_task(
-                        "calculate_trending_challenges", kwargs={"date": date}
-                    )
-        except Exception as e:
-            # Do not throw error, as this should not stop indexing
-            logger.error(
-                f"Error in calling update trending challenge {e}",
-                exc_info=True,
+        """
+        Add state changes in block to db (users, tracks, etc.)
+        """
+        # bulk process operations once all tx's for block have been parsed
+        # and get changed entity IDs for cache clearing
+        # after session commit
+        process_state_changes(
+            session,
+            txs_grouped_by_type,
+            next_block,
+            changed_entity_ids,
+            feed_inbox_updates,
+        )
+
+    except NotAllTransactionsFetched as e:
+        raise e
+    try:
+        # Only dispatch trending challenge computation on a similar block, modulo 100
+        # so things are consistent. Note that if a discovery node is behind, this will be
+        # inconsistent.
+        # TODO: Consider better alternatives for consistency with behind nodes. Maybe this
+        # should not be calculated.
+        if next_block["number"] % 100 == 0:
+            # Check the last block's timestamp for updating the trending challenge
+            [should_update, date] = should_trending_challenge_update(
+                session, next_block["timestamp"]
             )
-        try:
-            # Every 100 blocks, poll and apply delist statuses from trusted notifier
-            if next_block["number"] % 100 == 0:
-                celery.send_task(
-                    "update_delist_statuses",
-                    kwargs={"current_block_timestamp": next_block["timestamp"]},
-                )
-        except Exception as e:
-            # Do not throw error, as this should not stop indexing
-            logger.error(
-                f"Error in calling update_delist_statuses {e}",
-                exc_info=True,
+            if should_update:
+                celery.send_task("calculate_trending_challenges", kwargs={"date": date})
+    except Exception as e:
+        # Do not throw error, as this should not stop indexing
+        logger.error(
+            f"Error in calling update trending challenge {e}",
+            exc_info=True,
+        )
+    try:
+        # Every 100 blocks, poll and apply delist statuses from trusted notifier
+        if next_block["number"] % 100 == 0:
+            celery.send_task(
+                "update_delist_statuses",
+                kwargs={"current_block_timestamp": next_block["timestamp"]},
             )
+    except Exception as e:
+        # Do not throw error, as this should not stop indexing
+        logger.error(
+            f"Error in calling update_delist_statuses {e}",
+            exc_info=True,
+        )
+
+    return indexed_block
+
+
+def index_blocks(
+    session: Session,
+    latest_database_block: Block,
+    window_size: int,
+    changed_entity_ids: Dict[str, Set[int]],
+    latest_chain_block_number: Optional[int] = None,
+    feed_inbox_updates: Optional[FeedInboxUpdates] = None,
+):
+    """
+    Index up to `window_size` blocks forward from the latest database block in
+    the given session. Each block keeps its own Block and RevertBlock rows, so a
+    window can be reverted block by block like any other.
+
+    Returns the number of blocks indexed, whether a block was reverted and the
+    last block indexed. Ids of the entities changed or reverted are added to
+    `changed_entity_ids`.
+    """
+    num_blocks_indexed = 0
+    last_indexed_block: Optional[BlockData] = None
+    while num_blocks_indexed < window_size:
+        in_valid_state, next_block = get_relevant_blocks(
+            web3, latest_database_block, FINAL_POA_BLOCK, latest_chain_block_number
+        )
+        if not next_block:
+            break
+
+        if not in_valid_state:
+            # Only revert at the start of a window. If a reorg is detected
+            # mid-window, commit the blocks indexed so far and let the next run
+            # revert from the new current block.
+            if num_blocks_indexed == 0:
+                revert_block(session, latest_database_block, changed_entity_ids)
+                # Prefetched blocks may belong to the reverted fork
+                block_prefetcher.clear()
+                return 0, True, None
+            break
+
+        latest_database_block = index_next_block(
+            session,
+            latest_database_block,
+            next_block["block"],
+            changed_entity_ids,
+            next_block["tx_receipts"],
+            feed_inbox_updates,
+        )
+        last_indexed_block = next_block["block"]
+        num_blocks_indexed += 1
+        # Flush so the next block in the window reads this block's state
+        session.flush()
 
-    add_indexed_block_to_redis(next_block, redis)
+    return num_blocks_indexed, False, last_indexed_block
 
 
 def get_block(web3: Web3, blocknumber: int, final_poa_block=0):
@@ -411,8 +581,40 @@ def revert_delist_cursors(session: Session, revert_block_parent_hash: str):
         )
 
 
+def add_reverted_entity_ids(
+    session: Session,
+    revert_block_number: int,
+    revert_block_record: Optional[RevertBlock],
+    changed_entity_ids: Dict[str, Set[int]],
+):
+    """Adds the ids of the cached entities a revert changes to `changed_entity_ids`."""
+    prev_records: Dict[str, List[Dict]] = (
+        dict(revert_block_record.prev_records) if revert_block_record else {}
+    )
+    for record_type, id_column, blocknumber_column in [
+        ("Track", Track.track_id, Track.blocknumber),
+        ("User", User.user_id, User.blocknumber),
+        ("Playlist", Playlist.playlist_id, Playlist.blocknumber),
+    ]:
+        # rows written in the reverted block are cascade deleted
+        entity_ids = (
+            session.query(id_column)
+            .filter(blocknumber_column == revert_block_number)
+            .all()
+        )
+        changed_entity_ids[record_type].update(entity_id for entity_id, in entity_ids)
+        id_key = id_column.key
+        for json_record in prev_records.get(record_type, []):
+            if id_key in json_record:
+                changed_entity_ids[record_type].add(json_record[id_key])
+
+
 @log_duration(logger)
-def revert_block(session: Session, block_to_revert: Block):
+def revert_block(
+    session: Session,
+    block_to_revert: Block,
+    changed_entity_ids: Optional[Dict[str, Set[int]]] = None,
+):
     start_time = datetime.now()
 
     # Cache relevant information about current block
@@ -488,6 +690,11 @@ def revert_block(session: Session, block_to_revert: Block):
         logger.info(f"Reverting playlist route {playlist_route_to_revert}")
         session.delete(playlist_route_to_revert)
 
+    if changed_entity_ids is not None and revert_block_number is not None:
+        add_reverted_entity_ids(
+            session, revert_block_number, revert_block_record, changed_entity_ids
+        )
+
     # delete block record and cascade delete from tables ^
     session.query(Block).filter(Block.blockhash == revert_hash).delete()
     if not revert_block_record:
@@ -503,9 +710,10 @@ def revert_block(session: Session, block_to_revert: Block):
                 # skip playlist/track routes reverts
                 continue
             Model = model_mapping[record_type]
+            columns = get_record_metadata(Model).columns
             # filter out unnecessary keys
             filtered_json_record = {
-                k: v for k, v in json_record.items() if k in Model.__table__.columns  # type: ignore
+                k: v for k, v in json_record.items() if k in columns
             }
             revert_records.append(Model(**filtered_json_record))
     # Remove outdated block entry
@@ -533,28 +741,64 @@ def index_nethermind(self):
         logger.disable()
         return
 
+    max_window_size = int(
+        index_nethermind.shared_config["discprov"]["block_processing_window"] or 1
+    )
+    nothing_to_index = False
+    changed_entity_ids: Dict[str, Set[int]] = defaultdict(set)
+    challenge_bus: ChallengeEventBus = index_nethermind.challenge_event_bus
+    feed_inbox_updates = FeedInboxUpdates() if is_feed_inbox_enabled() else None
     try:
-        with db.scoped_session() as session:
-            latest_database_block = get_latest_database_block(session)
-
-            in_valid_state, next_block = get_relevant_blocks(
-                web3, latest_database_block, FINAL_POA_BLOCK
-            )
-            if not next_block:
-                # Nothing to index
-                logger.disable()
-                update_lock.release()
-                # Send the task with a small amount of sleep to free up cycles
-                celery.send_task(
-                    "index_nethermind", countdown=0.5, queue="index_nethermind"
+        try:
+            with db.scoped_session() as session:
+                latest_database_block = get_latest_database_block(session)
+
+                latest_chain_block_number = get_latest_chain_block_number(web3, redis)
+                window_size = 1
+                if max_window_size > 1:
+                    blocks_behind = (
+                        latest_chain_block_number - latest_database_block.number
+                    )
+                    window_size = get_block_window_size(blocks_behind, max_window_size)
+                    logger.set_context("window_size", window_size)
+
+                num_blocks_indexed, reverted, last_indexed_block = index_blocks(
+                    session,
+                    latest_database_block,
+                    window_size,
+                    changed_entity_ids,
+                    latest_chain_block_number,
+                    feed_inbox_updates,
                 )
-                return
-
-            if in_valid_state:
-                index_next_block(session, latest_database_block, next_block)
-            else:
-                revert_block(session, latest_database_block)
+                nothing_to_index = not num_blocks_indexed and not reverted
+                if nothing_to_index:
+                    logger.disable()
+        except Exception:
+            # The whole window was rolled back, so none of its challenge
+            # events happened
+            challenge_bus.clear()
+            raise
+        # dispatch challenge events and advance the redis indexed block once
+        # the window has committed, so a failed window is not seen as indexed
+        challenge_bus.flush()
+        if last_indexed_block:
+            add_indexed_block_to_redis(last_indexed_block, redis)
+        # invalidate once the session has committed so readers cannot
+        # re-cache the previous state
+        if changed_entity_ids and is_entity_cache_enabled():
+            invalidate_entity_caches(redis, changed_entity_ids)
+        if feed_inbox_updates:
+            try:
+                with db.scoped_session() as session:
+                    apply_feed_inbox_updates(session, redis, feed_inbox_updates)
+            except Exception as e:
+                # inboxes are only a read optimization, never fail indexing on them
+                logger.error(f"Error updating feed inboxes {e}", exc_info=True)
     except Exception as e:
         logger.error(f"Error in indexing blocks {e}", exc_info=True)
     update_lock.release()
+    if nothing_to_index:
+        # Send the task with a small amount of sleep to free up cycles
+        celery.send_task("index_nethermind", countdown=0.5, queue="index_nethermind")
+        return
     celery.send_task("index_nethermind", queue="index_nethermind")
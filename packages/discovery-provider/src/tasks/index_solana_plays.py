@@ -1,19 +1,41 @@
 import concurrent.futures
 import json
 import logging
+import queue
+import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Tuple, TypedDict, Union, cast
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import base58
 from redis import Redis
 from solders.pubkey import Pubkey
-from solders.rpc.responses import RpcConfirmedTransactionStatusWithSignature
+from solders.rpc.responses import (
+    GetTransactionResp,
+    RpcConfirmedTransactionStatusWithSignature,
+)
+from solders.signature import Signature
 from solders.transaction import Transaction
 from sqlalchemy import desc
+from sqlalchemy.orm.session import Session
 
 from src.challenges.challenge_event import ChallengeEvent
 from src.challenges.challenge_event_bus import ChallengeEventBus
+from src.models.indexing.indexing_checkpoints import IndexingCheckpoint
 from src.models.social.play import Play
 from src.solana.constants import FETCH_TX_SIGNATURES_BATCH_SIZE
 from src.solana.solana_client_manager import SolanaClientManager
@@ -31,12 +53,15 @@ from src.utils.redis_constants import (
     latest_sol_play_program_tx_key,
     latest_sol_plays_slot_key,
 )
+from src.utils.session_manager import SessionManager
+from src.utils.update_indexing_checkpoints import save_indexed_checkpoint
 
 TRACK_LISTEN_PROGRAM = shared_config["solana"]["track_listen_count_address"]
 SIGNER_GROUP = shared_config["solana"]["signer_group_address"]
 SECP_PROGRAM = "KeccakSecp256k11111111111111111111111111111"
 
-REDIS_TX_CACHE_QUEUE_PREFIX = "plays-tx-cache-queue"
+# indexing_checkpoints row with the slot and signature of the last processed tx
+SOLANA_PLAYS_CHECKPOINT = "solana_plays"
 
 # Number of signatures that are fetched from RPC and written at once
 # For example, in a batch of 1000 only 100 will be fetched and written in parallel
@@ -44,6 +69,22 @@ REDIS_TX_CACHE_QUEUE_PREFIX = "plays-tx-cache-queue"
 TX_SIGNATURES_PROCESSING_SIZE = 100
 INITIAL_FETCH_SIZE = 30
 
+# Number of workers fetching transactions from RPC
+TX_FETCH_WORKERS = 16
+# Number of transactions each worker fetches in one JSON-RPC batch request
+TX_FETCH_CHUNK_SIZE = 25
+# Seconds to wait on a chunk of transactions before requesting it again
+TX_FETCH_TIMEOUT_SEC = 45
+TX_FETCH_MAX_RETRIES = 3
+# Batches of signatures buffered ahead of the transaction fetchers
+MAX_QUEUED_BATCHES = 20
+# Batches whose transactions are fetched concurrently, written in order
+MAX_IN_FLIGHT_BATCHES = 3
+
+# (slot, signature) of the last processed transaction
+PlaysCheckpoint = Tuple[int, Optional[str]]
+T = TypeVar("T")
+
 logger = logging.getLogger(__name__)
 
 """
@@ -166,15 +207,8 @@ def is_valid_tx(account_keys):
     return False
 
 
-def parse_sol_play_transaction(solana_client_manager: SolanaClientManager, tx_sig: str):
+def parse_sol_play_transaction(tx_info: GetTransactionResp, tx_sig: str):
     try:
-        fetch_start_time = time.time()
-        tx_info = solana_client_manager.get_sol_tx_info(tx_sig)
-        fetch_completion_time = time.time()
-        fetch_time = fetch_completion_time - fetch_start_time
-        logger.info(
-            f"index_solana_plays.py | Got transaction: {tx_sig} in {fetch_time}"
-        )
         if not tx_info.value:
             return None
         transaction = tx_info.value.transaction
@@ -242,35 +276,48 @@ def parse_sol_play_transaction(solana_client_manager: SolanaClientManager, tx_si
         raise e
 
 
-# Query the highest traversed solana slot
-def get_latest_slot(db):
-    latest_slot = None
-    with db.scoped_session() as session:
-        highest_slot_query = (
-            session.query(Play)
-            .filter(Play.slot != None)
-            .filter(Play.signature != None)
-            .order_by(desc(Play.slot))
-        ).first()
-        # Can be None prior to first write operations
-        if highest_slot_query is not None:
-            latest_slot = highest_slot_query.slot
+def fetch_sol_play_transactions(
+    solana_client_manager: SolanaClientManager, tx_sigs: List[str]
+):
+    """Fetches a chunk of transactions and returns the parsed play of each, in order."""
+    fetch_start_time = time.time()
+    tx_infos = solana_client_manager.get_transactions(tx_sigs)
+    logger.info(
+        f"index_solana_plays.py | Got {len(tx_infos)} transactions in {time.time() - fetch_start_time}"
+    )
+    return [parse_sol_play_transaction(tx_infos[tx_sig], tx_sig) for tx_sig in tx_sigs]
 
+
+# Query the highest traversed solana slot
+def get_latest_slot(session: Session) -> int:
+    highest_slot_query = (
+        session.query(Play.slot)
+        .filter(Play.slot != None)
+        .filter(Play.signature != None)
+        .order_by(desc(Play.slot))
+    ).first()
+    latest_slot = highest_slot_query[0] if highest_slot_query else None
     # If no slots have yet been recorded, assume all are valid
     if latest_slot is None:
         latest_slot = 0
-
     logger.info(f"index_solana_plays.py | returning {latest_slot} for highest slot")
     return latest_slot
 
 
-# Query a tx signature and confirm its existence
-def get_tx_in_db(session, tx_sig):
-    exists = False
-    tx_sig_db_count = (session.query(Play).filter(Play.signature == tx_sig)).count()
-    exists = tx_sig_db_count > 0
-    logger.info(f"index_solana_plays.py | {tx_sig} exists={exists}")
-    return exists
+def get_plays_checkpoint(session: Session) -> PlaysCheckpoint:
+    """
+    Returns the slot and signature of the newest processed transaction.
+    Falls back to the highest slot in the plays table, whose transactions may
+    then be traversed again and are skipped when written.
+    """
+    checkpoint = (
+        session.query(IndexingCheckpoint.last_checkpoint, IndexingCheckpoint.signature)
+        .filter(IndexingCheckpoint.tablename == SOLANA_PLAYS_CHECKPOINT)
+        .first()
+    )
+    if checkpoint:
+        return checkpoint[0], checkpoint[1]
+    return get_latest_slot(session), None
 
 
 # pylint: disable=W0105
@@ -285,265 +332,267 @@ Each transaction here is signed by a trusted ethereum address authorized within
 protocol.
 
 Monitoring the address is performed by leveraging the `get_signatures_for_address`
-function, which accepts 'limit' and 'before' parameters which are key to the logic below.
-This function returns tx signatures processed by the programId in confirmation order,
-with the most recently confirmed returned first.
-
-For example, if there are 1000 transactions and we request with a limit of 1000, the returned
-array will have the following format:
-[1000th, 999th, ..., 3rd, 2nd, 1]
-
-This indexing logic leverages the above to monitor the 'slots' for each transaction, based on
-the highest value currently stored in the discovery database and comparing that with the slots
-of the latest returned transactions until an intersection is explicitly found between the two.
-
-In the startup case, where there are no DB records present an intersection is considered 'found'
-when there are no records remaining - indicating that we have reached the end of the transaction
-history for this particular programId.
-
-For example, given the following state:
-
-latest_processed_slot = 200 <- latest slot stored in database
+function, which accepts 'limit' and 'before' parameters and returns tx signatures
+processed by the programId in confirmation order, most recently confirmed first.
+
+Transactions are processed oldest first so that listen events reach the challenge bus
+in order, as a pipeline:
+
+1. The signature pager walks back from the most recent transaction until it reaches the
+   checkpoint, the slot and signature of the last processed transaction. Only the first
+   page and the 'before' cursor of every older page are kept in memory, so a large
+   backlog is not buffered.
+2. The pages are then fetched again from oldest to newest in a background thread and
+   split into batches of TX_SIGNATURES_PROCESSING_SIZE on a bounded queue. Finalized
+   history does not change so each page is fetched exactly as it was first seen.
+3. The transactions of each batch are fetched by a fixed pool of workers in chunks of
+   TX_FETCH_CHUNK_SIZE, one JSON-RPC batch request per chunk with its own timeout,
+   while the following batches are already in flight.
+4. Batches are written in order. The plays of a batch are inserted together with the
+   checkpoint of its newest transaction, so a restart resumes right after the last
+   written batch instead of starting over from the chain tail.
+
+For example, given the checkpoint slot=200, sig201 and the following history:
+
+[sig300 slot=230, ..., sig250 slot=210] <- first page, kept in memory
+[sig249 slot=209, ..., sig202 slot=201, sig201 slot=200] <- page before sig250
+
+the pager stops at sig201, and sig202 through sig300 are processed oldest first.
+"""
 
-last_tx_signature = None <- None by design, as we must start querying the most recent chain
-transactions
 
-transactions_history = get_signatures_for_address(before=None) =
-[
-    sig300, slot=230,
-    sig299, slot=230
-    sig298, slot=229
-    ...
-    sig250, slot=210
-]
-Since no intersection has been found, the above is loaded as a single 'batch' into an array of
-tx_signature batches that now has the following state:
+def is_checkpoint_reached(
+    tx: RpcConfirmedTransactionStatusWithSignature, checkpoint: PlaysCheckpoint
+) -> bool:
+    checkpoint_slot, checkpoint_signature = checkpoint
+    return tx.slot < checkpoint_slot or str(tx.signature) == checkpoint_signature
 
-tx_batches = [batch_300_to_250]
 
-Now, last_tx_signature = sig250
-transactions_history = get_signatures_for_address(before=None) =
-[
-    sig250, slot=210
-    sig249, slot=209
-    sig248, slot=209
-    ...
-    sig202, slot=201
-    sig201, slot=200 <-- slot intersection
-]
+def get_unprocessed_txs(
+    txs: List[RpcConfirmedTransactionStatusWithSignature],
+    checkpoint: PlaysCheckpoint,
+) -> List[RpcConfirmedTransactionStatusWithSignature]:
+    """Returns the transactions of a page newer than the checkpoint."""
+    unprocessed_txs = []
+    for tx in txs:
+        if is_checkpoint_reached(tx, checkpoint):
+            break
+        unprocessed_txs.append(tx)
+    return unprocessed_txs
 
-Here, we continue storing each transaction in a new 'batch' array until a tx with a
-slot equal to the latest_processed_slot is found - in this case, 200.
 
-Additionally, once an equivalent slot is found we explicitly validate that sig201 is present in
-the local DB - if not, processing continues until an explicit signature + slot intersection is
-found or no history is remaining
+def get_signature_pages(
+    solana_client_manager: SolanaClientManager, checkpoint: PlaysCheckpoint
+) -> Tuple[List[RpcConfirmedTransactionStatusWithSignature], List[Signature]]:
+    """
+    Walks back from the most recent transaction to the checkpoint.
+    Returns the unprocessed transactions of the first page, newest first, and
+    the 'before' cursors of the older pages with unprocessed transactions,
+    oldest page first.
+    """
+    head_txs = solana_client_manager.get_signatures_for_address(
+        TRACK_LISTEN_PROGRAM, before=None, limit=INITIAL_FETCH_SIZE
+    ).value
+    unprocessed_head_txs = get_unprocessed_txs(head_txs, checkpoint)
+
+    cursors: List[Signature] = []
+    txs, unprocessed_txs = head_txs, unprocessed_head_txs
+    while len(txs) == len(unprocessed_txs) and txs:
+        cursor = txs[-1].signature
+        txs = solana_client_manager.get_signatures_for_address(
+            TRACK_LISTEN_PROGRAM,
+            before=cursor,
+            limit=FETCH_TX_SIGNATURES_BATCH_SIZE,
+        ).value
+        unprocessed_txs = get_unprocessed_txs(txs, checkpoint)
+        if unprocessed_txs:
+            cursors.append(cursor)
+        logger.info(
+            f"index_solana_plays.py | Found {len(unprocessed_txs)} unprocessed transactions before {cursor}"
+        )
 
-At this point, tx_batches = [batch_300_to_250, batch_250_to_200]
+    cursors.reverse()
+    return unprocessed_head_txs, cursors
 
-tx_batches is reversed in order to apply the oldest transactions first - as follows:
 
-tx_batches = [batch_250_to_200, batch_300_to_250]
+def get_signature_batches(
+    solana_client_manager: SolanaClientManager,
+    checkpoint: PlaysCheckpoint,
+    head_txs: List[RpcConfirmedTransactionStatusWithSignature],
+    cursors: List[Signature],
+) -> Iterator[List[RpcConfirmedTransactionStatusWithSignature]]:
+    """Yields the unprocessed transactions in batches, oldest first."""
+    for cursor in cursors:
+        txs = solana_client_manager.get_signatures_for_address(
+            TRACK_LISTEN_PROGRAM,
+            before=cursor,
+            limit=FETCH_TX_SIGNATURES_BATCH_SIZE,
+        ).value
+        unprocessed_txs = get_unprocessed_txs(txs, checkpoint)
+        unprocessed_txs.reverse()
+        yield from split_list(unprocessed_txs, TX_SIGNATURES_PROCESSING_SIZE)
+    yield from split_list(head_txs[::-1], TX_SIGNATURES_PROCESSING_SIZE)
 
-Each batch is then processed in parallel and committed to the local database.
 
-It is important to note that we also limit the maximum size of tx_batches to ensure that this array
-does not grow unbounded over time and new discovery providers are able to safely recover all information.
-This is performed by simply slicing the tx_batches array and discarding the newest transactions until an intersection
-is found - these limiting parameters are defined as TX_SIGNATURES_MAX_BATCHES, TX_SIGNATURES_RESIZE_LENGTH
-"""
+def iterate_in_background(iterable: Iterable[T], max_size: int) -> Iterator[T]:
+    """
+    Consumes `iterable` in a background thread, buffering at most `max_size`
+    items. Errors raised by the iterable are raised to the caller.
+    """
+    items: "queue.Queue[Tuple[bool, Any]]" = queue.Queue(maxsize=max_size)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((False, item)):
+                    return
+            put((True, None))
+        except Exception as e:
+            put((True, e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            is_done, item = items.get()
+            if is_done:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stopped.set()
 
 
-def parse_sol_tx_batch(
-    db, solana_client_manager, redis, tx_sig_batch_records, retries=10
+def get_play_results(
+    executor: concurrent.futures.ThreadPoolExecutor,
+    solana_client_manager: SolanaClientManager,
+    tx_sig_chunks: List[List[str]],
+    futures: List[concurrent.futures.Future],
 ):
     """
-    Parse a batch of solana transactions in parallel by calling parse_sol_play_transaction
-    with a ThreaPoolExecutor
-
-    This function also has a recursive retry upto a certain limit in case a future doesn't complete
-    within the alloted time. It clears the futures thread queue and the batch is retried
+    Waits on the parsed transactions of a batch in order. A chunk of
+    transactions that times out is requested again up to TX_FETCH_MAX_RETRIES
+    times.
     """
-    batch_start_time = time.time()
-    challenge_bus_events = []
-    plays = []
-
-    # Last record in this batch to be cached
-    # Important to note that the batch records are in time DESC order
-    last_tx_in_batch = tx_sig_batch_records[0]
-    challenge_bus = index_solana_plays.challenge_event_bus
-
-    # Process each batch in parallel
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        parse_sol_tx_futures = {
-            executor.submit(
-                parse_sol_play_transaction,
-                solana_client_manager,
-                tx_sig,
-            ): tx_sig
-            for tx_sig in tx_sig_batch_records
-        }
-        try:
-            for future in concurrent.futures.as_completed(
-                parse_sol_tx_futures, timeout=45
-            ):
-                # Returns the properties for a Play object to be created in the db
-                # can be None so check the value exists
-                result = future.result()
-                if result:
-                    (
-                        user_id,
-                        track_id,
-                        created_at,
-                        source,
-                        location,
-                        slot,
-                        tx_sig,
-                    ) = result
-
-                    # Append plays to a list that will be written if all plays are successfully retrieved
-                    # from the rpc pool
-                    play: PlayInfo = {
-                        "user_id": user_id,
-                        "play_item_id": track_id,
-                        "created_at": created_at,
-                        "updated_at": datetime.now(),
-                        "source": source,
-                        "city": location.get("city"),
-                        "region": location.get("region"),
-                        "country": location.get("country"),
-                        "slot": slot,
-                        "signature": tx_sig,
-                    }
-                    plays.append(play)
-                    # Only enqueue a challenge event if it's *not*
-                    # an anonymous listen
-                    if user_id is not None:
-                        challenge_bus_events.append(
-                            {
-                                "slot": slot,
-                                "user_id": user_id,
-                                "created_at": created_at.timestamp(),
-                            }
-                        )
-
-        except Exception as exc:
-            logger.error(
-                f"index_solana_plays.py | Error parsing sol play transaction: {exc}"
-            )
-            # timeout in a ThreadPoolExecutor doesn't actually stop execution of the underlying thread
-            # in order to do that we need to actually clear the queue which we do here to force this
-            # task to stop execution
-            executor._threads.clear()
-            concurrent.futures.thread._threads_queues.clear()
-
-            # if we have retries left, recursively call this function again
-            if retries > 0:
-                return parse_sol_tx_batch(
-                    db, solana_client_manager, redis, tx_sig_batch_records, retries - 1
+    results = []
+    for tx_sigs, future in zip(tx_sig_chunks, futures):
+        retries = TX_FETCH_MAX_RETRIES
+        while True:
+            try:
+                results.extend(future.result(timeout=TX_FETCH_TIMEOUT_SEC))
+                break
+            except concurrent.futures.TimeoutError:
+                if retries == 0:
+                    raise
+                logger.warning(
+                    f"index_solana_plays.py | Timed out fetching {len(tx_sigs)} transactions, retrying"
                 )
+                retries -= 1
+                future = executor.submit(
+                    fetch_sol_play_transactions, solana_client_manager, tx_sigs
+                )
+    return results
 
-            # if no more retries, raise
-            raise exc
-
-        # if the thread pool executor completes successfully without raising an exception
-        # the data is successfully fetched so we can add it to the db session and dispatch
-        # events to challenge bus
-
-    # In the case where an entire batch is comprised of errors, wipe the cache to avoid a future find intersection loop
-    # For example, if the transactions between the latest cached value and database tail are entirely errors, no Play record will be inserted.
-    # This means every subsequent run will continue to no-op on error transactions and the cache will never be updated
-    if tx_sig_batch_records and not plays:
-        logger.info("index_solana_plays.py | Clearing redis cache")
-        redis.delete(REDIS_TX_CACHE_QUEUE_PREFIX)
 
-    # Cache the latest play from this batch
-    # This reflects the ordering from chain
-    for play in plays:
-        if play.get("signature") == last_tx_in_batch:
-            most_recent_db_play = {
-                "signature": play.get("signature"),
-                "slot": play.get("slot"),
-                "timestamp": int(play.get("created_at").timestamp()),
+def save_play_batch(
+    db: SessionManager,
+    redis: Redis,
+    txs: List[RpcConfirmedTransactionStatusWithSignature],
+    results,
+):
+    """
+    Inserts the plays of a batch, skipping transactions that were already
+    indexed, and advances the checkpoint to the newest transaction of the batch.
+    """
+    plays: List[PlayInfo] = []
+    for result in results:
+        # None for transactions that are not plays
+        if not result:
+            continue
+        (
+            user_id,
+            track_id,
+            created_at,
+            source,
+            location,
+            slot,
+            tx_sig,
+        ) = result
+        plays.append(
+            {
+                "user_id": user_id,
+                "play_item_id": track_id,
+                "created_at": created_at,
+                "updated_at": datetime.now(),
+                "source": source,
+                "city": location.get("city"),
+                "region": location.get("region"),
+                "country": location.get("country"),
+                "slot": slot,
+                "signature": tx_sig,
             }
-            cache_latest_sol_play_db_tx(redis, most_recent_db_play)
-            break
+        )
 
+    last_tx = txs[-1]
     db_save_start = time.time()
-    logger.info(
-        f"index_solana_plays.py | DB | Saving test to DB, fetched batch tx details in {db_save_start - batch_start_time}"
-    )
-
-    if plays:
-        with db.scoped_session() as session:
-            logger.info(
-                f"index_solana_plays.py | DB | Acquired session in {time.time() - db_save_start}"
-            )
-            session_execute_start = time.time()
+    with db.scoped_session() as session:
+        if plays:
+            indexed_signatures = {
+                signature
+                for (signature,) in session.query(Play.signature).filter(
+                    Play.signature.in_([play["signature"] for play in plays])
+                )
+            }
+            plays = [
+                play for play in plays if play["signature"] not in indexed_signatures
+            ]
+        if plays:
             # Save in bulk
             session.execute(Play.__table__.insert().values(plays))
-            logger.info(
-                f"index_solana_plays.py | DB | Session execute completed in {time.time() - session_execute_start}"
-            )
-
-        logger.info(
-            f"index_solana_plays.py | DB | Saved to DB in {time.time() - db_save_start}"
-        )
-
-        logger.info("index_solana_plays.py | Dispatching listen events")
-        listen_dispatch_start = time.time()
-        for event in challenge_bus_events:
-            challenge_bus.dispatch(
-                ChallengeEvent.track_listen,
-                event.get("slot"),
-                event.get("user_id"),
-                {"created_at": event.get("created_at")},
-            )
-        listen_dispatch_end = time.time()
-        listen_dispatch_diff = listen_dispatch_end - listen_dispatch_start
-        logger.info(
-            f"index_solana_plays.py | Dispatched listen events in {listen_dispatch_diff}"
+        save_indexed_checkpoint(
+            session, SOLANA_PLAYS_CHECKPOINT, last_tx.slot, str(last_tx.signature)
         )
-
-    batch_end_time = time.time()
-    batch_duration = batch_end_time - batch_start_time
     logger.info(
-        f"index_solana_plays.py | processed batch {len(tx_sig_batch_records)} txs in {batch_duration}s"
+        f"index_solana_plays.py | DB | Saved {len(plays)} plays up to slot {last_tx.slot} in {time.time() - db_save_start}"
     )
-    return None
-
+    redis.set(latest_sol_plays_slot_key, last_tx.slot)
 
-# Push to head of array containing seen transactions
-# Used to avoid re-traversal from chain tail when slot diff > certain number
-def cache_traversed_tx(redis: Redis, tx: RpcConfirmedTransactionStatusWithSignature):
-    redis.lpush(REDIS_TX_CACHE_QUEUE_PREFIX, tx.to_json())
+    if not plays:
+        return
 
+    # Cache the latest play from this batch
+    latest_play = plays[-1]
+    cache_latest_sol_play_db_tx(
+        redis,
+        {
+            "signature": latest_play["signature"],
+            "slot": latest_play["slot"],
+            "timestamp": int(latest_play["created_at"].timestamp()),
+        },
+    )
 
-# Fetch the cached transaction from redis queue
-# Eliminates transactions one by one if they are < latest db slot
-def fetch_traversed_tx_from_cache(redis: Redis, latest_db_slot: int):
-    cached_offset_tx_found = False
-    while not cached_offset_tx_found:
-        last_cached_tx_raw = redis.lrange(REDIS_TX_CACHE_QUEUE_PREFIX, 0, 1)
-        if last_cached_tx_raw:
-            last_cached_tx = RpcConfirmedTransactionStatusWithSignature.from_json(
-                last_cached_tx_raw[0].decode()
-            )
-            logger.info(
-                f"index_solana_plays.py | processing cached tx = {last_cached_tx}, latest_db_slot = {latest_db_slot}"
+    # Only dispatch a challenge event if it's *not* an anonymous listen
+    challenge_bus = index_solana_plays.challenge_event_bus
+    for play in plays:
+        if play["user_id"] is not None:
+            challenge_bus.dispatch(
+                ChallengeEvent.track_listen,
+                play["slot"],
+                play["user_id"],
+                {"created_at": play["created_at"].timestamp()},
             )
-            redis.ltrim(REDIS_TX_CACHE_QUEUE_PREFIX, 1, -1)
-            # If a single element is remaining, clear the list to avoid dupe processing
-            if redis.llen(REDIS_TX_CACHE_QUEUE_PREFIX) == 1:
-                redis.delete(REDIS_TX_CACHE_QUEUE_PREFIX)
-            # Return if a valid signature is found
-            if last_cached_tx.slot > latest_db_slot:
-                cached_offset_tx_found = True
-                last_tx_signature = last_cached_tx.signature
-                return last_tx_signature
-        else:
-            break
-    return None
+    # Keep the dispatch queue bounded while working through a backlog
+    challenge_bus.flush()
 
 
 def process_solana_plays(solana_client_manager: SolanaClientManager, redis: Redis):
@@ -558,130 +607,68 @@ def process_solana_plays(solana_client_manager: SolanaClientManager, redis: Redi
 
     db = index_solana_plays.db
 
-    # Highest currently processed slot in the DB
-    latest_processed_slot = get_latest_slot(db)
-    logger.info(f"index_solana_plays.py | latest used slot: {latest_processed_slot}")
-
-    # Utilize the cached tx to offset
-    cached_offset_tx = fetch_traversed_tx_from_cache(redis, latest_processed_slot)
-
-    # The 'before' value from where we start querying transactions
-    last_tx_signature = cached_offset_tx
-
-    # Loop exit condition
-    intersection_found = False
-
-    # List of signatures that will be populated as we traverse recent operations
-    transaction_signatures = []
-
-    # Current batch of transactions
-    transaction_signature_batch = []
-
-    # Current batch
-    page_count = 0
-
-    # The last transaction processed
-    last_tx = None
-
-    # The latest play slot to be processed
-    latest_play_slot = None
-    is_initial_fetch = True
+    with db.scoped_session() as session:
+        checkpoint = get_plays_checkpoint(session)
+    logger.info(f"index_solana_plays.py | checkpoint: {checkpoint}")
 
     # Get the latests slot available globally before fetching txs to keep track of indexing progress
+    latest_global_slot = None
     try:
         latest_global_slot = solana_client_manager.get_slot()
     except:
         logger.error("index_solana_plays.py | Failed to get block height")
 
-    # Traverse recent records until an intersection is found with existing Plays table
-    while not intersection_found:
-        fetch_size = (
-            INITIAL_FETCH_SIZE if is_initial_fetch else FETCH_TX_SIGNATURES_BATCH_SIZE
-        )
-        logger.info(
-            f"index_solana_plays.py | Requesting {fetch_size} transactions before {last_tx_signature}"
-        )
-        transactions_history = solana_client_manager.get_signatures_for_address(
-            TRACK_LISTEN_PROGRAM, before=last_tx_signature, limit=fetch_size
-        )
-        is_initial_fetch = False
-        transactions_array = transactions_history.value
-        if not transactions_array:
-            # This is considered an 'intersection' since there are no further transactions to process but
-            # really represents the end of known history for this ProgramId
-            intersection_found = True
+    head_txs, cursors = get_signature_pages(solana_client_manager, checkpoint)
+    if not head_txs:
+        if latest_global_slot is not None:
             logger.info(
-                f"index_solana_plays.py | No transactions found before {last_tx_signature}"
+                f"index_solana_plays.py | Setting latest plays slot as the latest global slot {latest_global_slot}"
             )
-        else:
-            with db.scoped_session() as read_session:
-                for tx in transactions_array:
-                    tx_sig = str(tx.signature)
-                    slot = tx.slot
-                    if tx.slot > latest_processed_slot:
-                        transaction_signature_batch.append(tx_sig)
-                    elif tx.slot <= latest_processed_slot:
-                        # Check the tx signature for any txs in the latest batch,
-                        # and if not present in DB, add to processing
-                        logger.info(
-                            f"index_solana_plays.py | Latest slot re-traversal\
-                            slot={slot}, sig={tx_sig},\
-                            latest_processed_slot(db)={latest_processed_slot}"
-                        )
-                        exists = get_tx_in_db(read_session, tx_sig)
-                        if exists:
-                            # Exit loop and set terminal condition since this tx has been found in DB
-                            # Transactions are returned with most recently committed first, so we can assume
-                            # subsequent transactions in this batch have already been processed
-                            intersection_found = True
-                            break
-                        # Otherwise, ensure this transaction is still processed
-                        transaction_signature_batch.append(tx_sig)
-                # Restart processing at the end of this transaction signature batch
-
-                # get latest play slot from the first fetch
-                if transaction_signature_batch and not latest_play_slot:
-                    latest_play_slot = transactions_array[0].slot
-
-                last_tx = transactions_array[-1]
-                last_tx_signature = last_tx.signature
-
-                # Append to recently seen cache
-                cache_traversed_tx(redis, last_tx)
-
-                # Append batch of processed signatures
-                if transaction_signature_batch:
-                    transaction_signatures.append(transaction_signature_batch)
-
-                # Reset batch state
-                transaction_signature_batch = []
-
-        logger.info(
-            f"index_solana_plays.py | intersection_found={intersection_found},\
-            last_tx_signature={last_tx_signature},\
-            page_count={page_count}"
-        )
-        page_count = page_count + 1
-
-    transaction_signatures.reverse()
-
-    for tx_sig_batch in transaction_signatures:
-        for tx_sig_batch_records in split_list(
-            tx_sig_batch, TX_SIGNATURES_PROCESSING_SIZE
-        ):
-            parse_sol_tx_batch(db, solana_client_manager, redis, tx_sig_batch_records)
+            redis.set(latest_sol_plays_slot_key, latest_global_slot)
+        return
 
-    if latest_play_slot:
-        logger.info(
-            f"index_solana_plays.py | Setting latest plays slot {latest_play_slot}"
-        )
-        redis.set(latest_sol_plays_slot_key, latest_play_slot)
+    logger.info(
+        f"index_solana_plays.py | Processing {len(cursors)} pages and {len(head_txs)} transactions up to slot {head_txs[0].slot}"
+    )
+    batches = iterate_in_background(
+        get_signature_batches(solana_client_manager, checkpoint, head_txs, cursors),
+        MAX_QUEUED_BATCHES,
+    )
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=TX_FETCH_WORKERS
+    ) as executor:
+        in_flight: Deque = deque()
+
+        def save_next_batch():
+            txs, tx_sig_chunks, futures = in_flight.popleft()
+            batch_start_time = time.time()
+            results = get_play_results(
+                executor, solana_client_manager, tx_sig_chunks, futures
+            )
+            save_play_batch(db, redis, txs, results)
+            logger.info(
+                f"index_solana_plays.py | processed batch {len(txs)} txs in {time.time() - batch_start_time}s"
+            )
 
-    elif latest_global_slot is not None:
-        logger.info(
-            f"index_solana_plays.py | Setting latest plays slot as the latest global slot {latest_global_slot}"
-        )
-        redis.set(latest_sol_plays_slot_key, latest_global_slot)
+        try:
+            for txs in batches:
+                tx_sigs = [str(tx.signature) for tx in txs]
+                tx_sig_chunks = list(split_list(tx_sigs, TX_FETCH_CHUNK_SIZE))
+                futures = [
+                    executor.submit(
+                        fetch_sol_play_transactions, solana_client_manager, chunk
+                    )
+                    for chunk in tx_sig_chunks
+                ]
+                in_flight.append((txs, tx_sig_chunks, futures))
+                if len(in_flight) >= MAX_IN_FLIGHT_BATCHES:
+                    save_next_batch()
+            while in_flight:
+                save_next_batch()
+        finally:
+            for _, _, futures in in_flight:
+                for future in futures:
+                    future.cancel()
 
 
 @celery.task(name="index_solana_plays", bind=True)
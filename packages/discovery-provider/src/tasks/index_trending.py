@@ -34,8 +34,11 @@ from src.utils.prometheus_metric import (
     PrometheusMetricNames,
     save_duration_metric,
 )
-from src.utils.redis_cache import set_json_cached_key
-from src.utils.redis_constants import trending_tracks_last_completion_redis_key
+from src.utils.redis_cache import set_list_cached_key
+from src.utils.redis_constants import (
+    trending_scores_last_full_rebuild_redis_key,
+    trending_tracks_last_completion_redis_key,
+)
 from src.utils.session_manager import SessionManager
 from src.utils.web3_provider import get_web3
 
@@ -46,6 +49,11 @@ time_ranges = ["week", "month", "year"]
 UPDATE_TRENDING_DURATION_DIFF_SEC = int(
     shared_config["discprov"]["trending_refresh_seconds"]
 )
+# Time in seconds between full rebuilds of track_trending_scores, other
+# updates only write the scores that changed
+TRENDING_SCORES_FULL_REBUILD_SEC = int(
+    shared_config["discprov"]["trending_scores_full_rebuild_seconds"]
+)
 
 
 def get_genres(session: Session) -> List[str]:
@@ -81,6 +89,21 @@ def update_view(session: Session, mat_view_name: str):
     )
 
 
+def get_trending_scores_rebuild_key(strategy) -> str:
+    return f"{trending_scores_last_full_rebuild_redis_key}:{strategy.trending_type.name}:{strategy.version.name}"
+
+
+def should_rebuild_trending_scores(redis: Redis, strategy) -> bool:
+    last_rebuild = redis.get(get_trending_scores_rebuild_key(strategy))
+    if not last_rebuild:
+        return True
+    return time.time() - int(last_rebuild) >= TRENDING_SCORES_FULL_REBUILD_SEC
+
+
+def set_last_trending_scores_rebuild(redis: Redis, strategy):
+    redis.set(get_trending_scores_rebuild_key(strategy), int(time.time()))
+
+
 def index_trending(self, db: SessionManager, redis: Redis, timestamp):
     logger.info("index_trending.py | starting indexing")
     update_start = time.time()
@@ -102,7 +125,10 @@ def index_trending(self, db: SessionManager, redis: Redis, timestamp):
                 TrendingType.TRACKS, version
             )
             if strategy.use_mat_view:
-                strategy.update_track_score_query(session)
+                full_rebuild = should_rebuild_trending_scores(redis, strategy)
+                strategy.update_track_score_query(session, full_rebuild)
+                if full_rebuild:
+                    set_last_trending_scores_rebuild(redis, strategy)
 
         for version in trending_track_versions:
             strategy = trending_strategy_factory.get_strategy(
@@ -126,7 +152,7 @@ def index_trending(self, db: SessionManager, redis: Redis, timestamp):
                             strategy=strategy,
                         )
                     key = make_trending_tracks_cache_key(time_range, genre, version)
-                    set_json_cached_key(redis, key, res)
+                    set_list_cached_key(redis, key, res[0], "track_id")
                     cache_end_time = time.time()
                     total_time = cache_end_time - cache_start_time
                     logger.info(
@@ -145,7 +171,7 @@ def index_trending(self, db: SessionManager, redis: Redis, timestamp):
             cache_start_time = time.time()
             res = make_get_unpopulated_tracks(session, redis, strategy)()
             key = make_underground_trending_cache_key(version)
-            set_json_cached_key(redis, key, res)
+            set_list_cached_key(redis, key, res[0], "track_id")
             cache_end_time = time.time()
             total_time = cache_end_time - cache_start_time
             logger.info(
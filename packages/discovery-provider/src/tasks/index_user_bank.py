@@ -1,4 +1,3 @@
-import concurrent.futures
 import re
 import time
 from datetime import datetime
@@ -17,7 +16,6 @@ from sqlalchemy.orm.session import Session
 
 from src.challenges.challenge_event import ChallengeEvent
 from src.challenges.challenge_event_bus import ChallengeEventBus
-from src.exceptions import SolanaTransactionFetchError
 from src.models.tracks.track_price_history import TrackPriceHistory
 from src.models.users.audio_transactions_history import (
     AudioTransactionsHistory,
@@ -764,17 +762,6 @@ def process_user_bank_tx_details(
         )
 
 
-def get_sol_tx_info(
-    solana_client_manager: SolanaClientManager,
-    tx_sig: str,
-):
-    try:
-        tx_info = solana_client_manager.get_sol_tx_info(tx_sig)
-        return (tx_info, tx_sig)
-    except SolanaTransactionFetchError:
-        return None
-
-
 def process_user_bank_txs() -> None:
     solana_client_manager: SolanaClientManager = index_user_bank.solana_client_manager
     challenge_bus: ChallengeEventBus = index_user_bank.challenge_event_bus
@@ -888,24 +875,14 @@ def process_user_bank_txs() -> None:
             batch_start_time = time.time()
 
             tx_infos: List[Tuple[GetTransactionResp, str]] = []
-            with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-                parse_sol_tx_futures = {
-                    executor.submit(
-                        get_sol_tx_info,
-                        solana_client_manager,
-                        str(tx_sig),
-                    ): tx_sig
-                    for tx_sig in tx_sig_batch
-                }
-                for future in concurrent.futures.as_completed(parse_sol_tx_futures):
-                    try:
-                        tx_info = future.result()
-                        if not tx_info:
-                            continue
-                        tx_infos.append(tx_info)
-                    except Exception as exc:
-                        logger.error(f"index_user_bank.py | error {exc}", exc_info=True)
-                        raise
+            fetched_tx_infos = solana_client_manager.get_transactions(tx_sig_batch)
+            for tx_sig in tx_sig_batch:
+                tx_info = fetched_tx_infos[tx_sig]
+                meta = tx_info.value.transaction.meta if tx_info.value else None
+                # Skip failed transactions
+                if meta and meta.err:
+                    continue
+                tx_infos.append((tx_info, tx_sig))
 
             # Sort by slot
             # Note: while it's possible (even likely) to have multiple tx in the same slot,
@@ -0,0 +1,97 @@
+import logging
+import time
+
+from sqlalchemy import text
+
+from src.tasks.celery_app import celery
+from src.utils.prometheus_metric import save_duration_metric
+from src.utils.redis_constants import notification_unread_counts_reconcile_cursor_key
+
+logger = logging.getLogger(__name__)
+
+# Number of users whose counts are recomputed per run, a full pass over all
+# users takes (number of users / batch size) runs
+RECONCILE_BATCH_SIZE = 1000
+
+get_user_ids_query = text(
+    """
+    SELECT
+        user_id
+    FROM
+        users
+    WHERE
+        is_current IS TRUE
+        AND user_id > :cursor
+    ORDER BY
+        user_id ASC
+    LIMIT :limit;
+    """
+)
+
+recount_query = text(
+    "SELECT recount_notification_unread_counts(CAST(:user_ids AS integer[]));"
+)
+
+
+def _reconcile_notification_unread_counts(
+    session, redis, batch_size=RECONCILE_BATCH_SIZE
+):
+    """
+    Recomputes the unread notification counts of the next batch of users,
+    repairing counts that drifted from the notification table. Walks through
+    all users and starts over once it reaches the end.
+    Returns the number of counts that were repaired.
+    """
+    cursor = int(redis.get(notification_unread_counts_reconcile_cursor_key) or 0)
+    user_ids = [
+        row[0]
+        for row in session.execute(
+            get_user_ids_query, {"cursor": cursor, "limit": batch_size}
+        )
+    ]
+    if not user_ids:
+        logger.info(
+            "reconcile_notification_unread_counts.py | Finished a pass over all users"
+        )
+        redis.delete(notification_unread_counts_reconcile_cursor_key)
+        return 0
+
+    changed_count = session.execute(recount_query, {"user_ids": user_ids}).scalar()
+    redis.set(notification_unread_counts_reconcile_cursor_key, user_ids[-1])
+    return changed_count
+
+
+# ####### CELERY TASKS ####### #
+@celery.task(name="reconcile_notification_unread_counts", bind=True)
+@save_duration_metric(metric_group="celery_task")
+def reconcile_notification_unread_counts(self):
+    db = reconcile_notification_unread_counts.db
+    redis = reconcile_notification_unread_counts.redis
+    # Define lock acquired boolean
+    have_lock = False
+    # Define redis lock object
+    update_lock = redis.lock("reconcile_notification_unread_counts_lock", timeout=3600)
+    try:
+        # Attempt to acquire lock - do not block if unable to acquire
+        have_lock = update_lock.acquire(blocking=False)
+        if have_lock:
+            start_time = time.time()
+            with db.scoped_session() as session:
+                changed_count = _reconcile_notification_unread_counts(session, redis)
+
+            logger.info(
+                f"reconcile_notification_unread_counts.py | Repaired {changed_count} counts in: {time.time()-start_time} sec"
+            )
+        else:
+            logger.info(
+                "reconcile_notification_unread_counts.py | Failed to acquire lock"
+            )
+    except Exception as e:
+        logger.error(
+            "reconcile_notification_unread_counts.py | Fatal error in main loop",
+            exc_info=True,
+        )
+        raise e
+    finally:
+        if have_lock:
+            update_lock.release()
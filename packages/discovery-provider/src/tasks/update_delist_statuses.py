@@ -11,6 +11,7 @@ from src.models.users.user import User
 from src.tasks.celery_app import celery
 from src.utils.auth_helpers import signed_get
 from src.utils.config import shared_config
+from src.utils.entity_cache import invalidate_entity_caches, is_entity_cache_enabled
 from src.utils.prometheus_metric import save_duration_metric
 from src.utils.structured_logger import StructuredLogger, log_duration
 
@@ -298,7 +299,8 @@ def update_delist_status_cursor(
 
 def process_user_delist_statuses(
     session: Session, resp: Dict, endpoint: str, current_block_timestamp: int
-):
+) -> Set[int]:
+    """Returns the ids of the users whose delist statuses were applied"""
     # Expect users in resp to be sorted by createdAt asc
     users = resp["result"]["users"]
     if len(users) > 0:
@@ -315,15 +317,18 @@ def process_user_delist_statuses(
                 logger.info(
                     f"update_delist_statuses.py | processed {len(users_updated)} user delist statuses: {users_updated}"
                 )
+                return {user["user_id"] for user in users_updated}
         except Exception as e:
             logger.error(
                 f"update_delist_statuses.py | exception while processing user delists: {e}"
             )
+    return set()
 
 
 def process_track_delist_statuses(
     session: Session, resp: Dict, endpoint: str, current_block_timestamp: int
-):
+) -> Set[int]:
+    """Returns the ids of the tracks whose delist statuses were applied"""
     # Expect tracks in resp to be sorted by createdAt asc
     tracks = resp["result"]["tracks"]
     if len(tracks) > 0:
@@ -340,15 +345,22 @@ def process_track_delist_statuses(
                 logger.info(
                     f"update_delist_statuses.py | processed {len(tracks_updated)} track delist statuses: {tracks_updated}"
                 )
+                return {track["track_id"] for track in tracks_updated}
         except Exception as e:
             logger.error(
                 f"update_delist_statuses.py | exception while processing track delists: {e}"
             )
+    return set()
 
 
 def process_delist_statuses(
     session: Session, trusted_notifier_endpoint: str, current_block_timestamp: int
-):
+) -> Dict[str, Set[int]]:
+    """
+    Applies new delist statuses from the trusted notifier and returns the ids
+    of the users and tracks updated, keyed by entity type.
+    """
+    changed_entity_ids: Dict[str, Set[int]] = {"User": set(), "Track": set()}
     for entity in (DelistEntity.USERS, DelistEntity.TRACKS):
         poll_more_endpoint = f"{trusted_notifier_endpoint}statuses/{entity.lower()}?batchSize={DELIST_BATCH_SIZE}"
         cursor_before = (
@@ -370,13 +382,14 @@ def process_delist_statuses(
         resp.raise_for_status()
 
         if entity == DelistEntity.USERS:
-            process_user_delist_statuses(
+            changed_entity_ids["User"] = process_user_delist_statuses(
                 session, resp.json(), trusted_notifier_endpoint, current_block_timestamp
             )
         elif entity == DelistEntity.TRACKS:
-            process_track_delist_statuses(
+            changed_entity_ids["Track"] = process_track_delist_statuses(
                 session, resp.json(), trusted_notifier_endpoint, current_block_timestamp
             )
+    return changed_entity_ids
 
 
 def get_trusted_notifier_endpoint(trusted_notifier_manager: Dict):
@@ -512,9 +525,13 @@ def update_delist_statuses(self, current_block_timestamp: int) -> None:
                 trusted_notifier_endpoint = get_trusted_notifier_endpoint(
                     trusted_notifier_manager
                 )
-                process_delist_statuses(
+                changed_entity_ids = process_delist_statuses(
                     session, trusted_notifier_endpoint, current_block_timestamp
                 )
+            # invalidate once the session has committed so readers cannot
+            # re-cache the previous state
+            if is_entity_cache_enabled():
+                invalidate_entity_caches(redis, changed_entity_ids)
 
         except Exception as e:
             logger.error(
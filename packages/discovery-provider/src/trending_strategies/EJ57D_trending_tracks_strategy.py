@@ -1,5 +1,4 @@
 import logging
-import time
 from datetime import datetime
 
 from dateutil.parser import parse
@@ -10,6 +9,7 @@ from src.trending_strategies.trending_type_and_version import (
     TrendingType,
     TrendingVersion,
 )
+from src.utils.prometheus_metric import PrometheusMetric, PrometheusMetricNames
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +50,130 @@ def z(time, track):
     return {"score": H * Q, **track}
 
 
+insert_track_scores_query = """
+    INSERT INTO track_trending_scores
+        (track_id, genre, type, version, time_range, score, created_at)
+"""
+
+week_score_query = """
+    select
+        tp.track_id,
+        tp.genre,
+        :type,
+        :version,
+        :week_time_range,
+        CASE
+        WHEN tp.owner_follower_count < :y
+            THEN 0
+        WHEN EXTRACT(DAYS from now() - aip.created_at) > :week
+            THEN greatest(1.0/:q, pow(:q, greatest(-10, 1.0 - 1.0*EXTRACT(DAYS from now() - aip.created_at)/:week))) * (:N * aip.week_listen_counts + :F * tp.repost_week_count + :O * tp.save_week_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
+        ELSE (:N * aip.week_listen_counts + :F * tp.repost_week_count + :O * tp.save_week_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
+        END as week_score,
+        now()
+    from trending_params tp
+    inner join aggregate_interval_plays aip
+        on tp.track_id = aip.track_id
+"""
+
+month_score_query = """
+    select
+        tp.track_id,
+        tp.genre,
+        :type,
+        :version,
+        :month_time_range,
+        CASE
+        WHEN tp.owner_follower_count < :y
+            THEN 0
+        WHEN EXTRACT(DAYS from now() - aip.created_at) > :month
+            THEN greatest(1.0/:q, pow(:q, greatest(-10, 1.0 - 1.0*EXTRACT(DAYS from now() - aip.created_at)/:month))) * (:N * aip.month_listen_counts + :F * tp.repost_month_count + :O * tp.save_month_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
+        ELSE (:N * aip.month_listen_counts + :F * tp.repost_month_count + :O * tp.save_month_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
+        END as month_score,
+        now()
+    from trending_params tp
+    inner join aggregate_interval_plays aip
+        on tp.track_id = aip.track_id
+"""
+
+all_time_score_query = """
+    select
+        tp.track_id,
+        tp.genre,
+        :type,
+        :version,
+        :all_time_time_range,
+        CASE
+        WHEN tp.owner_follower_count < :y
+            THEN 0
+        ELSE (:N * ap.count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
+        END as all_time_score,
+        now()
+    from trending_params tp
+    inner join aggregate_plays ap
+        on tp.track_id = ap.play_item_id
+    inner join tracks t
+        on ap.play_item_id = t.track_id
+    where -- same filtering for aggregate_interval_plays
+        t.is_current is True AND
+        t.is_delete is False AND
+        t.is_unlisted is False AND
+        t.stem_of is Null
+"""
+
+delete_track_scores_query = """
+    DELETE FROM track_trending_scores WHERE type=:type AND version=:version
+"""
+
+# Unchanged scores are not rewritten so that they do not leave dead tuples
+upsert_track_scores_clause = """
+    ON CONFLICT (track_id, type, version, time_range)
+    DO UPDATE SET
+        genre = EXCLUDED.genre,
+        score = EXCLUDED.score,
+        created_at = EXCLUDED.created_at
+    WHERE
+        track_trending_scores.score IS DISTINCT FROM EXCLUDED.score OR
+        track_trending_scores.genre IS DISTINCT FROM EXCLUDED.genre
+"""
+
+delete_stale_interval_scores_query = """
+    DELETE FROM track_trending_scores tts
+    WHERE
+        tts.type = :type AND
+        tts.version = :version AND
+        tts.time_range IN (:week_time_range, :month_time_range) AND
+        NOT EXISTS (
+            select 1
+            from trending_params tp
+            inner join aggregate_interval_plays aip
+                on tp.track_id = aip.track_id
+            where tp.track_id = tts.track_id
+        )
+"""
+
+delete_stale_all_time_scores_query = """
+    DELETE FROM track_trending_scores tts
+    WHERE
+        tts.type = :type AND
+        tts.version = :version AND
+        tts.time_range = :all_time_time_range AND
+        NOT EXISTS (
+            select 1
+            from trending_params tp
+            inner join aggregate_plays ap
+                on tp.track_id = ap.play_item_id
+            inner join tracks t
+                on ap.play_item_id = t.track_id
+            where
+                tp.track_id = tts.track_id AND
+                t.is_current is True AND
+                t.is_delete is False AND
+                t.is_unlisted is False AND
+                t.stem_of is Null
+        )
+"""
+
+
 class TrendingTracksStrategyEJ57D(BaseTrendingStrategy):
     def __init__(self):
         super().__init__(TrendingType.TRACKS, TrendingVersion.EJ57D, True)
@@ -59,104 +183,72 @@ class TrendingTracksStrategyEJ57D(BaseTrendingStrategy):
             f"get_track_score not implemented for Trending Tracks Strategy with version {TrendingVersion.EJ57D}"
         )
 
-    def update_track_score_query(self, session):
-        start_time = time.time()
-        trending_track_query = text(
-            """
-            begin;
-                DELETE FROM track_trending_scores WHERE type=:type AND version=:version;
-                INSERT INTO track_trending_scores
-                    (track_id, genre, type, version, time_range, score, created_at)
-                    select
-                        tp.track_id,
-                        tp.genre,
-                        :type,
-                        :version,
-                        :week_time_range,
-                        CASE
-                        WHEN tp.owner_follower_count < :y
-                            THEN 0
-                        WHEN EXTRACT(DAYS from now() - aip.created_at) > :week
-                            THEN greatest(1.0/:q, pow(:q, greatest(-10, 1.0 - 1.0*EXTRACT(DAYS from now() - aip.created_at)/:week))) * (:N * aip.week_listen_counts + :F * tp.repost_week_count + :O * tp.save_week_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
-                        ELSE (:N * aip.week_listen_counts + :F * tp.repost_week_count + :O * tp.save_week_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
-                        END as week_score,
-                        now()
-                    from trending_params tp
-                    inner join aggregate_interval_plays aip
-                        on tp.track_id = aip.track_id;
-                INSERT INTO track_trending_scores
-                    (track_id, genre, type, version, time_range, score, created_at)
-                    select
-                        tp.track_id,
-                        tp.genre,
-                        :type,
-                        :version,
-                        :month_time_range,
-                        CASE
-                        WHEN tp.owner_follower_count < :y
-                            THEN 0
-                        WHEN EXTRACT(DAYS from now() - aip.created_at) > :month
-                            THEN greatest(1.0/:q, pow(:q, greatest(-10, 1.0 - 1.0*EXTRACT(DAYS from now() - aip.created_at)/:month))) * (:N * aip.month_listen_counts + :F * tp.repost_month_count + :O * tp.save_month_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
-                        ELSE (:N * aip.month_listen_counts + :F * tp.repost_month_count + :O * tp.save_month_count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
-                        END as month_score,
-                        now()
-                    from trending_params tp
-                    inner join aggregate_interval_plays aip
-                        on tp.track_id = aip.track_id;
-                INSERT INTO track_trending_scores
-                    (track_id, genre, type, version, time_range, score, created_at)
-                    select
-                        tp.track_id,
-                        tp.genre,
-                        :type,
-                        :version,
-                        :all_time_time_range,
-                        CASE
-                        WHEN tp.owner_follower_count < :y
-                            THEN 0
-                        ELSE (:N * ap.count + :R * tp.repost_count + :i * tp.save_count) * tp.karma
-                        END as all_time_score,
-                        now()
-                    from trending_params tp
-                    inner join aggregate_plays ap
-                        on tp.track_id = ap.play_item_id
-                    inner join tracks t
-                        on ap.play_item_id = t.track_id
-                    where -- same filtering for aggregate_interval_plays
-                        t.is_current is True AND
-                        t.is_delete is False AND
-                        t.is_unlisted is False AND
-                        t.stem_of is Null;
-            commit;
+    def update_track_score_query(self, session, full_rebuild=True):
         """
+        Updates track_trending_scores from the trending_params and
+        aggregate_interval_plays views.
+
+        A full rebuild deletes and re-inserts every score for the strategy.
+        Otherwise scores are upserted and only rows whose score or genre
+        changed are written, and scores of tracks no longer in the views are
+        deleted, which keeps the table from churning on every run.
+        """
+        metric = PrometheusMetric(
+            PrometheusMetricNames.UPDATE_TRENDING_SCORES_DURATION_SECONDS
         )
-        session.execute(
-            trending_track_query,
-            {
-                "week": T["week"],
-                "month": T["month"],
-                "N": N,
-                "F": F,
-                "O": O,
-                "R": R,
-                "i": i,
-                "q": q,
-                "y": y,
-                "type": self.trending_type.name,
-                "version": self.version.name,
-                "week_time_range": "week",
-                "month_time_range": "month",
-                "all_time_time_range": "allTime",
-            },
-        )
-        duration = time.time() - start_time
+        params = {
+            "week": T["week"],
+            "month": T["month"],
+            "N": N,
+            "F": F,
+            "O": O,
+            "R": R,
+            "i": i,
+            "q": q,
+            "y": y,
+            "type": self.trending_type.name,
+            "version": self.version.name,
+            "week_time_range": "week",
+            "month_time_range": "month",
+            "all_time_time_range": "allTime",
+        }
+        score_queries = [week_score_query, month_score_query, all_time_score_query]
+        if full_rebuild:
+            queries = [delete_track_scores_query] + [
+                insert_track_scores_query + score_query for score_query in score_queries
+            ]
+        else:
+            queries = [
+                insert_track_scores_query + score_query + upsert_track_scores_clause
+                for score_query in score_queries
+            ] + [delete_stale_interval_scores_query, delete_stale_all_time_scores_query]
+
+        updated_rows = 0
+        for query in queries:
+            updated_rows += session.execute(text(query), params).rowcount
+        # Release the row locks before trending is cached from the scores
+        session.commit()
+
+        mode = "full" if full_rebuild else "incremental"
+        labels = {
+            "type": self.trending_type.name,
+            "version": self.version.name,
+            "mode": mode,
+        }
+        duration = metric.elapsed()
+        metric.save(duration, labels)
+        PrometheusMetric(
+            PrometheusMetricNames.UPDATE_TRENDING_SCORES_CHANGED_LATEST
+        ).save(updated_rows, labels)
         logger.info(
-            f"trending_tracks_strategy | Finished calculating trending scores in {duration} seconds",
+            f"trending_tracks_strategy | Finished {mode} update of trending scores in {duration} seconds, {updated_rows} rows changed",
             extra={
                 "id": "trending_strategy",
                 "type": self.trending_type.name,
                 "version": self.version.name,
+                "mode": mode,
                 "duration": duration,
+                "updated_rows": updated_rows,
             },
         )
 
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.get_all_other_nodes import get_all_healthy_content_nodes_cached
+from src.utils.rendezvous import RendezvousHash
+
+logger = logging.getLogger(__name__)
+
+ALL_HEALTHY_CONTENT_NODES_VERSION_KEY = "all-healthy-content-nodes-version"
+
+# How often a process checks redis for a new version of the healthy node list
+RING_REFRESH_INTERVAL_SEC = 30
+# Max number of cid lookups memoized per ring version
+MAX_MEMOIZED_CIDS = 100_000
+
+
+def get_content_nodes_version(content_nodes: List[Dict[str, str]]) -> str:
+    """Returns a version for a content node list that only changes with its contents."""
+    endpoints = sorted(node["endpoint"] for node in content_nodes)
+    return hashlib.sha256(json.dumps(endpoints).encode("utf-8")).hexdigest()
+
+
+def set_content_nodes_version(redis, content_nodes: List[Dict[str, str]]):
+    redis.set(
+        ALL_HEALTHY_CONTENT_NODES_VERSION_KEY, get_content_nodes_version(content_nodes)
+    )
+
+
+class ContentNodeRing:
+    """
+    Process-local rendezvous ring over the healthy content nodes.
+
+    `cache_current_nodes` writes the healthy node list to redis along with a
+    version. The ring checks that version at most once every
+    `refresh_interval_sec` and only re-reads and rebuilds the ring when it has
+    changed, so the per-image path does not touch redis. Lookups are memoized
+    per cid and dropped whenever the ring is rebuilt.
+    """
+
+    def __init__(
+        self,
+        refresh_interval_sec: float = RING_REFRESH_INTERVAL_SEC,
+        max_memoized_cids: int = MAX_MEMOIZED_CIDS,
+    ):
+        self.refresh_interval_sec = refresh_interval_sec
+        self.max_memoized_cids = max_memoized_cids
+        self.version: Optional[str] = None
+        self.rendezvous: Optional[RendezvousHash] = None
+        self._last_refresh = 0.0
+        self._primary_endpoints: Dict[str, str] = {}
+        self._n_primary_endpoints: Dict[Tuple[str, int], List[str]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self, redis, force=False):
+        now = time.monotonic()
+        if (
+            not force
+            and self.rendezvous
+            and now - self._last_refresh < self.refresh_interval_sec
+        ):
+            return
+        with self._lock:
+            self._last_refresh = now
+            version = redis.get(ALL_HEALTHY_CONTENT_NODES_VERSION_KEY)
+            if isinstance(version, bytes):
+                version = version.decode("utf-8")
+            # Without a version (e.g. before cache_current_nodes has run with
+            # versioning) the list is re-read on every refresh
+            if version and version == self.version and self.rendezvous:
+                return
+
+            healthy_nodes = get_all_healthy_content_nodes_cached(redis)
+            self.version = version
+            self.rendezvous = (
+                RendezvousHash(
+                    *[
+                        re.sub("/$", "", node["endpoint"].lower())
+                        for node in healthy_nodes
+                    ]
+                )
+                if healthy_nodes
+                else None
+            )
+            self._primary_endpoints = {}
+            self._n_primary_endpoints = {}
+
+    def get_primary_endpoint(self, redis, cid: str) -> str:
+        self.refresh(redis)
+        endpoint = self._primary_endpoints.get(cid)
+        if endpoint is not None:
+            return endpoint
+        rendezvous = self.rendezvous
+        if not rendezvous:
+            return ""
+        endpoint = rendezvous.get(cid)
+        if len(self._primary_endpoints) >= self.max_memoized_cids:
+            self._primary_endpoints = {}
+        self._primary_endpoints[cid] = endpoint
+        return endpoint
+
+    def get_primary_endpoints(self, redis, cids: List[str]) -> List[str]:
+        """
+        Batch version of `get_primary_endpoint`. Scores the cids that are not
+        memoized yet in one pass and memoizes them, so the per-entity URL
+        builders that follow are served from memory.
+        """
+        self.refresh(redis)
+        rendezvous = self.rendezvous
+        if not rendezvous:
+            return ["" for _ in cids]
+        memoized = self._primary_endpoints
+        endpoints = {cid: memoized[cid] for cid in cids if cid in memoized}
+        missing = [cid for cid in dict.fromkeys(cids) if cid not in endpoints]
+        if missing:
+            endpoints.update(zip(missing, rendezvous.get_many(missing)))
+            if len(memoized) + len(missing) > self.max_memoized_cids:
+                memoized = self._primary_endpoints = {}
+            for cid in missing:
+                memoized[cid] = endpoints[cid]
+        return [endpoints[cid] for cid in cids]
+
+    def get_n_primary_endpoints(self, redis, cid: str, n: int) -> List[str]:
+        self.refresh(redis)
+        endpoints = self._n_primary_endpoints.get((cid, n))
+        if endpoints is not None:
+            return endpoints
+        rendezvous = self.rendezvous
+        if not rendezvous:
+            return []
+        endpoints = rendezvous.get_n(n, cid)
+        if len(self._n_primary_endpoints) >= self.max_memoized_cids:
+            self._n_primary_endpoints = {}
+        self._n_primary_endpoints[(cid, n)] = endpoints
+        return endpoints
+
+
+content_node_ring = ContentNodeRing()
@@ -0,0 +1,83 @@
+from unittest import mock
+
+from src.utils.content_node_ring import ContentNodeRing, set_content_nodes_version
+from src.utils.get_all_other_nodes import ALL_HEALTHY_CONTENT_NODES_CACHE_KEY
+from src.utils.redis_cache import set_json_cached_key
+from src.utils.rendezvous import RendezvousHash
+
+content_nodes = [
+    {"endpoint": "https://cn1.audius.co/", "delegateOwnerWallet": "0x1"},
+    {"endpoint": "https://CN2.audius.co", "delegateOwnerWallet": "0x2"},
+    {"endpoint": "https://cn3.audius.co", "delegateOwnerWallet": "0x3"},
+]
+endpoints = ["https://cn1.audius.co", "https://cn2.audius.co", "https://cn3.audius.co"]
+
+
+def set_content_nodes(redis, nodes):
+    set_json_cached_key(redis, ALL_HEALTHY_CONTENT_NODES_CACHE_KEY, nodes)
+    set_content_nodes_version(redis, nodes)
+
+
+def test_get_primary_endpoint(redis_mock):
+    set_content_nodes(redis_mock, content_nodes)
+    ring = ContentNodeRing()
+    rendezvous = RendezvousHash(*endpoints)
+
+    for cid in ["QmA", "QmB", "QmC"]:
+        assert ring.get_primary_endpoint(redis_mock, cid) == rendezvous.get(cid)
+    assert ring.get_n_primary_endpoints(redis_mock, "QmA", 2) == rendezvous.get_n(
+        2, "QmA"
+    )
+
+
+def test_get_primary_endpoints(redis_mock):
+    set_content_nodes(redis_mock, content_nodes)
+    ring = ContentNodeRing()
+    rendezvous = RendezvousHash(*endpoints)
+
+    cids = ["QmA", "QmB", "QmA", "QmC"]
+    assert ring.get_primary_endpoints(redis_mock, cids) == [
+        rendezvous.get(cid) for cid in cids
+    ]
+    # The batch lookups are memoized for the single lookups
+    expected = rendezvous.get("QmB")
+    with mock.patch.object(RendezvousHash, "get") as get:
+        assert ring.get_primary_endpoint(redis_mock, "QmB") == expected
+    get.assert_not_called()
+
+
+def test_get_primary_endpoint_no_nodes(redis_mock):
+    ring = ContentNodeRing()
+    assert ring.get_primary_endpoint(redis_mock, "QmA") == ""
+    assert ring.get_primary_endpoints(redis_mock, ["QmA"]) == [""]
+    assert ring.get_n_primary_endpoints(redis_mock, "QmA", 2) == []
+
+
+def test_refresh_only_rebuilds_on_new_version(redis_mock):
+    set_content_nodes(redis_mock, content_nodes)
+    ring = ContentNodeRing(refresh_interval_sec=0)
+    ring.get_primary_endpoint(redis_mock, "QmA")
+    rendezvous = ring.rendezvous
+
+    # Same list, same version: the ring and memoized lookups are kept
+    set_content_nodes(redis_mock, list(reversed(content_nodes)))
+    ring.get_primary_endpoint(redis_mock, "QmA")
+    assert ring.rendezvous is rendezvous
+
+    set_content_nodes(redis_mock, content_nodes[:1])
+    assert ring.get_primary_endpoint(redis_mock, "QmA") == "https://cn1.audius.co"
+    assert ring.rendezvous is not rendezvous
+
+
+def test_refresh_interval(redis_mock):
+    set_content_nodes(redis_mock, content_nodes)
+    ring = ContentNodeRing(refresh_interval_sec=60)
+    ring.get_primary_endpoint(redis_mock, "QmA")
+
+    # Changes are not picked up until the refresh interval has passed
+    set_content_nodes(redis_mock, content_nodes[:1])
+    ring.get_primary_endpoint(redis_mock, "QmA")
+    assert ring.rendezvous.get_nodes() == endpoints
+
+    ring.refresh(redis_mock, force=True)
+    assert ring.rendezvous.get_nodes() == endpoints[:1]
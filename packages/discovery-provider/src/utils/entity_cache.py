@@ -0,0 +1,286 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import msgpack
+
+from src.utils.config import shared_config
+from src.utils.redis_cache import (
+    get_playlist_id_cache_key,
+    get_track_id_cache_key,
+    get_user_id_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# Entities are cached in redis for 5 min
+ENTITY_CACHE_TTL_SEC = 5 * 60
+# Process-local entries are short lived so a missed invalidation is too
+ENTITY_CACHE_LOCAL_TTL_SEC = 30
+ENTITY_CACHE_LOCAL_MAX_SIZE = 10_000
+ENTITY_CACHE_INVALIDATION_CHANNEL = "entity_cache_invalidations"
+# Changed entities are not written back to the cache for this long after an
+# invalidation, so a lagging read replica cannot re-cache the old row
+ENTITY_CACHE_INVALIDATION_HOLD_SEC = 10
+# msgpack extension type used for datetimes
+DATETIME_EXT_TYPE = 1
+
+
+def is_entity_cache_enabled() -> bool:
+    return shared_config["discprov"].get("entity_cache_enabled", "false") == "true"
+
+
+def get_invalidated_key(cache_key: str) -> str:
+    return f"{cache_key}:invalidated"
+
+
+def _encode_ext(obj):
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(DATETIME_EXT_TYPE, obj.isoformat().encode("utf-8"))
+    raise TypeError(f"Cannot serialize {type(obj)} to msgpack")
+
+
+def _decode_ext(code, data):
+    if code == DATETIME_EXT_TYPE:
+        return datetime.fromisoformat(data.decode("utf-8"))
+    return msgpack.ExtType(code, data)
+
+
+def pack_entity(entity: Dict) -> bytes:
+    return msgpack.packb(entity, default=_encode_ext, use_bin_type=True)
+
+
+def unpack_entity(value: bytes) -> Dict:
+    return msgpack.unpackb(value, ext_hook=_decode_ext, raw=False)
+
+
+class LocalEntityCache:
+    """
+    Bounded, thread safe LRU of packed entities with a ttl.
+
+    Values are kept packed so every read unpacks a fresh dict, callers are free
+    to mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        max_size: int = ENTITY_CACHE_LOCAL_MAX_SIZE,
+        ttl_sec: float = ENTITY_CACHE_LOCAL_TTL_SEC,
+    ):
+        self.max_size = max_size
+        self.ttl_sec = ttl_sec
+        # entity id -> (expires at, packed entity)
+        self._entries: OrderedDict[int, Tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, entity_id: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(entity_id)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[entity_id]
+                return None
+            self._entries.move_to_end(entity_id)
+            return value
+
+    def set(self, entity_id: int, value: bytes):
+        with self._lock:
+            self._entries[entity_id] = (time.monotonic() + self.ttl_sec, value)
+            self._entries.move_to_end(entity_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, entity_ids: Iterable[int]):
+        with self._lock:
+            for entity_id in entity_ids:
+                self._entries.pop(entity_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class EntityCache:
+    """
+    Read-through cache of entity dicts by id, in process first and then redis.
+
+    Misses are fetched with `fetch_entities` and written back to both tiers.
+    The indexer invalidates changed entities with `invalidate_entity_caches`.
+    """
+
+    def __init__(
+        self,
+        entity_type: str,
+        id_key: str,
+        get_cache_key: Callable[[int], str],
+        ttl_sec: int = ENTITY_CACHE_TTL_SEC,
+    ):
+        self.entity_type = entity_type
+        self.id_key = id_key
+        self.get_cache_key = get_cache_key
+        self.ttl_sec = ttl_sec
+        self.local = LocalEntityCache()
+
+    def get_many(
+        self,
+        redis,
+        entity_ids: Iterable[int],
+        fetch_entities: Callable[[List[int]], List[Dict]],
+    ) -> Dict[int, Dict]:
+        """Returns entity id -> entity for the entities that exist."""
+        invalidation_listener.ensure_started(redis)
+
+        packed_entities: Dict[int, bytes] = {}
+        redis_ids = []
+        for entity_id in dict.fromkeys(entity_ids):
+            value = self.local.get(entity_id)
+            if value is None:
+                redis_ids.append(entity_id)
+            else:
+                packed_entities[entity_id] = value
+
+        missing_ids = []
+        if redis_ids:
+            values = redis.mget([self.get_cache_key(id) for id in redis_ids])
+            for entity_id, value in zip(redis_ids, values):
+                if value is None:
+                    missing_ids.append(entity_id)
+                else:
+                    packed_entities[entity_id] = value
+                    self.local.set(entity_id, value)
+
+        entities = {}
+        for entity_id, value in packed_entities.items():
+            try:
+                entities[entity_id] = unpack_entity(value)
+            except Exception as e:
+                logger.warning(
+                    f"entity_cache.py | Unable to unpack {self.entity_type} {entity_id}: {e}"
+                )
+                self.local.delete([entity_id])
+                missing_ids.append(entity_id)
+
+        if missing_ids:
+            fetched_entities = fetch_entities(missing_ids)
+            for entity in fetched_entities:
+                entities[entity[self.id_key]] = entity
+            self._set_many(redis, fetched_entities)
+        return entities
+
+    def _set_many(self, redis, entities: List[Dict]):
+        if not entities:
+            return
+        cache_keys = [self.get_cache_key(entity[self.id_key]) for entity in entities]
+        invalidated = redis.mget([get_invalidated_key(key) for key in cache_keys])
+        pipe = redis.pipeline(transaction=False)
+        for entity, cache_key, is_invalidated in zip(entities, cache_keys, invalidated):
+            if is_invalidated:
+                continue
+            value = pack_entity(entity)
+            pipe.set(cache_key, value, ex=self.ttl_sec)
+            self.local.set(entity[self.id_key], value)
+        pipe.execute()
+
+
+track_cache = EntityCache("Track", "track_id", get_track_id_cache_key)
+user_cache = EntityCache("User", "user_id", get_user_id_cache_key)
+playlist_cache = EntityCache("Playlist", "playlist_id", get_playlist_id_cache_key)
+
+# Keyed by the entity manager record types
+entity_caches: Dict[str, EntityCache] = {
+    cache.entity_type: cache for cache in [track_cache, user_cache, playlist_cache]
+}
+
+
+def evict_local_entities(invalidations: Dict[str, List[int]]):
+    for entity_type, entity_ids in invalidations.items():
+        cache = entity_caches.get(entity_type)
+        if cache:
+            cache.local.delete(entity_ids)
+
+
+def invalidate_entity_caches(redis, changed_entity_ids: Dict[str, Set[int]]):
+    """
+    Drops changed entities from redis and from the process-local caches of
+    every process, which are notified over redis pub/sub.
+    Should be called once the changes are committed.
+    """
+    invalidations = {
+        entity_type: list(entity_ids)
+        for entity_type, entity_ids in changed_entity_ids.items()
+        if entity_type in entity_caches and entity_ids
+    }
+    if not invalidations:
+        return
+
+    pipe = redis.pipeline(transaction=False)
+    for entity_type, entity_ids in invalidations.items():
+        cache_keys = [entity_caches[entity_type].get_cache_key(id) for id in entity_ids]
+        pipe.delete(*cache_keys)
+        for cache_key in cache_keys:
+            pipe.set(
+                get_invalidated_key(cache_key),
+                1,
+                ex=ENTITY_CACHE_INVALIDATION_HOLD_SEC,
+            )
+    pipe.publish(ENTITY_CACHE_INVALIDATION_CHANNEL, msgpack.packb(invalidations))
+    pipe.execute()
+    evict_local_entities(invalidations)
+
+
+class EntityCacheInvalidationListener:
+    """
+    Evicts process-local entries as invalidations are published.
+
+    The listener thread is started lazily so each forked worker subscribes on
+    its own. Local caches are cleared whenever it (re)subscribes since
+    invalidations may have been missed while it was not listening.
+    """
+
+    def __init__(self, reconnect_interval_sec: float = 1):
+        self.reconnect_interval_sec = reconnect_interval_sec
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self, redis):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            threading.Thread(
+                target=self._run,
+                args=(redis,),
+                name="entity_cache_invalidations",
+                daemon=True,
+            ).start()
+
+    def _run(self, redis):
+        while True:
+            try:
+                pubsub = redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(ENTITY_CACHE_INVALIDATION_CHANNEL)
+                for cache in entity_caches.values():
+                    cache.local.clear()
+                for message in pubsub.listen():
+                    self.handle_message(message)
+            except Exception as e:
+                logger.error(f"entity_cache.py | Invalidation listener error {e}")
+                time.sleep(self.reconnect_interval_sec)
+
+    @staticmethod
+    def handle_message(message):
+        if message.get("type") != "message":
+            return
+        evict_local_entities(msgpack.unpackb(message["data"], raw=False))
+
+
+invalidation_listener = EntityCacheInvalidationListener()
@@ -0,0 +1,116 @@
+from datetime import datetime
+
+import msgpack
+import pytest
+
+from src.utils import entity_cache
+from src.utils.entity_cache import (
+    ENTITY_CACHE_INVALIDATION_CHANNEL,
+    EntityCache,
+    LocalEntityCache,
+    invalidate_entity_caches,
+    pack_entity,
+    unpack_entity,
+)
+from src.utils.redis_cache import get_track_id_cache_key
+
+
+@pytest.fixture
+def track_cache(monkeypatch):
+    # the invalidation listener is tested through handle_message
+    monkeypatch.setattr(
+        entity_cache.invalidation_listener, "ensure_started", lambda redis: None
+    )
+    cache = EntityCache("Track", "track_id", get_track_id_cache_key)
+    monkeypatch.setitem(entity_cache.entity_caches, "Track", cache)
+    return cache
+
+
+def make_fetch(entities):
+    fetched_ids = []
+
+    def fetch(ids):
+        fetched_ids.append(sorted(ids))
+        return [entities[id] for id in ids if id in entities]
+
+    return fetch, fetched_ids
+
+
+def test_pack_entity():
+    entity = {
+        "track_id": 1,
+        "created_at": datetime(2023, 1, 2, 3, 4, 5, 6),
+        "remix_of": None,
+        "track_segments": [{"duration": 6.0, "multihash": "Qm"}],
+        "user": [{"user_id": 2, "created_at": datetime(2022, 1, 1)}],
+    }
+    assert unpack_entity(pack_entity(entity)) == entity
+
+
+def test_local_entity_cache():
+    cache = LocalEntityCache(max_size=2, ttl_sec=60)
+    cache.set(1, b"1")
+    cache.set(2, b"2")
+    assert cache.get(1) == b"1"
+    # 2 is the least recently used
+    cache.set(3, b"3")
+    assert cache.get(2) is None
+    assert cache.get(1) == b"1"
+    cache.delete([1])
+    assert cache.get(1) is None
+
+    expired = LocalEntityCache(ttl_sec=-1)
+    expired.set(1, b"1")
+    assert expired.get(1) is None
+
+
+def test_get_many(redis_mock, track_cache):
+    tracks = {1: {"track_id": 1, "title": "a"}, 2: {"track_id": 2, "title": "b"}}
+    fetch, fetched_ids = make_fetch(tracks)
+
+    assert track_cache.get_many(redis_mock, [1, 2, 3, 1], fetch) == tracks
+    assert fetched_ids == [[1, 2, 3]]
+    assert redis_mock.get(get_track_id_cache_key(1)) is not None
+
+    # served from the local cache, results can be mutated by the caller
+    result = track_cache.get_many(redis_mock, [1], fetch)
+    result[1]["title"] = "c"
+    assert track_cache.get_many(redis_mock, [1, 2], fetch) == tracks
+    assert fetched_ids == [[1, 2, 3]]
+
+    # served from redis
+    track_cache.local.clear()
+    assert track_cache.get_many(redis_mock, [2], fetch) == {2: tracks[2]}
+    assert fetched_ids == [[1, 2, 3]]
+
+
+def test_invalidate_entity_caches(redis_mock, track_cache):
+    tracks = {1: {"track_id": 1, "title": "a"}}
+    fetch, fetched_ids = make_fetch(tracks)
+    track_cache.get_many(redis_mock, [1], fetch)
+
+    pubsub = redis_mock.pubsub()
+    pubsub.subscribe(ENTITY_CACHE_INVALIDATION_CHANNEL)
+    assert pubsub.get_message(timeout=1)["type"] == "subscribe"
+    invalidate_entity_caches(redis_mock, {"Track": {1}, "Follow": {2}})
+
+    assert redis_mock.get(get_track_id_cache_key(1)) is None
+    assert track_cache.local.get(1) is None
+    message = pubsub.get_message(timeout=1)
+    assert msgpack.unpackb(message["data"]) == {"Track": [1]}
+
+    # the refetched track is not re-cached until the invalidation hold expires
+    tracks[1] = {"track_id": 1, "title": "b"}
+    assert track_cache.get_many(redis_mock, [1], fetch) == tracks
+    assert redis_mock.get(get_track_id_cache_key(1)) is None
+    assert fetched_ids == [[1], [1]]
+
+
+def test_handle_invalidation_message(track_cache):
+    track_cache.local.set(1, pack_entity({"track_id": 1}))
+    track_cache.local.set(2, pack_entity({"track_id": 2}))
+    entity_cache.invalidation_listener.handle_message(
+        {"type": "message", "data": msgpack.packb({"Track": [1]})}
+    )
+    assert track_cache.local.get(1) is None
+    assert track_cache.local.get(2) is not None
@@ -0,0 +1,288 @@
+import calendar
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm.session import Session
+
+from src import exceptions
+from src.models.social.follow import Follow
+from src.models.social.repost import RepostType
+from src.models.users.aggregate_user import AggregateUser
+from src.utils.config import shared_config
+
+logger = logging.getLogger(__name__)
+
+# Max number of items kept in a feed inbox, older items are trimmed on write
+FEED_INBOX_MAX_SIZE = 1000
+# Activity from users with more followers than this is not fanned out on write
+# and is merged into the feed at read time instead
+FEED_INBOX_MAX_FAN_OUT_FOLLOWERS = 10_000
+# Inboxes of users that stop reading their feed expire, refreshed on every read
+FEED_INBOX_TTL_SEC = 7 * 24 * 60 * 60
+# Member marking an inbox as fully seeded. It is scored +inf so it is never
+# trimmed and never returned by a cursor read.
+FEED_INBOX_SEEDED_MEMBER = "seeded"
+
+# (user_id, item_key, timestamp) of a user creating or reposting an item
+FeedActivity = Tuple[int, str, int]
+
+
+def is_feed_inbox_enabled() -> bool:
+    return shared_config["discprov"].get("feed_inbox_enabled", "false") == "true"
+
+
+def get_feed_inbox_key(user_id: int) -> str:
+    return f"feed_inbox:{user_id}"
+
+
+def get_feed_item_key(item_type: str, item_id: int) -> str:
+    return f"{item_type}:{item_id}"
+
+
+def parse_feed_item_key(item_key: str) -> Tuple[str, int]:
+    item_type, item_id = item_key.split(":")
+    return item_type, int(item_id)
+
+
+def to_feed_timestamp(created_at) -> int:
+    return calendar.timegm(created_at.timetuple())
+
+
+def encode_feed_cursor(timestamp: int, item_key: str) -> str:
+    return f"{timestamp}:{item_key}"
+
+
+def decode_feed_cursor(cursor: str) -> Tuple[int, str]:
+    """
+    Cursors are `<activity unix timestamp>:<item key>` of the last item of the
+    previous page, e.g. `1690000000:track:12`.
+    """
+    try:
+        timestamp, item_key = cursor.split(":", 1)
+        parse_feed_item_key(item_key)
+        return int(timestamp), item_key
+    except ValueError:
+        raise exceptions.ArgumentError(f"Invalid feed cursor {cursor}")
+
+
+def get_high_follower_user_ids(session: Session, user_ids: Iterable[int]) -> Set[int]:
+    """Returns the users whose activity is not fanned out on write."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return set()
+    rows = (
+        session.query(AggregateUser.user_id)
+        .filter(
+            AggregateUser.user_id.in_(user_ids),
+            AggregateUser.follower_count > FEED_INBOX_MAX_FAN_OUT_FOLLOWERS,
+        )
+        .all()
+    )
+    return {row[0] for row in rows}
+
+
+def get_feed_activities(
+    new_records, original_records, block_timestamp: int
+) -> Tuple[List[FeedActivity], Set[int]]:
+    """
+    Returns the activities an entity manager block adds to follower feeds, and
+    the users whose followees changed so their inboxes need to be rebuilt.
+    """
+    activities: List[FeedActivity] = []
+
+    original_tracks = original_records.get("Track", {})
+    for track_id, tracks in new_records["Track"].items():
+        track = tracks[-1]
+        if (
+            track_id in original_tracks
+            or track.is_delete
+            or track.is_unlisted
+            # stem_of is sql null unless the track is a stem
+            or isinstance(track.stem_of, dict)
+        ):
+            continue
+        activities.append(
+            (track.owner_id, get_feed_item_key("track", track_id), block_timestamp)
+        )
+
+    original_playlists = original_records.get("Playlist", {})
+    for playlist_id, playlists in new_records["Playlist"].items():
+        playlist = playlists[-1]
+        original_playlist = original_playlists.get(playlist_id)
+        if playlist.is_delete or playlist.is_private:
+            continue
+        # new playlists and playlists that were made public
+        if original_playlist and not original_playlist.is_private:
+            continue
+        timestamp = (
+            to_feed_timestamp(playlist.created_at)
+            if playlist.created_at
+            else block_timestamp
+        )
+        activities.append(
+            (
+                playlist.playlist_owner_id,
+                get_feed_item_key("playlist", playlist_id),
+                timestamp,
+            )
+        )
+
+    original_reposts = original_records.get("Repost", {})
+    for key, reposts in new_records["Repost"].items():
+        repost = reposts[-1]
+        original_repost = original_reposts.get(key)
+        if repost.is_delete or (original_repost and not original_repost.is_delete):
+            continue
+        item_type = "track" if repost.repost_type == RepostType.track else "playlist"
+        activities.append(
+            (
+                repost.user_id,
+                get_feed_item_key(item_type, repost.repost_item_id),
+                block_timestamp,
+            )
+        )
+
+    follow_changed_user_ids = {
+        follow.follower_user_id
+        for follows in new_records["Follow"].values()
+        for follow in follows
+    }
+    return activities, follow_changed_user_ids
+
+
+def fan_out_feed_activities(
+    session: Session, redis, activities: List[FeedActivity]
+) -> int:
+    """
+    Adds activities to the inboxes of the actors' followers and returns the
+    number of inboxes updated. Only existing inboxes are written to, missing
+    inboxes are seeded in full the next time their feed is read.
+    """
+    actor_ids = {user_id for user_id, _, _ in activities}
+    actor_ids -= get_high_follower_user_ids(session, actor_ids)
+    if not actor_ids:
+        return 0
+
+    follows = (
+        session.query(Follow.followee_user_id, Follow.follower_user_id)
+        .filter(
+            Follow.followee_user_id.in_(actor_ids),
+            Follow.is_current == True,
+            Follow.is_delete == False,
+        )
+        .all()
+    )
+    followers_by_user_id: Dict[int, List[int]] = defaultdict(list)
+    for followee_user_id, follower_user_id in follows:
+        followers_by_user_id[followee_user_id].append(follower_user_id)
+    follower_ids = list({follower_user_id for _, follower_user_id in follows})
+    if not follower_ids:
+        return 0
+
+    pipe = redis.pipeline()
+    for follower_id in follower_ids:
+        pipe.exists(get_feed_inbox_key(follower_id))
+    inbox_ids = {
+        follower_id
+        for follower_id, exists in zip(follower_ids, pipe.execute())
+        if exists
+    }
+
+    updated_inbox_ids = set()
+    pipe = redis.pipeline()
+    for user_id, item_key, timestamp in activities:
+        for follower_id in followers_by_user_id.get(user_id, []):
+            if follower_id not in inbox_ids:
+                continue
+            # nx keeps the earliest activity for items already in the inbox
+            pipe.zadd(get_feed_inbox_key(follower_id), {item_key: timestamp}, nx=True)
+            updated_inbox_ids.add(follower_id)
+    for follower_id in updated_inbox_ids:
+        pipe.zremrangebyrank(
+            get_feed_inbox_key(follower_id), 0, -FEED_INBOX_MAX_SIZE - 2
+        )
+    pipe.execute()
+    return len(updated_inbox_ids)
+
+
+def invalidate_feed_inboxes(redis, user_ids: Iterable[int]):
+    keys = [get_feed_inbox_key(user_id) for user_id in user_ids]
+    if keys:
+        redis.delete(*keys)
+
+
+class FeedInboxUpdates:
+    """
+    Feed inbox changes of the blocks indexed in one session. They are applied
+    once the session has committed, so readers cannot re-seed an inbox from
+    the previous follows and a rolled back window leaves no activities behind.
+    """
+
+    def __init__(self):
+        self.activities: List[FeedActivity] = []
+        self.follow_changed_user_ids: Set[int] = set()
+
+    def add(self, new_records, original_records, block_timestamp: int):
+        activities, follow_changed_user_ids = get_feed_activities(
+            new_records, original_records, block_timestamp
+        )
+        self.activities.extend(activities)
+        self.follow_changed_user_ids.update(follow_changed_user_ids)
+
+    def __bool__(self):
+        return bool(self.activities or self.follow_changed_user_ids)
+
+
+def apply_feed_inbox_updates(session: Session, redis, updates: FeedInboxUpdates):
+    # Inboxes are dropped rather than patched when followees change
+    invalidate_feed_inboxes(redis, updates.follow_changed_user_ids)
+    if updates.activities:
+        num_inboxes = fan_out_feed_activities(session, redis, updates.activities)
+        logger.debug(
+            f"feed_inbox.py | Fanned out {len(updates.activities)} activities to {num_inboxes} inboxes"
+        )
+
+
+def seed_feed_inbox(redis, user_id: int, entries: Dict[str, int]):
+    """Replaces a user's inbox with item key -> timestamp `entries`."""
+    key = get_feed_inbox_key(user_id)
+    pipe = redis.pipeline()
+    pipe.delete(key)
+    pipe.zadd(key, {**entries, FEED_INBOX_SEEDED_MEMBER: float("inf")})
+    pipe.zremrangebyrank(key, 0, -FEED_INBOX_MAX_SIZE - 2)
+    pipe.expire(key, FEED_INBOX_TTL_SEC)
+    pipe.execute()
+
+
+def read_feed_inbox(
+    redis, user_id: int, max_timestamp: Optional[int], limit: int
+) -> Optional[List[Tuple[str, int]]]:
+    """
+    Returns up to `limit` (item_key, timestamp) entries at or before
+    `max_timestamp`, newest first, or None if the inbox needs to be seeded.
+    """
+    key = get_feed_inbox_key(user_id)
+    pipe = redis.pipeline()
+    pipe.zscore(key, FEED_INBOX_SEEDED_MEMBER)
+    pipe.zrevrangebyscore(
+        key,
+        "+inf" if max_timestamp is None else max_timestamp,
+        "-inf",
+        start=0,
+        num=limit + 1,
+        withscores=True,
+    )
+    pipe.expire(key, FEED_INBOX_TTL_SEC)
+    seeded, entries, _ = pipe.execute()
+    if seeded is None:
+        return None
+
+    results = []
+    for item_key, timestamp in entries:
+        if isinstance(item_key, bytes):
+            item_key = item_key.decode("utf-8")
+        if item_key == FEED_INBOX_SEEDED_MEMBER:
+            continue
+        results.append((item_key, int(timestamp)))
+    return results[:limit]
@@ -0,0 +1,185 @@
+from datetime import datetime
+
+import pytest
+
+from src import exceptions
+from src.models.playlists.playlist import Playlist
+from src.models.social.follow import Follow
+from src.models.social.repost import Repost, RepostType
+from src.models.tracks.track import Track
+from src.utils.feed_inbox import (
+    FEED_INBOX_MAX_SIZE,
+    FeedInboxUpdates,
+    apply_feed_inbox_updates,
+    decode_feed_cursor,
+    encode_feed_cursor,
+    get_feed_activities,
+    get_feed_inbox_key,
+    invalidate_feed_inboxes,
+    read_feed_inbox,
+    seed_feed_inbox,
+)
+
+
+def test_feed_cursor():
+    cursor = encode_feed_cursor(1690000000, "track:12")
+    assert cursor == "1690000000:track:12"
+    assert decode_feed_cursor(cursor) == (1690000000, "track:12")
+    with pytest.raises(exceptions.ArgumentError):
+        decode_feed_cursor("track:12")
+
+
+def test_read_feed_inbox(redis_mock):
+    assert read_feed_inbox(redis_mock, 1, None, 10) is None
+
+    seed_feed_inbox(redis_mock, 1, {"track:1": 100, "playlist:1": 200, "track:2": 200})
+    assert read_feed_inbox(redis_mock, 1, None, 10) == [
+        ("track:2", 200),
+        ("playlist:1", 200),
+        ("track:1", 100),
+    ]
+    assert read_feed_inbox(redis_mock, 1, None, 1) == [("track:2", 200)]
+    assert read_feed_inbox(redis_mock, 1, 199, 10) == [("track:1", 100)]
+
+    # an empty feed is still seeded
+    seed_feed_inbox(redis_mock, 2, {})
+    assert read_feed_inbox(redis_mock, 2, None, 10) == []
+
+    invalidate_feed_inboxes(redis_mock, [1, 2])
+    assert read_feed_inbox(redis_mock, 1, None, 10) is None
+    assert read_feed_inbox(redis_mock, 2, None, 10) is None
+
+
+def test_seed_feed_inbox_is_capped(redis_mock):
+    seed_feed_inbox(
+        redis_mock,
+        1,
+        {f"track:{i}": i for i in range(FEED_INBOX_MAX_SIZE + 10)},
+    )
+    # the cap does not count the seeded marker
+    assert redis_mock.zcard(get_feed_inbox_key(1)) == FEED_INBOX_MAX_SIZE + 1
+    entries = read_feed_inbox(redis_mock, 1, None, FEED_INBOX_MAX_SIZE + 10)
+    assert len(entries) == FEED_INBOX_MAX_SIZE
+    assert entries[-1] == ("track:10", 10)
+
+
+def test_get_feed_activities():
+    created_at = datetime(2023, 1, 1)
+    new_records = {
+        "Track": {
+            1: [Track(track_id=1, owner_id=1, is_delete=False, is_unlisted=False)],
+            # updated track
+            2: [Track(track_id=2, owner_id=1, is_delete=False, is_unlisted=False)],
+            # stem
+            3: [
+                Track(
+                    track_id=3,
+                    owner_id=1,
+                    is_delete=False,
+                    is_unlisted=False,
+                    stem_of={"parent_track_id": 1, "category": "other"},
+                )
+            ],
+        },
+        "Playlist": {
+            1: [
+                Playlist(
+                    playlist_id=1,
+                    playlist_owner_id=2,
+                    is_delete=False,
+                    is_private=False,
+                    created_at=created_at,
+                )
+            ],
+            # private playlist
+            2: [
+                Playlist(
+                    playlist_id=2,
+                    playlist_owner_id=2,
+                    is_delete=False,
+                    is_private=True,
+                    created_at=created_at,
+                )
+            ],
+        },
+        "Repost": {
+            (3, "Track", 2): [
+                Repost(
+                    user_id=3,
+                    repost_item_id=2,
+                    repost_type=RepostType.track,
+                    is_delete=False,
+                )
+            ],
+            # unrepost
+            (3, "Playlist", 1): [
+                Repost(
+                    user_id=3,
+                    repost_item_id=1,
+                    repost_type=RepostType.playlist,
+                    is_delete=True,
+                )
+            ],
+        },
+        "Follow": {
+            (4, "User", 1): [
+                Follow(follower_user_id=4, followee_user_id=1, is_delete=False)
+            ]
+        },
+    }
+    original_records = {"Track": {2: Track(track_id=2, owner_id=1)}}
+
+    activities, follow_changed_user_ids = get_feed_activities(
+        new_records, original_records, 1672617600
+    )
+    assert activities == [
+        (1, "track:1", 1672617600),
+        (2, "playlist:1", 1672531200),
+        (3, "track:2", 1672617600),
+    ]
+    assert follow_changed_user_ids == {4}
+
+
+def test_feed_inbox_updates(redis_mock):
+    updates = FeedInboxUpdates()
+    assert not updates
+
+    # blocks in a window are collected until the window commits
+    for block_timestamp, track_id in [(100, 1), (200, 2)]:
+        updates.add(
+            {
+                "Track": {
+                    track_id: [
+                        Track(
+                            track_id=track_id,
+                            owner_id=1,
+                            is_delete=False,
+                            is_unlisted=False,
+                        )
+                    ]
+                },
+                "Playlist": {},
+                "Repost": {},
+                "Follow": {
+                    (track_id, "User", 1): [
+                        Follow(
+                            follower_user_id=track_id,
+                            followee_user_id=1,
+                            is_delete=False,
+                        )
+                    ]
+                },
+            },
+            {},
+            block_timestamp,
+        )
+    assert updates.activities == [(1, "track:1", 100), (1, "track:2", 200)]
+    assert updates.follow_changed_user_ids == {1, 2}
+
+    # inboxes of users whose follows changed are dropped
+    seed_feed_inbox(redis_mock, 1, {"track:3": 50})
+    seed_feed_inbox(redis_mock, 3, {"track:3": 50})
+    updates.activities = []
+    apply_feed_inbox_updates(None, redis_mock, updates)
+    assert read_feed_inbox(redis_mock, 1, None, 10) is None
+    assert read_feed_inbox(redis_mock, 3, None, 10) == [("track:3", 50)]
@@ -3,13 +3,14 @@ import datetime
 import functools
 import json
 import logging
+import operator
 import os
 import re
 import time
 import unicodedata
 from functools import reduce
 from json.encoder import JSONEncoder
-from typing import List, Optional, TypedDict, cast
+from typing import Dict, Iterable, List, Optional, Tuple, TypedDict, cast
 
 import base58
 import psutil
@@ -85,11 +86,107 @@ def is_fqdn(endpoint_str):
 
 def query_result_to_list(query_result):
     results = []
+    serializer = None
     for row in query_result:
-        results.append(model_to_dictionary(row, None))
+        if serializer is None or serializer.model_class is not type(row):
+            serializer = get_model_serializer(type(row))
+        results.append(serializer.to_dictionary(row))
     return results
 
 
+def _tuple_getter(keys):
+    """Returns a function that reads `keys` off an object as a tuple."""
+    if not keys:
+        return lambda obj: ()
+    if len(keys) == 1:
+        getter = operator.attrgetter(keys[0])
+        return lambda obj: (getter(obj),)
+    return operator.attrgetter(*keys)
+
+
+class ModelSerializer:
+    """Row-to-dict function for a single SQLAlchemy model class.
+
+    Columns, `@property` members and relationships are resolved once when the
+    serializer is built, so serializing a row is a single attrgetter call plus
+    a pass over the loaded relationships. See `model_to_dictionary` for the
+    rules on which keys are included.
+    """
+
+    def __init__(self, model_class):
+        self.model_class = model_class
+        self.columns = model_class.__table__.columns.keys()
+        self.relationships = model_class.__mapper__.relationships.keys()
+        excluded = set(self.columns) | set(self.relationships)
+        self.properties = [
+            key
+            for key in dir(model_class)
+            if key not in excluded
+            and isinstance(getattr(model_class, key, None), property)
+        ]
+        self.exclude_keys = list(getattr(model_class, "exclude_keys", []))
+        self.serializable_keys = set(self.properties).union(self.columns)
+        assert set(self.exclude_keys).issubset(self.serializable_keys)
+
+        self.keys = self._get_keys(self.exclude_keys)
+        self.getter = _tuple_getter(self.keys)
+        self.relationship_keys = self._get_relationship_keys(self.exclude_keys)
+
+    def _get_keys(self, exclude_keys):
+        return [
+            key
+            for key in [*self.columns, *self.properties]
+            if key not in exclude_keys and not key.startswith("_")
+        ]
+
+    def _get_relationship_keys(self, exclude_keys):
+        return [
+            key
+            for key in self.relationships
+            if key not in exclude_keys and not key.startswith("_")
+        ]
+
+    def to_dictionary(self, model, exclude_keys=None):
+        if exclude_keys:
+            exclude_keys = [*exclude_keys, *self.exclude_keys]
+            assert set(exclude_keys).issubset(self.serializable_keys)
+            keys = self._get_keys(exclude_keys)
+            getter = _tuple_getter(keys)
+            relationship_keys = self._get_relationship_keys(exclude_keys)
+        else:
+            keys = self.keys
+            getter = self.getter
+            relationship_keys = self.relationship_keys
+
+        # Collect the relationships that are unloaded before reading any
+        # properties, which may load them, so we do not unintentionally
+        # cause them to load
+        unloaded = inspect(model).unloaded if relationship_keys else set()
+        model_dict = dict(zip(keys, getter(model)))
+
+        for key in relationship_keys:
+            if key in unloaded:
+                continue
+            attr = getattr(model, key)
+            if isinstance(attr, list):
+                model_dict[key] = query_result_to_list(attr)
+            else:
+                model_dict[key] = model_to_dictionary(attr)
+
+        return model_dict
+
+
+model_serializers: Dict[type, ModelSerializer] = {}
+
+
+def get_model_serializer(model_class) -> ModelSerializer:
+    serializer = model_serializers.get(model_class)
+    if not serializer:
+        serializer = ModelSerializer(model_class)
+        model_serializers[model_class] = serializer
+    return serializer
+
+
 def model_to_dictionary(model, exclude_keys=None):
     """Converts the given SQLAlchemy model into a dictionary, primarily used
     for serialization to JSON.
@@ -101,47 +198,7 @@ def model_to_dictionary(model, exclude_keys=None):
     - Excludes any property or attribute with a leading underscore.
     - Excludes unloaded properties expressed in relationships.
     """
-    state = inspect(model)
-    # Collect the model members that are unloaded so we do not
-    # unintentionally cause them to load
-    unloaded = state.unloaded
-    model_dict = {}
-
-    columns = model.__table__.columns.keys()
-    relationships = model.__mapper__.relationships.keys()
-    properties = []
-    for key in list(set(dir(model)) - set(columns) - set(relationships)):
-        if hasattr(type(model), key):
-            attr = getattr(type(model), key)
-            if not callable(attr) and isinstance(attr, property):
-                properties.append(key)
-
-    if exclude_keys is None:
-        exclude_keys = []
-    if hasattr(model, "exclude_keys"):
-        exclude_keys.extend(model.exclude_keys)
-
-    assert set(exclude_keys).issubset(set(properties).union(columns))
-
-    for key in columns:
-        if key not in exclude_keys and not key.startswith("_"):
-            model_dict[key] = getattr(model, key)
-
-    for key in properties:
-        if key not in exclude_keys and not key.startswith("_"):
-            model_dict[key] = getattr(model, key)
-
-    for key in relationships:
-        if key not in exclude_keys and not key.startswith("_"):
-            if key in unloaded:
-                continue
-            attr = getattr(model, key)
-            if isinstance(attr, list):
-                model_dict[key] = query_result_to_list(attr)
-            else:
-                model_dict[key] = model_to_dictionary(attr)
-
-    return model_dict
+    return get_model_serializer(type(model)).to_dictionary(model, exclude_keys)
 
 
 # Convert a tuple of model format into the proper model itself represented as a dictionary.
@@ -315,17 +372,38 @@ HASH_SALT = "azowernasdfoia"
 
 hashids = Hashids(min_length=5, salt=HASH_SALT)
 
+# Max number of ids memoized by encode_int_id and decode_string_id. Hashids is
+# pure python and the same user and track ids show up across most responses.
+HASH_ID_CACHE_SIZE = 100_000
+
+
+@functools.lru_cache(maxsize=HASH_ID_CACHE_SIZE)
+def _encode_int_id(id: int) -> str:
+    return cast(str, hashids.encode(id))
+
+
+@functools.lru_cache(maxsize=HASH_ID_CACHE_SIZE)
+def _decode_string_id(id: str) -> Tuple[int, ...]:
+    return hashids.decode(id)
+
 
 def encode_int_id(id: int):
     # if id is already a string, assume it has already been encoded
     if isinstance(id, str):
         return id
-    return cast(str, hashids.encode(id))
+    return _encode_int_id(id)
+
+
+def encode_ids(ids: Iterable[int]) -> List[str]:
+    """Encodes a list of ids, hashing each distinct id once."""
+    ids = list(ids)
+    encoded_ids = {id: encode_int_id(id) for id in set(ids)}
+    return [encoded_ids[id] for id in ids]
 
 
 def decode_string_id(id: str) -> Optional[int]:
     # Returns a tuple
-    decoded = hashids.decode(id)
+    decoded = _decode_string_id(id) if isinstance(id, str) else hashids.decode(id)
     if not decoded:
         return None
     return decoded[0]
@@ -1,6 +1,17 @@
 from urllib.parse import unquote
 
-from src.utils.helpers import is_fqdn, sanitize_slug
+from src.models.tracks.track import Track
+from src.utils.helpers import (
+    decode_string_id,
+    encode_ids,
+    encode_int_id,
+    get_model_serializer,
+    hashids,
+    is_fqdn,
+    model_to_dictionary,
+    query_result_to_list,
+    sanitize_slug,
+)
 
 
 def test_create_track_slug_normal_title():
@@ -81,3 +92,39 @@ def test_is_fqdn_url():
     assert is_fqdn("http://validurl2.subdomain.domain.com") == True
     assert is_fqdn("http://cn2_creator-node_1:4001") == True
     assert is_fqdn("http://www.example.$com\and%26here.html") == False
+
+
+def test_model_to_dictionary():
+    track = Track(track_id=1, owner_id=2, is_current=True, title="title")
+    track_dict = model_to_dictionary(track)
+
+    assert set(track_dict.keys()) == set(Track.__table__.columns.keys()) | {"permalink"}
+    assert track_dict["track_id"] == 1
+    assert track_dict["title"] == "title"
+    assert track_dict["permalink"] == ""
+    assert "_slug" not in track_dict
+
+    track_dict = model_to_dictionary(track, exclude_keys=["title", "permalink"])
+    assert "title" not in track_dict
+    assert "permalink" not in track_dict
+    assert track_dict["owner_id"] == 2
+
+    assert get_model_serializer(Track) is get_model_serializer(Track)
+    assert query_result_to_list([track, track]) == [
+        model_to_dictionary(track),
+        model_to_dictionary(track),
+    ]
+
+
+def test_encode_int_id():
+    assert encode_int_id(1) == hashids.encode(1)
+    assert encode_int_id(1) == encode_int_id(1)
+    assert encode_int_id("7eP5n") == "7eP5n"
+    assert decode_string_id(encode_int_id(44)) == 44
+    assert decode_string_id("not an id") is None
+
+
+def test_encode_ids():
+    ids = [3, 1, 3, 2, "7eP5n"]
+    assert encode_ids(ids) == [encode_int_id(id) for id in ids]
+    assert encode_ids([]) == []
@@ -0,0 +1,128 @@
+"""
+Batches read only eth contract calls into a few eth_calls through Multicall3
+https://github.com/mds1/multicall
+"""
+
+import logging
+from typing import Any, List, NamedTuple, Optional
+
+from eth_typing import ChecksumAddress
+from web3 import Web3
+from web3.contract import Contract
+
+from src.utils.config import shared_config
+
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at the same address on mainnet and most other chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# maximum number of contract calls aggregated into one eth_call
+MULTICALL_CHUNK_SIZE = 500
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+
+
+class ContractCall(NamedTuple):
+    contract: Contract
+    fn_name: str
+    args: tuple = ()
+
+
+def get_multicall_address() -> ChecksumAddress:
+    address = shared_config["eth_contracts"].get("multicall") or MULTICALL3_ADDRESS
+    return Web3.to_checksum_address(address)
+
+
+def aggregate(
+    web3: Web3,
+    calls: List[ContractCall],
+    block_identifier="latest",
+    chunk_size=MULTICALL_CHUNK_SIZE,
+) -> List[Optional[Any]]:
+    """
+    Makes read only contract calls with one eth_call per `chunk_size` calls,
+    returning the decoded result of each call in order, or None for calls
+    that reverted.
+
+    Falls back to one eth_call per call on chains without a multicall
+    contract, e.g. local dev chains, and for chunks whose eth_call failed.
+    """
+    address = get_multicall_address()
+    if not calls:
+        return []
+    if not web3.eth.get_code(address):
+        logger.warning(
+            f"multicall.py | No multicall contract at {address}, calling one by one"
+        )
+        return [_call(call, block_identifier) for call in calls]
+
+    multicall = web3.eth.contract(address=address, abi=MULTICALL3_ABI)
+    results: List[Optional[Any]] = []
+    for i in range(0, len(calls), chunk_size):
+        chunk = calls[i : i + chunk_size]
+        try:
+            return_data = multicall.functions.aggregate3(
+                [
+                    (
+                        call.contract.address,
+                        True,
+                        call.contract.encodeABI(fn_name=call.fn_name, args=call.args),
+                    )
+                    for call in chunk
+                ]
+            ).call(block_identifier=block_identifier)
+        except Exception as e:
+            logger.error(
+                f"multicall.py | Error aggregating {len(chunk)} calls, calling one by one: {e}"
+            )
+            results.extend(_call(call, block_identifier) for call in chunk)
+            continue
+        for call, (success, data) in zip(chunk, return_data):
+            # calls to addresses without code succeed with no return data
+            results.append(_decode(web3, call, data) if success and data else None)
+    return results
+
+
+def _decode(web3: Web3, call: ContractCall, data: bytes):
+    fn_abi = call.contract.get_function_by_name(call.fn_name).abi
+    values = web3.codec.decode([output["type"] for output in fn_abi["outputs"]], data)
+    return values[0] if len(values) == 1 else values
+
+
+def _call(call: ContractCall, block_identifier):
+    try:
+        return call.contract.get_function_by_name(call.fn_name)(*call.args).call(
+            block_identifier=block_identifier
+        )
+    except Exception as e:
+        logger.error(f"multicall.py | Error calling {call.fn_name}{call.args}: {e}")
+        return None
@@ -98,13 +98,20 @@ class PrometheusMetricNames:
     FLASK_ROUTE_DURATION_SECONDS = "flask_route_duration_seconds"
     HEALTH_CHECK = "health_check"
     INDEX_BLOCKS_DURATION_SECONDS = "index_blocks_duration_seconds"
+    INDEX_BLOCKS_PREFETCH_BUFFER_LATEST = "index_blocks_prefetch_buffer_latest"
+    INDEX_BLOCKS_PREFETCH_WAIT_DURATION_SECONDS = (
+        "index_blocks_prefetch_wait_duration_seconds"
+    )
     INDEX_METRICS_DURATION_SECONDS = "index_metrics_duration_seconds"
     INDEX_TRENDING_DURATION_SECONDS = "index_trending_duration_seconds"
     UPDATE_AGGREGATE_TABLE_DURATION_SECONDS = "update_aggregate_table_duration_seconds"
     UPDATE_TRENDING_VIEW_DURATION_SECONDS = "update_trending_view_duration_seconds"
+    UPDATE_TRENDING_SCORES_DURATION_SECONDS = "update_trending_scores_duration_seconds"
+    UPDATE_TRENDING_SCORES_CHANGED_LATEST = "update_trending_scores_changed_latest"
     ENTITY_MANAGER_UPDATE_CHANGED_LATEST = "entity_manager_update_changed_latest"
     ENTITY_MANAGER_UPDATE_DURATION_SECONDS = "entity_manager_update_duration_seconds"
     ENTITY_MANAGER_UPDATE_ERRORS = "entity_manager_update_errors"
+    ENTITY_MANAGER_HANDLER_DURATION_SECONDS = "entity_manager_handler_duration_seconds"
 
 
 """
@@ -179,6 +186,16 @@ PrometheusRegistry = {
         "Runtimes for src.task.index:index_blocks()",
         ("scope",),
     ),
+    PrometheusMetricNames.INDEX_BLOCKS_PREFETCH_BUFFER_LATEST: Gauge(
+        f"{METRIC_PREFIX}_{PrometheusMetricNames.INDEX_BLOCKS_PREFETCH_BUFFER_LATEST}",
+        "Number of blocks buffered or in flight in the index_nethermind prefetcher",
+        multiprocess_mode="liveall",
+    ),
+    PrometheusMetricNames.INDEX_BLOCKS_PREFETCH_WAIT_DURATION_SECONDS: Histogram(
+        f"{METRIC_PREFIX}_{PrometheusMetricNames.INDEX_BLOCKS_PREFETCH_WAIT_DURATION_SECONDS}",
+        "Time index_nethermind spent waiting on the prefetcher for the next block",
+        ("hit",),
+    ),
     PrometheusMetricNames.INDEX_METRICS_DURATION_SECONDS: Histogram(
         f"{METRIC_PREFIX}_{PrometheusMetricNames.INDEX_METRICS_DURATION_SECONDS}",
         "Runtimes for src.task.index_metrics:celery.task()",
@@ -201,6 +218,24 @@ PrometheusRegistry = {
         "Runtimes for src.task.index_trending:update_view()",
         ("mat_view_name",),
     ),
+    PrometheusMetricNames.UPDATE_TRENDING_SCORES_DURATION_SECONDS: Histogram(
+        f"{METRIC_PREFIX}_{PrometheusMetricNames.UPDATE_TRENDING_SCORES_DURATION_SECONDS}",
+        "Runtimes for updating track_trending_scores by trending strategy",
+        (
+            "type",
+            "version",
+            "mode",
+        ),
+    ),
+    PrometheusMetricNames.UPDATE_TRENDING_SCORES_CHANGED_LATEST: Histogram(
+        f"{METRIC_PREFIX}_{PrometheusMetricNames.UPDATE_TRENDING_SCORES_CHANGED_LATEST}",
+        "Number of track_trending_scores rows written or deleted by trending strategy",
+        (
+            "type",
+            "version",
+            "mode",
+        ),
+    ),
     PrometheusMetricNames.ENTITY_MANAGER_UPDATE_CHANGED_LATEST: Histogram(
         f"{METRIC_PREFIX}_{PrometheusMetricNames.ENTITY_MANAGER_UPDATE_CHANGED_LATEST}",
         "Number of entities changed by entity type",
@@ -217,6 +252,14 @@ PrometheusRegistry = {
         "Duration for entity manager updates",
         ("scope",),
     ),
+    PrometheusMetricNames.ENTITY_MANAGER_HANDLER_DURATION_SECONDS: Histogram(
+        f"{METRIC_PREFIX}_{PrometheusMetricNames.ENTITY_MANAGER_HANDLER_DURATION_SECONDS}",
+        "Duration for processing a single entity manager event by action and entity type",
+        (
+            "action",
+            "entity_type",
+        ),
+    ),
 }
 
 
@@ -1,7 +1,7 @@
 import functools
 import json
 import logging
-from typing import Any, List  # pylint: disable=C0302
+from typing import Any, Callable, Dict, List, Optional  # pylint: disable=C0302
 
 from flask.globals import request
 
@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 internal_api_cache_prefix = "INTERNAL_API"
 cache_prefix = "API_V1_ROUTE"
 default_ttl_sec = 60
+# Field of a cached list's items hash holding the list length. It is always
+# set, so an empty list can be told apart from a missing one.
+list_cache_size_field = "size"
 
 
 def extract_key(path, arg_items, cache_prefix_override=None):
@@ -93,6 +96,98 @@ def set_json_cached_key(redis, key, obj, ttl=None):
     redis.set(key, serialized, ttl)
 
 
+def get_list_cache_keys(key):
+    """Returns the keys of the ordered ids and the id -> item hash of a cached list"""
+    return f"{key}:ids", f"{key}:items"
+
+
+def set_list_cached_key(redis, key, items: List[Dict], id_key: str, ttl=None):
+    """
+    Sets a list in the cache as an ordered redis list of ids plus a hash of
+    id -> JSON serialized item, so a page can be read without decoding the
+    whole list. Items are read back with `get_list_cached_slice`.
+    """
+    ids_key, items_key = get_list_cache_keys(key)
+    # Replaced in a transaction so readers never see a partially written list
+    pipe = redis.pipeline()
+    # Also drop the list if it was cached as a single JSON value
+    pipe.delete(key, ids_key, items_key)
+    pipe.hset(items_key, list_cache_size_field, len(items))
+    if items:
+        pipe.rpush(ids_key, *[item[id_key] for item in items])
+        pipe.hset(
+            items_key,
+            mapping={item[id_key]: json.dumps(item, default=str) for item in items},
+        )
+        if ttl:
+            pipe.expire(ids_key, ttl)
+    if ttl:
+        pipe.expire(items_key, ttl)
+    pipe.execute()
+
+
+def get_list_cached_slice(
+    redis, key, offset: Optional[int] = None, limit: Optional[int] = None
+) -> Optional[List[Any]]:
+    """
+    Gets `limit` items starting at `offset` of a list set with
+    `set_list_cached_key`, only decoding those items.
+    Returns None if the list is not cached.
+    """
+    ids_key, items_key = get_list_cache_keys(key)
+    offset = offset or 0
+    if limit is not None and limit <= 0:
+        return [] if redis.hexists(items_key, list_cache_size_field) else None
+    end = -1 if limit is None else offset + limit - 1
+
+    # The list may be replaced between reading its ids and its items,
+    # in which case the slice is read again
+    for _ in range(2):
+        pipe = redis.pipeline(transaction=False)
+        pipe.hget(items_key, list_cache_size_field)
+        pipe.lrange(ids_key, offset, end)
+        size, ids = pipe.execute()
+        if size is None:
+            logger.debug(f"Redis Cache - miss {key}")
+            return None
+        if not ids:
+            return []
+        cached_values = redis.hmget(items_key, ids)
+        if all(val is not None for val in cached_values):
+            break
+
+    logger.debug(f"Redis Cache - hit {key}")
+    try:
+        return [json.loads(val) for val in cached_values if val is not None]
+    except Exception as e:
+        logger.warning(f"Unable to deserialize json cached response: {e}")
+        # Delete the list so that it may be properly re-cached
+        redis.delete(ids_key, items_key)
+        return None
+
+
+def use_redis_list_cache(
+    key,
+    ttl_sec,
+    offset: Optional[int],
+    limit: Optional[int],
+    id_key: str,
+    work_func: Callable[[], List[Dict]],
+):
+    """
+    Returns a slice of the list cached at `key`, otherwise caches the list
+    returned by `work_func` and returns its slice.
+    """
+    redis = redis_connection.get_redis()
+    cached_slice = get_list_cached_slice(redis, key, offset, limit)
+    if cached_slice is not None:
+        return cached_slice
+    to_cache = work_func()
+    set_list_cached_key(redis, key, to_cache, id_key, ttl_sec)
+    offset = offset or 0
+    return to_cache[offset:] if limit is None else to_cache[offset : offset + limit]
+
+
 def cache(**kwargs):
     """
     Cache decorator.
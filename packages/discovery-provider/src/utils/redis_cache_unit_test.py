@@ -10,7 +10,9 @@ from src.utils.redis_cache import (
     cache,
     get_all_json_cached_key,
     get_json_cached_key,
+    get_list_cached_slice,
     set_json_cached_key,
+    set_list_cached_key,
 )
 
 
@@ -54,6 +56,27 @@ def test_json_cache_date_value(redis_mock):
     assert parser.parse(result["date"]) == date
 
 
+def test_list_cache_slice(redis_mock):
+    """Test that pages of a cached list are read without the rest of the list"""
+    assert get_list_cached_slice(redis_mock, "key", 0, 10) is None
+
+    items = [{"track_id": i, "title": f"track {i}"} for i in range(1, 6)]
+    set_list_cached_key(redis_mock, "key", items, "track_id")
+    assert get_list_cached_slice(redis_mock, "key") == items
+    assert get_list_cached_slice(redis_mock, "key", 0, 2) == items[:2]
+    assert get_list_cached_slice(redis_mock, "key", 3, 10) == items[3:]
+    assert get_list_cached_slice(redis_mock, "key", 10, 10) == []
+    assert get_list_cached_slice(redis_mock, "key", 0, 0) == []
+
+    # replacing the list drops items that are no longer in it
+    set_list_cached_key(redis_mock, "key", items[:1], "track_id")
+    assert get_list_cached_slice(redis_mock, "key", 0, 10) == items[:1]
+
+    # an empty list is still cached
+    set_list_cached_key(redis_mock, "key", [], "track_id")
+    assert get_list_cached_slice(redis_mock, "key", 0, 10) == []
+
+
 def test_cache_decorator(redis_mock):
     """Test that the redis cache decorator works"""
 
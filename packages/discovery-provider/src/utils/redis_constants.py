@@ -13,6 +13,7 @@ index_aggregate_user_last_refresh_completion_redis_key = (
 
 trending_tracks_last_completion_redis_key = "trending:tracks:last-completion"
 trending_playlists_last_completion_redis_key = "trending-playlists:last-completion"
+trending_scores_last_full_rebuild_redis_key = "trending:scores:last-full-rebuild"
 challenges_last_processed_event_redis_key = "challenges:last-processed-event"
 user_balances_refresh_last_completion_redis_key = "user_balances:last-completion"
 latest_legacy_play_db_key = "latest_legacy_play_db_key"
@@ -78,3 +79,8 @@ USER_DELIST_DISCREPANCIES_KEY = "user_delist_discrepancies"
 # Track delist discrepancy keys
 TRACK_DELIST_DISCREPANCIES_TIMESTAMP_KEY = "track_delist_discrepancies_timestamp"
 TRACK_DELIST_DISCREPANCIES_KEY = "track_delist_discrepancies"
+
+# Last user id whose unread notification counts were reconciled
+notification_unread_counts_reconcile_cursor_key = (
+    "notification_unread_counts:reconcile-cursor"
+)
@@ -1,7 +1,12 @@
+import atexit
 import functools
 import json
 import logging  # pylint: disable=C0302
+import os
+import threading
+from collections import defaultdict
 from datetime import datetime, timedelta
+from typing import Dict, Set, Tuple
 
 from flask import Response as fResponse
 from flask.globals import request
@@ -71,6 +76,26 @@ datetime_format_secondary = "%Y/%m/%d:%H:%M"
 day_format = datetime_format_secondary.split(":", maxsplit=1)[0]
 
 
+# Personal metrics are kept in one hash per minute for two metrics intervals
+PERSONAL_METRICS_TTL_SEC = (METRICS_INTERVAL * 2 + 1) * 60
+# Daily metrics are kept through the next day and monthly metrics for 31 days
+# after the month starts
+DAILY_METRICS_TTL_SEC = 2 * 24 * 60 * 60
+MONTHLY_METRICS_TTL_SEC = 62 * 24 * 60 * 60
+# Request metrics are buffered in each process and flushed to redis on an
+# interval, or early once this many requests are buffered
+METRICS_BUFFER_FLUSH_INTERVAL_SEC = 0.25
+METRICS_BUFFER_MAX_SIZE = 1000
+
+
+def get_dated_metrics_key(key, date_str):
+    """
+    Returns the redis key for the metrics stored under `key` for a day, month
+    or minute, e.g. summed_unique_daily_metrics:2023/01/01
+    """
+    return f"{key}:{date_str}"
+
+
 def get_rounded_date_time():
     return datetime.utcnow().replace(minute=0, second=0, microsecond=0)
 
@@ -409,75 +434,58 @@ def persist_app_metrics(db, day, month, app_count):
 def cache_metrics(metrics, day, month, metric_type, daily_key, monthly_key):
     """
     Update the cached unique and total metrics for metric_type (route or app)
-    stored at daily_key for daily metrics and monthly_key for monthly_metrics.
-    Clean up old metrics from cache.
-    """
-    daily_metrics_str = REDIS.get(daily_key)
-    daily_metrics = json.loads(daily_metrics_str) if daily_metrics_str else {}
+    stored under daily_key for daily metrics and monthly_key for monthly_metrics.
 
-    monthly_metrics_str = REDIS.get(monthly_key)
-    monthly_metrics = json.loads(monthly_metrics_str) if monthly_metrics_str else {}
-
-    if day not in daily_metrics:
-        daily_metrics[day] = {}
-    if month not in monthly_metrics:
-        monthly_metrics[month] = {}
-
-    # only relevant for unique users metrics
-    unique_daily_count = 0
-    unique_monthly_count = 0
+    Route metrics (IPs) are added to a HyperLogLog per day and per month, and
+    the number of new unique IPs is the change in their counts. App metrics
+    are added to a hash of app name to count per day and per month.
+    Old metrics expire from the cache.
+    """
+    daily_metrics_key = get_dated_metrics_key(daily_key, day)
+    monthly_metrics_key = get_dated_metrics_key(monthly_key, month)
 
     # only relevant for app metrics
     app_count = {}
 
-    # update daily and monthly metrics, which could be route metrics or app metrics
-    # if route metrics, new_value and new_count would be an IP and the number of requests from it
-    # otherwise, new_value and new_count would be an app and the number of requests from it
+    if metric_type == "route":
+        if not metrics:
+            return 0, 0, app_count
+        values = list(metrics.keys())
+        pipe = REDIS.pipeline(transaction=False)
+        pipe.pfcount(daily_metrics_key)
+        pipe.pfadd(daily_metrics_key, *values)
+        pipe.pfcount(daily_metrics_key)
+        pipe.expire(daily_metrics_key, DAILY_METRICS_TTL_SEC)
+        pipe.pfcount(monthly_metrics_key)
+        pipe.pfadd(monthly_metrics_key, *values)
+        pipe.pfcount(monthly_metrics_key)
+        pipe.expire(monthly_metrics_key, MONTHLY_METRICS_TTL_SEC)
+        (
+            daily_count_before,
+            _,
+            daily_count_after,
+            _,
+            monthly_count_before,
+            _,
+            monthly_count_after,
+            _,
+        ) = pipe.execute()
+        unique_daily_count = daily_count_after - daily_count_before
+        unique_monthly_count = monthly_count_after - monthly_count_before
+        logger.info(f"updated cached {daily_key} and {monthly_key}")
+        return unique_daily_count, unique_monthly_count, app_count
+
+    pipe = REDIS.pipeline(transaction=False)
     for new_value, new_count in metrics.items():
-        if metric_type == "route" and new_value not in daily_metrics[day]:
-            unique_daily_count += 1
-        if metric_type == "route" and new_value not in monthly_metrics[month]:
-            unique_monthly_count += 1
-        if metric_type == "app":
-            app_count[new_value] = new_count
-        daily_metrics[day][new_value] = (
-            daily_metrics[day][new_value] + new_count
-            if new_value in daily_metrics[day]
-            else new_count
-        )
-        monthly_metrics[month][new_value] = (
-            monthly_metrics[month][new_value] + new_count
-            if new_value in monthly_metrics[month]
-            else new_count
-        )
-
-    # clean up metrics METRICS_INTERVAL after the end of the day from daily_metrics
-    yesterday_str = (datetime.utcnow() - timedelta(days=1)).strftime(
-        datetime_format_secondary
-    )
-    daily_metrics = {
-        timestamp: metrics
-        for timestamp, metrics in daily_metrics.items()
-        if timestamp > yesterday_str
-    }
-    if daily_metrics:
-        REDIS.set(daily_key, json.dumps(daily_metrics))
-    logger.info(f"updated cached {daily_key}")
-
-    # clean up metrics METRICS_INTERVAL after the end of the month from monthly_metrics
-    thirty_one_days_ago = (datetime.utcnow() - timedelta(days=31)).strftime(
-        datetime_format_secondary
-    )
-    monthly_metrics = {
-        timestamp: metrics
-        for timestamp, metrics in monthly_metrics.items()
-        if timestamp > thirty_one_days_ago
-    }
-    if monthly_metrics:
-        REDIS.set(monthly_key, json.dumps(monthly_metrics))
-    logger.info(f"updated cached {monthly_key}")
+        app_count[new_value] = new_count
+        pipe.hincrby(daily_metrics_key, new_value, new_count)
+        pipe.hincrby(monthly_metrics_key, new_value, new_count)
+    pipe.expire(daily_metrics_key, DAILY_METRICS_TTL_SEC)
+    pipe.expire(monthly_metrics_key, MONTHLY_METRICS_TTL_SEC)
+    pipe.execute()
+    logger.info(f"updated cached {daily_key} and {monthly_key}")
 
-    return unique_daily_count, unique_monthly_count, app_count
+    return 0, 0, app_count
 
 
 def merge_metrics(metrics, end_time, metric_type, db, are_personal_metrics):
@@ -556,19 +564,37 @@ def merge_app_metrics(metrics, end_time, db):
 
 
 def get_redis_metrics(redis_handle, start_time, metric_type):
-    redis_metrics_str = redis_handle.get(metric_type)
-    metrics = json.loads(redis_metrics_str) if redis_metrics_str else {}
-    if not metrics:
-        return {}
-
+    """
+    Sums the per minute hashes of personal metrics recorded after start_time.
+    """
     # if route metrics, value and count would be an IP and the number of requests from it
     # otherwise, value and count would be an app and the number of requests from it
+    now = datetime.utcnow()
+    bucket_time = max(
+        start_time, now - timedelta(seconds=PERSONAL_METRICS_TTL_SEC)
+    ).replace(second=0, microsecond=0)
+    bucket_times = []
+    while bucket_time <= now:
+        if bucket_time > start_time:
+            bucket_times.append(bucket_time)
+        bucket_time += timedelta(minutes=1)
+    if not bucket_times:
+        return {}
+
+    pipe = redis_handle.pipeline(transaction=False)
+    for bucket_time in bucket_times:
+        pipe.hgetall(
+            get_dated_metrics_key(
+                metric_type, bucket_time.strftime(datetime_format_secondary)
+            )
+        )
+
     result = {}
-    for datetime_str, value_counts in metrics.items():
-        datetime_obj = datetime.strptime(datetime_str, datetime_format_secondary)
-        if datetime_obj > start_time:
-            for value, count in value_counts.items():
-                result[value] = result[value] + count if value in result else count
+    for value_counts in pipe.execute():
+        for value, count in value_counts.items():
+            if isinstance(value, bytes):
+                value = value.decode("utf-8")
+            result[value] = result.get(value, 0) + int(count)
 
     return result
 
@@ -585,29 +611,10 @@ def get_summed_unique_metrics(start_time):
     day = start_time.strftime(day_format)
     month = f"{day[:7]}/01"
 
-    summed_unique_daily_metrics_str = REDIS.get(summed_unique_daily_metrics)
-    summed_unique_daily_metrics_obj = (
-        json.loads(summed_unique_daily_metrics_str)
-        if summed_unique_daily_metrics_str
-        else {}
-    )
-    summed_unique_daily_count = (
-        len(summed_unique_daily_metrics_obj[day])
-        if day in summed_unique_daily_metrics_obj
-        else 0
-    )
-
-    summed_unique_monthly_metrics_str = REDIS.get(summed_unique_monthly_metrics)
-    summed_unique_monthly_metrics_obj = (
-        json.loads(summed_unique_monthly_metrics_str)
-        if summed_unique_monthly_metrics_str
-        else {}
-    )
-    summed_unique_monthly_count = (
-        len(summed_unique_monthly_metrics_obj[month])
-        if month in summed_unique_monthly_metrics_obj
-        else 0
-    )
+    pipe = REDIS.pipeline(transaction=False)
+    pipe.pfcount(get_dated_metrics_key(summed_unique_daily_metrics, day))
+    pipe.pfcount(get_dated_metrics_key(summed_unique_monthly_metrics, month))
+    summed_unique_daily_count, summed_unique_monthly_count = pipe.execute()
 
     return {"daily": summed_unique_daily_count, "monthly": summed_unique_monthly_count}
 
@@ -617,96 +624,134 @@ def get_aggregate_metrics_info():
     return json.loads(info_str) if info_str else {}
 
 
-def update_personal_metrics(key, old_timestamp, timestamp, value, metric_type):
-    values_str = REDIS.get(key)
-    values = json.loads(values_str) if values_str else {}
-    if timestamp in values:
-        values[timestamp][value] = (
-            values[timestamp][value] + 1 if value in values[timestamp] else 1
-        )
-    else:
-        values[timestamp] = {value: 1}
-
-    # clean up and update cached metrics
-    updated_metrics = {
-        timestamp: metrics
-        for timestamp, metrics in values.items()
-        if timestamp > old_timestamp
-    }
-    if updated_metrics:
-        REDIS.set(key, json.dumps(updated_metrics))
-    logger.debug(f"updated cached personal {metric_type} metrics")
-
-
-def update_summed_unique_metrics(now, ip):
-    thirty_one_days_ago = now - timedelta(days=31)
-    thirty_one_days_ago_str = thirty_one_days_ago.strftime(day_format)
-    yesterday = now - timedelta(days=1)
-    yesterday_str = yesterday.strftime(day_format)
-    today_str = now.strftime(day_format)
+def update_personal_metrics(pipe, key, timestamp, value, count=1):
+    bucket_key = get_dated_metrics_key(key, timestamp)
+    pipe.hincrby(bucket_key, value, count)
+    pipe.expire(bucket_key, PERSONAL_METRICS_TTL_SEC)
+
+
+def update_summed_unique_metrics(pipe, today_str, ips):
     this_month_str = f"{today_str[:7]}/01"
 
-    summed_unique_daily_metrics_str = REDIS.get(summed_unique_daily_metrics)
-    summed_unique_daily_metrics_obj = (
-        json.loads(summed_unique_daily_metrics_str)
-        if summed_unique_daily_metrics_str
-        else {}
-    )
-    if today_str not in summed_unique_daily_metrics_obj:
-        summed_unique_daily_metrics_obj[today_str] = [ip]
-    elif ip not in summed_unique_daily_metrics_obj[today_str]:
-        summed_unique_daily_metrics_obj[today_str] = summed_unique_daily_metrics_obj[
-            today_str
-        ] + [ip]
-    summed_unique_daily_metrics_obj = {
-        timestamp: ips
-        for timestamp, ips in summed_unique_daily_metrics_obj.items()
-        if timestamp >= yesterday_str
-    }
-    REDIS.set(summed_unique_daily_metrics, json.dumps(summed_unique_daily_metrics_obj))
-
-    summed_unique_monthly_metrics_str = REDIS.get(summed_unique_monthly_metrics)
-    summed_unique_monthly_metrics_obj = (
-        json.loads(summed_unique_monthly_metrics_str)
-        if summed_unique_monthly_metrics_str
-        else {}
-    )
-    if this_month_str not in summed_unique_monthly_metrics_obj:
-        summed_unique_monthly_metrics_obj[this_month_str] = [ip]
-    elif ip not in summed_unique_monthly_metrics_obj[this_month_str]:
-        summed_unique_monthly_metrics_obj[
-            this_month_str
-        ] = summed_unique_monthly_metrics_obj[this_month_str] + [ip]
-    summed_unique_monthly_metrics_obj = {
-        timestamp: ips
-        for timestamp, ips in summed_unique_monthly_metrics_obj.items()
-        if timestamp >= thirty_one_days_ago_str
-    }
-    REDIS.set(
-        summed_unique_monthly_metrics,
-        json.dumps(summed_unique_monthly_metrics_obj),
-    )
+    daily_key = get_dated_metrics_key(summed_unique_daily_metrics, today_str)
+    pipe.pfadd(daily_key, *ips)
+    pipe.expire(daily_key, DAILY_METRICS_TTL_SEC)
 
+    monthly_key = get_dated_metrics_key(summed_unique_monthly_metrics, this_month_str)
+    pipe.pfadd(monthly_key, *ips)
+    pipe.expire(monthly_key, MONTHLY_METRICS_TTL_SEC)
 
-def record_aggregate_metrics():
-    now = datetime.utcnow()
-    timestamp = now.strftime(datetime_format_secondary)
-    old_timestamp = (now - timedelta(minutes=METRICS_INTERVAL * 2)).strftime(
-        datetime_format_secondary
-    )
-    ip = get_request_ip(request)
 
-    update_summed_unique_metrics(now, ip)
+class MetricsBuffer:
+    """
+    Per process buffer of request metrics.
 
-    update_personal_metrics(
-        personal_route_metrics, old_timestamp, timestamp, ip, "route"
-    )
+    Requests only update in-memory counts. A background thread sends them to
+    redis in a single pipeline every `flush_interval_sec`, or sooner once
+    `max_size` requests have been buffered. Anything left is flushed when the
+    process exits.
+
+    With `start_thread=False` neither the thread nor the exit hook is started
+    and the caller is responsible for calling `flush`.
+    """
+
+    def __init__(
+        self,
+        redis,
+        flush_interval_sec=METRICS_BUFFER_FLUSH_INTERVAL_SEC,
+        max_size=METRICS_BUFFER_MAX_SIZE,
+        start_thread=True,
+    ):
+        self.redis = redis
+        self.flush_interval_sec = flush_interval_sec
+        self.max_size = max_size
+        self.start_thread = start_thread
+        self._lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._pid = None
+        self._reset()
+
+    def _reset(self):
+        # day -> ips seen that day
+        self._summed_unique_ips: Dict[str, Set[str]] = defaultdict(set)
+        # (key, minute timestamp, ip or app name) -> count
+        self._personal_counts: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._size = 0
+
+    def record(self, now, ip, application_name=None):
+        self._ensure_started()
+        timestamp = now.strftime(datetime_format_secondary)
+        with self._lock:
+            self._summed_unique_ips[now.strftime(day_format)].add(ip)
+            self._personal_counts[(personal_route_metrics, timestamp, ip)] += 1
+            if application_name:
+                self._personal_counts[
+                    (personal_app_metrics, timestamp, application_name)
+                ] += 1
+            self._size += 1
+            is_full = self._size >= self.max_size
+        if is_full:
+            self._flush_event.set()
+
+    def flush(self):
+        with self._lock:
+            if not self._size:
+                return
+            summed_unique_ips = self._summed_unique_ips
+            personal_counts = self._personal_counts
+            self._reset()
+
+        pipe = self.redis.pipeline(transaction=False)
+        for today_str, ips in summed_unique_ips.items():
+            update_summed_unique_metrics(pipe, today_str, ips)
+        for (key, timestamp, value), count in personal_counts.items():
+            update_personal_metrics(pipe, key, timestamp, value, count)
+        pipe.execute()
+        logger.debug("flushed buffered request metrics")
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            # Started lazily so each forked worker gets its own flush thread
+            # and does not inherit metrics recorded by its parent
+            if self._pid is None and self.start_thread:
+                atexit.register(self._flush_on_exit)
+            self._pid = pid
+            self._reset()
+            if self.start_thread:
+                threading.Thread(
+                    target=self._run, name="metrics_buffer", daemon=True
+                ).start()
+
+    def _run(self):
+        while True:
+            self._flush_event.wait(self.flush_interval_sec)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error while flushing request metrics: {e}")
+
+    def _flush_on_exit(self):
+        if self._pid != os.getpid():
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Error while flushing request metrics on exit: {e}")
 
+
+metrics_buffer = MetricsBuffer(REDIS)
+
+
+def record_aggregate_metrics():
+    ip = get_request_ip(request)
     application_name = request.args.get(app_name_param, type=str, default=None)
-    if application_name:
-        update_personal_metrics(
-            personal_app_metrics, old_timestamp, timestamp, application_name, "app"
-        )
+    metrics_buffer.record(datetime.utcnow(), ip, application_name)
 
 
 # Metrics decorator.
@@ -1,6 +1,7 @@
-from typing import List
+from typing import Dict, List, Sequence
 
 import crc32c
+import numpy as np
 
 
 # Python equivalent of https://github.com/tysonmote/rendezvous/blob/be0258dbbd3d/rendezvous.go
@@ -13,23 +14,112 @@ class RendezvousHash:
             self.nodes.append(bytes(node, "utf-8"))
 
     def get(self, key: str) -> str:
+        key_bytes = bytes(key, "utf-8")
         max_node = max(
             (node for node in self.nodes),
             default=None,
-            key=lambda node: self.hash(node, bytes(key, "utf-8")),
+            key=lambda node: self.hash(node, key_bytes),
         )
         return max_node.decode("utf-8") if max_node is not None else ""
 
     def get_n(self, n: int, key: str) -> List[str]:
-        scores = [(self.hash(node, bytes(key, "utf-8")), node) for node in self.nodes]
+        key_bytes = bytes(key, "utf-8")
+        scores = [(self.hash(node, key_bytes), node) for node in self.nodes]
         scores.sort(key=lambda x: (-x[0], x[1]))
         return [node.decode("utf-8") for _, node in scores[:n]]
 
     def get_nodes(self) -> List[str]:
         return [node.decode("utf-8") for node in self.nodes]
 
+    def get_many(self, keys: Sequence[str]) -> List[str]:
+        """Batch version of `get`, returns the highest scoring node for each key."""
+        if not self.nodes:
+            return ["" for _ in keys]
+        if not keys:
+            return []
+        # argmax returns the first max like `max` does in `get`
+        max_indexes = self.score_many(keys).argmax(axis=1)
+        nodes = self.get_nodes()
+        return [nodes[i] for i in max_indexes]
+
+    def score_many(self, keys: Sequence[str]) -> np.ndarray:
+        """
+        Returns a (len(keys), len(nodes)) uint32 matrix of `hash(node, key)`.
+
+        Rather than hashing every key + node pair, this uses the fact that
+        crc32c is affine over xor for messages of equal length:
+
+            crc(key + node) = crc(key + 0*len(node))
+                              ^ crc(0*len(key) + node)
+                              ^ crc(0*(len(key) + len(node)))
+
+        The first term is computed from crc(key) for each distinct node length
+        with a vectorized GF(2) matrix multiply, and the last two only depend
+        on the node and the key length, so they are computed once per distinct
+        key length. The result is bit-for-bit equal to `hash`.
+        """
+        key_bytes = [bytes(key, "utf-8") for key in keys]
+        node_lengths = np.array([len(node) for node in self.nodes], dtype=np.int64)
+        scores = np.empty((len(key_bytes), len(self.nodes)), dtype=np.uint32)
+        if not key_bytes or not self.nodes:
+            return scores
+
+        key_crcs = np.fromiter(
+            (crc32c.crc32c(key) for key in key_bytes),
+            dtype=np.uint32,
+            count=len(key_bytes),
+        )
+        for node_length in np.unique(node_lengths):
+            scores[:, node_lengths == node_length] = _append_zeros(
+                key_crcs, int(node_length)
+            )[:, None]
+
+        key_lengths = np.array([len(key) for key in key_bytes], dtype=np.int64)
+        unique_key_lengths, key_length_indexes = np.unique(
+            key_lengths, return_inverse=True
+        )
+        node_terms = np.array(
+            [
+                [
+                    crc32c.crc32c(bytes(int(key_length)) + node)
+                    ^ crc32c.crc32c(bytes(int(key_length) + len(node)))
+                    for node in self.nodes
+                ]
+                for key_length in unique_key_lengths
+            ],
+            dtype=np.uint32,
+        )
+        scores ^= node_terms[key_length_indexes.reshape(-1)]
+        return scores
+
     @staticmethod
     def hash(node: bytes, key: bytes) -> int:
         combined = key + node
         # Convert to unsigned 32-bit integer to match golang uint32 here: https://github.com/tysonmote/rendezvous/blob/be0258dbbd3d/rendezvous.go#L92
         return crc32c.crc32c(combined) & 0xFFFFFFFF
+
+
+# Affine map from crc(m) to crc(m + 0*length), keyed by length
+_append_zeros_maps: Dict[int, np.ndarray] = {}
+
+
+def _append_zeros(crcs: np.ndarray, length: int) -> np.ndarray:
+    """Returns crc(m + 0*length) for each crc(m) in `crcs`."""
+    append_zeros_map = _append_zeros_maps.get(length)
+    if append_zeros_map is None:
+        zeros = bytes(length)
+        constant = crc32c.crc32c(zeros, 0)
+        # Row 0 is the constant term, row b + 1 the contribution of bit b
+        append_zeros_map = np.array(
+            [constant]
+            + [crc32c.crc32c(zeros, 1 << bit) ^ constant for bit in range(32)],
+            dtype=np.uint32,
+        )
+        _append_zeros_maps[length] = append_zeros_map
+
+    result = np.full(crcs.shape, append_zeros_map[0], dtype=np.uint32)
+    for bit in range(32):
+        result ^= np.where((crcs >> bit) & 1, append_zeros_map[bit + 1], 0).astype(
+            np.uint32
+        )
+    return result
@@ -67,3 +67,34 @@ def test_hash_get_n(n, key, expected):
     hash_obj.add("a", "b", "c", "d", "e")
     got_nodes = hash_obj.get_n(n, key)
     assert got_nodes == expected
+
+
+def test_hash_get_many():
+    hash_obj = RendezvousHash("a", "b", "c", "d", "e")
+    assert hash_obj.get_many(["", "foo", "bar"]) == ["d", "e", "c"]
+    assert hash_obj.get_many([]) == []
+    assert RendezvousHash().get_many(["foo"]) == [""]
+
+
+def test_score_many_matches_hash():
+    nodes = [
+        "https://creatornode.audius.co",
+        "https://creatornode2.audius.co",
+        "https://cn1.content.example.com",
+        "http://cn4_creator-node_1:4000",
+        "",
+    ]
+    keys = [
+        "",
+        "QmQSSnQKTAmrfuiY2nr2yjzMGr1Gr2SzYPDpDt4FcstDDe",
+        "baeaaaiqsea7fukrfaacrmxqkrwfgmmzcyrqzsm2rz5mgpuzy37xmv2czqtezgbiq",
+        "ü",
+    ]
+    hash_obj = RendezvousHash(*nodes)
+    scores = hash_obj.score_many(keys)
+    assert scores.shape == (len(keys), len(nodes))
+    for i, key in enumerate(keys):
+        for j, node in enumerate(nodes):
+            assert scores[i][j] == RendezvousHash.hash(
+                bytes(node, "utf-8"), bytes(key, "utf-8")
+            )
@@ -0,0 +1,335 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from flask import has_app_context
+from sqlalchemy import text
+
+from src.utils.config import shared_config
+from src.utils.db_session import get_db_read_replica
+
+logger = logging.getLogger(__name__)
+
+# New follows and unfollows are pulled from the follows table this often
+SOCIAL_GRAPH_SYNC_INTERVAL_SEC = 5
+# The graph is rebuilt from the follows table once this many follows changed
+# since it was last built, which folds the changes back into the arrays
+SOCIAL_GRAPH_MAX_CHANGES = 100_000
+SOCIAL_GRAPH_LOAD_BATCH_SIZE = 100_000
+
+EMPTY_USER_IDS = np.empty(0, dtype=np.int32)
+
+# (follower_user_id, followee_user_id, is_delete, blocknumber, blockhash)
+FollowChange = Tuple[int, int, bool, int, str]
+
+load_follows_query = text(
+    """
+    SELECT
+        follower_user_id,
+        followee_user_id
+    FROM
+        follows
+    WHERE
+        is_current IS TRUE
+        AND is_delete IS FALSE;
+    """
+)
+
+latest_follow_block_query = text(
+    """
+    SELECT
+        blocknumber,
+        blockhash
+    FROM
+        follows
+    ORDER BY
+        blocknumber DESC
+    LIMIT 1;
+    """
+)
+
+# Reverted blocks are deleted from the blocks table
+block_exists_query = text("SELECT 1 FROM blocks WHERE blockhash = :blockhash;")
+
+follow_changes_query = text(
+    """
+    SELECT
+        follower_user_id,
+        followee_user_id,
+        is_delete,
+        blocknumber,
+        blockhash
+    FROM
+        follows
+    WHERE
+        is_current IS TRUE
+        AND blocknumber > :blocknumber
+    ORDER BY
+        blocknumber ASC;
+    """
+)
+
+
+def is_social_graph_enabled() -> bool:
+    return shared_config["discprov"].get("social_graph_enabled", "false") == "true"
+
+
+def intersect_sorted(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersects two sorted arrays of unique ids in O(len(small) log len(large))."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return EMPTY_USER_IDS
+    indexes = np.searchsorted(b, a)
+    indexes[indexes == len(b)] = 0
+    return a[b[indexes] == a]
+
+
+class Adjacency:
+    """
+    Sorted neighbor ids of every user packed into one array (compressed sparse
+    rows) indexed by user id, with the edges changed since it was built kept in
+    per-user sets on top.
+    """
+
+    def __init__(self, sources: np.ndarray, targets: np.ndarray):
+        order = np.lexsort((targets, sources))
+        sources = sources[order]
+        targets = targets[order]
+        # drop duplicate edges
+        is_unique = np.ones(len(sources), dtype=bool)
+        is_unique[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        sources = sources[is_unique]
+
+        size = int(sources.max()) + 1 if len(sources) else 0
+        self.offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=self.offsets[1:])
+        self.targets = targets[is_unique].astype(np.int32)
+        self.added: Dict[int, Set[int]] = {}
+        self.removed: Dict[int, Set[int]] = {}
+
+    def _get_built(self, source: int) -> np.ndarray:
+        if source < 0 or source + 1 >= len(self.offsets):
+            return EMPTY_USER_IDS
+        return self.targets[self.offsets[source] : self.offsets[source + 1]]
+
+    def _has_built(self, source: int, target: int) -> bool:
+        targets = self._get_built(source)
+        index = np.searchsorted(targets, target)
+        return bool(index < len(targets) and targets[index] == target)
+
+    def get(self, source: int) -> np.ndarray:
+        targets = self._get_built(source)
+        removed = self.removed.get(source)
+        if removed:
+            targets = targets[~np.isin(targets, list(removed))]
+        added = self.added.get(source)
+        if added:
+            targets = np.union1d(targets, np.fromiter(added, dtype=np.int32))
+        return targets
+
+    def add(self, source: int, target: int):
+        self.removed.get(source, set()).discard(target)
+        if not self._has_built(source, target):
+            self.added.setdefault(source, set()).add(target)
+
+    def remove(self, source: int, target: int):
+        self.added.get(source, set()).discard(target)
+        if self._has_built(source, target):
+            self.removed.setdefault(source, set()).add(target)
+
+
+class SocialGraph:
+    """
+    Process-local copy of the current follows, for follow set intersections
+    that are too slow to compute in SQL on every request.
+    """
+
+    def __init__(
+        self,
+        follower_user_ids: np.ndarray,
+        followee_user_ids: np.ndarray,
+        blocknumber,
+        blockhash: Optional[str] = None,
+    ):
+        self.followees = Adjacency(follower_user_ids, followee_user_ids)
+        self.followers = Adjacency(followee_user_ids, follower_user_ids)
+        # Follows up to this block are in the graph
+        self.blocknumber = blocknumber
+        self.blockhash = blockhash
+        self.change_count = 0
+        self._lock = threading.Lock()
+
+    def apply_changes(self, changes: Iterable[FollowChange]):
+        with self._lock:
+            for (
+                follower_user_id,
+                followee_user_id,
+                is_delete,
+                blocknumber,
+                blockhash,
+            ) in changes:
+                if is_delete:
+                    self.followees.remove(follower_user_id, followee_user_id)
+                    self.followers.remove(followee_user_id, follower_user_id)
+                else:
+                    self.followees.add(follower_user_id, followee_user_id)
+                    self.followers.add(followee_user_id, follower_user_id)
+                if blocknumber >= self.blocknumber:
+                    self.blocknumber = blocknumber
+                    self.blockhash = blockhash
+                self.change_count += 1
+
+    def get_followees(self, user_id: int) -> np.ndarray:
+        with self._lock:
+            return self.followees.get(user_id)
+
+    def get_followers(self, user_id: int) -> np.ndarray:
+        with self._lock:
+            return self.followers.get(user_id)
+
+    def get_follow_intersection(
+        self, followee_user_id: int, follower_user_id: int
+    ) -> np.ndarray:
+        """Users followed by `follower_user_id` who follow `followee_user_id`."""
+        return intersect_sorted(
+            self.get_followers(followee_user_id), self.get_followees(follower_user_id)
+        )
+
+    def get_mutuals(self, user_id: int) -> np.ndarray:
+        """Users who follow `user_id` and are followed back."""
+        return intersect_sorted(
+            self.get_followers(user_id), self.get_followees(user_id)
+        )
+
+    def get_followee_follow_counts(
+        self, user_id: int, user_ids: List[int]
+    ) -> Dict[int, int]:
+        """
+        Number of users followed by `user_id` who follow each of `user_ids`,
+        users with no such followees are left out.
+        """
+        followees = self.get_followees(user_id)
+        counts = {}
+        for other_user_id in user_ids:
+            count = len(intersect_sorted(followees, self.get_followers(other_user_id)))
+            if count:
+                counts[other_user_id] = count
+        return counts
+
+
+def load_social_graph(session) -> SocialGraph:
+    # Changes committed while the follows are read are applied again on the
+    # first sync, which is a no-op for follows that are already in the graph
+    latest_follow_block = session.execute(latest_follow_block_query).first()
+    blocknumber, blockhash = latest_follow_block or (0, None)
+    result = session.execute(load_follows_query.execution_options(stream_results=True))
+    chunks = []
+    while True:
+        rows = result.fetchmany(SOCIAL_GRAPH_LOAD_BATCH_SIZE)
+        if not rows:
+            break
+        chunks.append(
+            np.fromiter(
+                itertools.chain.from_iterable(rows),
+                dtype=np.int32,
+                count=len(rows) * 2,
+            ).reshape(-1, 2)
+        )
+    follows = np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int32)
+    return SocialGraph(follows[:, 0], follows[:, 1], blocknumber, blockhash)
+
+
+def is_social_graph_reverted(session, graph: SocialGraph) -> bool:
+    """
+    Whether the latest block synced into the graph was reverted. Reverts
+    delete follows rather than adding rows, so the graph is rebuilt instead.
+    """
+    if graph.blockhash is None:
+        return False
+    return (
+        session.execute(block_exists_query, {"blockhash": graph.blockhash}).scalar()
+        is None
+    )
+
+
+def sync_social_graph(session, graph: SocialGraph) -> int:
+    """Applies the follows indexed since the graph was last synced."""
+    changes = session.execute(
+        follow_changes_query, {"blocknumber": graph.blocknumber}
+    ).fetchall()
+    graph.apply_changes(changes)
+    return len(changes)
+
+
+class SocialGraphLoader:
+    """
+    Loads the social graph in the background and keeps it in sync.
+
+    The loader thread is started lazily so each forked worker loads its own
+    graph. Until the first load finishes there is no graph and callers fall
+    back to SQL.
+    """
+
+    def __init__(self, sync_interval_sec: float = SOCIAL_GRAPH_SYNC_INTERVAL_SEC):
+        self.sync_interval_sec = sync_interval_sec
+        self.graph: Optional[SocialGraph] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self, db):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            # a graph inherited from the parent process has no thread syncing it
+            self.graph = None
+            threading.Thread(
+                target=self._run,
+                args=(db,),
+                name="social_graph",
+                daemon=True,
+            ).start()
+
+    def _run(self, db):
+        while True:
+            try:
+                with db.scoped_session() as session:
+                    if (
+                        self.graph is None
+                        or self.graph.change_count > SOCIAL_GRAPH_MAX_CHANGES
+                        or is_social_graph_reverted(session, self.graph)
+                    ):
+                        start_time = time.time()
+                        graph = load_social_graph(session)
+                        self.graph = graph
+                        logger.info(
+                            f"social_graph.py | Loaded {len(graph.followees.targets)} follows in {time.time() - start_time} sec"
+                        )
+                    else:
+                        sync_social_graph(session, self.graph)
+            except Exception as e:
+                logger.error(f"social_graph.py | Error syncing social graph {e}")
+            time.sleep(self.sync_interval_sec)
+
+
+social_graph_loader = SocialGraphLoader()
+
+
+def get_social_graph() -> Optional[SocialGraph]:
+    """
+    Returns the process-local social graph, or None when it is disabled or
+    still loading.
+    """
+    if not is_social_graph_enabled():
+        return None
+    if has_app_context():
+        social_graph_loader.ensure_started(get_db_read_replica())
+    return social_graph_loader.graph
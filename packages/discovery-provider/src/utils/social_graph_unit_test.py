@@ -0,0 +1,79 @@
+from unittest import mock
+
+import numpy as np
+
+from src.utils.social_graph import (
+    SocialGraph,
+    intersect_sorted,
+    is_social_graph_reverted,
+)
+
+
+def make_graph(follows, blocknumber=10):
+    follows = np.array(follows, dtype=np.int32)
+    return SocialGraph(follows[:, 0], follows[:, 1], blocknumber)
+
+
+def test_intersect_sorted():
+    a = np.array([1, 3, 5, 7, 9], dtype=np.int32)
+    b = np.array([2, 3, 9, 10, 11], dtype=np.int32)
+    assert intersect_sorted(a, b).tolist() == [3, 9]
+    assert intersect_sorted(b, a).tolist() == [3, 9]
+    assert intersect_sorted(a, np.array([], dtype=np.int32)).tolist() == []
+
+
+def test_social_graph():
+    # (follower, followee)
+    graph = make_graph([(1, 2), (1, 3), (2, 1), (3, 2), (4, 2), (4, 3), (1, 2)])
+
+    assert graph.get_followees(1).tolist() == [2, 3]
+    assert graph.get_followers(2).tolist() == [1, 3, 4]
+    assert graph.get_followers(10).tolist() == []
+    assert graph.get_mutuals(1).tolist() == [2]
+    # users followed by 1 who follow 2
+    assert graph.get_follow_intersection(2, 1).tolist() == [3]
+    assert graph.get_followee_follow_counts(4, [1, 2, 3]) == {1: 1, 2: 1}
+    assert graph.get_followee_follow_counts(1, [1, 2, 3]) == {1: 1, 2: 1}
+
+
+def test_apply_changes():
+    graph = make_graph([(1, 2), (1, 3), (3, 2)])
+
+    graph.apply_changes(
+        [
+            # unfollow, follow a new user and a user past the end of the arrays
+            (1, 3, True, 11, "0x11"),
+            (1, 4, False, 11, "0x11"),
+            (20, 2, False, 12, "0x12"),
+            # follow again, follow twice
+            (1, 3, False, 13, "0x13"),
+            (1, 3, False, 13, "0x13"),
+            (3, 2, True, 14, "0x14"),
+        ]
+    )
+    assert graph.blocknumber == 14
+    assert graph.blockhash == "0x14"
+    assert graph.change_count == 6
+    assert graph.get_followees(1).tolist() == [2, 3, 4]
+    assert graph.get_followers(2).tolist() == [1, 20]
+    assert graph.get_followees(3).tolist() == []
+    assert graph.get_followees(20).tolist() == [2]
+    # 3 no longer follows 2
+    assert graph.get_followee_follow_counts(1, [2]) == {}
+
+
+def test_is_social_graph_reverted():
+    session = mock.Mock()
+    graph = make_graph([(1, 2)])
+    # no follows were indexed when the graph was loaded
+    assert not is_social_graph_reverted(session, graph)
+    session.execute.assert_not_called()
+
+    graph.apply_changes([(1, 3, False, 11, "0x11")])
+    session.execute.return_value.scalar.return_value = 1
+    assert not is_social_graph_reverted(session, graph)
+    assert session.execute.call_args.args[1] == {"blockhash": "0x11"}
+
+    # the block was reverted and deleted from the blocks table
+    session.execute.return_value.scalar.return_value = None
+    assert is_social_graph_reverted(session, graph)
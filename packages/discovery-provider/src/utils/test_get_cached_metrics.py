@@ -1,11 +1,15 @@
-import json
 from datetime import datetime, timedelta
 
 from src.utils.redis_metrics import (
+    MetricsBuffer,
     datetime_format_secondary,
+    day_format,
+    get_dated_metrics_key,
     get_redis_metrics,
     personal_app_metrics,
     personal_route_metrics,
+    summed_unique_daily_metrics,
+    summed_unique_monthly_metrics,
 )
 
 now = datetime.utcnow()
@@ -16,6 +20,12 @@ start_time = int((now - timedelta(minutes=3)).timestamp())
 start_time_obj = datetime.fromtimestamp(start_time)
 
 
+def set_cached_metrics(redis, key, metrics):
+    for timestamp, value_counts in metrics.items():
+        for value, count in value_counts.items():
+            redis.hincrby(get_dated_metrics_key(key, timestamp), value, count)
+
+
 def test_get_cached_route_metrics(redis_mock):
     metrics = {
         old_time.strftime(datetime_format_secondary): {"some-ip": 1, "other-ip": 2},
@@ -29,7 +39,7 @@ def test_get_cached_route_metrics(redis_mock):
             "another-ip": 3,
         },
     }
-    redis_mock.set(personal_route_metrics, json.dumps(metrics))
+    set_cached_metrics(redis_mock, personal_route_metrics, metrics)
 
     result = get_redis_metrics(redis_mock, start_time_obj, personal_route_metrics)
 
@@ -53,7 +63,7 @@ def test_get_cached_app_metrics(redis_mock):
             "another-app": 3,
         },
     }
-    redis_mock.set(personal_app_metrics, json.dumps(metrics))
+    set_cached_metrics(redis_mock, personal_app_metrics, metrics)
 
     result = get_redis_metrics(redis_mock, start_time_obj, personal_app_metrics)
 
@@ -62,3 +72,39 @@ def test_get_cached_app_metrics(redis_mock):
     assert result["some-other-app"] == 2
     assert result["top-app"] == 1
     assert result["some-app"] == 2
+
+
+def test_metrics_buffer_flush(redis_mock):
+    buffer = MetricsBuffer(redis_mock, start_thread=False)
+    buffer.record(recent_time_1, "1.2.3.4", "some-app")
+    buffer.record(recent_time_2, "1.2.3.4")
+    buffer.record(recent_time_2, "5.6.7.8", "some-app")
+
+    # Nothing is written until the buffer is flushed
+    assert get_redis_metrics(redis_mock, start_time_obj, personal_route_metrics) == {}
+
+    buffer.flush()
+    assert get_redis_metrics(redis_mock, start_time_obj, personal_route_metrics) == {
+        "1.2.3.4": 2,
+        "5.6.7.8": 1,
+    }
+    assert get_redis_metrics(redis_mock, start_time_obj, personal_app_metrics) == {
+        "some-app": 2
+    }
+
+    day = recent_time_2.strftime(day_format)
+    month = f"{day[:7]}/01"
+    assert (
+        redis_mock.pfcount(get_dated_metrics_key(summed_unique_daily_metrics, day)) == 2
+    )
+    assert (
+        redis_mock.pfcount(get_dated_metrics_key(summed_unique_monthly_metrics, month))
+        == 2
+    )
+
+    # Flushing an empty buffer is a no-op
+    buffer.flush()
+    assert get_redis_metrics(redis_mock, start_time_obj, personal_route_metrics) == {
+        "1.2.3.4": 2,
+        "5.6.7.8": 1,
+    }
@@ -3,19 +3,22 @@ from sqlalchemy import text
 from src.models.indexing.indexing_checkpoints import IndexingCheckpoint
 
 UPDATE_INDEXING_CHECKPOINTS_QUERY = """
-    INSERT INTO indexing_checkpoints (tablename, last_checkpoint)
-    VALUES(:tablename, :last_checkpoint)
+    INSERT INTO indexing_checkpoints (tablename, last_checkpoint, signature)
+    VALUES(:tablename, :last_checkpoint, :signature)
     ON CONFLICT (tablename)
-    DO UPDATE SET last_checkpoint = EXCLUDED.last_checkpoint;
+    DO UPDATE SET
+        last_checkpoint = EXCLUDED.last_checkpoint,
+        signature = EXCLUDED.signature;
     """
 
 
-def save_indexed_checkpoint(session, tablename, checkpoint):
+def save_indexed_checkpoint(session, tablename, checkpoint, signature=None):
     session.execute(
         text(UPDATE_INDEXING_CHECKPOINTS_QUERY),
         {
             "tablename": tablename,
             "last_checkpoint": checkpoint,
+            "signature": signature,
         },
     )
 
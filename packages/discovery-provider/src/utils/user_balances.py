@@ -0,0 +1,210 @@
+"""
+Fetches the AUDIO balances of users' wallets in batches: eth balances through
+multicall and solana token account balances through getMultipleAccounts.
+"""
+
+import logging
+from typing import Dict, List, Optional, Set, Tuple, TypedDict
+
+from solders.account import Account
+from solders.pubkey import Pubkey
+from web3 import Web3
+
+from src.solana.solana_client_manager import (
+    GET_MULTIPLE_ACCOUNTS_BATCH_SIZE,
+    SolanaClientManager,
+)
+from src.solana.solana_helpers import ASSOCIATED_TOKEN_PROGRAM_ID_PK, SPL_TOKEN_ID_PK
+from src.utils.multicall import ContractCall, aggregate
+
+logger = logging.getLogger(__name__)
+
+# spl token accounts start with the mint (32 bytes) and owner (32 bytes)
+# followed by the amount as a little endian u64
+SPL_TOKEN_ACCOUNT_AMOUNT_OFFSET = 64
+
+
+class AssociatedWallets(TypedDict):
+    eth: List[str]
+    sol: List[str]
+
+
+class UserWalletMetadata(TypedDict):
+    owner_wallet: str
+    associated_wallets: AssociatedWallets
+    bank_account: Optional[str]
+
+
+class UserWalletBalances(TypedDict):
+    owner_wallet_balance: int
+    # AUDIO held, delegated and staked by associated eth wallets
+    associated_balance: int
+    # balance of the user bank, in wAUDIO
+    waudio_balance: str
+    associated_sol_balance: int
+
+
+def get_associated_token_account(wallet: str, mint: Pubkey) -> Pubkey:
+    account, _ = Pubkey.find_program_address(
+        [bytes(Pubkey.from_string(wallet)), bytes(SPL_TOKEN_ID_PK), bytes(mint)],
+        ASSOCIATED_TOKEN_PROGRAM_ID_PK,
+    )
+    return account
+
+
+def get_spl_token_amount(account_info: Optional[Account]) -> Optional[int]:
+    if account_info is None:
+        return None
+    return int.from_bytes(
+        account_info.data[
+            SPL_TOKEN_ACCOUNT_AMOUNT_OFFSET : SPL_TOKEN_ACCOUNT_AMOUNT_OFFSET + 8
+        ],
+        "little",
+    )
+
+
+def fetch_user_balances(
+    user_id_metadata: Dict[int, UserWalletMetadata],
+    token_contract,
+    delegate_manager_contract,
+    staking_contract,
+    eth_web3: Web3,
+    solana_client_manager: SolanaClientManager,
+    waudio_mint: Optional[Pubkey],
+    block_identifier="latest",
+) -> Dict[int, UserWalletBalances]:
+    """
+    Fetches the balances of every user's wallets with one eth_call per
+    multicall chunk and one getMultipleAccounts call per 100 solana accounts.
+
+    Users whose eth balances, user bank or solana accounts could not be
+    fetched are logged and left out. Associated solana wallets without a
+    wAUDIO token account have no balance.
+    """
+    eth_calls: List[ContractCall] = []
+    sol_accounts: List[Pubkey] = []
+    # user_id => (owner wallet call, associated eth wallet calls,
+    # associated sol accounts, bank account)
+    user_indexes: Dict[int, Tuple[int, List[int], List[int], Optional[int]]] = {}
+
+    for user_id, wallets in user_id_metadata.items():
+        try:
+            owner_index = len(eth_calls)
+            eth_calls.append(
+                ContractCall(
+                    token_contract,
+                    "balanceOf",
+                    (Web3.to_checksum_address(wallets["owner_wallet"]),),
+                )
+            )
+            associated_indexes = []
+            for wallet in wallets["associated_wallets"]["eth"]:
+                wallet = Web3.to_checksum_address(wallet)
+                associated_indexes.extend(range(len(eth_calls), len(eth_calls) + 3))
+                eth_calls.extend(
+                    [
+                        ContractCall(token_contract, "balanceOf", (wallet,)),
+                        ContractCall(
+                            delegate_manager_contract,
+                            "getTotalDelegatorStake",
+                            (wallet,),
+                        ),
+                        ContractCall(staking_contract, "totalStakedFor", (wallet,)),
+                    ]
+                )
+
+            sol_indexes = []
+            if waudio_mint is not None:
+                for wallet in wallets["associated_wallets"]["sol"]:
+                    try:
+                        sol_accounts.append(
+                            get_associated_token_account(wallet, waudio_mint)
+                        )
+                        sol_indexes.append(len(sol_accounts) - 1)
+                    except Exception as e:
+                        logger.error(
+                            f"user_balances.py | Error deriving token account for user {user_id}, wallet {wallet}: {e}"
+                        )
+
+            bank_index = None
+            if wallets["bank_account"] is not None:
+                if waudio_mint is None:
+                    logger.error(
+                        "user_balances.py | Missing Required SPL Confirguration"
+                    )
+                else:
+                    sol_accounts.append(Pubkey.from_string(wallets["bank_account"]))
+                    bank_index = len(sol_accounts) - 1
+
+            user_indexes[user_id] = (
+                owner_index,
+                associated_indexes,
+                sol_indexes,
+                bank_index,
+            )
+        except Exception as e:
+            logger.error(
+                f"user_balances.py | Error fetching balance for user {user_id}: {e}"
+            )
+
+    eth_results = aggregate(eth_web3, eth_calls, block_identifier)
+    sol_amounts: List[Optional[int]] = []
+    failed_sol_indexes: Set[int] = set()
+    for i in range(0, len(sol_accounts), GET_MULTIPLE_ACCOUNTS_BATCH_SIZE):
+        batch = sol_accounts[i : i + GET_MULTIPLE_ACCOUNTS_BATCH_SIZE]
+        try:
+            batch_amounts = [
+                get_spl_token_amount(account_info)
+                for account_info in solana_client_manager.get_multiple_accounts(batch)
+            ]
+        except Exception as e:
+            logger.error(
+                f"user_balances.py | Error fetching solana accounts {i} to {i + len(batch)}: {e}"
+            )
+            batch_amounts = [None] * len(batch)
+            failed_sol_indexes.update(range(i, i + len(batch)))
+        sol_amounts.extend(batch_amounts)
+
+    balances: Dict[int, UserWalletBalances] = {}
+    for user_id, (
+        owner_index,
+        associated_indexes,
+        sol_indexes,
+        bank_index,
+    ) in user_indexes.items():
+        eth_balances = [
+            balance
+            for balance in [eth_results[owner_index]]
+            + [eth_results[index] for index in associated_indexes]
+            if balance is not None
+        ]
+        if len(eth_balances) != len(associated_indexes) + 1:
+            logger.error(
+                f"user_balances.py | Error fetching eth balances for user {user_id}"
+            )
+            continue
+        user_sol_indexes = sol_indexes + (
+            [bank_index] if bank_index is not None else []
+        )
+        if failed_sol_indexes.intersection(user_sol_indexes):
+            logger.error(
+                f"user_balances.py | Error fetching solana balances for user {user_id}"
+            )
+            continue
+        waudio_balance = "0"
+        if bank_index is not None:
+            if sol_amounts[bank_index] is None:
+                logger.error(
+                    f"user_balances.py | Missing user bank {sol_accounts[bank_index]} for user {user_id}"
+                )
+                continue
+            waudio_balance = str(sol_amounts[bank_index])
+        balances[user_id] = {
+            "owner_wallet_balance": eth_balances[0],
+            "associated_balance": sum(eth_balances[1:]),
+            "waudio_balance": waudio_balance,
+            "associated_sol_balance": sum(
+                sol_amounts[index] or 0 for index in sol_indexes
+            ),
+        }
+    return balances
@@ -0,0 +1,290 @@
+from unittest import mock
+
+from eth_abi import decode, encode
+from eth_utils import function_abi_to_4byte_selector
+from hexbytes import HexBytes
+from solders.account import Account
+from solders.pubkey import Pubkey
+from web3 import Web3
+from web3.providers import BaseProvider
+
+from src.solana.solana_helpers import SPL_TOKEN_ID_PK
+from src.utils.helpers import load_eth_abi_values
+from src.utils.multicall import MULTICALL3_ADDRESS, ContractCall, aggregate
+from src.utils.user_balances import fetch_user_balances, get_associated_token_account
+
+TOKEN_ADDRESS = "0x0000000000000000000000000000000000000001"
+DELEGATE_MANAGER_ADDRESS = "0x0000000000000000000000000000000000000002"
+STAKING_ADDRESS = "0x0000000000000000000000000000000000000003"
+OWNER_WALLET = "0x00000000000000000000000000000000000000a1"
+ASSOCIATED_WALLET = "0x00000000000000000000000000000000000000a2"
+BROKE_WALLET = "0x00000000000000000000000000000000000000a3"
+
+WAUDIO_MINT = Pubkey.new_unique()
+BANK_ACCOUNT = Pubkey.new_unique()
+SOL_WALLET = Pubkey.new_unique()
+
+
+class StubEVMProvider(BaseProvider):
+    """
+    In-process stand-in for an eth node: runs Multicall3's aggregate3 and the
+    view functions registered with `add_function` in python.
+    """
+
+    def __init__(self, has_multicall=True):
+        self.functions = {}
+        self.has_multicall = has_multicall
+        # number of upcoming multicalls that fail, e.g. by running out of gas
+        self.failing_multicalls = 0
+        self.eth_calls = 0
+
+    def add_function(self, address, abi, fn_name, fn):
+        fn_abi = next(item for item in abi if item.get("name") == fn_name)
+        selector = function_abi_to_4byte_selector(fn_abi)
+        self.functions[(Web3.to_checksum_address(address), selector)] = (fn_abi, fn)
+
+    def call(self, address, data):
+        fn_abi, fn = self.functions[(Web3.to_checksum_address(address), data[:4])]
+        args = decode([input["type"] for input in fn_abi["inputs"]], data[4:])
+        outputs = [output["type"] for output in fn_abi["outputs"]]
+        return encode(outputs, [fn(*args)])
+
+    def aggregate3(self, data):
+        (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+        results = []
+        for address, _, call_data in calls:
+            if not any(address == key[0] for key in self.functions):
+                # no code at the address
+                results.append((True, b""))
+                continue
+            try:
+                results.append((True, self.call(address, call_data)))
+            except Exception:
+                results.append((False, b""))
+        return encode(["(bool,bytes)[]"], [results])
+
+    def make_request(self, method, params):
+        if method == "eth_chainId":
+            result = "0x1"
+        elif method == "eth_blockNumber":
+            result = "0x10"
+        elif method == "eth_getCode":
+            has_code = self.has_multicall or params[0] != MULTICALL3_ADDRESS
+            result = "0x6080" if has_code else "0x"
+        elif method == "eth_call":
+            self.eth_calls += 1
+            address = Web3.to_checksum_address(params[0]["to"])
+            data = HexBytes(params[0]["data"])
+            if address == MULTICALL3_ADDRESS and self.failing_multicalls:
+                self.failing_multicalls -= 1
+                return {"jsonrpc": "2.0", "id": 0, "error": "out of gas"}
+            elif address == MULTICALL3_ADDRESS and self.has_multicall:
+                result = HexBytes(self.aggregate3(data)).hex()
+            else:
+                try:
+                    result = HexBytes(self.call(address, data)).hex()
+                except Exception:
+                    return {"jsonrpc": "2.0", "id": 0, "error": "execution reverted"}
+        else:
+            raise NotImplementedError(method)
+        return {"jsonrpc": "2.0", "id": 0, "result": result}
+
+    def isConnected(self):
+        return True
+
+
+def get_contracts(has_multicall=True):
+    """Deploys the token, delegate manager and staking contracts to the stand-in"""
+    eth_abi_values = load_eth_abi_values()
+    token_abi = eth_abi_values["AudiusToken"]["abi"]
+    delegate_manager_abi = eth_abi_values["DelegateManager"]["abi"]
+    staking_abi = eth_abi_values["Staking"]["abi"]
+    balances = {OWNER_WALLET: 100, ASSOCIATED_WALLET: 10}
+
+    def balance_of(wallet):
+        if wallet == BROKE_WALLET:
+            raise Exception("revert")
+        return balances.get(wallet, 0)
+
+    provider = StubEVMProvider(has_multicall)
+    provider.add_function(TOKEN_ADDRESS, token_abi, "balanceOf", balance_of)
+    provider.add_function(
+        DELEGATE_MANAGER_ADDRESS,
+        delegate_manager_abi,
+        "getTotalDelegatorStake",
+        lambda wallet: 20,
+    )
+    provider.add_function(
+        STAKING_ADDRESS, staking_abi, "totalStakedFor", lambda wallet: 30
+    )
+    web3 = Web3(provider)
+    return (
+        provider,
+        web3,
+        web3.eth.contract(address=TOKEN_ADDRESS, abi=token_abi),
+        web3.eth.contract(address=DELEGATE_MANAGER_ADDRESS, abi=delegate_manager_abi),
+        web3.eth.contract(address=STAKING_ADDRESS, abi=staking_abi),
+    )
+
+
+def test_aggregate():
+    provider, web3, token, delegate_manager, _ = get_contracts()
+    calls = [
+        ContractCall(token, "balanceOf", (Web3.to_checksum_address(OWNER_WALLET),)),
+        ContractCall(token, "balanceOf", (Web3.to_checksum_address(BROKE_WALLET),)),
+        ContractCall(
+            delegate_manager,
+            "getTotalDelegatorStake",
+            (Web3.to_checksum_address(OWNER_WALLET),),
+        ),
+    ] * 4
+    assert aggregate(web3, calls, chunk_size=5) == [100, None, 20] * 4
+    # 12 calls in chunks of 5
+    assert provider.eth_calls == 3
+
+    # calls to an address without code have no result
+    no_code = web3.eth.contract(
+        address="0x00000000000000000000000000000000000000ff", abi=token.abi
+    )
+    assert aggregate(
+        web3,
+        [ContractCall(no_code, "balanceOf", (Web3.to_checksum_address(OWNER_WALLET),))],
+    ) == [None]
+
+
+def test_aggregate_chunk_error():
+    provider, web3, token, _, _ = get_contracts()
+    calls = [
+        ContractCall(token, "balanceOf", (Web3.to_checksum_address(OWNER_WALLET),)),
+        ContractCall(token, "balanceOf", (Web3.to_checksum_address(BROKE_WALLET),)),
+    ] * 2
+    provider.failing_multicalls = 1
+    assert aggregate(web3, calls, chunk_size=2) == [100, None] * 2
+    # the failed chunk is called one by one
+    assert provider.eth_calls == 4
+
+
+def test_aggregate_without_multicall():
+    provider, web3, token, _, _ = get_contracts(has_multicall=False)
+    calls = [
+        ContractCall(token, "balanceOf", (Web3.to_checksum_address(OWNER_WALLET),)),
+        ContractCall(token, "balanceOf", (Web3.to_checksum_address(BROKE_WALLET),)),
+    ]
+    assert aggregate(web3, calls) == [100, None]
+    assert provider.eth_calls == 2
+
+
+def get_token_account(amount):
+    data = bytes(WAUDIO_MINT) + bytes(32) + amount.to_bytes(8, "little") + bytes(93)
+    return Account(lamports=1, data=data, owner=SPL_TOKEN_ID_PK)
+
+
+def test_fetch_user_balances():
+    provider, web3, token, delegate_manager, staking = get_contracts()
+    token_accounts = {
+        BANK_ACCOUNT: get_token_account(5),
+        get_associated_token_account(str(SOL_WALLET), WAUDIO_MINT): get_token_account(
+            7
+        ),
+    }
+    solana_client_manager = mock.Mock()
+    solana_client_manager.get_multiple_accounts.side_effect = lambda accounts: [
+        token_accounts.get(account) for account in accounts
+    ]
+
+    user_id_metadata = {
+        1: {
+            "owner_wallet": OWNER_WALLET,
+            "associated_wallets": {
+                "eth": [ASSOCIATED_WALLET],
+                "sol": [str(SOL_WALLET), str(Pubkey.new_unique())],
+            },
+            "bank_account": str(BANK_ACCOUNT),
+        },
+        # the owner wallet balance call fails
+        2: {
+            "owner_wallet": BROKE_WALLET,
+            "associated_wallets": {"eth": [], "sol": []},
+            "bank_account": None,
+        },
+        # the user bank does not exist
+        3: {
+            "owner_wallet": OWNER_WALLET,
+            "associated_wallets": {"eth": [], "sol": []},
+            "bank_account": str(Pubkey.new_unique()),
+        },
+    }
+    for user_id in range(4, 200):
+        user_id_metadata[user_id] = {
+            "owner_wallet": ASSOCIATED_WALLET,
+            "associated_wallets": {"eth": [OWNER_WALLET], "sol": []},
+            "bank_account": None,
+        }
+
+    balances = fetch_user_balances(
+        user_id_metadata,
+        token,
+        delegate_manager,
+        staking,
+        web3,
+        solana_client_manager,
+        WAUDIO_MINT,
+    )
+
+    assert balances[1] == {
+        "owner_wallet_balance": 100,
+        "associated_balance": 10 + 20 + 30,
+        "waudio_balance": "5",
+        "associated_sol_balance": 7,
+    }
+    assert 2 not in balances
+    assert 3 not in balances
+    assert balances[4] == {
+        "owner_wallet_balance": 10,
+        "associated_balance": 100 + 20 + 30,
+        "waudio_balance": "0",
+        "associated_sol_balance": 0,
+    }
+    assert len(balances) == 197
+    # 790 eth calls in 2 multicall chunks and 4 solana accounts in 1 batch
+    assert provider.eth_calls == 2
+    assert solana_client_manager.get_multiple_accounts.call_count == 1
+
+
+def test_fetch_user_balances_solana_error():
+    _, web3, token, delegate_manager, staking = get_contracts()
+    failing_bank_account = Pubkey.new_unique()
+
+    def get_multiple_accounts(accounts):
+        if failing_bank_account in accounts:
+            raise Exception("All requests failed to fetch")
+        return [get_token_account(5) for _ in accounts]
+
+    solana_client_manager = mock.Mock()
+    solana_client_manager.get_multiple_accounts.side_effect = get_multiple_accounts
+
+    user_id_metadata = {
+        user_id: {
+            "owner_wallet": OWNER_WALLET,
+            "associated_wallets": {"eth": [], "sol": []},
+            "bank_account": str(
+                failing_bank_account if user_id == 2 else Pubkey.new_unique()
+            ),
+        }
+        for user_id in range(1, 4)
+    }
+    with mock.patch("src.utils.user_balances.GET_MULTIPLE_ACCOUNTS_BATCH_SIZE", 1):
+        balances = fetch_user_balances(
+            user_id_metadata,
+            token,
+            delegate_manager,
+            staking,
+            web3,
+            solana_client_manager,
+            WAUDIO_MINT,
+        )
+
+    # the users in the other batches are still fetched
+    assert set(balances) == {1, 3}
+    assert balances[3]["waudio_balance"] == "5"
+    assert solana_client_manager.get_multiple_accounts.call_count == 3